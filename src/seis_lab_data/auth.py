@@ -55,6 +55,10 @@ class AuthConfig:
     def introspection_endpoint(self):
         return f"{self.authentik_internal_url}/application/o/introspect/"
 
+    @property
+    def issuer(self):
+        return f"{self.authentik_external_url}/application/o/{self.app_slug}/"
+
     @property
     def jwks_uri(self):
         return f"{self.authentik_internal_url}/application/o/{self.app_slug}/jwks/"
@@ -1,5 +1,7 @@
 import asyncio
 import dataclasses
+import functools
+import itertools
 import json
 import logging
 import uuid
@@ -7,8 +9,10 @@ from collections.abc import AsyncGenerator
 from typing import Annotated
 
 import typer
+from anyio import to_thread
 from psycopg.errors import UniqueViolation
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import text
 from redis import asyncio as aioredis
 
 from .. import (
@@ -17,10 +21,13 @@ from .. import (
     subscribers,
 )
 from ..operations import (
+    extents as extent_ops,
     projects as project_ops,
     surveymissions as mission_ops,
     surveyrelatedrecords as record_ops,
 )
+from ..db import models
+from ..db.commands import common as common_commands
 from ..db.queries import (
     datasetcategories as category_queries,
     workflowstages as stage_queries,
@@ -141,6 +148,128 @@ async def generate_many_projects(
         ctx.obj["main"].status_console.print("Done!")
 
 
+@app.async_command()
+async def generate_load_test_data(
+    ctx: typer.Context,
+    num_projects: Annotated[int, typer.Option(min=1)] = 100,
+    num_survey_missions: Annotated[int, typer.Option(min=1)] = 1_000,
+    num_records: Annotated[int, typer.Option(min=0)] = 100_000,
+    seed: Annotated[
+        int,
+        typer.Option(help="Generating again with the same seed yields the same data."),
+    ] = 0,
+    published_ratio: Annotated[float, typer.Option(min=0, max=1)] = 0.5,
+    batch_size: Annotated[int, typer.Option(min=1)] = 10_000,
+    concurrency: Annotated[
+        int, typer.Option(min=1, help="Number of record batches to write at once.")
+    ] = 4,
+):
+    """Generate large amounts of synthetic data around the Portuguese EEZ, for load testing.
+
+    Data is written directly to the database with COPY, bypassing validation
+    and events. Records are written in batches, several at a time, each batch
+    in its own transaction.
+    """
+    admin_ = ctx.obj["admin_user"]
+    printer = ctx.obj["main"].status_console.print
+    settings: config.SeisLabDataSettings = ctx.obj["main"].settings
+    session_maker = settings.get_db_session_maker()
+    async with session_maker() as session:
+        dataset_categories = await category_queries.collect_all_dataset_categories(
+            session
+        )
+        workflow_stages = await stage_queries.collect_all_workflow_stages(session)
+    if num_records > 0 and not (dataset_categories and workflow_stages):
+        printer(
+            "Records need dataset categories and workflow stages, but there are "
+            "none. Load the bootstrap data first, with `seis-lab-data bootstrap "
+            "all`. Aborting..."
+        )
+        raise typer.Abort()
+    vocabulary = sampledata.SyntheticVocabulary.from_faker()
+    projects = sampledata.generate_synthetic_projects(
+        seed, num_projects, admin_.id, vocabulary, published_ratio
+    )
+    survey_missions = sampledata.generate_synthetic_survey_missions(
+        seed, num_survey_missions, projects, admin_.id, vocabulary, published_ratio
+    )
+    async with session_maker() as session:
+        for model, column_names, resources in (
+            (models.Project, sampledata.SYNTHETIC_PROJECT_COLUMNS, projects),
+            (
+                models.SurveyMission,
+                sampledata.SYNTHETIC_SURVEY_MISSION_COLUMNS,
+                survey_missions,
+            ),
+        ):
+            printer(f"Writing {len(resources)} rows to {model.__tablename__}...")
+            for batch in itertools.batched(resources, batch_size):
+                await common_commands.copy_rows(
+                    session,
+                    model.__tablename__,
+                    column_names,
+                    (resource.row for resource in batch),
+                )
+        await session.commit()
+
+    generate_records = functools.partial(
+        sampledata.generate_synthetic_survey_related_records,
+        owner_id=admin_.id,
+        survey_missions=survey_missions,
+        dataset_categories=[
+            identifiers.DatasetCategoryId(dc.id) for dc in dataset_categories
+        ],
+        workflow_stages=[identifiers.WorkflowStageId(ws.id) for ws in workflow_stages],
+        vocabulary=vocabulary,
+        published_ratio=published_ratio,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write_record_batch(batch_index: int, num_batch_records: int) -> None:
+        async with semaphore:
+            # generation is CPU-bound, running it in a thread lets the event
+            # loop keep writing other batches in the meantime
+            records = await to_thread.run_sync(
+                generate_records, seed, batch_index, num_batch_records
+            )
+            async with session_maker() as batch_session:
+                await common_commands.copy_rows(
+                    batch_session,
+                    models.SurveyRelatedRecord.__tablename__,
+                    sampledata.SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS,
+                    records,
+                )
+                await batch_session.commit()
+            printer(f"Wrote record batch {batch_index + 1}/{num_batches}")
+
+    num_batches = -(-num_records // batch_size)
+    printer(f"Writing {num_records} records in {num_batches} batches...")
+    await asyncio.gather(
+        *(
+            write_record_batch(index, min(batch_size, num_records - index * batch_size))
+            for index in range(num_batches)
+        )
+    )
+
+    async with session_maker() as session:
+        printer("Computing the extents of survey missions and projects...")
+        await extent_ops.rebuild_extents(
+            session,
+            request_id=identifiers.RequestId(uuid.uuid4()),
+            event_dispatcher=no_op_dispatcher,
+            batch_size=settings.extent_reconciliation_batch_size,
+        )
+        await session.execute(
+            text(
+                f"ANALYZE {models.Project.__tablename__}, "
+                f"{models.SurveyMission.__tablename__}, "
+                f"{models.SurveyRelatedRecord.__tablename__}"
+            )
+        )
+        await session.commit()
+    printer("Done!")
+
+
 @app.async_command()
 async def load_all_samples(ctx: typer.Context):
     """Load all sample data into the database."""
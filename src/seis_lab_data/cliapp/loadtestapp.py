@@ -0,0 +1,164 @@
+import dataclasses
+import datetime as dt
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.table import Table
+
+from .. import config
+from ..loadtesting import (
+    results,
+    scenarios,
+)
+from .asynctyper import AsyncTyper
+
+app = AsyncTyper()
+
+
+@app.callback()
+def load_test_app_callback(ctx: typer.Context) -> None:
+    """Measure how the web app copes with many concurrent users"""
+
+
+@app.async_command(name="run")
+async def run_load_test(
+    ctx: typer.Context,
+    scenario: scenarios.LoadTestScenario,
+    base_url: Annotated[
+        str | None, typer.Option(help="Defaults to the configured public URL")
+    ] = None,
+    duration: Annotated[float, typer.Option(help="Seconds", min=1)] = 60,
+    num_users: Annotated[
+        int, typer.Option(help="Number of anonymous visitors browsing", min=0)
+    ] = 20,
+    think_time: Annotated[
+        float,
+        typer.Option(help="Mean number of seconds users wait between pages", min=0),
+    ] = 1.0,
+    seed: int = 0,
+    session_cookie: Annotated[
+        str | None,
+        typer.Option(
+            help=(
+                "Value of the `session` cookie of a logged in editor, as found in "
+                "a browser. Needed for scenarios where someone makes changes"
+            )
+        ),
+    ] = None,
+    survey_mission_id: Annotated[
+        str | None,
+        typer.Option(help="Survey mission to bulk update or to listen to"),
+    ] = None,
+    num_sse_listeners: Annotated[int, typer.Option(min=1)] = 500,
+    results_dir: Annotated[
+        Path, typer.Option(help="Where to store results, for later comparison")
+    ] = Path("load-test-results"),
+    commit: Annotated[
+        str | None,
+        typer.Option(help="Commit being tested. Defaults to the checked out one"),
+    ] = None,
+):
+    """Run a load test scenario against a running instance of the web app.
+
+    Latency percentiles, throughput and error rates are reported per route and
+    stored as JSON, so that runs can be compared across commits.
+    """
+    printer = ctx.obj["main"].status_console.print
+    settings: config.SeisLabDataSettings = ctx.obj["main"].settings
+    if scenario != scenarios.LoadTestScenario.ANONYMOUS_BROWSING and (
+        survey_mission_id is None
+    ):
+        printer(f"The {scenario.value!r} scenario needs a survey mission, aborting...")
+        raise typer.Abort()
+    if scenario == scenarios.LoadTestScenario.EDITOR_BULK_UPDATE and (
+        session_cookie is None
+    ):
+        printer(f"The {scenario.value!r} scenario needs a session cookie, aborting...")
+        raise typer.Abort()
+    options = scenarios.LoadTestOptions(
+        base_url=base_url or settings.public_url,
+        duration_seconds=duration,
+        num_users=num_users,
+        think_time_seconds=think_time,
+        seed=seed,
+        session_cookie=session_cookie,
+        survey_mission_id=survey_mission_id,
+        num_sse_listeners=num_sse_listeners,
+    )
+    recorder = results.LoadTestRecorder()
+    started_at = dt.datetime.now(dt.timezone.utc)
+    printer(f"Running {scenario.value!r} against {options.base_url} for {duration}s...")
+    await scenarios.run_scenario(scenario, options, recorder)
+    run = results.LoadTestRun(
+        scenario=scenario.value,
+        base_url=options.base_url,
+        commit=commit or results.get_current_commit(),
+        started_at=started_at,
+        duration_seconds=recorder.elapsed_seconds,
+        options={
+            k: v
+            for k, v in dataclasses.asdict(options).items()
+            if k != "session_cookie"
+        },
+        routes=results.summarize_samples(recorder.samples, recorder.elapsed_seconds),
+    )
+    table = Table("Route", "Requests", "Req/s", "Errors", "p50 ms", "p95 ms", "p99 ms")
+    for route in run.routes:
+        table.add_row(
+            route.route,
+            str(route.num_requests),
+            f"{route.requests_per_second:.1f}",
+            f"{route.error_rate:.1%}",
+            f"{route.p50_ms:.0f}",
+            f"{route.p95_ms:.0f}",
+            f"{route.p99_ms:.0f}",
+        )
+    printer(table)
+    printer(f"Results stored in {run.save(results_dir)}")
+
+
+def _format_change(change: float | None) -> str:
+    if change is None:
+        return "-"
+    # changes of up to 10% are considered noise
+    if change > 0.1:
+        return f"[red]{change:+.0%}[/red]"
+    if change < -0.1:
+        return f"[green]{change:+.0%}[/green]"
+    return f"{change:+.0%}"
+
+
+@app.command(name="compare")
+def compare_load_tests(ctx: typer.Context, baseline: Path, candidate: Path):
+    """Compare the results of two load test runs, route by route"""
+    baseline_run = results.LoadTestRun.from_json(baseline.read_text())
+    candidate_run = results.LoadTestRun.from_json(candidate.read_text())
+    table = Table(
+        "Route",
+        f"p95 ms ({baseline_run.commit})",
+        f"p95 ms ({candidate_run.commit})",
+        "Change",
+        f"Req/s ({baseline_run.commit})",
+        f"Req/s ({candidate_run.commit})",
+        f"Errors ({baseline_run.commit})",
+        f"Errors ({candidate_run.commit})",
+    )
+    for comparison in results.compare_runs(baseline_run, candidate_run):
+        table.add_row(
+            comparison.route,
+            *(
+                f"{stats.p95_ms:.0f}" if stats else "-"
+                for stats in (comparison.baseline, comparison.candidate)
+            ),
+            _format_change(comparison.p95_change),
+            *(
+                f"{stats.requests_per_second:.1f}" if stats else "-"
+                for stats in (comparison.baseline, comparison.candidate)
+            ),
+            *(
+                f"{stats.error_rate:.1%}" if stats else "-"
+                for stats in (comparison.baseline, comparison.candidate)
+            ),
+        )
+    ctx.obj["main"].status_console.print(table)
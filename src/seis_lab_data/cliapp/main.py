@@ -1,17 +1,31 @@
+import asyncio
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import Annotated
 
 from rich.padding import Padding
 from rich.panel import Panel
+from rich.table import Table
 import typer
 
-from .. import config
-from ..tasks import broker
+from .. import (
+    config,
+    constants,
+)
+from ..tasks import (
+    broker,
+    resources,
+)
+from ..webapp import (
+    fragmentcache,
+    staticassets,
+)
 from .bootstrapapp import app as bootstrap_app
 from .dbapp import app as db_app
 from .devapp import app as dev_app
+from .loadtestapp import app as load_test_app
 from .mainapp import app as main_app
 from .translationsapp import app as translations_app
 
@@ -22,6 +36,7 @@ app.add_typer(db_app, name="db")
 app.add_typer(main_app, name="main")
 app.add_typer(dev_app, name="dev")
 app.add_typer(bootstrap_app, name="bootstrap")
+app.add_typer(load_test_app, name="load-test")
 
 
 @app.callback()
@@ -36,9 +51,43 @@ def base_callback(ctx: typer.Context) -> None:
 @app.command(
     context_settings={"allow_extra_args": True, "ignore_unknown_options": True}
 )
-def run_processing_worker(ctx: typer.Context) -> None:
+def run_processing_worker(
+    ctx: typer.Context,
+    queue: Annotated[
+        list[constants.TaskQueue] | None,
+        typer.Option(
+            help=(
+                "Queue to consume tasks from. Can be provided multiple times. "
+                "If not provided, the worker consumes from all queues."
+            )
+        ),
+    ] = None,
+    processes: Annotated[
+        int | None,
+        typer.Option(
+            help=(
+                "Number of worker processes. Defaults to the largest of the "
+                "values configured for the selected queues."
+            )
+        ),
+    ] = None,
+    threads: Annotated[
+        int | None,
+        typer.Option(
+            help=(
+                "Number of worker threads per process. Defaults to the sum of "
+                "the values configured for the selected queues."
+            )
+        ),
+    ] = None,
+) -> None:
     """Start a processing worker"""
     context: config.SeisLabDataCliContext = ctx.obj["main"]
+    selected_queues = queue or list(constants.TaskQueue)
+    queue_settings = [
+        context.settings.worker_queues.get(q, config.SeisLabDataWorkerQueueSettings())
+        for q in selected_queues
+    ]
     panel = Panel(
         "SeisLabData processing worker",
         title="seis-lab-data",
@@ -51,16 +100,34 @@ def run_processing_worker(ctx: typer.Context) -> None:
         "dramatiq",
         "--skip-logging",
         "seis_lab_data.tasks.broker:setup_broker",
+        "--queues",
+        *(q.value for q in selected_queues),
     ]
     if context.settings.debug:
+        num_processes = processes or 1
         dramatiq_args.extend(
             [
-                "--processes=1",
-                "--threads=1",
+                f"--processes={num_processes}",
+                f"--threads={threads or 1}",
                 f"--watch={Path(__file__).parents[1]}",
                 "--watch-exclude=__pycache__/*",
             ]
         )
+    else:
+        num_processes = processes or max(s.processes for s in queue_settings)
+        dramatiq_args.extend(
+            [
+                f"--processes={num_processes}",
+                f"--threads={threads or sum(s.threads for s in queue_settings)}",
+            ]
+        )
+    context.status_console.print(
+        f"This worker may open up to "
+        f"{resources.get_max_db_connections(context.settings, num_processes)} "
+        f"database connections ({num_processes} processes with a pool of "
+        f"{context.settings.database_pool_size} + "
+        f"{context.settings.database_max_overflow} overflow connections each)"
+    )
     sys.stdout.flush()
     sys.stderr.flush()
     context.status_console.print(
@@ -136,3 +203,46 @@ def run_web_server(ctx: typer.Context):
     sys.stdout.flush()
     sys.stderr.flush()
     os.execvp("uvicorn", uvicorn_args)
+
+
+@app.command()
+def fragment_cache_stats(ctx: typer.Context):
+    """Show hits and misses of the cache of rendered list components"""
+    context: config.SeisLabDataCliContext = ctx.obj["main"]
+    cache = fragmentcache.FragmentCache(
+        context.settings.get_redis_client(),
+        ttl_seconds=context.settings.fragment_cache_ttl_seconds,
+    )
+    table = Table("Component", "Hits", "Misses", "Hit ratio")
+    for stats in sorted(asyncio.run(cache.get_stats()), key=lambda s: s.name):
+        table.add_row(
+            stats.name, str(stats.hits), str(stats.misses), f"{stats.hit_ratio:.1%}"
+        )
+    context.status_console.print(table)
+
+
+@app.command()
+def build_static_assets(
+    ctx: typer.Context,
+    output_dir: Annotated[
+        Path | None,
+        typer.Option(help="Defaults to the configured static build dir"),
+    ] = None,
+):
+    """Write fingerprinted and precompressed copies of the static files"""
+    context: config.SeisLabDataCliContext = ctx.obj["main"]
+    if (build_dir := output_dir or context.settings.static_build_dir) is None:
+        context.status_console.print(
+            "Provide an output dir or set SEIS_LAB_DATA__STATIC_BUILD_DIR, aborting..."
+        )
+        raise typer.Abort()
+    manifest = staticassets.StaticAssetManifest.build(
+        context.settings.static_dir, build_dir
+    )
+    if staticassets.brotli is None:
+        context.status_console.print(
+            "brotli is not installed, only gzip variants were built"
+        )
+    context.status_console.print(
+        f"Built {len(manifest.assets)} static assets into {build_dir}"
+    )
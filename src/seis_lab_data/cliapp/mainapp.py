@@ -1,16 +1,27 @@
 import asyncio
+import dataclasses
+import datetime as dt
 import json
+import sys
 import uuid
+from pathlib import Path
 from typing import Annotated
 
+import shapely
 import typer
 
-from .. import config
+from .. import (
+    config,
+    constants,
+    exports,
+)
 from ..operations import (
     datasetcategories as category_ops,
+    extents as extent_ops,
     projects as project_ops,
     surveymissions as mission_ops,
     surveyrelatedrecords as record_ops,
+    validation as validation_ops,
     workflowstages as stage_ops,
 )
 from ..db.queries import (
@@ -20,11 +31,13 @@ from ..db.queries import (
 from ..schemas import (
     common as common_schemas,
     datasetcategories as category_schemas,
+    filters as filter_schemas,
     identifiers,
     surveymissions as mission_schemas,
     surveyrelatedrecords as record_schemas,
     workflowstages as stage_schemas,
 )
+from ..tasks import validation as validation_tasks
 from .asynctyper import AsyncTyper
 from .utils import resolve_admin_user
 from .projectsapp import app as projects_app
@@ -166,6 +179,86 @@ async def list_survey_related_records(
         )
 
 
+@survey_related_records_app.async_command(name="export")
+async def export_survey_related_records(
+    ctx: typer.Context,
+    export_format: Annotated[
+        constants.ExportFormat, typer.Option("--format")
+    ] = constants.ExportFormat.NDJSON,
+    output: Annotated[
+        Path | None, typer.Option(help="File to write to. Defaults to stdout")
+    ] = None,
+    batch_size: Annotated[
+        int | None,
+        typer.Option(help="Rows fetched at a time. Defaults to the configured one"),
+    ] = None,
+    survey_mission_id: uuid.UUID | None = None,
+    project_id: uuid.UUID | None = None,
+    en_name: str | None = None,
+    pt_name: str | None = None,
+    bbox: Annotated[
+        str | None, typer.Option(help="As min_lon,min_lat,max_lon,max_lat")
+    ] = None,
+    temporal_extent_begin: Annotated[
+        dt.datetime | None, typer.Option(formats=["%Y-%m-%d"])
+    ] = None,
+    temporal_extent_end: Annotated[
+        dt.datetime | None, typer.Option(formats=["%Y-%m-%d"])
+    ] = None,
+    dataset_category_id: uuid.UUID | None = None,
+    workflow_stage_id: uuid.UUID | None = None,
+    only_internal: bool = False,
+):
+    """Export the survey-related records matching some filters.
+
+    Records are read from the database and written out in batches, which
+    means that any number of them can be exported.
+    """
+    settings: config.SeisLabDataSettings = ctx.obj["main"].settings
+    printer = ctx.obj["main"].status_console.print
+    if export_format not in exports.get_available_formats():
+        printer(f"Exporting as {export_format.value!r} needs pyarrow, aborting...")
+        raise typer.Abort()
+    spatial_intersect = None
+    if bbox is not None:
+        try:
+            spatial_intersect = shapely.box(*(float(c) for c in bbox.split(",")))
+        except (TypeError, ValueError):
+            printer(f"Invalid bounding box {bbox!r}, aborting...")
+            raise typer.Abort()
+    temporal_extent = None
+    if temporal_extent_begin is not None or temporal_extent_end is not None:
+        temporal_extent = filter_schemas.TemporalExtentFilterValue(
+            begin=temporal_extent_begin.date() if temporal_extent_begin else None,
+            end=temporal_extent_end.date() if temporal_extent_end else None,
+        )
+    num_bytes = 0
+    async with settings.get_db_session_maker()() as session:
+        batches = record_ops.export_survey_related_records(
+            session,
+            initiator=ctx.obj["admin_user"],
+            batch_size=batch_size or settings.export_batch_size,
+            only_internal=only_internal,
+            survey_mission_id=survey_mission_id,
+            project_id=project_id,
+            en_name_filter=en_name,
+            pt_name_filter=pt_name,
+            spatial_intersect=spatial_intersect,
+            temporal_extent=temporal_extent,
+            dataset_category_id=dataset_category_id,
+            workflow_stage_id=workflow_stage_id,
+        )
+        target = output.open("wb") if output is not None else sys.stdout.buffer
+        try:
+            async for chunk in exports.serialize(export_format, batches):
+                target.write(chunk)
+                num_bytes += len(chunk)
+        finally:
+            if output is not None:
+                target.close()
+    printer(f"Exported {num_bytes} bytes to {output or 'stdout'}")
+
+
 @survey_related_records_app.async_command(name="get")
 async def get_survey_related_record(
     ctx: typer.Context, survey_related_record_id: uuid.UUID
@@ -433,3 +526,77 @@ async def delete_workflow_stage(
             event_dispatcher=settings.get_event_dispatcher(),
         )
     print(f"Deleted workflow stage with id {workflow_stage_id!r}")
+
+
+@app.async_command(name="validate")
+async def bulk_validate(
+    ctx: typer.Context,
+    resource_type: constants.ResourceType,
+    project_id: uuid.UUID | None = None,
+    survey_mission_id: uuid.UUID | None = None,
+    batch_size: int | None = None,
+    background: Annotated[
+        bool,
+        typer.Option(help="Queue validation for a worker instead of running it now."),
+    ] = False,
+):
+    """Validate all projects, survey missions or survey-related records at once.
+
+    Validation can be restricted to a project or to a survey mission.
+    """
+    settings: config.SeisLabDataSettings = ctx.obj["main"].settings
+    printer = ctx.obj["main"].status_console.print
+    request_id = identifiers.RequestId(uuid.uuid4())
+    if background:
+        validation_tasks.bulk_validate.send(
+            raw_request_id=str(request_id),
+            raw_resource_type=resource_type.value,
+            raw_initiator=json.dumps(dataclasses.asdict(ctx.obj["admin_user"])),
+            raw_project_id=str(project_id) if project_id else None,
+            raw_survey_mission_id=str(survey_mission_id) if survey_mission_id else None,
+        )
+        printer(f"Queued validation with request id {str(request_id)!r}")
+        return
+    async with settings.get_db_session_maker()() as session:
+        summary = await validation_ops.bulk_validate(
+            request_id=request_id,
+            resource_type=resource_type,
+            initiator=ctx.obj["admin_user"],
+            session=session,
+            event_dispatcher=settings.get_event_dispatcher(),
+            batch_size=batch_size or settings.bulk_validation_batch_size,
+            project_id=identifiers.ProjectId(project_id) if project_id else None,
+            survey_mission_id=(
+                identifiers.SurveyMissionId(survey_mission_id)
+                if survey_mission_id
+                else None
+            ),
+        )
+    if summary is None:
+        printer("Could not validate, aborting...")
+        raise typer.Abort()
+    printer(
+        f"Validated {summary.num_validated} resources, "
+        f"{summary.num_invalid} of which are not valid"
+    )
+
+
+@app.async_command(name="rebuild-extents")
+async def rebuild_extents(ctx: typer.Context, batch_size: int | None = None):
+    """Recompute the extents of the records underneath all missions and projects.
+
+    These are normally kept up to date as records change - this is for when
+    they were not, e.g. after records were modified directly in the database.
+    """
+    settings: config.SeisLabDataSettings = ctx.obj["main"].settings
+    async with settings.get_db_session_maker()() as session:
+        summary = await extent_ops.rebuild_extents(
+            session,
+            request_id=identifiers.RequestId(uuid.uuid4()),
+            event_dispatcher=settings.get_event_dispatcher(),
+            batch_size=batch_size or settings.extent_reconciliation_batch_size,
+        )
+    ctx.obj["main"].status_console.print(
+        f"Rebuilt the extents of {summary.num_survey_missions} survey missions "
+        f"and {summary.num_projects} projects"
+    )
@@ -149,6 +149,7 @@ async def discover_survey_mission_contents(
 ):
     """Discover contents of a survey mission automatically."""
     redis_client: aioredis.Redis = ctx.obj["main"].redis_client
+    request_id = identifiers.RequestId(uuid.uuid4())
 
     async def handle_message(
         message: message_schemas.DiscoveryMessage,
@@ -162,22 +163,43 @@ async def discover_survey_mission_contents(
             case message_schemas.DiscoveryMessage(succeeded=False):
                 yield f"[red]Error:[/red] Mission discovery failed with {message.details!r}"
                 done.set()
-            case message_schemas.DiscoveryMessage(succeeded=True):
+            case message_schemas.DiscoveryMessage(
+                succeeded=True, modification=constants.DiscoveryStage.ENDED
+            ):
                 yield f"[green]Success:[/green] Mission {message.resource_id!r} discovery completed successfully!"
                 done.set()
 
-    topic_names = [constants.NEW_TOPIC_SURVEY_MISSIONS]
+    async def handle_progress_message(
+        message: message_schemas.DiscoveryProgressMessage,
+        context: subscribers.HandlerContext,
+        done: asyncio.Event | None = None,
+    ) -> AsyncGenerator[str, None]:
+        yield (
+            f"Processed {message.files_seen}/{message.total_files} files "
+            f"({message.files_failed} failed, "
+            f"{message.files_per_second:.1f} files/s)"
+        )
+
+    topic_names = [
+        constants.NEW_TOPIC_SURVEY_MISSIONS,
+        constants.PROGRESS_TOPIC_NAME_TEMPLATE.format(request_id=request_id),
+    ]
     pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
     discovery_tasks.discover_survey_mission_contents.send(
-        raw_request_id=str(uuid.uuid4()),
+        raw_request_id=str(request_id),
         raw_survey_mission_id=str(survey_mission_id),
         raw_initiator=json.dumps(dataclasses.asdict(ctx.obj["admin_user"])),
     )  # noqa
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
-        subscribers.HandlerContext(resource_id=str(survey_mission_id)),
-        {"discovery": handle_message},
+        subscribers.HandlerContext(
+            resource_id=str(survey_mission_id), request_id=request_id
+        ),
+        {
+            "discovery": handle_message,
+            "discovery_progress": handle_progress_message,
+        },
     )
     async for chunk in subscription:
         ctx.obj["main"].status_console.print(chunk)
@@ -1,8 +1,11 @@
+import dataclasses
 import datetime as dt
+import json
 import random
 import uuid
 from itertools import count
 from typing import (
+    Final,
     Iterator,
     Sequence,
 )
@@ -949,3 +952,320 @@ def _generate_sample_temporal_extent() -> tuple[dt.date | None, dt.date | None]:
     end = _FAKE_EN.date_object()
     start = _FAKE_EN.date_object(end_datetime=dt.datetime(end.year, end.month, end.day))
     return random.choice([start, None]), random.choice([end, None])
+
+
+# rough boxes around the sea of the three parts of the Portuguese exclusive
+# economic zone (mainland, Azores and Madeira), along with weights that are
+# about proportional to their areas
+PORTUGUESE_EEZ_REGIONS: Final[
+    tuple[tuple[tuple[float, float, float, float], float], ...]
+] = (
+    ((-13.8, 35.6, -9.3, 42.1), 0.19),
+    ((-35.6, 33.6, -22.6, 42.9), 0.55),
+    ((-20.4, 29.3, -13.3, 35.4), 0.26),
+)
+SYNTHETIC_PROJECT_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "owner_id",
+    "name",
+    "description",
+    "status",
+    "is_valid",
+    "validation_result",
+    "root_path",
+    "links",
+    "bbox_4326",
+    "created_at",
+    "temporal_extent_begin",
+    "temporal_extent_end",
+)
+SYNTHETIC_SURVEY_MISSION_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "owner_id",
+    "name",
+    "description",
+    "status",
+    "is_valid",
+    "validation_result",
+    "project_id",
+    "relative_path",
+    "links",
+    "bbox_4326",
+    "created_at",
+    "temporal_extent_begin",
+    "temporal_extent_end",
+)
+SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "owner_id",
+    "name",
+    "description",
+    "status",
+    "is_valid",
+    "validation_result",
+    "survey_mission_id",
+    "dataset_category_id",
+    "workflow_stage_id",
+    "links",
+    "bbox_4326",
+    "created_at",
+    "temporal_extent_begin",
+    "temporal_extent_end",
+)
+_SYNTHETIC_EPOCH: Final[dt.date] = dt.date(2000, 1, 1)
+_SYNTHETIC_NUM_DAYS: Final[int] = 25 * 365
+_SYNTHETIC_VALID_RESULT: Final[str] = json.dumps({"is_valid": True, "errors": None})
+
+
+@dataclasses.dataclass(frozen=True)
+class SyntheticVocabulary:
+    """Words that synthetic names and descriptions are made of.
+
+    Picking words from a fixed pool is much faster than asking faker for
+    sentences, which matters when generating millions of rows.
+    """
+
+    en_words: list[str]
+    pt_words: list[str]
+
+    @classmethod
+    def from_faker(cls) -> "SyntheticVocabulary":
+        return cls(
+            en_words=_FAKE_EN.get_words_list(),
+            pt_words=_FAKE_PT.get_words_list(),
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class SyntheticResource:
+    """A generated project or survey mission.
+
+    Besides its row, this keeps what its children are generated from.
+    """
+
+    id: uuid.UUID
+    x: float
+    y: float
+    temporal_extent_begin: dt.date
+    temporal_extent_end: dt.date
+    is_published: bool
+    row: tuple
+
+
+def get_synthetic_rng(seed: int, *parts: object) -> random.Random:
+    """Return a random number generator for some part of the synthetic data.
+
+    As each part gets its own generator, the generated data does not depend on
+    the order in which the parts are generated.
+    """
+    return random.Random("-".join(str(part) for part in (seed, *parts)))
+
+
+def _get_synthetic_id(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _get_synthetic_text(
+    rng: random.Random,
+    vocabulary: SyntheticVocabulary,
+    num_words: tuple[int, int],
+    max_length: int,
+) -> str:
+    return json.dumps(
+        {
+            "en": " ".join(rng.choices(vocabulary.en_words, k=rng.randint(*num_words)))[
+                :max_length
+            ],
+            "pt": " ".join(rng.choices(vocabulary.pt_words, k=rng.randint(*num_words)))[
+                :max_length
+            ],
+        }
+    )
+
+
+def _get_synthetic_bbox(rng: random.Random, x: float, y: float, max_size: float) -> str:
+    width = rng.uniform(max_size / 20, max_size)
+    height = rng.uniform(max_size / 20, max_size)
+    x_min = min(max(x - width / 2, -180.0), 180.0 - width)
+    y_min = min(max(y - height / 2, -90.0), 90.0 - height)
+    return f"SRID=4326;{shapely.box(x_min, y_min, x_min + width, y_min + height).wkt}"
+
+
+def _get_synthetic_temporal_extent(
+    rng: random.Random, parent: SyntheticResource, max_days: int
+) -> tuple[dt.date, dt.date]:
+    begin = parent.temporal_extent_begin + dt.timedelta(
+        days=rng.randint(
+            0, (parent.temporal_extent_end - parent.temporal_extent_begin).days
+        )
+    )
+    duration = rng.randint(0, min(max_days, (parent.temporal_extent_end - begin).days))
+    return begin, begin + dt.timedelta(days=duration)
+
+
+def _get_synthetic_status(is_published: bool) -> tuple[str, bool, str]:
+    # synthetic resources are generated valid, so they can all be published.
+    # Enums are stored by name, which is the same for all resource types
+    return (
+        "PUBLISHED" if is_published else "DRAFT",
+        True,
+        _SYNTHETIC_VALID_RESULT,
+    )
+
+
+def generate_synthetic_projects(
+    seed: int,
+    num_projects: int,
+    owner_id: identifiers.UserId,
+    vocabulary: SyntheticVocabulary,
+    published_ratio: float = 0.5,
+) -> list[SyntheticResource]:
+    """Generate projects around the Portuguese exclusive economic zone.
+
+    Projects are spread over the parts of the zone according to their weights.
+    Each one spans from one month to four years, sometime since 2000.
+    """
+    rng = get_synthetic_rng(seed, "projects")
+    created_at = dt.datetime.now(dt.timezone.utc)
+    regions, weights = zip(*PORTUGUESE_EEZ_REGIONS)
+    projects = []
+    for index in range(num_projects):
+        x_min, y_min, x_max, y_max = rng.choices(regions, weights=weights)[0]
+        x = rng.uniform(x_min, x_max)
+        y = rng.uniform(y_min, y_max)
+        begin = _SYNTHETIC_EPOCH + dt.timedelta(
+            days=rng.randint(0, _SYNTHETIC_NUM_DAYS)
+        )
+        end = begin + dt.timedelta(days=rng.randint(30, 4 * 365))
+        is_published = rng.random() < published_ratio
+        project_id = _get_synthetic_id(rng)
+        projects.append(
+            SyntheticResource(
+                id=project_id,
+                x=x,
+                y=y,
+                temporal_extent_begin=begin,
+                temporal_extent_end=end,
+                is_published=is_published,
+                row=(
+                    project_id,
+                    owner_id,
+                    _get_synthetic_text(
+                        rng, vocabulary, (3, 8), constants.NAME_MAX_LENGTH
+                    ),
+                    _get_synthetic_text(
+                        rng, vocabulary, (10, 60), constants.DESCRIPTION_MAX_LENGTH
+                    ),
+                    *_get_synthetic_status(is_published),
+                    f"/archive/synthetic/project-{index}",
+                    "[]",
+                    _get_synthetic_bbox(rng, x, y, max_size=1.0),
+                    created_at,
+                    begin,
+                    end,
+                ),
+            )
+        )
+    return projects
+
+
+def generate_synthetic_survey_missions(
+    seed: int,
+    num_survey_missions: int,
+    projects: Sequence[SyntheticResource],
+    owner_id: identifiers.UserId,
+    vocabulary: SyntheticVocabulary,
+    published_ratio: float = 0.5,
+) -> list[SyntheticResource]:
+    """Generate survey missions for the input projects.
+
+    Missions are clustered around the center of their project and happen
+    during its temporal extent. They can only be published if their project is.
+    """
+    rng = get_synthetic_rng(seed, "survey-missions")
+    created_at = dt.datetime.now(dt.timezone.utc)
+    survey_missions = []
+    for index in range(num_survey_missions):
+        project = rng.choice(projects)
+        x = rng.gauss(project.x, 0.3)
+        y = rng.gauss(project.y, 0.3)
+        begin, end = _get_synthetic_temporal_extent(rng, project, max_days=120)
+        is_published = project.is_published and rng.random() < published_ratio
+        survey_mission_id = _get_synthetic_id(rng)
+        survey_missions.append(
+            SyntheticResource(
+                id=survey_mission_id,
+                x=x,
+                y=y,
+                temporal_extent_begin=begin,
+                temporal_extent_end=end,
+                is_published=is_published,
+                row=(
+                    survey_mission_id,
+                    owner_id,
+                    _get_synthetic_text(
+                        rng, vocabulary, (3, 8), constants.NAME_MAX_LENGTH
+                    ),
+                    _get_synthetic_text(
+                        rng, vocabulary, (10, 60), constants.DESCRIPTION_MAX_LENGTH
+                    ),
+                    *_get_synthetic_status(is_published),
+                    project.id,
+                    f"mission-{index}",
+                    "[]",
+                    _get_synthetic_bbox(rng, x, y, max_size=0.3),
+                    created_at,
+                    begin,
+                    end,
+                ),
+            )
+        )
+    return survey_missions
+
+
+def generate_synthetic_survey_related_records(
+    seed: int,
+    batch_index: int,
+    num_records: int,
+    survey_missions: Sequence[SyntheticResource],
+    owner_id: identifiers.UserId,
+    dataset_categories: Sequence[identifiers.DatasetCategoryId],
+    workflow_stages: Sequence[identifiers.WorkflowStageId],
+    vocabulary: SyntheticVocabulary,
+    published_ratio: float = 0.5,
+) -> list[tuple]:
+    """Generate a batch of survey-related records for the input missions.
+
+    Records are clustered tightly around the center of their mission and
+    happen during its temporal extent. Each batch is generated independently
+    of the others, which allows generating them concurrently.
+    """
+    rng = get_synthetic_rng(seed, "records", batch_index)
+    created_at = dt.datetime.now(dt.timezone.utc)
+    records = []
+    for _ in range(num_records):
+        survey_mission = rng.choice(survey_missions)
+        x = rng.gauss(survey_mission.x, 0.05)
+        y = rng.gauss(survey_mission.y, 0.05)
+        begin, end = _get_synthetic_temporal_extent(rng, survey_mission, max_days=10)
+        is_published = survey_mission.is_published and rng.random() < published_ratio
+        records.append(
+            (
+                _get_synthetic_id(rng),
+                owner_id,
+                _get_synthetic_text(rng, vocabulary, (3, 8), constants.NAME_MAX_LENGTH),
+                _get_synthetic_text(
+                    rng, vocabulary, (10, 60), constants.DESCRIPTION_MAX_LENGTH
+                ),
+                *_get_synthetic_status(is_published),
+                survey_mission.id,
+                rng.choice(dataset_categories),
+                rng.choice(workflow_stages),
+                "[]",
+                _get_synthetic_bbox(rng, x, y, max_size=0.05),
+                created_at,
+                begin,
+                end,
+            )
+        )
+    return records
@@ -31,6 +31,20 @@ NEW_TOPIC_WORKFLOW_STAGES: typing.Final[str] = "workflow_stages"
 
 PROGRESS_TOPIC_NAME_TEMPLATE: typing.Final[str] = "progress:{request_id}"
 
+# redis keys and channels live in separate namespaces, but we still prefix stream
+# names in order to make them easy to spot when inspecting redis
+EVENT_STREAM_NAME_TEMPLATE: typing.Final[str] = "events:{topic_name}"
+
+CONCURRENCY_LIMIT_KEY_TEMPLATE: typing.Final[str] = "concurrency-slots:{name}"
+
+# bumped whenever a resource of the given type is modified - cached fragments are
+# keyed by the versions of the resource types they show
+RESOURCE_VERSION_KEY_TEMPLATE: typing.Final[str] = "resource-version:{resource_type}"
+FRAGMENT_CACHE_KEY_TEMPLATE: typing.Final[str] = "fragment-cache:{name}:{digest}"
+FRAGMENT_CACHE_STATS_KEY: typing.Final[str] = "fragment-cache-stats"
+
+TOKEN_INTROSPECTION_KEY_TEMPLATE: typing.Final[str] = "token-introspection:{token_hash}"
+
 PROJECT_UPDATED_TOPIC: typing.Final[str] = "project-updated:{project_id}"
 PROJECT_STATUS_CHANGED_TOPIC: typing.Final[str] = "project-status-changed:{project_id}"
 PROJECT_VALIDITY_CHANGED_TOPIC: typing.Final[str] = (
@@ -71,6 +85,21 @@ SURVEY_RELATED_RECORD_DELETED_TOPIC: typing.Final[str] = (
 )
 
 
+class EventBackend(str, enum.Enum):
+    PUBSUB = "pubsub"
+    STREAMS = "streams"
+
+
+class TokenVerificationMode(str, enum.Enum):
+    INTROSPECTION = "introspection"
+    LOCAL = "local"
+
+
+class TaskQueue(str, enum.Enum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
 class PageType(str, enum.Enum):
     HOME = "home"
     RESOURCE_LIST = "resource_list"
@@ -109,6 +138,7 @@ class ResourceModification(str, enum.Enum):
 class BulkResourceModification(str, enum.Enum):
     UPDATED = "updated"
     DELETED = "deleted"
+    VALIDATED = "validated"
 
 
 class DiscoveryStage(str, enum.Enum):
@@ -117,6 +147,28 @@ class DiscoveryStage(str, enum.Enum):
     PROGRESS = "progress"
 
 
+class DiscoveryJobStatus(str, enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class DiscoveryChunkStatus(str, enum.Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+
+
+class BulkUpdateJobStatus(str, enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    GEOPARQUET = "geoparquet"
+
+
 class ValidationStage(str, enum.Enum):
     STARTED = "started"
     ENDED = "ended"
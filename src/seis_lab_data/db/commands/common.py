@@ -1,6 +1,12 @@
 import logging
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
 
 import shapely
+from psycopg import sql
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 logger = logging.getLogger(__name__)
 
@@ -12,3 +18,30 @@ def get_bbox_4326_for_db(original_bbox: shapely.Polygon):
         logger.debug("Received invalid bbox, so it will be ignored")
         bbox_to_create = None
     return bbox_to_create
+
+
+def build_copy_statement(table_name: str, column_names: Sequence[str]) -> sql.Composed:
+    return sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+        table=sql.Identifier(table_name),
+        columns=sql.SQL(", ").join(sql.Identifier(name) for name in column_names),
+    )
+
+
+async def copy_rows(
+    session: AsyncSession,
+    table_name: str,
+    column_names: Sequence[str],
+    rows: Iterable[tuple],
+) -> None:
+    """Write rows to a table with postgresql's COPY, which is much faster than INSERT.
+
+    This bypasses the ORM, so rows must already hold values the way they are
+    stored in the DB - JSON as text, enums by name and geometries as EWKT.
+    COPY runs in the session's transaction, which is not committed here.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(build_copy_statement(table_name, column_names)) as copy:
+            for row in rows:
+                await copy.write_row(row)
@@ -55,6 +55,7 @@ async def update_dataset_category(
 ) -> models.DatasetCategory:
     for key, value in to_update.model_dump(exclude_unset=True).items():
         setattr(resource, key, value)
+    resource.version += 1
     session.add(resource)
     await session.commit()
     await session.refresh(resource)
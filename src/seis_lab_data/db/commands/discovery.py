@@ -1,10 +1,19 @@
 import logging
 from typing import cast
 
+from sqlalchemy import (
+    exists,
+    func,
+    select,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ... import errors
+from ... import (
+    constants,
+    errors,
+)
 from ...schemas import (
     identifiers,
     discovery as discovery_schemas,
@@ -73,3 +82,127 @@ async def update_asset_discovery_configuration(
             session, identifiers.AssetDiscoveryConfId(asset_discovery_configuration.id)
         ),
     )
+
+
+async def create_discovery_job(
+    session: AsyncSession,
+    discovery_job_id: identifiers.RequestId,
+    survey_mission_id: identifiers.SurveyMissionId,
+    chunks: list[list[models.DiscoveryCandidate]],
+) -> models.DiscoveryJob:
+    """Create a discovery job together with all of its chunks.
+
+    Job and chunks are committed in a single transaction, which means a job
+    either exists with its full plan or does not exist at all.
+    """
+    discovery_job = models.DiscoveryJob(
+        id=discovery_job_id,
+        survey_mission_id=survey_mission_id,
+        total_files=sum(len(chunk) for chunk in chunks),
+    )
+    session.add(discovery_job)
+    for position, candidates in enumerate(chunks):
+        session.add(
+            models.DiscoveryChunk(
+                job_id=discovery_job_id,
+                position=position,
+                candidates=candidates,
+            )
+        )
+    try:
+        await session.commit()
+    except IntegrityError as err:
+        await session.rollback()
+        raise errors.SeisLabDataError(str(err)) from err
+    await session.refresh(discovery_job)
+    return discovery_job
+
+
+async def complete_discovery_chunk(
+    session: AsyncSession,
+    discovery_chunk: models.DiscoveryChunk,
+    *,
+    files_seen: int,
+    files_extracted: int,
+    files_failed: int,
+) -> models.DiscoveryJob | None:
+    """Mark a chunk as completed and add its counters to those of its job.
+
+    Returns the updated job, or `None` if the chunk had already been completed
+    by some other run, in which case the job's counters are left untouched.
+    """
+    chunk_result = await session.execute(
+        update(models.DiscoveryChunk)
+        .where(models.DiscoveryChunk.id == discovery_chunk.id)
+        .where(models.DiscoveryChunk.status == constants.DiscoveryChunkStatus.PENDING)
+        .values(status=constants.DiscoveryChunkStatus.COMPLETED)
+        .returning(models.DiscoveryChunk.id)
+    )
+    if chunk_result.scalar_one_or_none() is None:
+        await session.rollback()
+        return None
+    await session.execute(
+        update(models.DiscoveryJob)
+        .where(models.DiscoveryJob.id == discovery_chunk.job_id)
+        .values(
+            files_seen=models.DiscoveryJob.files_seen + files_seen,
+            files_extracted=models.DiscoveryJob.files_extracted + files_extracted,
+            files_failed=models.DiscoveryJob.files_failed + files_failed,
+        )
+    )
+    await session.commit()
+    discovery_job = await session.get(models.DiscoveryJob, discovery_chunk.job_id)
+    await session.refresh(discovery_job)
+    return discovery_job
+
+
+async def finish_discovery_job(
+    session: AsyncSession,
+    discovery_job_id: identifiers.RequestId,
+) -> bool:
+    """Mark a job as completed, provided that none of its chunks is pending.
+
+    Returns whether the job was finished by this call - when the last chunks of
+    a job complete at the same time only one of their runs gets `True`.
+    """
+    pending_chunks = (
+        select(models.DiscoveryChunk.id)
+        .where(models.DiscoveryChunk.job_id == discovery_job_id)
+        .where(models.DiscoveryChunk.status == constants.DiscoveryChunkStatus.PENDING)
+    )
+    result = await session.execute(
+        update(models.DiscoveryJob)
+        .where(models.DiscoveryJob.id == discovery_job_id)
+        .where(models.DiscoveryJob.status == constants.DiscoveryJobStatus.RUNNING)
+        .where(~exists(pending_chunks))
+        .values(
+            status=constants.DiscoveryJobStatus.COMPLETED,
+            finished_at=func.now(),
+        )
+        .returning(models.DiscoveryJob.id)
+    )
+    await session.commit()
+    return result.scalar_one_or_none() is not None
+
+
+async def fail_discovery_job(
+    session: AsyncSession,
+    discovery_job_id: identifiers.RequestId,
+) -> bool:
+    """Mark a running job as failed.
+
+    Returns whether the job was failed by this call, which is not the case if
+    it had already finished.
+    """
+    result = await session.execute(
+        update(models.DiscoveryJob)
+        .where(models.DiscoveryJob.id == discovery_job_id)
+        .where(models.DiscoveryJob.status == constants.DiscoveryJobStatus.RUNNING)
+        .values(
+            status=constants.DiscoveryJobStatus.FAILED,
+            finished_at=func.now(),
+        )
+        .returning(models.DiscoveryJob.id)
+    )
+    await session.commit()
+    return result.scalar_one_or_none() is not None
@@ -0,0 +1,227 @@
+import logging
+import uuid
+
+from sqlalchemy import (
+    case,
+    exists,
+    func,
+    select,
+    true,
+    update,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+_Record = models.SurveyRelatedRecord
+_Mission = models.SurveyMission
+_Project = models.Project
+
+
+def _widen_bbox(current, added):
+    return case(
+        (current.is_(None), added),
+        (added.is_(None), current),
+        else_=func.ST_Envelope(func.ST_Collect(current, added)),
+    )
+
+
+def _get_extent_columns(bbox_column, begin_column, end_column) -> list:
+    return [
+        func.ST_Envelope(func.ST_Collect(bbox_column)).label("bbox_4326"),
+        func.min(begin_column).label("temporal_extent_begin"),
+        func.max(end_column).label("temporal_extent_end"),
+    ]
+
+
+def build_widen_extents_statements(record_ids: list[uuid.UUID]) -> list:
+    """Build the UPDATEs that widen extents so that they cover some records.
+
+    There is one statement for the records' survey missions and another one
+    for their projects.
+    """
+    statements = []
+    for model, group_column in (
+        (_Mission, _Record.survey_mission_id),
+        (_Project, _Mission.project_id),
+    ):
+        added = (
+            select(
+                group_column.label("id"),
+                *_get_extent_columns(
+                    _Record.bbox_4326,
+                    _Record.temporal_extent_begin,
+                    _Record.temporal_extent_end,
+                ),
+            )
+            .select_from(_Record)
+            .join(_Mission, _Mission.id == _Record.survey_mission_id)
+            .where(_Record.id.in_(record_ids))
+            .group_by(group_column)
+            .subquery("added")
+        )
+        statements.append(
+            update(model)
+            .where(model.id == added.c.id)
+            .values(
+                records_bbox_4326=_widen_bbox(
+                    model.records_bbox_4326, added.c.bbox_4326
+                ),
+                records_temporal_extent_begin=func.least(
+                    model.records_temporal_extent_begin,
+                    added.c.temporal_extent_begin,
+                ),
+                records_temporal_extent_end=func.greatest(
+                    model.records_temporal_extent_end, added.c.temporal_extent_end
+                ),
+                # these are derived values, not modifications of the resource
+                updated_at=model.updated_at,
+                version=model.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return statements
+
+
+async def widen_extents_for_records(
+    session: AsyncSession, record_ids: list[uuid.UUID]
+) -> None:
+    """Widen the extents of missions and projects to cover new records.
+
+    Unlike other changes to records, creating them can never shrink these
+    extents, which means they do not need to be recomputed. This does not
+    commit, so that it happens in the same transaction as the records'
+    creation.
+    """
+    for statement in build_widen_extents_statements(record_ids):
+        await session.execute(statement)
+
+
+async def mark_survey_mission_extents_dirty(
+    session: AsyncSession, survey_mission_ids
+) -> None:
+    """Mark the extents of survey missions and their projects as dirty.
+
+    Dirty extents are recomputed in batches, later on, by the
+    `reconcile_*_extents()` functions. `survey_mission_ids` may be a list of
+    ids or a statement that selects them. Like `widen_extents_for_records()`,
+    this does not commit.
+    """
+    await session.execute(
+        update(_Mission)
+        .where(_Mission.id.in_(survey_mission_ids))
+        .values(records_extent_is_dirty=True, updated_at=_Mission.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await mark_project_extents_dirty(
+        session,
+        select(_Mission.project_id).where(_Mission.id.in_(survey_mission_ids)),
+    )
+
+
+async def mark_project_extents_dirty(session: AsyncSession, project_ids) -> None:
+    await session.execute(
+        update(_Project)
+        .where(_Project.id.in_(project_ids))
+        .values(records_extent_is_dirty=True, updated_at=_Project.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_survey_mission_reconciliation(batch_size: int):
+    """Build an UPDATE that recomputes a batch of dirty survey mission extents.
+
+    Missions which are being reconciled by someone else are skipped.
+    """
+    dirty_ids = (
+        select(_Mission.id)
+        .where(_Mission.records_extent_is_dirty == true())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    extent = _get_extent_columns(
+        _Record.bbox_4326, _Record.temporal_extent_begin, _Record.temporal_extent_end
+    )
+    return (
+        update(_Mission)
+        .where(_Mission.id.in_(dirty_ids))
+        .values(
+            **{
+                f"records_{column.name}": select(column)
+                .where(_Record.survey_mission_id == _Mission.id)
+                .scalar_subquery()
+                for column in extent
+            },
+            records_extent_is_dirty=False,
+            updated_at=_Mission.updated_at,
+            version=_Mission.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_project_reconciliation(batch_size: int):
+    """Build an UPDATE that recomputes a batch of dirty project extents.
+
+    Projects are computed from their missions' extents, so those which still
+    have dirty missions are left for later.
+    """
+    dirty_ids = (
+        select(_Project.id)
+        .where(_Project.records_extent_is_dirty == true())
+        .where(
+            ~exists().where(
+                _Mission.project_id == _Project.id,
+                _Mission.records_extent_is_dirty == true(),
+            )
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    extent = _get_extent_columns(
+        _Mission.records_bbox_4326,
+        _Mission.records_temporal_extent_begin,
+        _Mission.records_temporal_extent_end,
+    )
+    return (
+        update(_Project)
+        .where(_Project.id.in_(dirty_ids))
+        .values(
+            **{
+                f"records_{column.name}": select(column)
+                .where(_Mission.project_id == _Project.id)
+                .scalar_subquery()
+                for column in extent
+            },
+            records_extent_is_dirty=False,
+            updated_at=_Project.updated_at,
+            version=_Project.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_survey_mission_extents(
+    session: AsyncSession, batch_size: int
+) -> int:
+    result = await session.execute(build_survey_mission_reconciliation(batch_size))
+    await session.commit()
+    return result.rowcount
+
+
+async def reconcile_project_extents(session: AsyncSession, batch_size: int) -> int:
+    result = await session.execute(build_project_reconciliation(batch_size))
+    await session.commit()
+    return result.rowcount
+
+
+async def mark_all_extents_dirty(session: AsyncSession) -> None:
+    for model in (_Mission, _Project):
+        await session.execute(
+            update(model)
+            .values(records_extent_is_dirty=True, updated_at=model.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    await session.commit()
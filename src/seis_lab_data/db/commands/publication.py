@@ -0,0 +1,119 @@
+import dataclasses
+import logging
+
+from sqlalchemy import (
+    Boolean,
+    true,
+    update,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ...constants import (
+    SurveyMissionStatus,
+    SurveyRelatedRecordStatus,
+)
+from ...schemas import identifiers
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+_Record = models.SurveyRelatedRecord
+_Mission = models.SurveyMission
+
+
+@dataclasses.dataclass(frozen=True)
+class PublicationCascade:
+    num_survey_missions: int
+    num_records: int
+
+
+def _is_valid(model):
+    return model.validation_result["is_valid"].astext.cast(Boolean) == true()
+
+
+def build_survey_mission_publication_update(
+    project_id: identifiers.ProjectId,
+    *,
+    publish: bool,
+):
+    """Build the UPDATE that gives a project's missions their target status.
+
+    A mission's own validity does not depend on its parent project, so there
+    is no need to re-validate missions - when publishing, those whose stored
+    validation result is valid are published. When unpublishing, all of them
+    go back to draft.
+    """
+    statement = update(_Mission).where(_Mission.project_id == project_id)
+    if publish:
+        return (
+            statement.where(_Mission.status != SurveyMissionStatus.PUBLISHED)
+            .where(_is_valid(_Mission))
+            .values(status=SurveyMissionStatus.PUBLISHED)
+        )
+    return statement.where(_Mission.status == SurveyMissionStatus.PUBLISHED).values(
+        status=SurveyMissionStatus.DRAFT
+    )
+
+
+def build_record_publication_update(
+    *,
+    publish: bool,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+):
+    """Build the UPDATE that gives records of a project or mission their target status.
+
+    With a `project_id`, the records' missions are joined in, because their
+    target status also depends on that of their mission, which is published
+    exactly when it is valid.
+    """
+    statement = update(_Record)
+    if project_id is not None:
+        statement = statement.where(_Record.survey_mission_id == _Mission.id).where(
+            _Mission.project_id == project_id
+        )
+        if publish:
+            statement = statement.where(_is_valid(_Mission))
+    if survey_mission_id is not None:
+        statement = statement.where(_Record.survey_mission_id == survey_mission_id)
+    if publish:
+        return (
+            statement.where(_Record.status != SurveyRelatedRecordStatus.PUBLISHED)
+            .where(_is_valid(_Record))
+            .values(status=SurveyRelatedRecordStatus.PUBLISHED)
+        )
+    return statement.where(
+        _Record.status == SurveyRelatedRecordStatus.PUBLISHED
+    ).values(status=SurveyRelatedRecordStatus.DRAFT)
+
+
+async def cascade_publication(
+    session: AsyncSession,
+    *,
+    publish: bool,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> PublicationCascade:
+    """Publish or unpublish everything underneath a project or a survey mission.
+
+    This is meant to be called after the status of the project or mission
+    itself has been decided. All missions and records get their target status
+    with one UPDATE per level, which are committed together.
+    """
+    num_survey_missions = 0
+    if project_id is not None:
+        result = await session.execute(
+            build_survey_mission_publication_update(project_id, publish=publish)
+        )
+        num_survey_missions = result.rowcount
+    result = await session.execute(
+        build_record_publication_update(
+            publish=publish,
+            project_id=project_id,
+            survey_mission_id=survey_mission_id,
+        )
+    )
+    await session.commit()
+    return PublicationCascade(
+        num_survey_missions=num_survey_missions, num_records=result.rowcount
+    )
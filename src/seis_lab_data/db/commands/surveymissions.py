@@ -1,10 +1,5 @@
 import logging
 
-from sqlalchemy import (
-    Boolean,
-    true,
-    update,
-)
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ... import errors
@@ -14,6 +9,7 @@ from ...schemas import (
     surveymissions as mission_schemas,
 )
 from .. import models
+from . import extents as extent_commands
 from ..queries import surveymissions as mission_queries
 from .common import get_bbox_4326_for_db
 
@@ -54,6 +50,9 @@ async def delete_survey_mission(
     if survey_mission := (
         await mission_queries.get_survey_mission(session, survey_mission_id)
     ):
+        await extent_commands.mark_project_extents_dirty(
+            session, [survey_mission.project_id]
+        )
         await session.delete(survey_mission)
         await session.commit()
     else:
@@ -68,6 +67,7 @@ async def update_survey_mission(
     to_update: mission_schemas.SurveyMissionUpdate,
 ) -> models.SurveyMission:
     logger.debug(f"{to_update.model_dump()=}")
+    previous_project_id = survey_mission.project_id
     for key, value in to_update.model_dump(
         exclude={"bbox_4326"}, exclude_unset=True
     ).items():
@@ -79,6 +79,10 @@ async def update_survey_mission(
     )
     survey_mission.bbox_4326 = updated_bbox_4326
     session.add(survey_mission)
+    if survey_mission.project_id != previous_project_id:
+        await extent_commands.mark_project_extents_dirty(
+            session, [previous_project_id, survey_mission.project_id]
+        )
     await session.commit()
     await session.refresh(survey_mission)
     return survey_mission
@@ -120,53 +124,3 @@ async def set_survey_mission_status(
     return await mission_queries.get_survey_mission(
         session, identifiers.SurveyMissionId(survey_mission_id)
     )
-
-
-async def bulk_publish_valid_survey_missions_for_project(
-    session: AsyncSession,
-    project_id: identifiers.ProjectId,
-) -> list[identifiers.SurveyMissionId]:
-    """Publish every already-valid, not-yet-published mission of a project.
-
-    A mission's own validity does not depend on its parent project, so when
-    the project (re)becomes valid there is no need to re-validate its
-    missions - those already marked valid can be published directly from
-    their stored validation result. Returns the ids of the missions that
-    got published, so callers can further cascade to those missions' own
-    records.
-    """
-    result = await session.execute(
-        update(models.SurveyMission)
-        .where(models.SurveyMission.project_id == project_id)
-        .where(models.SurveyMission.status != SurveyMissionStatus.PUBLISHED)
-        .where(
-            models.SurveyMission.validation_result["is_valid"].astext.cast(Boolean)
-            == true()
-        )
-        .values(status=SurveyMissionStatus.PUBLISHED)
-        .returning(models.SurveyMission.id)
-    )
-    await session.commit()
-    return [identifiers.SurveyMissionId(row) for row in result.scalars().all()]
-
-
-async def bulk_unpublish_survey_missions_for_project(
-    session: AsyncSession,
-    project_id: identifiers.ProjectId,
-) -> list[identifiers.SurveyMissionId]:
-    """Unpublish every published mission of a project.
-
-    Used when the project becomes invalid, so its missions don't stay
-    published without a published parent. Returns the ids of the missions
-    that got unpublished, so callers can further cascade to those missions'
-    own records.
-    """
-    result = await session.execute(
-        update(models.SurveyMission)
-        .where(models.SurveyMission.project_id == project_id)
-        .where(models.SurveyMission.status == SurveyMissionStatus.PUBLISHED)
-        .values(status=SurveyMissionStatus.DRAFT)
-        .returning(models.SurveyMission.id)
-    )
-    await session.commit()
-    return [identifiers.SurveyMissionId(row) for row in result.scalars().all()]
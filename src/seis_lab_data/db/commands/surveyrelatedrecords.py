@@ -1,9 +1,8 @@
 import logging
 import uuid
+from typing import Final
 
-import shapely
 from sqlalchemy import (
-    Boolean,
     bindparam,
     column,
     delete,
@@ -19,16 +18,20 @@ from sqlalchemy.dialects.postgresql import (
     UUID as PG_UUID,
     insert as pg_insert,
 )
+from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ... import errors
+from ... import (
+    constants,
+    errors,
+)
 from ...constants import SurveyRelatedRecordStatus
 from ...schemas import (
-    filters as filter_schemas,
     identifiers,
     surveyrelatedrecords as record_schemas,
 )
 from .. import models
+from . import extents as extent_commands
 from ..queries import (
     recordassets as asset_queries,
     surveyrelatedrecords as record_queries,
@@ -37,6 +40,11 @@ from .common import get_bbox_4326_for_db
 
 logger = logging.getLogger(__name__)
 
+# fields whose changes affect the extents of missions and projects
+_EXTENT_FIELDS: Final[frozenset[str]] = frozenset(
+    {"bbox_4326", "temporal_extent_begin", "temporal_extent_end"}
+)
+
 
 async def create_survey_related_record(
     session: AsyncSession,
@@ -76,6 +84,8 @@ async def create_survey_related_record(
             relation=related.relationship.model_dump(),
         )
         session.add(db_related)
+    await session.flush()
+    await extent_commands.widen_extents_for_records(session, [survey_record.id])
     await session.commit()
     await session.refresh(survey_record)
     return await record_queries.get_survey_related_record(session, to_create.id)
@@ -90,6 +100,9 @@ async def delete_survey_related_record(
             session, survey_related_record_id
         )
     ):
+        await extent_commands.mark_survey_mission_extents_dirty(
+            session, [survey_record.survey_mission_id]
+        )
         await session.delete(survey_record)
         await session.commit()
     else:
@@ -154,14 +167,9 @@ async def _replace_related_records_for_subjects(
     await session.execute(upsert_stmt)
 
 
-async def _apply_bulk_update_to_matched_records(
-    session: AsyncSession,
+def _get_bulk_update_values(
     to_update: record_schemas.SurveyRelatedRecordBulkUpdate,
-    matched_ids: list[uuid.UUID],
-) -> int:
-    if not matched_ids:
-        return 0
-
+) -> dict:
     values_to_set = to_update.model_dump(
         exclude={"bbox_4326", "related_records"}, exclude_unset=True
     )
@@ -173,85 +181,128 @@ async def _apply_bulk_update_to_matched_records(
             if (bbox := to_update.bbox_4326) is not None
             else None
         )
+    return values_to_set
 
-    if values_to_set:
-        result = await session.execute(
-            update(models.SurveyRelatedRecord)
-            .where(models.SurveyRelatedRecord.id.in_(matched_ids))
-            .values(**values_to_set)
-        )
-        updated_count = result.rowcount
-    else:
-        updated_count = len(matched_ids)
-
-    if "related_records" in to_update.model_fields_set:
-        await _replace_related_records_for_subjects(
-            session, matched_ids, to_update.related_records
-        )
 
-    return updated_count
+def build_bulk_update_chunk_statement(
+    to_update: record_schemas.SurveyRelatedRecordBulkUpdate,
+    ids_statement,
+    *,
+    after_record_id: uuid.UUID | None,
+    chunk_size: int,
+):
+    """Build the statement that bulk-updates the next chunk of matching records.
+
+    The chunk is made of the first `chunk_size` records matched by
+    `ids_statement` whose id comes after `after_record_id`, which is selected
+    in a subquery rather than sent over as a list of ids. The statement
+    returns the ids of the records in the chunk. When there are no columns to
+    set, as happens when only related records are being replaced, it just
+    selects those ids.
+    """
+    matched = ids_statement.subquery("matched")
+    chunk_ids = select(matched.c.id)
+    if after_record_id is not None:
+        chunk_ids = chunk_ids.where(matched.c.id > after_record_id)
+    chunk_ids = chunk_ids.order_by(matched.c.id).limit(chunk_size)
+    if not (values_to_set := _get_bulk_update_values(to_update)):
+        return chunk_ids
+    return (
+        update(models.SurveyRelatedRecord)
+        .where(models.SurveyRelatedRecord.id.in_(chunk_ids))
+        .values(**values_to_set)
+        .returning(models.SurveyRelatedRecord.id)
+        .execution_options(synchronize_session=False)
+    )
 
 
-async def bulk_update_manually_selected_records(
+async def create_bulk_update_job(
     session: AsyncSession,
-    to_update: record_schemas.SurveyRelatedRecordBulkUpdate,
-    selected: list[identifiers.SurveyRelatedRecordId],
-    survey_mission_id: identifiers.SurveyMissionId | None = None,
-) -> int:
-    ids_statement = record_queries.build_survey_related_record_id_statement(
-        survey_mission_id=survey_mission_id, record_ids=selected
+    bulk_update_job_id: identifiers.RequestId,
+    ids_statement,
+) -> models.BulkUpdateJob:
+    total_count = await session.scalar(
+        select(func.count()).select_from(ids_statement.subquery())
+    )
+    bulk_update_job = models.BulkUpdateJob(
+        id=bulk_update_job_id, total_count=total_count
     )
-    matched_ids = (await session.exec(ids_statement)).all()
+    session.add(bulk_update_job)
     try:
-        updated_count = await _apply_bulk_update_to_matched_records(
-            session, to_update, matched_ids
-        )
         await session.commit()
-    except Exception as err:
+    except IntegrityError as err:
         await session.rollback()
-        raise err
-    return updated_count
+        raise errors.SeisLabDataError(str(err)) from err
+    await session.refresh(bulk_update_job)
+    return bulk_update_job
 
 
-async def bulk_update_filtered_records(
+async def run_bulk_update_chunk(
     session: AsyncSession,
+    bulk_update_job_id: identifiers.RequestId,
     to_update: record_schemas.SurveyRelatedRecordBulkUpdate,
-    excluded_record_ids: list[identifiers.SurveyRelatedRecordId] | None = None,
-    survey_mission_id: identifiers.SurveyMissionId | None = None,
-    en_name_filter: str | None = None,
-    pt_name_filter: str | None = None,
-    spatial_intersect: shapely.Polygon | None = None,
-    temporal_extent: filter_schemas.TemporalExtentFilterValue | None = None,
-    asset_path_fragment_filter: str | None = None,
-    asset_media_type_filter: str | None = None,
-    dataset_category_id: identifiers.DatasetCategoryId | None = None,
-    workflow_stage_id: identifiers.WorkflowStageId | None = None,
-) -> int:
-    filter_kwargs = dict(
-        survey_mission_id=survey_mission_id,
-        en_name_filter=en_name_filter,
-        pt_name_filter=pt_name_filter,
-        spatial_intersect=spatial_intersect,
-        temporal_extent=temporal_extent,
-        asset_path_fragment_filter=asset_path_fragment_filter,
-        asset_media_type_filter=asset_media_type_filter,
-        dataset_category_id=dataset_category_id,
-        workflow_stage_id=workflow_stage_id,
-        excluded_record_ids=excluded_record_ids,
-    )
-    ids_statement = record_queries.build_survey_related_record_id_statement(
-        **filter_kwargs
-    )
-    matched_ids = (await session.exec(ids_statement)).all()
+    ids_statement,
+    *,
+    chunk_size: int,
+) -> models.BulkUpdateJob:
+    """Bulk-update the next chunk of a job's records.
+
+    The chunk's changes are committed together with the job's progress, which
+    means that a job interrupted by a worker failure can be resumed from its
+    last committed chunk. The job's row is locked while the chunk runs, so
+    concurrent runs of the same job take turns. Once no records are left the
+    job is marked as completed. Returns the updated job.
+    """
+    bulk_update_job = (
+        await session.exec(
+            select(models.BulkUpdateJob)
+            .where(models.BulkUpdateJob.id == bulk_update_job_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    if bulk_update_job.status == constants.BulkUpdateJobStatus.COMPLETED:
+        await session.rollback()
+        return bulk_update_job
     try:
-        updated_count = await _apply_bulk_update_to_matched_records(
-            session, to_update, matched_ids
+        chunk_ids = (
+            (
+                await session.execute(
+                    build_bulk_update_chunk_statement(
+                        to_update,
+                        ids_statement,
+                        after_record_id=bulk_update_job.last_record_id,
+                        chunk_size=chunk_size,
+                    )
+                )
+            )
+            .scalars()
+            .all()
         )
+        if not chunk_ids:
+            bulk_update_job.status = constants.BulkUpdateJobStatus.COMPLETED
+            bulk_update_job.finished_at = models.now_()
+        else:
+            if "related_records" in to_update.model_fields_set:
+                await _replace_related_records_for_subjects(
+                    session, chunk_ids, to_update.related_records
+                )
+            if not _EXTENT_FIELDS.isdisjoint(to_update.model_fields_set):
+                await extent_commands.mark_survey_mission_extents_dirty(
+                    session,
+                    select(models.SurveyRelatedRecord.survey_mission_id)
+                    .where(models.SurveyRelatedRecord.id.in_(chunk_ids))
+                    .distinct(),
+                )
+            bulk_update_job.last_record_id = max(chunk_ids)
+            bulk_update_job.affected_count += len(chunk_ids)
+        session.add(bulk_update_job)
         await session.commit()
     except Exception as err:
         await session.rollback()
         raise err
-    return updated_count
+    await session.refresh(bulk_update_job)
+    return bulk_update_job
 
 
 async def update_survey_related_record(
@@ -344,6 +395,9 @@ async def update_survey_related_record(
         ):
             await session.delete(existing_related)
 
+    await extent_commands.mark_survey_mission_extents_dirty(
+        session, [survey_related_record.survey_mission_id]
+    )
     await session.commit()
     await session.refresh(survey_related_record)
     return await record_queries.get_survey_related_record(
@@ -389,49 +443,3 @@ async def set_survey_related_record_status(
     return await record_queries.get_survey_related_record(
         session, identifiers.SurveyRelatedRecordId(survey_related_record_id)
     )
-
-
-async def bulk_publish_valid_survey_related_records(
-    session: AsyncSession,
-    survey_mission_id: identifiers.SurveyMissionId,
-) -> int:
-    """Publish every already-valid, not-yet-published record of a survey mission.
-
-    A record's own validity does not depend on its parent mission, so when the
-    mission (re)becomes valid there is no need to re-validate its records -
-    those already marked valid can be published directly from their stored
-    validation result.
-    """
-    result = await session.execute(
-        update(models.SurveyRelatedRecord)
-        .where(models.SurveyRelatedRecord.survey_mission_id == survey_mission_id)
-        .where(models.SurveyRelatedRecord.status != SurveyRelatedRecordStatus.PUBLISHED)
-        .where(
-            models.SurveyRelatedRecord.validation_result["is_valid"].astext.cast(
-                Boolean
-            )
-            == true()
-        )
-        .values(status=SurveyRelatedRecordStatus.PUBLISHED)
-    )
-    await session.commit()
-    return result.rowcount
-
-
-async def bulk_unpublish_survey_related_records(
-    session: AsyncSession,
-    survey_mission_id: identifiers.SurveyMissionId,
-) -> int:
-    """Unpublish every published record of a survey mission.
-
-    Used when the mission (or its parent project) becomes invalid, so its
-    records don't stay published without a published parent.
-    """
-    result = await session.execute(
-        update(models.SurveyRelatedRecord)
-        .where(models.SurveyRelatedRecord.survey_mission_id == survey_mission_id)
-        .where(models.SurveyRelatedRecord.status == SurveyRelatedRecordStatus.PUBLISHED)
-        .values(status=SurveyRelatedRecordStatus.DRAFT)
-    )
-    await session.commit()
-    return result.rowcount
@@ -0,0 +1,252 @@
+import logging
+import uuid
+
+from sqlalchemy import (
+    Boolean,
+    Text,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    null,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import (
+    JSONB,
+    UUID as PG_UUID,
+    array,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ... import constants
+from .. import models
+from ..queries.validation import (
+    VALIDATABLE_MODELS,
+    build_validation_statement,
+)
+from ...schemas import identifiers
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_JSONB_ARRAY = cast(literal("[]"), JSONB)
+
+
+def build_validation_results_update(
+    resource_type: constants.ResourceType,
+    results: list[tuple[uuid.UUID, models.ValidationResult]],
+):
+    """Build an UPDATE that stores the validation results of many rows at once.
+
+    Results are joined to the table as a VALUES list, so that each row gets
+    its own result from a single statement.
+    """
+    model = VALIDATABLE_MODELS[resource_type]
+    validated = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("is_valid", Boolean),
+        column("validation_result", JSONB),
+        name="validated",
+    ).data([(id_, result["is_valid"], result) for id_, result in results])
+    return (
+        update(model)
+        .where(model.id == validated.c.id)
+        .values(
+            is_valid=validated.c.is_valid,
+            validation_result=validated.c.validation_result,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def write_validation_results(
+    session: AsyncSession,
+    resource_type: constants.ResourceType,
+    results: list[tuple[uuid.UUID, models.ValidationResult]],
+) -> int:
+    if not results:
+        return 0
+    result = await session.execute(
+        build_validation_results_update(resource_type, results)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+def _text(value: str):
+    return cast(literal(value), Text)
+
+
+def _build_error(name: str, type_: str, message: str):
+    return func.jsonb_build_object(
+        _text("name"),
+        _text(name),
+        _text("message"),
+        _text(message),
+        _text("type_"),
+        _text(type_),
+    )
+
+
+def _pluralize_characters(length: int) -> str:
+    return f"{length} character{'' if length == 1 else 's'}"
+
+
+def _check_localizable(
+    localizable_column, name: str, min_length: int, max_length: int
+) -> list:
+    checks = []
+    for locale in ("en", "pt"):
+        value = localizable_column[locale]
+        error_name = f"{name}.{locale}"
+        checks.append(
+            case(
+                (
+                    func.jsonb_typeof(value).is_(None),
+                    _build_error(error_name, "missing", "Field required"),
+                ),
+                (
+                    func.jsonb_typeof(value) != "string",
+                    _build_error(
+                        error_name, "string_type", "Input should be a valid string"
+                    ),
+                ),
+                (
+                    func.char_length(value.astext) < min_length,
+                    _build_error(
+                        error_name,
+                        "string_too_short",
+                        f"String should have at least "
+                        f"{_pluralize_characters(min_length)}",
+                    ),
+                ),
+                (
+                    func.char_length(value.astext) > max_length,
+                    _build_error(
+                        error_name,
+                        "string_too_long",
+                        f"String should have at most "
+                        f"{_pluralize_characters(max_length)}",
+                    ),
+                ),
+            )
+        )
+    return checks
+
+
+def _check_not_null(nullable_column, name: str):
+    return case(
+        (
+            nullable_column.is_(None),
+            _build_error(
+                name, "uuid_type", "UUID input should be a string, bytes or UUID object"
+            ),
+        )
+    )
+
+
+def _check_bbox(bbox_column):
+    def build_value_error(message: str):
+        return _build_error("bbox_4326", "value_error", f"Value error, {message}")
+
+    return case(
+        (bbox_column.is_(None), build_value_error("value is None")),
+        (
+            func.ST_IsValid(bbox_column).is_(False),
+            build_value_error("Geometry is not valid"),
+        ),
+        (
+            func.ST_GeometryType(bbox_column) != "ST_Polygon",
+            build_value_error("Geometry is not a Polygon"),
+        ),
+        (func.ST_Area(bbox_column) == 0, build_value_error("Polygon has zero area")),
+    )
+
+
+def build_sql_validation_errors(resource_type: constants.ResourceType):
+    """Build an expression which checks the validation rules that SQL can check.
+
+    These mirror the rules of the schemas in `schemas.validation`, in the same
+    order and with the same error messages as pydantic, except for links,
+    which must still be validated in python. The expression evaluates to a
+    JSONB array of errors, which is empty when all rules pass.
+    """
+    model = VALIDATABLE_MODELS[resource_type]
+    checks = _check_localizable(
+        model.name, "name", constants.NAME_MIN_LENGTH, constants.NAME_MAX_LENGTH
+    )
+    if resource_type == constants.ResourceType.RECORD:
+        checks.extend(
+            [
+                _check_not_null(model.dataset_category_id, "dataset_category_id"),
+                _check_not_null(model.workflow_stage_id, "workflow_stage_id"),
+            ]
+        )
+    checks.extend(
+        _check_localizable(
+            model.description,
+            "description",
+            constants.DESCRIPTION_MIN_LENGTH,
+            constants.DESCRIPTION_MAX_LENGTH,
+        )
+    )
+    checks.append(_check_bbox(model.bbox_4326))
+    return func.to_jsonb(func.array_remove(array(checks, type_=JSONB), null()))
+
+
+def build_sql_validation_update(
+    resource_type: constants.ResourceType,
+    *,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+):
+    """Build an UPDATE that validates all resources of a type in a scope.
+
+    Only the rules that can be expressed in SQL are checked.
+    """
+    model = VALIDATABLE_MODELS[resource_type]
+    checked = (
+        build_validation_statement(
+            resource_type,
+            [
+                model.id.label("id"),
+                build_sql_validation_errors(resource_type).label("errors"),
+            ],
+            project_id=project_id,
+            survey_mission_id=survey_mission_id,
+        )
+        .order_by(None)
+        .subquery("checked")
+    )
+    is_valid = checked.c.errors == _EMPTY_JSONB_ARRAY
+    return (
+        update(model)
+        .where(model.id == checked.c.id)
+        .values(
+            is_valid=is_valid,
+            validation_result=func.jsonb_build_object(
+                _text("is_valid"),
+                is_valid,
+                _text("errors"),
+                func.nullif(checked.c.errors, _EMPTY_JSONB_ARRAY),
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_sql_validation_rules(
+    session: AsyncSession,
+    resource_type: constants.ResourceType,
+    *,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> int:
+    result = await session.execute(
+        build_sql_validation_update(
+            resource_type, project_id=project_id, survey_mission_id=survey_mission_id
+        )
+    )
+    await session.commit()
+    return result.rowcount
@@ -51,6 +51,7 @@ async def update_workflow_stage(
 ) -> models.WorkflowStage:
     for key, value in to_update.model_dump(exclude_unset=True).items():
         setattr(resource, key, value)
+    resource.version += 1
     session.add(resource)
     await session.commit()
     await session.refresh(resource)
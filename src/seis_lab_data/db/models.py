@@ -23,8 +23,14 @@ from pydantic import (
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import SAWarning
 from sqlalchemy import (
+    DDL,
+    Computed,
     Index,
+    Text,
+    UniqueConstraint,
+    event,
     select,
+    text,
 )
 from sqlalchemy.orm import (
     column_property,
@@ -50,6 +56,11 @@ warnings.filterwarnings(
 
 now_ = partial(dt.datetime.now, tz=dt.timezone.utc)
 
+# lowercased names in all languages, used for trigram searches
+NAME_SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce(name ->> 'en', '') || ' ' || coalesce(name ->> 'pt', ''))"
+)
+
 
 class ValidationError(TypedDict):
     name: str
@@ -100,6 +111,8 @@ class DatasetCategory(SQLModel, table=True):
     name: Annotated[LocalizableString, PlainSerializer(serialize_localizable_field)] = (
         Field(sa_column=Column(JSONB))
     )
+    # bumped on every update, since there are no modification times
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     survey_related_records: list["SurveyRelatedRecord"] = Relationship(
         back_populates="dataset_category",
@@ -114,6 +127,8 @@ class WorkflowStage(SQLModel, table=True):
     name: Annotated[LocalizableString, PlainSerializer(serialize_localizable_field)] = (
         Field(sa_column=Column(JSONB))
     )
+    # bumped on every update, since there are no modification times
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     survey_related_records: list["SurveyRelatedRecord"] = Relationship(
         back_populates="workflow_stage",
@@ -260,6 +275,17 @@ class SurveyRelatedRecordSelfLink(SQLModel, table=True):
 class SurveyMission(SQLModel, table=True):
     __table_args__ = (
         Index("idx_surveymission_name_gin", "name", postgresql_using="gin"),
+        Index(
+            "idx_surveymission_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_surveymission_records_extent_dirty",
+            "id",
+            postgresql_where=text("records_extent_is_dirty"),
+        ),
     )
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -271,6 +297,10 @@ class SurveyMission(SQLModel, table=True):
     description: Annotated[
         LocalizableString, PlainSerializer(serialize_localizable_field)
     ] = Field(sa_column=Column(JSONB))
+    search_text: str | None = Field(
+        default=None,
+        sa_column=Column(Text(), Computed(NAME_SEARCH_TEXT_EXPRESSION)),
+    )
     project_id: uuid.UUID = Field(
         foreign_key="project.id",
         ondelete="CASCADE",
@@ -303,6 +333,28 @@ class SurveyMission(SQLModel, table=True):
     )
     temporal_extent_begin: dt.date | None = Field(sa_column=Column(Date()))
     temporal_extent_end: dt.date | None = Field(sa_column=Column(Date()))
+    # extents of the survey-related records underneath, as opposed to the above
+    # ones, which are edited by hand - they are widened as records are created,
+    # while other changes just mark them as dirty, for a worker to recompute
+    records_bbox_4326: Annotated[
+        WKBElement | None,
+        PlainSerializer(serialize_wkbelement, return_type=dict, when_used="json"),
+    ] = Field(
+        default=None,
+        sa_column=Column(Geometry(srid=4326, geometry_type="GEOMETRY")),
+    )
+    records_temporal_extent_begin: dt.date | None = Field(
+        default=None, sa_column=Column(Date())
+    )
+    records_temporal_extent_end: dt.date | None = Field(
+        default=None, sa_column=Column(Date())
+    )
+    records_extent_is_dirty: bool = Field(
+        default=False, sa_column_kwargs={"server_default": "false"}
+    )
+    # bumped whenever the extents of records are rolled up, which leaves the
+    # modification times alone
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     project: "Project" = Relationship(back_populates="survey_missions")
     survey_related_records: list["SurveyRelatedRecord"] = Relationship(
@@ -325,7 +377,20 @@ class SurveyMission(SQLModel, table=True):
 
 
 class Project(SQLModel, table=True):
-    __table_args__ = (Index("idx_project_name_gin", "name", postgresql_using="gin"),)
+    __table_args__ = (
+        Index("idx_project_name_gin", "name", postgresql_using="gin"),
+        Index(
+            "idx_project_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_project_records_extent_dirty",
+            "id",
+            postgresql_where=text("records_extent_is_dirty"),
+        ),
+    )
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -336,6 +401,10 @@ class Project(SQLModel, table=True):
     description: Annotated[
         LocalizableString, PlainSerializer(serialize_localizable_field)
     ] = Field(sa_column=Column(JSONB))
+    search_text: str | None = Field(
+        default=None,
+        sa_column=Column(Text(), Computed(NAME_SEARCH_TEXT_EXPRESSION)),
+    )
     status: constants.ProjectStatus = constants.ProjectStatus.DRAFT
     root_path: str = ""
     is_valid: bool = False
@@ -362,6 +431,28 @@ class Project(SQLModel, table=True):
     )
     temporal_extent_begin: dt.date | None = Field(sa_column=Column(Date()))
     temporal_extent_end: dt.date | None = Field(sa_column=Column(Date()))
+    # extents of the survey-related records underneath, as opposed to the above
+    # ones, which are edited by hand - they are widened as records are created,
+    # while other changes just mark them as dirty, for a worker to recompute
+    records_bbox_4326: Annotated[
+        WKBElement | None,
+        PlainSerializer(serialize_wkbelement, return_type=dict, when_used="json"),
+    ] = Field(
+        default=None,
+        sa_column=Column(Geometry(srid=4326, geometry_type="GEOMETRY")),
+    )
+    records_temporal_extent_begin: dt.date | None = Field(
+        default=None, sa_column=Column(Date())
+    )
+    records_temporal_extent_end: dt.date | None = Field(
+        default=None, sa_column=Column(Date())
+    )
+    records_extent_is_dirty: bool = Field(
+        default=False, sa_column_kwargs={"server_default": "false"}
+    )
+    # bumped whenever the extents of records are rolled up, which leaves the
+    # modification times alone
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     survey_missions: list["SurveyMission"] = Relationship(
         back_populates="project",
@@ -416,3 +507,71 @@ class RecordAsset(SQLModel, table=True):
     survey_related_record: SurveyRelatedRecord = Relationship(
         back_populates="assets",
     )
+
+
+class DiscoveryCandidate(TypedDict):
+    relative_path: str
+    asset_discovery_configuration_id: str
+
+
+class DiscoveryJob(SQLModel, table=True):
+    # the id of the request that triggered discovery, which lets a re-delivered
+    # planner message resume the existing job instead of starting a new one
+    id: uuid.UUID = Field(primary_key=True)
+    survey_mission_id: uuid.UUID = Field(
+        foreign_key="surveymission.id", ondelete="CASCADE", index=True
+    )
+    status: constants.DiscoveryJobStatus = constants.DiscoveryJobStatus.RUNNING
+    total_files: int = 0
+    files_seen: int = 0
+    files_extracted: int = 0
+    files_failed: int = 0
+    # stored with time zone, as they are used to compute the discovery rate
+    created_at: dt.datetime = Field(
+        default_factory=now_, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: dt.datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+
+
+class DiscoveryChunk(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint("job_id", "position", name="uq_discoverychunk_job_position"),
+    )
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    job_id: uuid.UUID = Field(
+        foreign_key="discoveryjob.id", ondelete="CASCADE", index=True
+    )
+    position: int
+    candidates: list[DiscoveryCandidate] = Field(
+        sa_column=Column(JSONB), default_factory=list
+    )
+    status: constants.DiscoveryChunkStatus = constants.DiscoveryChunkStatus.PENDING
+
+
+class BulkUpdateJob(SQLModel, table=True):
+    # the id of the request that triggered the bulk update, which lets a
+    # re-delivered message resume the existing job instead of starting over
+    id: uuid.UUID = Field(primary_key=True)
+    status: constants.BulkUpdateJobStatus = constants.BulkUpdateJobStatus.RUNNING
+    total_count: int = 0
+    affected_count: int = 0
+    # records are updated in order of their id - this is the highest id that
+    # has already been updated, and it is where the next chunk starts from
+    last_record_id: uuid.UUID | None = None
+    created_at: dt.datetime = Field(
+        default_factory=now_, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: dt.datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+
+
+# the trigram indexes need pg_trgm, which is created by migrations but must
+# also exist whenever the schema is created straight from the metadata
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
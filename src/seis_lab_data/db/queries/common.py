@@ -1,3 +1,15 @@
+import dataclasses
+import datetime as dt
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    DateTime,
+    cast,
+    literal,
+    null,
+    union_all,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import (
     func,
@@ -5,5 +17,101 @@ from sqlmodel import (
 )
 
 
+@dataclasses.dataclass(frozen=True)
+class ModificationSummary:
+    """When a set of rows was last modified and how many of them there are.
+
+    Together, these change whenever a row is created, updated or deleted,
+    which makes them usable as validators for HTTP conditional requests.
+    Rows also contribute the sum of their version counters, which covers
+    changes that leave modification times alone.
+    """
+
+    last_modified: dt.datetime | None
+    num_rows: int
+    version: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class RowPermissions:
+    """What a user may do with a row, as computed by the database along with it."""
+
+    can_read: bool
+    can_update: bool
+    can_delete: bool
+
+
+def get_permission_columns(
+    can_read: ColumnElement[bool],
+    can_update: ColumnElement[bool],
+    can_delete: ColumnElement[bool],
+) -> tuple[ColumnElement[bool], ...]:
+    """Label permission clauses, for selecting them as columns of each row.
+
+    The clauses are expected to come from the `get_*_clause()` functions of
+    the `permissions` modules.
+    """
+    return (
+        can_read.label("can_read"),
+        can_update.label("can_update"),
+        can_delete.label("can_delete"),
+    )
+
+
 async def _get_total_num_records(session: AsyncSession, statement):
     return (await session.exec(select(func.count()).select_from(statement))).first()
+
+
+def build_modification_statement(model, *where_clauses):
+    """Select the most recent modification time and row count of a model's rows.
+
+    Models that have a `version` counter also select the sum of their rows'
+    versions, which grows with every update - this is how lookup tables, which
+    have no modification times, and the extents rolled up into survey missions
+    and projects, which are not modifications of their own, are noticed.
+    """
+    last_modified = (
+        func.max(func.coalesce(model.updated_at, model.created_at))
+        if hasattr(model, "updated_at")
+        else cast(null(), DateTime())
+    )
+    version = (
+        func.coalesce(func.sum(model.version), 0)
+        if hasattr(model, "version")
+        else cast(literal(0), BigInteger())
+    )
+    return (
+        select(
+            last_modified.label("last_modified"),
+            func.count().label("num_rows"),
+            version.label("version"),
+        )
+        .select_from(model)
+        .where(*where_clauses)
+    )
+
+
+async def get_modification_summary(
+    session: AsyncSession, *statements
+) -> ModificationSummary:
+    """Combine the results of several modification statements, in a single query.
+
+    Each statement is expected to have been built with
+    `build_modification_statement()`.
+    """
+    combined = union_all(*statements).subquery()
+    last_modified, num_rows, version = (
+        await session.exec(
+            select(
+                func.max(combined.c.last_modified),
+                func.sum(combined.c.num_rows),
+                func.sum(combined.c.version),
+            )
+        )
+    ).one()
+    # postgresql sums bigints as numeric
+    return ModificationSummary(
+        last_modified=last_modified,
+        num_rows=int(num_rows or 0),
+        version=int(version or 0),
+    )
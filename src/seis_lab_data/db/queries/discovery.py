@@ -4,6 +4,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 
+from ... import constants
 from ...schemas import identifiers
 from .. import models
 
@@ -97,3 +98,45 @@ async def collect_all_asset_discovery_configurations(
             )
         )
     return (await session.exec(statement)).all()
+
+
+async def get_discovery_job(
+    session: AsyncSession,
+    discovery_job_id: identifiers.RequestId,
+) -> models.DiscoveryJob | None:
+    return await session.get(models.DiscoveryJob, discovery_job_id)
+
+
+async def get_discovery_chunk(
+    session: AsyncSession,
+    discovery_chunk_id: identifiers.DiscoveryChunkId,
+) -> models.DiscoveryChunk | None:
+    return await session.get(models.DiscoveryChunk, discovery_chunk_id)
+
+
+async def collect_pending_discovery_chunk_ids(
+    session: AsyncSession,
+    discovery_job_id: identifiers.RequestId,
+) -> list[identifiers.DiscoveryChunkId]:
+    statement = (
+        select(models.DiscoveryChunk.id)
+        .where(models.DiscoveryChunk.job_id == discovery_job_id)
+        .where(models.DiscoveryChunk.status == constants.DiscoveryChunkStatus.PENDING)
+        .order_by(models.DiscoveryChunk.position)
+    )
+    return [
+        identifiers.DiscoveryChunkId(id_) for id_ in (await session.exec(statement))
+    ]
+
+
+async def get_running_discovery_job(
+    session: AsyncSession,
+    survey_mission_id: identifiers.SurveyMissionId,
+) -> models.DiscoveryJob | None:
+    statement = (
+        select(models.DiscoveryJob)
+        .where(models.DiscoveryJob.survey_mission_id == survey_mission_id)
+        .where(models.DiscoveryJob.status == constants.DiscoveryJobStatus.RUNNING)
+        .order_by(models.DiscoveryJob.created_at.desc())
+    )
+    return (await session.exec(statement)).first()
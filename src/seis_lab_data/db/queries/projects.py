@@ -1,4 +1,5 @@
 import logging
+import uuid
 
 import shapely
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -14,7 +15,12 @@ from ...schemas import (
     identifiers,
 )
 from .. import models
-from .common import _get_total_num_records
+from .common import (
+    ModificationSummary,
+    _get_total_num_records,
+    build_modification_statement,
+    get_modification_summary,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +136,46 @@ async def collect_all_projects(
     return items
 
 
+async def collect_project_names(
+    session: AsyncSession,
+) -> list[tuple[uuid.UUID, dict[str, str], ProjectStatus]]:
+    """Collect just the id, name and status of every project."""
+    statement = select(
+        models.Project.id, models.Project.name, models.Project.status
+    ).order_by(models.Project.id)
+    return (await session.exec(statement)).all()
+
+
+async def search_project_names(
+    session: AsyncSession,
+    search_value: str,
+    limit: int,
+    published_only: bool = False,
+) -> list[tuple[uuid.UUID, dict[str, str]]]:
+    """Find projects whose names resemble the search value, most similar first.
+
+    Relies on the trigram index of the projects' `search_text` column, which
+    also tolerates typos.
+    """
+    search_value = search_value.lower()
+    search_text = models.Project.search_text
+    statement = (
+        select(models.Project.id, models.Project.name)
+        .where(
+            or_(
+                search_text.contains(search_value, autoescape=True),
+                search_text.op("%>")(search_value),
+            )
+        )
+        .order_by(func.word_similarity(search_value, search_text).desc())
+        .order_by(models.Project.id)
+        .limit(limit)
+    )
+    if published_only:
+        statement = statement.where(models.Project.status == ProjectStatus.PUBLISHED)
+    return (await session.exec(statement)).all()
+
+
 async def get_project(
     session: AsyncSession,
     project_id: "identifiers.ProjectId",
@@ -145,3 +191,33 @@ async def get_project_by_english_name(
         models.Project.name["en"].astext == english_name
     )
     return (await session.exec(statement)).first()
+
+
+async def get_projects_modification_summary(
+    session: AsyncSession,
+) -> ModificationSummary:
+    """Summarize modifications of projects, survey missions and records.
+
+    Projects are listed along with the extents rolled up from their records,
+    so changes to any of these must be noticed.
+    """
+    return await get_modification_summary(
+        session,
+        build_modification_statement(models.Project),
+        build_modification_statement(models.SurveyMission),
+        build_modification_statement(models.SurveyRelatedRecord),
+    )
+
+
+async def get_project_modification_summary(
+    session: AsyncSession,
+    project_id: identifiers.ProjectId,
+) -> ModificationSummary:
+    """Summarize modifications of a project and of its survey missions."""
+    return await get_modification_summary(
+        session,
+        build_modification_statement(models.Project, models.Project.id == project_id),
+        build_modification_statement(
+            models.SurveyMission, models.SurveyMission.project_id == project_id
+        ),
+    )
@@ -126,9 +126,33 @@ async def list_media_types(
     return (await session.exec(statement)).all()
 
 
+async def collect_all_media_types(session: AsyncSession) -> list[str]:
+    return [
+        media_type
+        for media_type in (await session.exec(_get_media_type_list_statement())).all()
+        if media_type
+    ]
+
+
 async def count_media_types(
     session: AsyncSession,
     name_filter: str | None = None,
 ) -> int:
     statement = _get_media_type_list_statement(name_filter)
     return (await session.exec(select(func.count()).select_from(statement))).first()
+
+
+async def collect_survey_mission_asset_paths(
+    session: AsyncSession,
+    survey_mission_id: identifiers.SurveyMissionId,
+) -> set[str]:
+    statement = (
+        select(models.RecordAsset.relative_path)
+        .join(
+            models.SurveyRelatedRecord,
+            models.RecordAsset.survey_related_record_id
+            == models.SurveyRelatedRecord.id,
+        )
+        .where(models.SurveyRelatedRecord.survey_mission_id == survey_mission_id)
+    )
+    return set((await session.exec(statement)).all())
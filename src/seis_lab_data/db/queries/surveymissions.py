@@ -1,3 +1,5 @@
+import uuid
+
 import shapely
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -13,7 +15,12 @@ from ...schemas import (
     identifiers,
     filters as filter_schemas,
 )
-from .common import _get_total_num_records
+from .common import (
+    ModificationSummary,
+    _get_total_num_records,
+    build_modification_statement,
+    get_modification_summary,
+)
 
 
 def _build_survey_mission_statement(
@@ -136,6 +143,60 @@ async def collect_all_project_survey_missions(
     return (await session.exec(statement)).all()
 
 
+async def collect_survey_mission_names(
+    session: AsyncSession,
+) -> list[tuple[uuid.UUID, dict[str, str], SurveyMissionStatus, dict[str, str]]]:
+    """Collect the id, name and status of every survey mission.
+
+    The name of each survey mission's project is included too.
+    """
+    statement = (
+        select(
+            models.SurveyMission.id,
+            models.SurveyMission.name,
+            models.SurveyMission.status,
+            models.Project.name,
+        )
+        .join(models.Project)
+        .order_by(models.SurveyMission.id)
+    )
+    return (await session.exec(statement)).all()
+
+
+async def search_survey_mission_names(
+    session: AsyncSession,
+    search_value: str,
+    limit: int,
+    published_only: bool = False,
+) -> list[tuple[uuid.UUID, dict[str, str], dict[str, str]]]:
+    """Find survey missions whose names resemble the search value.
+
+    Results are sorted by similarity and include the name of each survey
+    mission's project. Relies on the trigram index of the survey missions'
+    `search_text` column, which also tolerates typos.
+    """
+    search_value = search_value.lower()
+    search_text = models.SurveyMission.search_text
+    statement = (
+        select(models.SurveyMission.id, models.SurveyMission.name, models.Project.name)
+        .join(models.Project)
+        .where(
+            or_(
+                search_text.contains(search_value, autoescape=True),
+                search_text.op("%>")(search_value),
+            )
+        )
+        .order_by(func.word_similarity(search_value, search_text).desc())
+        .order_by(models.SurveyMission.id)
+        .limit(limit)
+    )
+    if published_only:
+        statement = statement.where(
+            models.SurveyMission.status == SurveyMissionStatus.PUBLISHED
+        )
+    return (await session.exec(statement)).all()
+
+
 async def get_survey_mission(
     session: AsyncSession,
     survey_mission_id: identifiers.SurveyMissionId,
@@ -174,3 +235,50 @@ async def get_survey_mission_by_path(
         .options(selectinload(models.SurveyMission.project))
     )
     return (await session.exec(statement)).first()
+
+
+async def get_survey_missions_modification_summary(
+    session: AsyncSession,
+) -> ModificationSummary:
+    """Summarize modifications of survey missions, their projects and records.
+
+    Survey missions are listed along with the extents rolled up from their
+    records, so changes to records must be noticed too.
+    """
+    return await get_modification_summary(
+        session,
+        build_modification_statement(models.SurveyMission),
+        build_modification_statement(models.Project),
+        build_modification_statement(models.SurveyRelatedRecord),
+    )
+
+
+async def get_survey_mission_modification_summary(
+    session: AsyncSession,
+    survey_mission_id: identifiers.SurveyMissionId,
+) -> ModificationSummary:
+    """Summarize modifications of a survey mission, its project and its records.
+
+    Dataset categories and workflow stages are offered as filters on the survey
+    mission's detail page, so their number is taken into account too.
+    """
+    parent_project_id = (
+        select(models.SurveyMission.project_id)
+        .where(models.SurveyMission.id == survey_mission_id)
+        .scalar_subquery()
+    )
+    return await get_modification_summary(
+        session,
+        build_modification_statement(
+            models.SurveyMission, models.SurveyMission.id == survey_mission_id
+        ),
+        build_modification_statement(
+            models.Project, models.Project.id == parent_project_id
+        ),
+        build_modification_statement(
+            models.SurveyRelatedRecord,
+            models.SurveyRelatedRecord.survey_mission_id == survey_mission_id,
+        ),
+        build_modification_statement(models.DatasetCategory),
+        build_modification_statement(models.WorkflowStage),
+    )
@@ -1,6 +1,14 @@
 import logging
+from collections.abc import (
+    AsyncIterator,
+    Sequence,
+)
 
 import shapely
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+)
 from sqlalchemy.orm import aliased, selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import (
@@ -16,7 +24,14 @@ from ...schemas import (
     identifiers,
     filters as filter_schemas,
 )
-from .common import _get_total_num_records
+from .common import (
+    ModificationSummary,
+    RowPermissions,
+    _get_total_num_records,
+    build_modification_statement,
+    get_modification_summary,
+    get_permission_columns,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -140,9 +155,10 @@ def _build_survey_related_record_statement(
     record_ids: list[identifiers.SurveyRelatedRecordId] | None = None,
     dataset_category_id: identifiers.DatasetCategoryId | None = None,
     workflow_stage_id: identifiers.WorkflowStageId | None = None,
+    columns: Sequence[ColumnElement] = (),
 ):
     statement = (
-        select(models.SurveyRelatedRecord)
+        select(models.SurveyRelatedRecord, *columns)
         .options(
             selectinload(models.SurveyRelatedRecord.survey_mission).selectinload(
                 models.SurveyMission.project
@@ -385,6 +401,172 @@ async def list_survey_related_records(
     )
 
 
+async def list_survey_related_records_with_permissions(
+    session: AsyncSession,
+    can_read: ColumnElement[bool],
+    can_update: ColumnElement[bool],
+    can_delete: ColumnElement[bool],
+    only_updatable: bool = False,
+    only_internal: bool = False,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+    project_id: identifiers.ProjectId | None = None,
+    page: int = 1,
+    page_size: int = 20,
+    include_total: bool = False,
+    en_name_filter: str | None = None,
+    pt_name_filter: str | None = None,
+    spatial_intersect: shapely.Polygon | None = None,
+    temporal_extent: filter_schemas.TemporalExtentFilterValue | None = None,
+    asset_path_fragment_filter: str | None = None,
+    asset_media_type_filter: str | None = None,
+    dataset_category_id: identifiers.DatasetCategoryId | None = None,
+    workflow_stage_id: identifiers.WorkflowStageId | None = None,
+) -> tuple[list[tuple[models.SurveyRelatedRecord, RowPermissions]], int | None]:
+    """Return the records a user may read, along with what they may do with each.
+
+    Permissions are given as SQL clauses, which filter out unreadable records
+    and are also selected as columns, so that no record needs to be checked
+    afterwards. With `only_updatable`, only records the user may update are
+    returned and with `only_internal`, only records that are not published.
+    """
+    statement = _build_survey_related_record_statement(
+        survey_mission_id=survey_mission_id,
+        project_id=project_id,
+        en_name_filter=en_name_filter,
+        pt_name_filter=pt_name_filter,
+        spatial_intersect=spatial_intersect,
+        temporal_extent=temporal_extent,
+        asset_path_fragment_filter=asset_path_fragment_filter,
+        asset_media_type_filter=asset_media_type_filter,
+        dataset_category_id=dataset_category_id,
+        workflow_stage_id=workflow_stage_id,
+        columns=get_permission_columns(can_read, can_update, can_delete),
+    ).where(can_read)
+    if only_updatable:
+        statement = statement.where(can_update)
+    if only_internal:
+        statement = statement.where(
+            models.SurveyRelatedRecord.status != SurveyRelatedRecordStatus.PUBLISHED
+        )
+    rows = (
+        await session.exec(statement.offset(page_size * (page - 1)).limit(page_size))
+    ).all()
+    num_total = (
+        await _get_total_num_records(session, statement) if include_total else None
+    )
+    return [(record, RowPermissions(*flags)) for record, *flags in rows], num_total
+
+
+async def get_survey_related_record_with_permissions(
+    session: AsyncSession,
+    survey_related_record_id: identifiers.SurveyRelatedRecordId,
+    can_read: ColumnElement[bool],
+    can_update: ColumnElement[bool],
+    can_delete: ColumnElement[bool],
+) -> tuple[models.SurveyRelatedRecord, RowPermissions] | None:
+    """Return a record along with what a user may do with it.
+
+    Unlike with listings, records that may not be read are still returned,
+    with `can_read` unset, so that callers can tell them from missing ones.
+    """
+    statement = _build_survey_related_record_statement(
+        record_ids=[survey_related_record_id],
+        columns=get_permission_columns(can_read, can_update, can_delete),
+    )
+    if (row := (await session.exec(statement)).first()) is None:
+        return None
+    record, *flags = row
+    return record, RowPermissions(*flags)
+
+
+def build_survey_related_record_export_statement(
+    can_read: ColumnElement[bool],
+    only_internal: bool = False,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+    project_id: identifiers.ProjectId | None = None,
+    en_name_filter: str | None = None,
+    pt_name_filter: str | None = None,
+    spatial_intersect: shapely.Polygon | None = None,
+    temporal_extent: filter_schemas.TemporalExtentFilterValue | None = None,
+    asset_path_fragment_filter: str | None = None,
+    asset_media_type_filter: str | None = None,
+    dataset_category_id: identifiers.DatasetCategoryId | None = None,
+    workflow_stage_id: identifiers.WorkflowStageId | None = None,
+):
+    """Build a statement selecting the flat columns that records are exported with.
+
+    Unlike the list statements, this loads no relationships, which makes its
+    rows suitable for being streamed from a server-side cursor. The bounding
+    box is selected as WKB.
+    """
+    statement = (
+        select(
+            models.SurveyRelatedRecord.id,
+            models.SurveyRelatedRecord.name["en"].astext.label("name_en"),
+            models.SurveyRelatedRecord.name["pt"].astext.label("name_pt"),
+            models.SurveyRelatedRecord.description["en"].astext.label("description_en"),
+            models.SurveyRelatedRecord.description["pt"].astext.label("description_pt"),
+            models.SurveyRelatedRecord.status,
+            models.SurveyRelatedRecord.survey_mission_id,
+            models.SurveyMission.name["en"].astext.label("survey_mission_name_en"),
+            models.SurveyMission.project_id,
+            models.Project.name["en"].astext.label("project_name_en"),
+            models.DatasetCategory.name["en"].astext.label("dataset_category_en"),
+            models.WorkflowStage.name["en"].astext.label("workflow_stage_en"),
+            models.SurveyRelatedRecord.temporal_extent_begin,
+            models.SurveyRelatedRecord.temporal_extent_end,
+            func.ST_AsBinary(models.SurveyRelatedRecord.bbox_4326).label("bbox_4326"),
+        )
+        .join(
+            models.SurveyMission,
+            models.SurveyRelatedRecord.survey_mission_id == models.SurveyMission.id,
+        )
+        .join(models.Project, models.SurveyMission.project_id == models.Project.id)
+        .outerjoin(
+            models.DatasetCategory,
+            models.SurveyRelatedRecord.dataset_category_id == models.DatasetCategory.id,
+        )
+        .outerjoin(
+            models.WorkflowStage,
+            models.SurveyRelatedRecord.workflow_stage_id == models.WorkflowStage.id,
+        )
+        .where(can_read)
+    )
+    statement = _apply_survey_related_record_filters(
+        statement=statement,
+        survey_mission_id=survey_mission_id,
+        project_id=project_id,
+        en_name_filter=en_name_filter,
+        pt_name_filter=pt_name_filter,
+        spatial_intersect=spatial_intersect,
+        temporal_extent=temporal_extent,
+        asset_path_fragment_filter=asset_path_fragment_filter,
+        asset_media_type_filter=asset_media_type_filter,
+        dataset_category_id=dataset_category_id,
+        workflow_stage_id=workflow_stage_id,
+    )
+    if only_internal:
+        statement = statement.where(
+            models.SurveyRelatedRecord.status != SurveyRelatedRecordStatus.PUBLISHED
+        )
+    return statement.order_by(models.SurveyRelatedRecord.id)
+
+
+async def stream_survey_related_record_export(
+    session: AsyncSession,
+    statement,
+    batch_size: int,
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Yield the rows of an export statement in batches of `batch_size`.
+
+    Rows are fetched from a server-side cursor, so only a single batch is
+    held in memory at a time, regardless of how many rows match.
+    """
+    result = await session.stream(statement.execution_options(yield_per=batch_size))
+    async for batch in result.mappings().partitions():
+        yield batch
+
+
 async def get_survey_related_record(
     session: AsyncSession,
     survey_related_record_id: identifiers.SurveyRelatedRecordId,
@@ -408,6 +590,13 @@ async def get_survey_related_record(
     return (await session.exec(statement)).first()
 
 
+async def get_bulk_update_job(
+    session: AsyncSession,
+    bulk_update_job_id: identifiers.RequestId,
+) -> models.BulkUpdateJob | None:
+    return await session.get(models.BulkUpdateJob, bulk_update_job_id)
+
+
 async def get_survey_related_record_by_english_name(
     session: AsyncSession,
     survey_mission_id: identifiers.SurveyMissionId,
@@ -499,3 +688,64 @@ async def list_survey_related_record_subject_records(
         .options(selectinload(models.SurveyRelatedRecord.workflow_stage))
     )
     return (await session.exec(statement.offset(offset).limit(limit))).all()
+
+
+async def get_survey_related_records_modification_summary(
+    session: AsyncSession,
+) -> ModificationSummary:
+    """Summarize modifications of records and of everything shown alongside them."""
+    return await get_modification_summary(
+        session,
+        build_modification_statement(models.SurveyRelatedRecord),
+        build_modification_statement(models.SurveyMission),
+        build_modification_statement(models.Project),
+        build_modification_statement(models.DatasetCategory),
+        build_modification_statement(models.WorkflowStage),
+    )
+
+
+async def get_survey_related_record_modification_summary(
+    session: AsyncSession,
+    survey_related_record_id: identifiers.SurveyRelatedRecordId,
+) -> ModificationSummary:
+    """Summarize modifications of a record and of what its detail page shows.
+
+    Assets and links between records do not have modification times, so
+    only their number is taken into account.
+    """
+    parent_mission_id = (
+        select(models.SurveyRelatedRecord.survey_mission_id)
+        .where(models.SurveyRelatedRecord.id == survey_related_record_id)
+        .scalar_subquery()
+    )
+    parent_project_id = (
+        select(models.SurveyMission.project_id)
+        .where(models.SurveyMission.id == parent_mission_id)
+        .scalar_subquery()
+    )
+    return await get_modification_summary(
+        session,
+        build_modification_statement(
+            models.SurveyRelatedRecord,
+            models.SurveyRelatedRecord.id == survey_related_record_id,
+        ),
+        build_modification_statement(
+            models.SurveyMission, models.SurveyMission.id == parent_mission_id
+        ),
+        build_modification_statement(
+            models.Project, models.Project.id == parent_project_id
+        ),
+        build_modification_statement(
+            models.RecordAsset,
+            models.RecordAsset.survey_related_record_id == survey_related_record_id,
+        ),
+        build_modification_statement(
+            models.SurveyRelatedRecordSelfLink,
+            or_(
+                models.SurveyRelatedRecordSelfLink.subject_id
+                == survey_related_record_id,
+                models.SurveyRelatedRecordSelfLink.related_to_id
+                == survey_related_record_id,
+            ),
+        ),
+    )
@@ -0,0 +1,116 @@
+import uuid
+from collections.abc import AsyncIterator
+from typing import Final
+
+from sqlalchemy import (
+    func,
+    select,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ... import constants
+from ...schemas import identifiers
+from .. import models
+
+VALIDATABLE_MODELS: Final[dict[constants.ResourceType, type]] = {
+    constants.ResourceType.PROJECT: models.Project,
+    constants.ResourceType.MISSION: models.SurveyMission,
+    constants.ResourceType.RECORD: models.SurveyRelatedRecord,
+}
+
+
+def build_validation_statement(
+    resource_type: constants.ResourceType,
+    columns: list,
+    *where_clauses,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+):
+    """Select columns of the resources of a type that are in a validation scope.
+
+    Projects may be scoped by their id, survey missions by their project and
+    records by either their survey mission or their mission's project.
+    """
+    model = VALIDATABLE_MODELS[resource_type]
+    statement = select(*columns).select_from(model).where(*where_clauses)
+    match resource_type:
+        case constants.ResourceType.PROJECT:
+            if project_id is not None:
+                statement = statement.where(model.id == project_id)
+        case constants.ResourceType.MISSION:
+            if project_id is not None:
+                statement = statement.where(model.project_id == project_id)
+            if survey_mission_id is not None:
+                statement = statement.where(model.id == survey_mission_id)
+        case constants.ResourceType.RECORD:
+            if project_id is not None:
+                statement = statement.join(models.SurveyMission).where(
+                    models.SurveyMission.project_id == project_id
+                )
+            if survey_mission_id is not None:
+                statement = statement.where(
+                    model.survey_mission_id == survey_mission_id
+                )
+    return statement.order_by(model.id)
+
+
+async def iter_rows_to_validate(
+    session: AsyncSession,
+    resource_type: constants.ResourceType,
+    column_names: list[str],
+    *,
+    batch_size: int,
+    with_links_only: bool = False,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> AsyncIterator[list[dict]]:
+    """Yield batches of rows to validate, as plain dicts.
+
+    Batches are paginated by id rather than by offset, so each one is found
+    through the primary key index no matter how deep into the table it is,
+    and rows that are updated in between batches are neither skipped nor
+    repeated.
+    """
+    model = VALIDATABLE_MODELS[resource_type]
+    where_clauses = []
+    if with_links_only:
+        where_clauses.append(func.coalesce(func.jsonb_array_length(model.links), 0) > 0)
+    statement = build_validation_statement(
+        resource_type,
+        [getattr(model, name) for name in column_names],
+        *where_clauses,
+        project_id=project_id,
+        survey_mission_id=survey_mission_id,
+    ).limit(batch_size)
+    last_id: uuid.UUID | None = None
+    while True:
+        batch_statement = (
+            statement if last_id is None else statement.where(model.id > last_id)
+        )
+        rows = [
+            dict(row) for row in (await session.execute(batch_statement)).mappings()
+        ]
+        if not rows:
+            break
+        yield rows
+        if len(rows) < batch_size:
+            break
+        last_id = rows[-1]["id"]
+
+
+async def count_invalid(
+    session: AsyncSession,
+    resource_type: constants.ResourceType,
+    *,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> int:
+    model = VALIDATABLE_MODELS[resource_type]
+    statement = build_validation_statement(
+        resource_type,
+        [func.count()],
+        model.is_valid.is_(False),
+        project_id=project_id,
+        survey_mission_id=survey_mission_id,
+    ).order_by(None)
+    return (await session.execute(statement)).scalar_one()
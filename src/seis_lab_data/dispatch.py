@@ -1,8 +1,14 @@
+import asyncio
+import dataclasses
 import logging
+import weakref
 from typing import Protocol
 
+import pydantic
 from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
+from . import constants
 from .schemas import (
     events,
     messages,
@@ -10,6 +16,11 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+_PROGRESS_EVENT_TYPES = (
+    events.DiscoveryProgressEvent,
+    events.BulkUpdateProgressEvent,
+)
+
 
 class EventDispatcherProtocol(Protocol):
     async def __call__(self, event: events.SeisLabDataEvent) -> None: ...
@@ -19,74 +30,272 @@ async def no_op_dispatcher(event: events.SeisLabDataEvent) -> None:
     logger.debug(f"no-op dispatch called with {event=}")
 
 
+def build_message(event: events.SeisLabDataEvent) -> pydantic.BaseModel | None:
+    """Convert an internal event into the message that gets sent over redis."""
+    match event:
+        case events.ResourceModificationEvent():
+            return messages.ResourceModificationMessage(
+                resource_type=event.resource_type,
+                request_id=event.request_id,
+                resource_id=event.resource_id,
+                parent_resource_id=event.parent_resource_id,
+                modification=event.modification,
+                succeeded=event.succeeded,
+                details=event.details,
+            )
+        case events.BulkResourceModificationEvent():
+            return messages.BulkResourceModificationMessage(
+                request_id=event.request_id,
+                resource_type=event.resource_type,
+                modification=event.modification,
+                succeeded=event.succeeded,
+                affected_count=event.affected_count,
+                details=event.details,
+            )
+        case events.ResourceStatusChangedEvent():
+            return messages.ResourceStatusChangedMessage(
+                request_id=event.request_id,
+                resource_type=event.resource_type,
+                resource_id=event.resource_id,
+                succeeded=event.succeeded,
+                new_status=event.new_status,
+                details=event.details,
+            )
+        case events.DiscoveryEvent():
+            return messages.DiscoveryMessage(
+                resource_type=event.resource_type,
+                resource_id=event.resource_id,
+                request_id=event.request_id,
+                modification=event.modification,
+                succeeded=event.succeeded,
+                details=event.details,
+            )
+        case events.DiscoveryProgressEvent():
+            return messages.DiscoveryProgressMessage(
+                resource_type=event.resource_type,
+                resource_id=event.resource_id,
+                request_id=event.request_id,
+                total_files=event.total_files,
+                files_seen=event.files_seen,
+                files_extracted=event.files_extracted,
+                files_failed=event.files_failed,
+                files_per_second=event.files_per_second,
+            )
+        case events.BulkUpdateProgressEvent():
+            return messages.BulkUpdateProgressMessage(
+                resource_type=event.resource_type,
+                request_id=event.request_id,
+                total_count=event.total_count,
+                affected_count=event.affected_count,
+            )
+        case events.ValidationEvent():
+            return messages.ValidationMessage(
+                resource_type=event.resource_type,
+                resource_id=event.resource_id,
+                request_id=event.request_id,
+                modification=event.modification,
+                succeeded=event.succeeded,
+                is_valid=event.is_valid,
+                details=event.details,
+            )
+        case _:
+            return None
+
+
+def get_topic_name(event: events.SeisLabDataEvent) -> str:
+    """Return the name of the topic where an event is to be sent.
+
+    Progress reports are only relevant to whoever made the request, so they
+    go to a per-request topic instead of the resource type's topic.
+    """
+    if isinstance(event, _PROGRESS_EVENT_TYPES):
+        return constants.PROGRESS_TOPIC_NAME_TEMPLATE.format(
+            request_id=event.request_id
+        )
+    return event.resource_type.get_topic_name()
+
+
+def get_version_key(event: events.SeisLabDataEvent) -> str | None:
+    """Return the key of the version counter that an event bumps, if any.
+
+    Each resource type has a version counter, which is incremented whenever a
+    resource of that type is successfully modified. Cached fragments include
+    the versions of the resource types they show in their keys, which means
+    they stop being used as soon as any of those resources change.
+    """
+    if isinstance(event, _PROGRESS_EVENT_TYPES) or not event.succeeded:
+        return None
+    return constants.RESOURCE_VERSION_KEY_TEMPLATE.format(
+        resource_type=event.resource_type.value
+    )
+
+
 class RedisEventDispatcher:
+    """Publish events on redis pub/sub channels, one channel per resource type.
+
+    Before an event is published, the version counter of its resource type is
+    bumped, which ensures subscribers reacting to the event never get served
+    a stale cached fragment.
+    """
+
     def __init__(self, redis_client: aioredis.Redis) -> None:
         self._redis = redis_client
 
     async def __call__(self, event: events.SeisLabDataEvent) -> None:
         logger.debug(f"received event {event=}")
-        match event:
-            case events.ResourceModificationEvent():
-                await self._redis.publish(
-                    channel=event.resource_type.get_topic_name(),
-                    message=messages.ResourceModificationMessage(
-                        resource_type=event.resource_type,
-                        request_id=event.request_id,
-                        resource_id=event.resource_id,
-                        parent_resource_id=event.parent_resource_id,
-                        modification=event.modification,
-                        succeeded=event.succeeded,
-                        details=event.details,
-                    ).model_dump_json(),
-                )
-            case events.BulkResourceModificationEvent():
-                await self._redis.publish(
-                    channel=event.resource_type.get_topic_name(),
-                    message=messages.BulkResourceModificationMessage(
-                        request_id=event.request_id,
-                        resource_type=event.resource_type,
-                        modification=event.modification,
-                        succeeded=event.succeeded,
-                        affected_count=event.affected_count,
-                        details=event.details,
-                    ).model_dump_json(),
-                )
-            case events.ResourceStatusChangedEvent():
-                await self._redis.publish(
-                    channel=event.resource_type.get_topic_name(),
-                    message=messages.ResourceStatusChangedMessage(
-                        request_id=event.request_id,
-                        resource_type=event.resource_type,
-                        resource_id=event.resource_id,
-                        succeeded=event.succeeded,
-                        new_status=event.new_status,
-                        details=event.details,
-                    ).model_dump_json(),
-                )
-            case events.DiscoveryEvent():
-                await self._redis.publish(
-                    channel=event.resource_type.get_topic_name(),
-                    message=messages.DiscoveryMessage(
-                        resource_type=event.resource_type,
-                        resource_id=event.resource_id,
-                        request_id=event.request_id,
-                        modification=event.modification,
-                        succeeded=event.succeeded,
-                        details=event.details,
-                    ).model_dump_json(),
-                )
-            case events.ValidationEvent():
-                await self._redis.publish(
-                    channel=event.resource_type.get_topic_name(),
-                    message=messages.ValidationMessage(
-                        resource_type=event.resource_type,
-                        resource_id=event.resource_id,
-                        request_id=event.request_id,
-                        modification=event.modification,
-                        succeeded=event.succeeded,
-                        is_valid=event.is_valid,
-                        details=event.details,
-                    ).model_dump_json(),
-                )
-            case _:
-                logger.debug(f"no Redis dispatch configured for {event=}")
+        if (message := build_message(event)) is None:
+            logger.debug(f"no Redis dispatch configured for {event=}")
+            return
+        if (version_key := get_version_key(event)) is not None:
+            await self._redis.incr(version_key)
+        await self._publish(get_topic_name(event), message.model_dump_json())
+
+    def pipeline(self) -> Pipeline:
+        return self._redis.pipeline(transaction=False)
+
+    async def _publish(self, topic_name: str, payload: str) -> None:
+        await self._redis.publish(channel=topic_name, message=payload)
+
+    def queue_publish(self, pipeline: Pipeline, topic_name: str, payload: str) -> None:
+        pipeline.publish(channel=topic_name, message=payload)
+
+
+def is_progress_topic(topic_name: str) -> bool:
+    return topic_name.startswith(
+        constants.PROGRESS_TOPIC_NAME_TEMPLATE.format(request_id="")
+    )
+
+
+class RedisStreamEventDispatcher(RedisEventDispatcher):
+    """Append events to capped redis streams, one stream per resource type.
+
+    Contrary to pub/sub, stream entries outlive the moment they are published,
+    which means subscribers are able to catch up on events that were dispatched
+    before they started listening - see `subscribers.open_topic_stream()`.
+    Streams are trimmed approximately, which lets redis trim whole
+    macro nodes and is much cheaper than exact trimming.
+
+    Progress reports go to a new stream for each request, so these streams are
+    kept shorter and expire once their request has gone quiet for
+    `progress_ttl_seconds`.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        max_length: int,
+        progress_max_length: int = 1_000,
+        progress_ttl_seconds: int = 24 * 60 * 60,
+    ) -> None:
+        super().__init__(redis_client)
+        self._max_length = max_length
+        self._progress_max_length = progress_max_length
+        self._progress_ttl_seconds = progress_ttl_seconds
+
+    async def _publish(self, topic_name: str, payload: str) -> None:
+        if is_progress_topic(topic_name):
+            pipeline = self.pipeline()
+            self.queue_publish(pipeline, topic_name, payload)
+            await pipeline.execute()
+        else:
+            await self._redis.xadd(**self._get_xadd_kwargs(topic_name, payload))
+
+    def queue_publish(self, pipeline: Pipeline, topic_name: str, payload: str) -> None:
+        xadd_kwargs = self._get_xadd_kwargs(topic_name, payload)
+        pipeline.xadd(**xadd_kwargs)
+        if is_progress_topic(topic_name):
+            pipeline.expire(xadd_kwargs["name"], self._progress_ttl_seconds)
+
+    def _get_xadd_kwargs(self, topic_name: str, payload: str) -> dict:
+        return {
+            "name": constants.EVENT_STREAM_NAME_TEMPLATE.format(topic_name=topic_name),
+            "fields": {"data": payload},
+            "maxlen": (
+                self._progress_max_length
+                if is_progress_topic(topic_name)
+                else self._max_length
+            ),
+            "approximate": True,
+        }
+
+
+@dataclasses.dataclass
+class _EventBuffer:
+    pending: list[tuple[str, str, str | None]] = dataclasses.field(default_factory=list)
+    lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
+    flush_timer: asyncio.Task | None = None
+
+
+class BatchingEventDispatcher:
+    """Buffer events and send them to redis in pipelined batches.
+
+    Events are buffered separately for each asyncio task - which, in a dramatiq
+    worker, means for each message being processed. A task's buffer is sent
+    whenever it holds ``max_size`` events, ``max_delay_seconds`` after its
+    oldest pending event was buffered, or when ``flush()`` is called, whichever
+    comes first. Events are always sent in the order in which they were
+    dispatched by the task.
+
+    Callers must ``await flush()`` once they are done, otherwise the last events
+    may be lost if the event loop stops before the delayed send happens.
+    """
+
+    def __init__(
+        self,
+        dispatcher: RedisEventDispatcher,
+        max_size: int,
+        max_delay_seconds: float,
+    ) -> None:
+        self._dispatcher = dispatcher
+        self._max_size = max_size
+        self._max_delay_seconds = max_delay_seconds
+        self._buffers: weakref.WeakKeyDictionary[asyncio.Task, _EventBuffer] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def __call__(self, event: events.SeisLabDataEvent) -> None:
+        logger.debug(f"received event {event=}")
+        if (message := build_message(event)) is None:
+            logger.debug(f"no Redis dispatch configured for {event=}")
+            return
+        buffer = self._buffers.setdefault(asyncio.current_task(), _EventBuffer())
+        buffer.pending.append(
+            (get_topic_name(event), message.model_dump_json(), get_version_key(event))
+        )
+        if len(buffer.pending) >= self._max_size:
+            await self._send(buffer)
+        elif buffer.flush_timer is None:
+            buffer.flush_timer = asyncio.create_task(self._send_later(buffer))
+
+    async def flush(self) -> None:
+        """Send all events that are buffered for the current task."""
+        if (buffer := self._buffers.pop(asyncio.current_task(), None)) is None:
+            return
+        if buffer.flush_timer is not None:
+            buffer.flush_timer.cancel()
+            buffer.flush_timer = None
+        await self._send(buffer)
+
+    async def _send_later(self, buffer: _EventBuffer) -> None:
+        await asyncio.sleep(self._max_delay_seconds)
+        buffer.flush_timer = None
+        await self._send(buffer)
+
+    async def _send(self, buffer: _EventBuffer) -> None:
+        async with buffer.lock:
+            to_send, buffer.pending = buffer.pending, []
+            if not to_send:
+                return
+            pipeline = self._dispatcher.pipeline()
+            for topic_name, payload, version_key in to_send:
+                if version_key is not None:
+                    pipeline.incr(version_key)
+                self._dispatcher.queue_publish(pipeline, topic_name, payload)
+            await pipeline.execute()
+            logger.debug(f"sent a batch of {len(to_send)} events")
+
+
+async def flush_pending_events(dispatcher: EventDispatcherProtocol) -> None:
+    """Send any events that the dispatcher may be holding on to."""
+    if isinstance(dispatcher, BatchingEventDispatcher):
+        await dispatcher.flush()
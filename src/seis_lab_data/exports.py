@@ -0,0 +1,189 @@
+import csv
+import datetime as dt
+import enum
+import io
+import json
+import logging
+import uuid
+from collections.abc import (
+    AsyncIterator,
+    Mapping,
+    Sequence,
+)
+from typing import Final
+
+import shapely
+
+from .constants import ExportFormat
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional, without it GeoParquet is not offered
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "name_en",
+    "name_pt",
+    "description_en",
+    "description_pt",
+    "status",
+    "survey_mission_id",
+    "survey_mission_name_en",
+    "project_id",
+    "project_name_en",
+    "dataset_category_en",
+    "workflow_stage_en",
+    "temporal_extent_begin",
+    "temporal_extent_end",
+    "bbox_4326",
+)
+GEOMETRY_COLUMN: Final[str] = "bbox_4326"
+
+MEDIA_TYPES: Final[dict[ExportFormat, str]] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.GEOPARQUET: "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS: Final[dict[ExportFormat, str]] = {
+    ExportFormat.NDJSON: "ndjson",
+    ExportFormat.CSV: "csv",
+    ExportFormat.GEOPARQUET: "parquet",
+}
+
+ExportBatches = AsyncIterator[Sequence[Mapping]]
+
+
+def get_available_formats() -> list[ExportFormat]:
+    return [
+        f for f in ExportFormat if f != ExportFormat.GEOPARQUET or pyarrow is not None
+    ]
+
+
+def _get_text_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (uuid.UUID, dt.date)):
+        return str(value)
+    return value
+
+
+def _get_text_row(row: Mapping) -> dict:
+    """Convert an exported row to plain values, with its geometry as WKT."""
+    result = {name: _get_text_value(row[name]) for name in EXPORT_COLUMNS}
+    if (wkb := row[GEOMETRY_COLUMN]) is not None:
+        result[GEOMETRY_COLUMN] = shapely.from_wkb(bytes(wkb)).wkt
+    return result
+
+
+async def serialize_as_ndjson(batches: ExportBatches) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps(_get_text_row(row), ensure_ascii=False) + "\n" for row in batch
+        ).encode("utf-8")
+
+
+async def serialize_as_csv(batches: ExportBatches) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(_get_text_row(row) for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if remaining := buffer.getvalue():
+        yield remaining.encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only file that hands over what has been written to it so far.
+
+    Parquet writers rely on the position of the file they write to, which is
+    why this keeps track of it instead of being a rewound `BytesIO`.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        drained = b"".join(self._chunks)
+        self._chunks.clear()
+        return drained
+
+
+def _get_geoparquet_schema():
+    geo_metadata = {
+        "version": "1.1.0",
+        "primary_column": GEOMETRY_COLUMN,
+        "columns": {
+            # without a `crs`, coordinates are longitude/latitude on WGS84
+            GEOMETRY_COLUMN: {"encoding": "WKB", "geometry_types": ["Polygon"]},
+        },
+    }
+    return pyarrow.schema(
+        [
+            (
+                name,
+                {
+                    "temporal_extent_begin": pyarrow.date32(),
+                    "temporal_extent_end": pyarrow.date32(),
+                    GEOMETRY_COLUMN: pyarrow.binary(),
+                }.get(name, pyarrow.string()),
+            )
+            for name in EXPORT_COLUMNS
+        ],
+        metadata={"geo": json.dumps(geo_metadata)},
+    )
+
+
+def _get_parquet_value(name: str, value):
+    if value is None or isinstance(value, dt.date):
+        return value
+    if name == GEOMETRY_COLUMN:
+        return bytes(value)
+    return _get_text_value(value)
+
+
+async def serialize_as_geoparquet(batches: ExportBatches) -> AsyncIterator[bytes]:
+    """Write each batch as a row group, handing over the bytes as they are written."""
+    if pyarrow is None:
+        raise RuntimeError("GeoParquet exports need pyarrow to be installed")
+    schema = _get_geoparquet_schema()
+    sink = _ChunkSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        async for batch in batches:
+            columns = {
+                name: [_get_parquet_value(name, row[name]) for row in batch]
+                for name in EXPORT_COLUMNS
+            }
+            writer.write_table(pyarrow.table(columns, schema=schema))
+            if chunk := sink.drain():
+                yield chunk
+    yield sink.drain()
+
+
+def serialize(
+    export_format: ExportFormat, batches: ExportBatches
+) -> AsyncIterator[bytes]:
+    return {
+        ExportFormat.NDJSON: serialize_as_ndjson,
+        ExportFormat.CSV: serialize_as_csv,
+        ExportFormat.GEOPARQUET: serialize_as_geoparquet,
+    }[export_format](batches)
@@ -33,6 +33,17 @@ class GeospatialItemWithBoundingBox(typing.Protocol):
     def model_dump(self, exclude: set[str], **kwargs) -> dict: ...
 
 
+def get_map_bbox(item: GeospatialItemWithBoundingBox) -> shapely.Polygon | None:
+    """Return the bbox to show an item with on a map.
+
+    Projects and survey missions without a hand-edited bbox are shown with the
+    extent of their records instead, if they have any.
+    """
+    if item.bbox_4326 is not None:
+        return item.bbox_4326
+    return getattr(item, "records_bbox_4326", None)
+
+
 def to_feature_collection(
     items: list[GeospatialItemWithBoundingBox],
 ) -> GeoJsonFeatureCollection:
@@ -42,8 +53,8 @@ def to_feature_collection(
             id=str(item.id),
             type="Feature",
             geometry=(
-                GeoJsonPolygonGeometry(**(item.bbox_4326.__geo_interface__))
-                if item.bbox_4326
+                GeoJsonPolygonGeometry(**map_bbox.__geo_interface__)
+                if (map_bbox := get_map_bbox(item)) is not None
                 else None
             ),
             properties={
@@ -51,6 +62,7 @@ def to_feature_collection(
                     exclude={
                         "id",
                         "bbox_4326",
+                        "records_bbox_4326",
                     }
                 ),
             },
@@ -0,0 +1,166 @@
+import dataclasses
+import datetime as dt
+import json
+import logging
+import math
+import subprocess
+import time
+from collections import defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestSample:
+    route: str
+    duration_seconds: float
+    succeeded: bool
+
+
+class LoadTestRecorder:
+    """Collect the outcome of every request made during a load test."""
+
+    def __init__(self) -> None:
+        self.samples: list[RequestSample] = []
+        self._started_at = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self._started_at
+
+    def record(self, route: str, duration_seconds: float, succeeded: bool) -> None:
+        self.samples.append(RequestSample(route, duration_seconds, succeeded))
+
+
+@dataclasses.dataclass(frozen=True)
+class RouteStats:
+    route: str
+    num_requests: int
+    num_errors: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.num_errors / self.num_requests if self.num_requests else 0.0
+
+
+def get_percentile(sorted_values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize_samples(
+    samples: list[RequestSample], elapsed_seconds: float
+) -> list[RouteStats]:
+    """Compute per-route latency percentiles, throughput and error counts."""
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+    summary = []
+    for route, route_samples in sorted(by_route.items()):
+        durations = sorted(s.duration_seconds * 1000 for s in route_samples)
+        summary.append(
+            RouteStats(
+                route=route,
+                num_requests=len(route_samples),
+                num_errors=sum(1 for s in route_samples if not s.succeeded),
+                requests_per_second=(
+                    len(route_samples) / elapsed_seconds if elapsed_seconds else 0.0
+                ),
+                p50_ms=get_percentile(durations, 0.5),
+                p95_ms=get_percentile(durations, 0.95),
+                p99_ms=get_percentile(durations, 0.99),
+            )
+        )
+    return summary
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadTestRun:
+    scenario: str
+    base_url: str
+    commit: str
+    started_at: dt.datetime
+    duration_seconds: float
+    options: dict
+    routes: list[RouteStats]
+
+    def get_file_name(self) -> str:
+        return f"{self.started_at:%Y%m%dT%H%M%S}-{self.scenario}-{self.commit}.json"
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                **dataclasses.asdict(self),
+                "started_at": self.started_at.isoformat(),
+            },
+            indent=2,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "LoadTestRun":
+        parsed = json.loads(raw)
+        return cls(
+            **{
+                **parsed,
+                "started_at": dt.datetime.fromisoformat(parsed["started_at"]),
+                "routes": [RouteStats(**r) for r in parsed["routes"]],
+            }
+        )
+
+    def save(self, results_dir: Path) -> Path:
+        results_dir.mkdir(parents=True, exist_ok=True)
+        target = results_dir / self.get_file_name()
+        target.write_text(self.to_json())
+        return target
+
+
+def get_current_commit() -> str:
+    """Return the short hash of the checked out git commit, if there is one."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        logger.debug("Could not find out the current git commit")
+        return "unknown"
+    return completed.stdout.strip()
+
+
+@dataclasses.dataclass(frozen=True)
+class RouteComparison:
+    route: str
+    baseline: RouteStats | None
+    candidate: RouteStats | None
+
+    @property
+    def p95_change(self) -> float | None:
+        """Relative change of the 95th percentile latency, e.g. 0.1 means 10% slower."""
+        if self.baseline is None or self.candidate is None or not self.baseline.p95_ms:
+            return None
+        return self.candidate.p95_ms / self.baseline.p95_ms - 1
+
+
+def compare_runs(
+    baseline: LoadTestRun, candidate: LoadTestRun
+) -> list[RouteComparison]:
+    baseline_routes = {r.route: r for r in baseline.routes}
+    candidate_routes = {r.route: r for r in candidate.routes}
+    return [
+        RouteComparison(
+            route=route,
+            baseline=baseline_routes.get(route),
+            candidate=candidate_routes.get(route),
+        )
+        for route in sorted(baseline_routes.keys() | candidate_routes.keys())
+    ]
@@ -0,0 +1,390 @@
+"""Scripted browsing scenarios to be run against a live instance of the web app.
+
+Each scenario drives a number of concurrent virtual users for a fixed duration
+and records every request they make, labelled with its route rather than with
+its URL, so that e.g. all detail pages are aggregated together.
+"""
+
+import asyncio
+import dataclasses
+import enum
+import html
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from collections.abc import Callable
+from html.parser import HTMLParser
+
+import httpx
+
+from ..cliapp.sampledata import PORTUGUESE_EEZ_REGIONS
+from .results import LoadTestRecorder
+
+logger = logging.getLogger(__name__)
+
+_RECORD_ID_PATTERN = re.compile(
+    r"/survey-related-records/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+)
+_CSRF_TOKEN_PATTERN = re.compile(r"'X-CSRFToken':\s*'([^']+)'")
+_SEARCH_TERMS = ("survey", "bathymetry", "seismic", "raw", "processed", "mission")
+
+
+class LoadTestScenario(str, enum.Enum):
+    ANONYMOUS_BROWSING = "anonymous-browsing"
+    EDITOR_BULK_UPDATE = "editor-bulk-update"
+    IDLE_SSE_LISTENERS = "idle-sse-listeners"
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadTestOptions:
+    base_url: str
+    duration_seconds: float
+    num_users: int
+    think_time_seconds: float
+    seed: int
+    session_cookie: str | None = None
+    survey_mission_id: str | None = None
+    num_sse_listeners: int = 500
+    bulk_update_timeout_seconds: float = 300
+
+
+class LoadTestClient:
+    """An HTTP client that records the latency and outcome of its requests."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: LoadTestRecorder) -> None:
+        self.client = client
+        self.recorder = recorder
+
+    async def request(
+        self, method: str, url: str, route: str, **kwargs
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as err:
+            logger.debug(f"{method} {url} failed: {err}")
+            self.recorder.record(
+                f"{method} {route}", time.perf_counter() - started, False
+            )
+            return None
+        self.recorder.record(
+            f"{method} {route}",
+            time.perf_counter() - started,
+            response.status_code < 400,
+        )
+        return response
+
+    async def listen(
+        self,
+        url: str,
+        route: str,
+        stop: asyncio.Event,
+        on_line: Callable[[str], None] | None = None,
+    ) -> None:
+        """Keep an SSE connection open until `stop` is set.
+
+        The recorded latency is the time it took to get the response headers.
+        A connection counts as failed if it is refused or if it is closed
+        before `stop` is set.
+        """
+        started = time.perf_counter()
+        time_to_headers = None
+        succeeded = False
+
+        async def read_lines(response: httpx.Response) -> None:
+            async for line in response.aiter_lines():
+                if on_line is not None:
+                    on_line(line)
+
+        try:
+            async with self.client.stream(
+                "GET", url, timeout=httpx.Timeout(30, read=None)
+            ) as response:
+                time_to_headers = time.perf_counter() - started
+                if response.status_code < 400:
+                    reader = asyncio.create_task(read_lines(response))
+                    stopped = asyncio.create_task(stop.wait())
+                    done, pending = await asyncio.wait(
+                        (reader, stopped), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in pending:
+                        task.cancel()
+                    if reader in done and (error := reader.exception()) is not None:
+                        logger.debug(f"SSE connection to {url} failed: {error}")
+                    succeeded = stopped in done
+        except httpx.HTTPError as err:
+            logger.debug(f"Could not connect to {url}: {err}")
+        self.recorder.record(
+            f"GET {route}",
+            time_to_headers
+            if time_to_headers is not None
+            else time.perf_counter() - started,
+            succeeded,
+        )
+
+
+class _FormFieldParser(HTMLParser):
+    """Collect the default values of a rendered form's fields."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.values: dict[str, str] = {}
+        self._current_select: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        if tag == "input" and (name := attributes.get("name")):
+            if attributes.get("type") == "checkbox" and "checked" not in attributes:
+                return
+            self.values.setdefault(name, attributes.get("value") or "")
+        elif tag == "select":
+            self._current_select = attributes.get("name")
+        elif tag == "option" and self._current_select:
+            if value := attributes.get("value"):
+                self.values.setdefault(self._current_select, value)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "select":
+            self._current_select = None
+
+
+def get_form_values(rendered: str) -> dict[str, str]:
+    parser = _FormFieldParser()
+    parser.feed(rendered)
+    return parser.values
+
+
+def get_csrf_token(rendered: str) -> str | None:
+    if match := _CSRF_TOKEN_PATTERN.search(rendered):
+        return html.unescape(match.group(1))
+    return None
+
+
+def get_record_ids(rendered: str) -> list[str]:
+    return list(dict.fromkeys(_RECORD_ID_PATTERN.findall(rendered)))
+
+
+def get_random_search_params(rng: random.Random) -> dict:
+    """Build the signals sent by the records list page when filtering it.
+
+    Map updates are simulated by searching within a random bounding box
+    around the Portuguese exclusive economic zone.
+    """
+    params = {}
+    if rng.random() < 0.5:
+        params["search"] = rng.choice(_SEARCH_TERMS)
+    if rng.random() < 0.7:
+        regions, weights = zip(*PORTUGUESE_EEZ_REGIONS)
+        min_lon, min_lat, max_lon, max_lat = rng.choices(regions, weights=weights)[0]
+        lon = rng.uniform(min_lon, max_lon)
+        lat = rng.uniform(min_lat, max_lat)
+        size = rng.uniform(0.2, 3)
+        params.update(
+            minLon=lon - size / 2,
+            minLat=lat - size / 2,
+            maxLon=lon + size / 2,
+            maxLat=lat + size / 2,
+        )
+    if rng.random() < 0.3:
+        begin_year = rng.randint(2000, 2024)
+        params.update(
+            temporalExtentBegin=f"{begin_year}-01-01",
+            temporalExtentEnd=f"{rng.randint(begin_year, 2025)}-12-31",
+        )
+    return params
+
+
+async def _think(rng: random.Random, options: LoadTestOptions) -> None:
+    if options.think_time_seconds:
+        await asyncio.sleep(rng.uniform(0, 2 * options.think_time_seconds))
+
+
+async def browse_anonymously(
+    client: LoadTestClient,
+    options: LoadTestOptions,
+    rng: random.Random,
+    deadline: float,
+) -> None:
+    """Browse published records - list pages, filters, map updates and details."""
+    known_record_ids: list[str] = []
+    while time.perf_counter() < deadline:
+        await client.request("GET", "/", "/")
+        await _think(rng, options)
+        await client.request(
+            "GET", "/survey-related-records/", "/survey-related-records/"
+        )
+        for _ in range(rng.randint(1, 4)):
+            response = await client.request(
+                "GET",
+                "/survey-related-records/search",
+                "/survey-related-records/search",
+                params={
+                    "datastar": json.dumps(get_random_search_params(rng)),
+                    "page": rng.choice((1, 1, 1, 2)),
+                },
+            )
+            if response is not None and response.status_code == 200:
+                known_record_ids = get_record_ids(response.text) or known_record_ids
+            await _think(rng, options)
+        if known_record_ids:
+            await client.request(
+                "GET",
+                f"/survey-related-records/{rng.choice(known_record_ids)}",
+                "/survey-related-records/{survey_related_record_id}",
+            )
+            await _think(rng, options)
+
+
+async def bulk_update_as_editor(
+    client: LoadTestClient,
+    options: LoadTestOptions,
+    rng: random.Random,
+    deadline: float,
+) -> None:
+    """Repeatedly bulk update all records of a survey mission.
+
+    Besides the requests themselves, the time between submitting each bulk
+    update and being notified of its completion is recorded.
+    """
+    mission_url = f"/survey-missions/{options.survey_mission_id}"
+    mission_route = "/survey-missions/{survey_mission_id}"
+    while time.perf_counter() < deadline:
+        await client.request("GET", mission_url, mission_route)
+        form_response = await client.request(
+            "GET",
+            f"{mission_url}/records/bulk-update",
+            f"{mission_route}/records/bulk-update",
+            params={"selection": json.dumps({"selectAllMatching": True})},
+        )
+        if form_response is None or form_response.status_code != 200:
+            await _think(rng, options)
+            continue
+        form_values = get_form_values(form_response.text)
+        request_id = form_values.get("request_id", str(uuid.uuid4()))
+        completed = asyncio.Event()
+
+        def check_completion(line: str) -> None:
+            # completion is signalled by redirecting back to the mission
+            if "window.location" in line:
+                completed.set()
+
+        listener = asyncio.create_task(
+            client.listen(
+                f"{mission_url}/records/bulk-update/stream/{request_id}",
+                f"{mission_route}/records/bulk-update/stream/{{request_id}}",
+                completed,
+                on_line=check_completion,
+            )
+        )
+        submitted = time.perf_counter()
+        response = await client.request(
+            "POST",
+            f"{mission_url}/records/bulk-update",
+            f"{mission_route}/records/bulk-update",
+            data={
+                **form_values,
+                "update_workflow_stage": "y",
+            },
+            headers={"X-CSRFToken": get_csrf_token(form_response.text) or ""},
+        )
+        if response is not None and response.status_code == 200:
+            try:
+                await asyncio.wait_for(
+                    completed.wait(), timeout=options.bulk_update_timeout_seconds
+                )
+            except TimeoutError:
+                logger.debug(f"Bulk update {request_id} did not finish in time")
+            client.recorder.record(
+                "bulk update completion",
+                time.perf_counter() - submitted,
+                completed.is_set(),
+            )
+        completed.set()
+        await listener
+        await _think(rng, options)
+
+
+async def trigger_discovery(
+    client: LoadTestClient, options: LoadTestOptions, request_id: str
+) -> None:
+    mission_url = f"/survey-missions/{options.survey_mission_id}"
+    mission_route = "/survey-missions/{survey_mission_id}"
+    details = await client.request(
+        "GET", f"{mission_url}/details", f"{mission_route}/details"
+    )
+    if details is None or (csrf_token := get_csrf_token(details.text)) is None:
+        logger.warning("Could not find out how to trigger discovery, skipping it")
+        return
+    await client.request(
+        "POST",
+        f"{mission_url}/discover/{request_id}",
+        f"{mission_route}/discover/{{request_id}}",
+        headers={"X-CSRFToken": csrf_token},
+    )
+
+
+async def run_scenario(
+    scenario: LoadTestScenario,
+    options: LoadTestOptions,
+    recorder: LoadTestRecorder,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> None:
+    """Run a scenario until its duration is over.
+
+    All scenarios include anonymous browsing, so that the effect of editors
+    and idle listeners on regular visitors can be measured.
+    """
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    deadline = time.perf_counter() + options.duration_seconds
+    async with (
+        httpx.AsyncClient(
+            base_url=options.base_url, limits=limits, transport=transport, timeout=30
+        ) as anonymous_client,
+        httpx.AsyncClient(
+            base_url=options.base_url,
+            limits=limits,
+            transport=transport,
+            timeout=30,
+            cookies=(
+                {"session": options.session_cookie} if options.session_cookie else None
+            ),
+        ) as editor_client,
+    ):
+        anonymous = LoadTestClient(anonymous_client, recorder)
+        editor = LoadTestClient(editor_client, recorder)
+        tasks = [
+            browse_anonymously(
+                anonymous, options, random.Random(f"{options.seed}-{index}"), deadline
+            )
+            for index in range(options.num_users)
+        ]
+        if scenario == LoadTestScenario.EDITOR_BULK_UPDATE:
+            tasks.append(
+                bulk_update_as_editor(
+                    editor, options, random.Random(f"{options.seed}-editor"), deadline
+                )
+            )
+        stop_listening = asyncio.Event()
+        if scenario == LoadTestScenario.IDLE_SSE_LISTENERS:
+            # all listeners follow the same discovery, as if they had all
+            # opened the page of the mission that is being discovered
+            request_id = str(uuid.uuid4())
+            tasks.extend(
+                anonymous.listen(
+                    f"/survey-missions/{options.survey_mission_id}/stream/{request_id}",
+                    "/survey-missions/{survey_mission_id}/stream/{request_id}",
+                    stop_listening,
+                )
+                for _ in range(options.num_sse_listeners)
+            )
+            if options.session_cookie:
+                tasks.append(trigger_discovery(editor, options, request_id))
+
+        async def stop_when_done() -> None:
+            await asyncio.sleep(max(deadline - time.perf_counter(), 0))
+            stop_listening.set()
+
+        await asyncio.gather(stop_when_done(), *tasks)
@@ -0,0 +1,59 @@
+"""added name search text columns
+
+Revision ID: 8f2d4b6a1c3e
+Revises: 3c9e1f7a2b6d
+Create Date: 2026-10-19 10:15:42.118734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2d4b6a1c3e"
+down_revision: Union[str, Sequence[str], None] = "3c9e1f7a2b6d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce(name ->> 'en', '') || ' ' || coalesce(name ->> 'pt', ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table_name in ("project", "surveymission"):
+        op.add_column(
+            table_name,
+            sa.Column(
+                "search_text",
+                sa.Text(),
+                sa.Computed(_SEARCH_TEXT_EXPRESSION),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"idx_{table_name}_search_text_trgm",
+            table_name,
+            ["search_text"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ("surveymission", "project"):
+        op.drop_index(
+            f"idx_{table_name}_search_text_trgm",
+            table_name=table_name,
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+        op.drop_column(table_name, "search_text")
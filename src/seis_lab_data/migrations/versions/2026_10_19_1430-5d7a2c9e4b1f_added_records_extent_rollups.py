@@ -0,0 +1,81 @@
+"""added records extent rollups
+
+Revision ID: 5d7a2c9e4b1f
+Revises: 8f2d4b6a1c3e
+Create Date: 2026-10-19 14:30:08.402117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa
+from geoalchemy2 import Geometry
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d7a2c9e4b1f"
+down_revision: Union[str, Sequence[str], None] = "8f2d4b6a1c3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in ("project", "surveymission"):
+        op.add_column(
+            table_name,
+            sa.Column(
+                "records_bbox_4326",
+                Geometry(
+                    geometry_type="GEOMETRY",
+                    srid=4326,
+                    dimension=2,
+                    spatial_index=False,
+                    from_text="ST_GeomFromEWKT",
+                    name="geometry",
+                ),
+                nullable=True,
+            ),
+        )
+        op.add_column(
+            table_name,
+            sa.Column("records_temporal_extent_begin", sa.Date(), nullable=True),
+        )
+        op.add_column(
+            table_name,
+            sa.Column("records_temporal_extent_end", sa.Date(), nullable=True),
+        )
+        op.add_column(
+            table_name,
+            sa.Column(
+                "records_extent_is_dirty",
+                sa.Boolean(),
+                server_default="false",
+                nullable=False,
+            ),
+        )
+        op.create_index(
+            f"idx_{table_name}_records_extent_dirty",
+            table_name,
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("records_extent_is_dirty"),
+        )
+        # existing extents are computed by the next reconciliation
+        op.execute(f"UPDATE {table_name} SET records_extent_is_dirty = true")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ("surveymission", "project"):
+        op.drop_index(
+            f"idx_{table_name}_records_extent_dirty",
+            table_name=table_name,
+            postgresql_where=sa.text("records_extent_is_dirty"),
+        )
+        op.drop_column(table_name, "records_extent_is_dirty")
+        op.drop_column(table_name, "records_temporal_extent_end")
+        op.drop_column(table_name, "records_temporal_extent_begin")
+        op.drop_column(table_name, "records_bbox_4326")
@@ -0,0 +1,39 @@
+"""added failed discovery job status
+
+Revision ID: c81f5a3d9e02
+Revises: 9b3e6d1f4a27
+Create Date: 2026-10-19 17:45:08.316254
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f5a3d9e02"
+down_revision: Union[str, Sequence[str], None] = "9b3e6d1f4a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE discoveryjobstatus ADD VALUE IF NOT EXISTS 'FAILED'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # postgres is not able to drop a value from an enum type, so the type is
+    # recreated without it, after turning failed jobs into completed ones
+    op.execute("UPDATE discoveryjob SET status = 'COMPLETED' WHERE status = 'FAILED'")
+    op.execute("ALTER TYPE discoveryjobstatus RENAME TO discoveryjobstatus_old")
+    sa.Enum("RUNNING", "COMPLETED", name="discoveryjobstatus").create(op.get_bind())
+    op.execute(
+        "ALTER TABLE discoveryjob ALTER COLUMN status TYPE discoveryjobstatus "
+        "USING status::text::discoveryjobstatus"
+    )
+    op.execute("DROP TYPE discoveryjobstatus_old")
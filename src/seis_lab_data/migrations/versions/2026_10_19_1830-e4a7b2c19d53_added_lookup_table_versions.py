@@ -0,0 +1,38 @@
+"""added lookup table versions
+
+Revision ID: e4a7b2c19d53
+Revises: c81f5a3d9e02
+Create Date: 2026-10-19 18:30:41.902375
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7b2c19d53"
+down_revision: Union[str, Sequence[str], None] = "c81f5a3d9e02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "datasetcategory",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "workflowstage",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("workflowstage", "version")
+    op.drop_column("datasetcategory", "version")
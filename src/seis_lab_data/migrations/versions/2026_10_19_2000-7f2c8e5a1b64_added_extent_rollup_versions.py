@@ -0,0 +1,38 @@
+"""added extent rollup versions
+
+Revision ID: 7f2c8e5a1b64
+Revises: e4a7b2c19d53
+Create Date: 2026-10-19 20:00:12.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f2c8e5a1b64"
+down_revision: Union[str, Sequence[str], None] = "e4a7b2c19d53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "surveymission",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "project",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("project", "version")
+    op.drop_column("surveymission", "version")
@@ -3,7 +3,10 @@ import math
 import re
 import uuid
 from collections.abc import AsyncIterator
-from typing import AsyncGenerator
+from typing import (
+    AsyncGenerator,
+    cast,
+)
 
 import shapely
 from anyio import Path, to_thread
@@ -34,6 +37,7 @@ from ..schemas import (
     surveyrelatedrecords as record_schemas,
     user as user_schemas,
 )
+from ..schemas.events import get_utc_now
 from .. import dispatch
 from ..tasks.extractors import (
     common as extractor_common,
@@ -217,6 +221,67 @@ async def run_mission_discovery(
     settings: config.SeisLabDataSettings,
     user: user_schemas.User,
 ) -> None:
+    """Discover the contents of a survey mission, processing all chunks in turn.
+
+    This runs the whole discovery job in the current task. Workers instead
+    process each chunk in a separate task - see `tasks.discovery`. Should
+    anything go wrong, the job is marked as failed and the mission's status is
+    restored before the error is raised again.
+    """
+    try:
+        chunk_ids = await plan_mission_discovery(
+            request_id=request_id,
+            mission_id=mission_id,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            settings=settings,
+            user=user,
+        )
+        for chunk_id in chunk_ids:
+            await run_discovery_chunk(
+                chunk_id=chunk_id,
+                session=session,
+                event_dispatcher=event_dispatcher,
+                settings=settings,
+                user=user,
+            )
+    except Exception as err:
+        await session.rollback()
+        await discovery_commands.fail_discovery_job(session, request_id)
+        await _end_mission_discovery(
+            request_id=request_id,
+            mission_id=mission_id,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            user=user,
+            details=str(err),
+        )
+        raise
+
+
+async def plan_mission_discovery(
+    *,
+    request_id: identifiers.RequestId,
+    mission_id: identifiers.SurveyMissionId,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    settings: config.SeisLabDataSettings,
+    user: user_schemas.User,
+) -> list[identifiers.DiscoveryChunkId]:
+    """Plan the discovery of a survey mission's contents.
+
+    The mission's directory is searched for files that match the asset
+    discovery configurations and that are not tracked yet. These are split in
+    chunks of `settings.discovery_chunk_size` files and stored as a discovery
+    job, which uses the request id as its own id. If there already is a job
+    for the request, as happens when the planner's message is redelivered after
+    a worker restart, or if the mission has a job that is still running, that
+    job is resumed rather than planned again - once the user's permission to
+    run discovery on the mission has been checked, like for a new job. A job
+    for the request that has already completed or failed is left alone.
+
+    Returns the ids of the chunks that are still pending.
+    """
     try:
         if (
             mission := await mission_queries.get_survey_mission(session, mission_id)
@@ -240,9 +305,26 @@ async def run_mission_discovery(
                 details=str(err),
             )
         )
-        return
+        return []
+
+    # permissions are checked before resuming, as the resumed chunks create
+    # records on behalf of whoever made this request
+    if (
+        discovery_job := await discovery_queries.get_discovery_job(session, request_id)
+    ) is None:
+        discovery_job = await discovery_queries.get_running_discovery_job(
+            session, mission_id
+        )
+    elif discovery_job.status != constants.DiscoveryJobStatus.RUNNING:
+        logger.debug(f"discovery job {request_id} has already finished - ignoring...")
+        return []
+    if discovery_job is not None:
+        logger.info(f"Resuming discovery job {discovery_job.id}...")
+        return await discovery_queries.collect_pending_discovery_chunk_ids(
+            session, identifiers.RequestId(discovery_job.id)
+        )
 
-    logger.debug(f"Discovering contents of mission {mission.name['en']!r}...")
+    logger.debug(f"Planning discovery of mission {mission.name['en']!r}...")
     asset_discovery_configs = (
         await discovery_queries.collect_all_asset_discovery_configurations(session)
     )
@@ -265,14 +347,12 @@ async def run_mission_discovery(
         )
     )
     try:
-        await _discover_mission_records(
-            request_id=request_id,
-            mission=mission,
-            session=session,
-            event_dispatcher=event_dispatcher,
-            settings=settings,
-            user=user,
+        candidates = await _collect_discovery_candidates(
+            mission_root_path=_get_mission_root_path(mission, settings),
             asset_discovery_configs=asset_discovery_configs,
+            tracked_paths=await asset_queries.collect_survey_mission_asset_paths(
+                session, mission_id
+            ),
         )
     except FileNotFoundError as err:
         await event_dispatcher(
@@ -286,18 +366,6 @@ async def run_mission_discovery(
                 details=str(err),
             )
         )
-    else:
-        await event_dispatcher(
-            event_schemas.DiscoveryEvent(
-                initiator=user.id,
-                resource_type=constants.ResourceType.MISSION,
-                resource_id=str(mission_id),
-                request_id=request_id,
-                modification=constants.DiscoveryStage.ENDED,
-                succeeded=True,
-            )
-        )
-    finally:
         await mission_ops.change_survey_mission_status(
             request_id=request_id,
             target_status=constants.SurveyMissionStatus.DRAFT,
@@ -306,19 +374,235 @@ async def run_mission_discovery(
             session=session,
             event_dispatcher=event_dispatcher,
         )
+        return []
+
+    chunk_size = settings.discovery_chunk_size
+    discovery_job = await discovery_commands.create_discovery_job(
+        session,
+        request_id,
+        mission_id,
+        [
+            candidates[index : index + chunk_size]
+            for index in range(0, len(candidates), chunk_size)
+        ],
+    )
+    logger.debug(
+        f"Planned discovery of {discovery_job.total_files} files in chunks "
+        f"of {chunk_size}"
+    )
+    await _report_discovery_progress(discovery_job, event_dispatcher, user)
+    if discovery_job.total_files == 0 and await discovery_commands.finish_discovery_job(
+        session, request_id
+    ):
+        await _end_mission_discovery(
+            request_id=request_id,
+            mission_id=mission_id,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            user=user,
+        )
+    return await discovery_queries.collect_pending_discovery_chunk_ids(
+        session, request_id
+    )
 
 
-async def _discover_mission_records(
+async def run_discovery_chunk(
     *,
-    request_id: identifiers.RequestId,
-    mission: models.SurveyMission,
+    chunk_id: identifiers.DiscoveryChunkId,
     session: AsyncSession,
     event_dispatcher: dispatch.EventDispatcherProtocol,
     settings: config.SeisLabDataSettings,
     user: user_schemas.User,
-    asset_discovery_configs: list[models.AssetDiscoveryConfiguration],
 ) -> None:
-    mission_root_path = Path(
+    """Create a record for each file of a discovery chunk.
+
+    Completed chunks, as well as chunks of jobs that are no longer running,
+    are ignored and files that are already tracked are skipped, which makes it
+    safe to run a chunk again after an interruption. Whoever completes the
+    job's last chunk also ends the discovery.
+    """
+    if (
+        chunk := await discovery_queries.get_discovery_chunk(session, chunk_id)
+    ) is None or chunk.status == constants.DiscoveryChunkStatus.COMPLETED:
+        logger.debug(f"discovery chunk {chunk_id} is gone or completed - ignoring...")
+        return
+    request_id = identifiers.RequestId(chunk.job_id)
+    discovery_job = cast(
+        models.DiscoveryJob,
+        await discovery_queries.get_discovery_job(session, request_id),
+    )
+    if discovery_job.status != constants.DiscoveryJobStatus.RUNNING:
+        logger.debug(f"discovery job {request_id} is no longer running - ignoring...")
+        return
+    mission_id = identifiers.SurveyMissionId(discovery_job.survey_mission_id)
+    mission = cast(
+        models.SurveyMission,
+        await mission_queries.get_survey_mission(session, mission_id),
+    )
+    mission_root_path = _get_mission_root_path(mission, settings)
+    asset_discovery_configs = {
+        str(conf.id): conf
+        for conf in await discovery_queries.collect_all_asset_discovery_configurations(
+            session
+        )
+    }
+    files_extracted = 0
+    files_failed = 0
+    for candidate in chunk.candidates:
+        relative_file_path = candidate["relative_path"]
+        if (
+            await asset_queries.get_record_asset_by_file_path(
+                session, relative_file_path, mission_id
+            )
+        ) is not None:
+            logger.debug(
+                f"file {relative_file_path!r} is already tracked in the DB - ignoring..."
+            )
+            continue
+        if (
+            asset_discovery_conf := asset_discovery_configs.get(
+                candidate["asset_discovery_configuration_id"]
+            )
+        ) is None:
+            logger.warning(
+                "Asset discovery configuration for %s no longer exists",
+                relative_file_path,
+            )
+            files_failed += 1
+            continue
+        if await _discover_record(
+            request_id=request_id,
+            mission=mission,
+            found_path=mission_root_path / relative_file_path,
+            relative_file_path=relative_file_path,
+            asset_discovery_conf=asset_discovery_conf,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            user=user,
+        ):
+            files_extracted += 1
+        else:
+            files_failed += 1
+
+    if (
+        updated_job := await discovery_commands.complete_discovery_chunk(
+            session,
+            chunk,
+            files_seen=len(chunk.candidates),
+            files_extracted=files_extracted,
+            files_failed=files_failed,
+        )
+    ) is None:
+        logger.debug(f"discovery chunk {chunk_id} was completed by another run")
+        return
+    await _report_discovery_progress(updated_job, event_dispatcher, user)
+    if await discovery_commands.finish_discovery_job(session, request_id):
+        await _end_mission_discovery(
+            request_id=request_id,
+            mission_id=mission_id,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            user=user,
+        )
+
+
+async def fail_discovery_chunk(
+    *,
+    chunk_id: identifiers.DiscoveryChunkId,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    user: user_schemas.User,
+    details: str,
+) -> None:
+    """Fail the discovery job of a chunk that could not be processed.
+
+    This is called once a chunk has run out of retries. Its job is marked as
+    failed, which makes any of the job's chunks that are still queued be
+    ignored, and the mission's status is restored.
+    """
+    if (
+        chunk := await discovery_queries.get_discovery_chunk(session, chunk_id)
+    ) is None:
+        logger.debug(f"discovery chunk {chunk_id} is gone - ignoring...")
+        return
+    request_id = identifiers.RequestId(chunk.job_id)
+    discovery_job = cast(
+        models.DiscoveryJob,
+        await discovery_queries.get_discovery_job(session, request_id),
+    )
+    if not await discovery_commands.fail_discovery_job(session, request_id):
+        logger.debug(f"discovery job {request_id} had already finished")
+        return
+    logger.warning(f"Discovery job {request_id} failed: {details}")
+    await _end_mission_discovery(
+        request_id=request_id,
+        mission_id=identifiers.SurveyMissionId(discovery_job.survey_mission_id),
+        session=session,
+        event_dispatcher=event_dispatcher,
+        user=user,
+        details=details,
+    )
+
+
+async def _end_mission_discovery(
+    *,
+    request_id: identifiers.RequestId,
+    mission_id: identifiers.SurveyMissionId,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    user: user_schemas.User,
+    details: str | None = None,
+) -> None:
+    await event_dispatcher(
+        event_schemas.DiscoveryEvent(
+            initiator=user.id,
+            resource_type=constants.ResourceType.MISSION,
+            resource_id=str(mission_id),
+            request_id=request_id,
+            modification=constants.DiscoveryStage.ENDED,
+            succeeded=details is None,
+            details=details,
+        )
+    )
+    await mission_ops.change_survey_mission_status(
+        request_id=request_id,
+        target_status=constants.SurveyMissionStatus.DRAFT,
+        survey_mission_id=mission_id,
+        initiator=user,
+        session=session,
+        event_dispatcher=event_dispatcher,
+    )
+
+
+async def _report_discovery_progress(
+    discovery_job: models.DiscoveryJob,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    user: user_schemas.User,
+) -> None:
+    elapsed_seconds = (get_utc_now() - discovery_job.created_at).total_seconds()
+    await event_dispatcher(
+        event_schemas.DiscoveryProgressEvent(
+            initiator=user.id,
+            resource_type=constants.ResourceType.MISSION,
+            resource_id=str(discovery_job.survey_mission_id),
+            request_id=identifiers.RequestId(discovery_job.id),
+            total_files=discovery_job.total_files,
+            files_seen=discovery_job.files_seen,
+            files_extracted=discovery_job.files_extracted,
+            files_failed=discovery_job.files_failed,
+            files_per_second=(
+                discovery_job.files_seen / elapsed_seconds
+                if elapsed_seconds > 0
+                else 0.0
+            ),
+        )
+    )
+
+
+def _get_mission_root_path(
+    mission: models.SurveyMission, settings: config.SeisLabDataSettings
+) -> Path:
+    return Path(
         "/".join(
             (
                 str(settings.readonly_archive_root_directory),
@@ -326,7 +610,17 @@ async def _discover_mission_records(
             )
         )
     )
+
+
+async def _collect_discovery_candidates(
+    *,
+    mission_root_path: Path,
+    asset_discovery_configs: list[models.AssetDiscoveryConfiguration],
+    tracked_paths: set[str],
+) -> list[models.DiscoveryCandidate]:
     logger.debug(f"{mission_root_path=}")
+    candidates = []
+    seen_paths = set(tracked_paths)
     for asset_discovery_conf in asset_discovery_configs:
         logger.debug(f"Searching for asset {asset_discovery_conf=}...")
         full_path_regexp = "/".join(
@@ -339,89 +633,107 @@ async def _discover_mission_records(
         async for found_path in _discover_asset_paths(full_path_regexp):
             # each found_path is to become a record with a single asset
             relative_file_path = str(found_path.relative_to(mission_root_path))
-            if (
-                await asset_queries.get_record_asset_by_file_path(
-                    session,
-                    relative_file_path,
-                    identifiers.SurveyMissionId(mission.id),
+            if relative_file_path in seen_paths:
+                logger.debug(
+                    f"file {found_path!r} is already tracked in the DB - ignoring..."
                 )
-            ) is None:
-                # best-effort metadata extraction: a failure must never abort
-                # discovery or record creation
-                metadata = None
-                try:
-                    metadata = await to_thread.run_sync(
-                        extractor_dispatch.dispatch_extractor, str(found_path)
-                    )
-                except Exception as err:
-                    logger.warning(
-                        "Metadata extraction failed for %s: %s", found_path, err
-                    )
-                    logger.debug("Extraction failure detail", exc_info=True)
-                bbox_4326 = None
-                if metadata is not None:
-                    bbox_4326 = metadata.bbox_4326
-                    if (native_bbox := metadata.bbox_native_needing_crs) is not None:
-                        try:
-                            implicit_srs = osr.SpatialReference()
-                            implicit_srs.ImportFromEPSG(mission.implicit_crs)
-                            bbox_4326 = extractor_common.project_bbox_to_wgs84(
-                                native_bbox, implicit_srs
-                            )
-                        except Exception as err:
-                            logger.warning(
-                                "Could not apply implicit CRS %s to %s: %s",
-                                mission.implicit_crs,
-                                found_path,
-                                err,
-                            )
-                bbox_wkt = (
-                    _bbox_4326_tuple_to_wkt(bbox_4326)
-                    if bbox_4326 is not None
-                    else None
+                continue
+            seen_paths.add(relative_file_path)
+            candidates.append(
+                models.DiscoveryCandidate(
+                    relative_path=relative_file_path,
+                    asset_discovery_configuration_id=str(asset_discovery_conf.id),
                 )
-                # create a new record and a new asset
-                await record_ops.create_survey_related_record(
-                    request_id=request_id,
-                    to_create=record_schemas.SurveyRelatedRecordCreate(
-                        id=identifiers.SurveyRelatedRecordId(uuid.uuid4()),
-                        owner_id=identifiers.UserId(user.id),
-                        survey_mission_id=identifiers.SurveyMissionId(mission.id),
-                        name=common.LocalizableDraftName(en=found_path.name),
-                        description=common.LocalizableDraftDescription(
-                            en=metadata.describe("en") if metadata is not None else "",
-                            pt=metadata.describe("pt") if metadata is not None else "",
-                        ),
-                        dataset_category_id=identifiers.DatasetCategoryId(
-                            asset_discovery_conf.dataset_category_id
-                        ),
-                        workflow_stage_id=identifiers.WorkflowStageId(
-                            asset_discovery_conf.workflow_stage_id
-                        ),
-                        bbox_4326=bbox_wkt,
-                        temporal_extent_begin=(
-                            metadata.temporal_extent_begin if metadata else None
-                        ),
-                        temporal_extent_end=(
-                            metadata.temporal_extent_end if metadata else None
-                        ),
-                        assets=[
-                            record_schemas.RecordAssetCreate(
-                                id=identifiers.RecordAssetId(uuid.uuid4()),
-                                name=common.LocalizableDraftName(en=found_path.stem),
-                                description=common.LocalizableDraftDescription(en=""),
-                                relative_path=relative_file_path,
-                            )
-                        ],
-                    ),
-                    initiator=user,
-                    session=session,
-                    event_dispatcher=event_dispatcher,
+            )
+    return candidates
+
+
+async def _discover_record(
+    *,
+    request_id: identifiers.RequestId,
+    mission: models.SurveyMission,
+    found_path: Path,
+    relative_file_path: str,
+    asset_discovery_conf: models.AssetDiscoveryConfiguration,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    user: user_schemas.User,
+) -> bool:
+    """Create a record for a discovered file.
+
+    Returns whether both metadata extraction and record creation succeeded.
+    """
+    # best-effort metadata extraction: a failure must never abort
+    # discovery or record creation
+    metadata = None
+    try:
+        metadata = await to_thread.run_sync(
+            extractor_dispatch.dispatch_extractor, str(found_path)
+        )
+    except Exception as err:
+        logger.warning("Metadata extraction failed for %s: %s", found_path, err)
+        logger.debug("Extraction failure detail", exc_info=True)
+    bbox_4326 = None
+    if metadata is not None:
+        bbox_4326 = metadata.bbox_4326
+        if (native_bbox := metadata.bbox_native_needing_crs) is not None:
+            try:
+                implicit_srs = osr.SpatialReference()
+                implicit_srs.ImportFromEPSG(mission.implicit_crs)
+                bbox_4326 = extractor_common.project_bbox_to_wgs84(
+                    native_bbox, implicit_srs
                 )
-            else:
-                logger.debug(
-                    f"file {found_path!r} is already tracked in the DB - ignoring..."
+            except Exception as err:
+                logger.warning(
+                    "Could not apply implicit CRS %s to %s: %s",
+                    mission.implicit_crs,
+                    found_path,
+                    err,
                 )
+    bbox_wkt = _bbox_4326_tuple_to_wkt(bbox_4326) if bbox_4326 is not None else None
+    # create a new record and a new asset
+    try:
+        await record_ops.create_survey_related_record(
+            request_id=request_id,
+            to_create=record_schemas.SurveyRelatedRecordCreate(
+                id=identifiers.SurveyRelatedRecordId(uuid.uuid4()),
+                owner_id=identifiers.UserId(user.id),
+                survey_mission_id=identifiers.SurveyMissionId(mission.id),
+                name=common.LocalizableDraftName(en=found_path.name),
+                description=common.LocalizableDraftDescription(
+                    en=metadata.describe("en") if metadata is not None else "",
+                    pt=metadata.describe("pt") if metadata is not None else "",
+                ),
+                dataset_category_id=identifiers.DatasetCategoryId(
+                    asset_discovery_conf.dataset_category_id
+                ),
+                workflow_stage_id=identifiers.WorkflowStageId(
+                    asset_discovery_conf.workflow_stage_id
+                ),
+                bbox_4326=bbox_wkt,
+                temporal_extent_begin=(
+                    metadata.temporal_extent_begin if metadata else None
+                ),
+                temporal_extent_end=(
+                    metadata.temporal_extent_end if metadata else None
+                ),
+                assets=[
+                    record_schemas.RecordAssetCreate(
+                        id=identifiers.RecordAssetId(uuid.uuid4()),
+                        name=common.LocalizableDraftName(en=found_path.stem),
+                        description=common.LocalizableDraftDescription(en=""),
+                        relative_path=relative_file_path,
+                    )
+                ],
+            ),
+            initiator=user,
+            session=session,
+            event_dispatcher=event_dispatcher,
+        )
+    except errors.SeisLabDataError as err:
+        logger.warning("Could not create a record for %s: %s", found_path, err)
+        return False
+    return metadata is not None
 
 
 def _bbox_4326_tuple_to_wkt(
@@ -0,0 +1,90 @@
+import dataclasses
+import logging
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .. import (
+    constants,
+    dispatch,
+)
+from ..db.commands import extents as extent_commands
+from ..schemas import (
+    events as event_schemas,
+    identifiers,
+)
+
+logger = logging.getLogger(__name__)
+
+# extents are reconciled by the system rather than on behalf of a user
+_INITIATOR = "extent-reconciliation"
+
+
+@dataclasses.dataclass(frozen=True)
+class ExtentReconciliationSummary:
+    num_survey_missions: int
+    num_projects: int
+
+
+async def reconcile_extents(
+    session: AsyncSession,
+    *,
+    request_id: identifiers.RequestId,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    batch_size: int,
+) -> ExtentReconciliationSummary:
+    """Recompute all dirty survey mission and project extents, in batches.
+
+    Survey missions go first, as projects are computed from them. Projects and
+    survey missions are listed along with their extents, so a single event is
+    dispatched for each of them whose extents were recomputed, which
+    invalidates the components that show them.
+    """
+    num_missions = 0
+    while reconciled := await extent_commands.reconcile_survey_mission_extents(
+        session, batch_size
+    ):
+        num_missions += reconciled
+    num_projects = 0
+    while reconciled := await extent_commands.reconcile_project_extents(
+        session, batch_size
+    ):
+        num_projects += reconciled
+    logger.debug(
+        f"Reconciled the extents of {num_missions} survey missions and "
+        f"{num_projects} projects"
+    )
+    for resource_type, affected_count in (
+        (constants.ResourceType.MISSION, num_missions),
+        (constants.ResourceType.PROJECT, num_projects),
+    ):
+        if affected_count:
+            await event_dispatcher(
+                event_schemas.BulkResourceModificationEvent(
+                    initiator=_INITIATOR,
+                    request_id=request_id,
+                    resource_type=resource_type,
+                    modification=constants.BulkResourceModification.UPDATED,
+                    succeeded=True,
+                    affected_count=affected_count,
+                )
+            )
+    return ExtentReconciliationSummary(
+        num_survey_missions=num_missions, num_projects=num_projects
+    )
+
+
+async def rebuild_extents(
+    session: AsyncSession,
+    *,
+    request_id: identifiers.RequestId,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    batch_size: int,
+) -> ExtentReconciliationSummary:
+    """Recompute the extents of all survey missions and projects."""
+    await extent_commands.mark_all_extents_dirty(session)
+    return await reconcile_extents(
+        session,
+        request_id=request_id,
+        event_dispatcher=event_dispatcher,
+        batch_size=batch_size,
+    )
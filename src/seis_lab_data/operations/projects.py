@@ -12,8 +12,6 @@ from .. import (
 from ..permissions import projects as project_permissions
 from ..db import models
 from ..db.commands import projects as project_commands
-from ..db.commands import surveymissions as mission_commands
-from ..db.commands import surveyrelatedrecords as record_commands
 from ..db.queries import projects as project_queries
 from ..schemas import (
     events as event_schemas,
@@ -23,6 +21,7 @@ from ..schemas import (
     user as user_schemas,
     validation as validation_schemas,
 )
+from . import publication as publication_ops
 
 logger = logging.getLogger(__name__)
 
@@ -243,85 +242,24 @@ async def update_project(
             session=session,
             event_dispatcher=event_dispatcher,
         )
-        if validated_project.validation_result.get("is_valid"):
-            if validated_project.status != constants.ProjectStatus.PUBLISHED:
-                await change_project_status(
-                    request_id=request_id,
-                    target_status=constants.ProjectStatus.PUBLISHED,
-                    project_id=project_id,
-                    initiator=initiator,
-                    session=session,
-                    event_dispatcher=event_dispatcher,
-                )
-            published_mission_ids = (
-                await mission_commands.bulk_publish_valid_survey_missions_for_project(
-                    session, project_id
-                )
-            )
-            if published_mission_ids:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.MISSION,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=len(published_mission_ids),
-                    )
-                )
-            published_record_count = 0
-            for mission_id in published_mission_ids:
-                published_record_count += (
-                    await record_commands.bulk_publish_valid_survey_related_records(
-                        session, mission_id
-                    )
-                )
-            if published_record_count:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.RECORD,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=published_record_count,
-                    )
-                )
-        else:
-            unpublished_mission_ids = (
-                await mission_commands.bulk_unpublish_survey_missions_for_project(
-                    session, project_id
-                )
+        is_valid = bool(validated_project.validation_result.get("is_valid"))
+        if is_valid and validated_project.status != constants.ProjectStatus.PUBLISHED:
+            await change_project_status(
+                request_id=request_id,
+                target_status=constants.ProjectStatus.PUBLISHED,
+                project_id=project_id,
+                initiator=initiator,
+                session=session,
+                event_dispatcher=event_dispatcher,
             )
-            if unpublished_mission_ids:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.MISSION,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=len(unpublished_mission_ids),
-                    )
-                )
-            unpublished_record_count = 0
-            for mission_id in unpublished_mission_ids:
-                unpublished_record_count += (
-                    await record_commands.bulk_unpublish_survey_related_records(
-                        session, mission_id
-                    )
-                )
-            if unpublished_record_count:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.RECORD,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=unpublished_record_count,
-                    )
-                )
+        await publication_ops.cascade_publication(
+            request_id=request_id,
+            initiator=initiator,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            publish=is_valid,
+            project_id=project_id,
+        )
     except errors.SeisLabDataError as err:
         await event_dispatcher(
             event_schemas.ResourceModificationEvent(
@@ -0,0 +1,56 @@
+import logging
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .. import (
+    constants,
+    dispatch,
+)
+from ..db.commands import publication as publication_commands
+from ..schemas import (
+    events as event_schemas,
+    identifiers,
+    user as user_schemas,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def cascade_publication(
+    *,
+    request_id: identifiers.RequestId,
+    initiator: user_schemas.User,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    publish: bool,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> publication_commands.PublicationCascade:
+    """Cascade the publication of a project or survey mission to its contents.
+
+    Rather than one event per resource, a single event is dispatched for each
+    level whose resources were affected.
+    """
+    cascade = await publication_commands.cascade_publication(
+        session,
+        publish=publish,
+        project_id=project_id,
+        survey_mission_id=survey_mission_id,
+    )
+    logger.debug(f"{cascade=}")
+    for resource_type, affected_count in (
+        (constants.ResourceType.MISSION, cascade.num_survey_missions),
+        (constants.ResourceType.RECORD, cascade.num_records),
+    ):
+        if affected_count:
+            await event_dispatcher(
+                event_schemas.BulkResourceModificationEvent(
+                    initiator=initiator.id,
+                    request_id=request_id,
+                    resource_type=resource_type,
+                    modification=constants.BulkResourceModification.UPDATED,
+                    succeeded=True,
+                    affected_count=affected_count,
+                )
+            )
+    return cascade
@@ -11,7 +11,6 @@ from .. import (
 )
 from ..db import models
 from ..db.commands import surveymissions as mission_commands
-from ..db.commands import surveyrelatedrecords as record_commands
 from ..db.queries import (
     projects as project_queries,
     surveymissions as mission_queries,
@@ -25,6 +24,7 @@ from ..schemas import (
     user as user_schemas,
     validation as validation_schemas,
 )
+from . import publication as publication_ops
 
 logger = logging.getLogger(__name__)
 
@@ -283,54 +283,32 @@ async def update_survey_mission(
             session=session,
             event_dispatcher=event_dispatcher,
         )
-        if all(
+        is_publishable = all(
             (
                 validated_mission.validation_result.get("is_valid"),
                 (validated_mission.project.validation_result or {}).get("is_valid"),
             )
+        )
+        if (
+            is_publishable
+            and validated_mission.status != constants.SurveyMissionStatus.PUBLISHED
         ):
-            if validated_mission.status != constants.SurveyMissionStatus.PUBLISHED:
-                await change_survey_mission_status(
-                    request_id=request_id,
-                    target_status=constants.SurveyMissionStatus.PUBLISHED,
-                    survey_mission_id=survey_mission_id,
-                    initiator=initiator,
-                    session=session,
-                    event_dispatcher=event_dispatcher,
-                )
-            published_count = (
-                await record_commands.bulk_publish_valid_survey_related_records(
-                    session, survey_mission_id
-                )
-            )
-            if published_count:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.RECORD,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=published_count,
-                    )
-                )
-        else:
-            unpublished_count = (
-                await record_commands.bulk_unpublish_survey_related_records(
-                    session, survey_mission_id
-                )
+            await change_survey_mission_status(
+                request_id=request_id,
+                target_status=constants.SurveyMissionStatus.PUBLISHED,
+                survey_mission_id=survey_mission_id,
+                initiator=initiator,
+                session=session,
+                event_dispatcher=event_dispatcher,
             )
-            if unpublished_count:
-                await event_dispatcher(
-                    event_schemas.BulkResourceModificationEvent(
-                        initiator=initiator.id,
-                        request_id=request_id,
-                        resource_type=constants.ResourceType.RECORD,
-                        modification=constants.BulkResourceModification.UPDATED,
-                        succeeded=True,
-                        affected_count=unpublished_count,
-                    )
-                )
+        await publication_ops.cascade_publication(
+            request_id=request_id,
+            initiator=initiator,
+            session=session,
+            event_dispatcher=event_dispatcher,
+            publish=is_publishable,
+            survey_mission_id=survey_mission_id,
+        )
     except errors.SeisLabDataError as err:
         await event_dispatcher(
             event_schemas.ResourceModificationEvent(
@@ -1,7 +1,15 @@
 import logging
+from collections.abc import (
+    AsyncIterator,
+    Sequence,
+)
 
 import pydantic
 import shapely
+from sqlalchemy import (
+    RowMapping,
+    and_,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .. import (
@@ -16,6 +24,7 @@ from ..db.queries import (
     surveymissions as mission_queries,
     surveyrelatedrecords as record_queries,
 )
+from ..db.queries.common import RowPermissions
 from ..schemas import (
     events as event_schemas,
     filters as filter_schemas,
@@ -375,25 +384,132 @@ async def list_survey_related_records(
         return await record_queries.list_survey_related_records(session, **kwargs)
 
 
-async def get_survey_related_record(
+def _get_permission_clauses(initiator: user_schemas.User | None) -> tuple:
+    return (
+        record_permissions.get_read_survey_related_record_clause(initiator),
+        record_permissions.get_update_survey_related_record_clause(initiator),
+        record_permissions.get_delete_survey_related_record_clause(initiator),
+    )
+
+
+async def list_survey_related_records_with_permissions(
+    session: AsyncSession,
+    initiator: user_schemas.User | None,
+    only_updatable: bool = False,
+    only_internal: bool = False,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+    project_id: identifiers.ProjectId | None = None,
+    page: int = 1,
+    page_size: int = 20,
+    include_total: bool = False,
+    en_name_filter: str | None = None,
+    pt_name_filter: str | None = None,
+    spatial_intersect: shapely.Polygon | None = None,
+    temporal_extent: filter_schemas.TemporalExtentFilterValue | None = None,
+    asset_path_fragment_filter: str | None = None,
+    asset_media_type_filter: str | None = None,
+    dataset_category_id: identifiers.DatasetCategoryId | None = None,
+    workflow_stage_id: identifiers.WorkflowStageId | None = None,
+) -> tuple[list[tuple[models.SurveyRelatedRecord, RowPermissions]], int | None]:
+    """List the records the initiator may read, with per-record permissions.
+
+    With `only_updatable`, this lists the records the initiator may edit.
+    """
+    return await record_queries.list_survey_related_records_with_permissions(
+        session,
+        *_get_permission_clauses(initiator),
+        only_updatable=only_updatable,
+        only_internal=only_internal,
+        survey_mission_id=survey_mission_id,
+        project_id=project_id,
+        page=page,
+        page_size=page_size,
+        include_total=include_total,
+        en_name_filter=en_name_filter,
+        pt_name_filter=pt_name_filter,
+        spatial_intersect=spatial_intersect,
+        temporal_extent=temporal_extent,
+        asset_path_fragment_filter=asset_path_fragment_filter,
+        asset_media_type_filter=asset_media_type_filter,
+        dataset_category_id=dataset_category_id,
+        workflow_stage_id=workflow_stage_id,
+    )
+
+
+async def export_survey_related_records(
+    session: AsyncSession,
+    initiator: user_schemas.User | None,
+    batch_size: int,
+    only_internal: bool = False,
+    only_updatable: bool = False,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+    project_id: identifiers.ProjectId | None = None,
+    en_name_filter: str | None = None,
+    pt_name_filter: str | None = None,
+    spatial_intersect: shapely.Polygon | None = None,
+    temporal_extent: filter_schemas.TemporalExtentFilterValue | None = None,
+    asset_path_fragment_filter: str | None = None,
+    asset_media_type_filter: str | None = None,
+    dataset_category_id: identifiers.DatasetCategoryId | None = None,
+    workflow_stage_id: identifiers.WorkflowStageId | None = None,
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Stream all the records the initiator may read, in batches of rows.
+
+    Accepts the same filters as `list_survey_related_records_with_permissions()`,
+    but without pagination. Rows are flat, see
+    `build_survey_related_record_export_statement()` for their columns.
+    """
+    can_read, can_update, _ = _get_permission_clauses(initiator)
+    statement = record_queries.build_survey_related_record_export_statement(
+        and_(can_read, can_update) if only_updatable else can_read,
+        only_internal=only_internal,
+        survey_mission_id=survey_mission_id,
+        project_id=project_id,
+        en_name_filter=en_name_filter,
+        pt_name_filter=pt_name_filter,
+        spatial_intersect=spatial_intersect,
+        temporal_extent=temporal_extent,
+        asset_path_fragment_filter=asset_path_fragment_filter,
+        asset_media_type_filter=asset_media_type_filter,
+        dataset_category_id=dataset_category_id,
+        workflow_stage_id=workflow_stage_id,
+    )
+    async for batch in record_queries.stream_survey_related_record_export(
+        session, statement, batch_size
+    ):
+        yield batch
+
+
+async def get_survey_related_record_with_permissions(
     survey_related_record_id: identifiers.SurveyRelatedRecordId,
     initiator: user_schemas.User | None,
     session: AsyncSession,
 ) -> (
     tuple[
         models.SurveyRelatedRecord,
+        RowPermissions,
         list[tuple[str, models.SurveyRelatedRecord]],
         list[tuple[str, models.SurveyRelatedRecord]],
     ]
     | None
 ):
-    record = await record_queries.get_survey_related_record(
-        session, survey_related_record_id
+    """Get a record, along with what the initiator may do with it.
+
+    Permissions are computed by the database, in the same query that fetches
+    the record.
+    """
+    result = await record_queries.get_survey_related_record_with_permissions(
+        session, survey_related_record_id, *_get_permission_clauses(initiator)
     )
-    if record is None:
+    if result is None:
         return None
-
+    record, permissions = result
     record_id = identifiers.SurveyRelatedRecordId(record.id)
+    if not permissions.can_read:
+        raise errors.UserNotAllowedError(
+            f"User not allowed to read survey-related record {record_id!r}."
+        )
+
     records_related_to = (
         await record_queries.list_survey_related_record_related_to_records(
             session, record_id
@@ -404,18 +520,27 @@ async def get_survey_related_record(
             session, record_id
         )
     )
+    return record, permissions, records_related_to, records_subject_for
 
-    if record.status == constants.SurveyRelatedRecordStatus.PUBLISHED:
-        return record, records_related_to, records_subject_for
-
-    error_msg = f"User not allowed to read survey-related record {record_id!r}."
-
-    if initiator is None:
-        raise errors.UserNotAllowedError(error_msg)
-
-    if not record_permissions.can_read_private_survey_related_record(initiator, record):
-        raise errors.UserNotAllowedError(error_msg)
 
+async def get_survey_related_record(
+    survey_related_record_id: identifiers.SurveyRelatedRecordId,
+    initiator: user_schemas.User | None,
+    session: AsyncSession,
+) -> (
+    tuple[
+        models.SurveyRelatedRecord,
+        list[tuple[str, models.SurveyRelatedRecord]],
+        list[tuple[str, models.SurveyRelatedRecord]],
+    ]
+    | None
+):
+    result = await get_survey_related_record_with_permissions(
+        survey_related_record_id, initiator, session
+    )
+    if result is None:
+        return None
+    record, _, records_related_to, records_subject_for = result
     return record, records_related_to, records_subject_for
 
 
@@ -502,6 +627,7 @@ async def bulk_update_survey_related_records(
     initiator: user_schemas.User,
     session: AsyncSession,
     event_dispatcher: dispatch.EventDispatcherProtocol,
+    chunk_size: int,
     selected: list[identifiers.SurveyRelatedRecordId] | None = None,
     excluded_record_ids: list[identifiers.SurveyRelatedRecordId] | None = None,
     survey_mission_id: identifiers.SurveyMissionId | None = None,
@@ -523,24 +649,26 @@ async def bulk_update_survey_related_records(
 
     `survey_mission_id` is an optional additional scope - omit it to bulk-update
     across all missions a user may access.
+
+    Matching records are updated in committed chunks of `chunk_size` records,
+    in order of their id, and progress is reported after each chunk. The work
+    is tracked in a bulk update job, which uses the request id as its own id.
+    If there already is a job for the request, as happens when the message is
+    redelivered after a worker restart, that job is resumed from its last
+    committed chunk.
     """
+    affected_count = 0
     try:
         if not record_permissions.can_bulk_update_survey_related_records(initiator):
             raise errors.UserNotAllowedError(
                 "User not allowed to bulk-update survey-related records."
             )
         if selected is not None:
-            updated_count = await record_commands.bulk_update_manually_selected_records(
-                session,
-                to_update,
-                selected,
-                survey_mission_id=survey_mission_id,
+            ids_statement = record_queries.build_survey_related_record_id_statement(
+                survey_mission_id=survey_mission_id, record_ids=selected
             )
         else:
-            updated_count = await record_commands.bulk_update_filtered_records(
-                session,
-                to_update,
-                excluded_record_ids=excluded_record_ids,
+            ids_statement = record_queries.build_survey_related_record_id_statement(
                 survey_mission_id=survey_mission_id,
                 en_name_filter=en_name_filter,
                 pt_name_filter=pt_name_filter,
@@ -550,7 +678,34 @@ async def bulk_update_survey_related_records(
                 asset_media_type_filter=asset_media_type_filter,
                 dataset_category_id=dataset_category_id,
                 workflow_stage_id=workflow_stage_id,
+                excluded_record_ids=excluded_record_ids,
+            )
+        ids_statement = ids_statement.where(
+            record_permissions.get_update_survey_related_record_clause(initiator)
+        )
+        if (
+            bulk_update_job := await record_queries.get_bulk_update_job(
+                session, request_id
             )
+        ) is not None:
+            logger.info(f"Resuming bulk update job {bulk_update_job.id}...")
+        else:
+            bulk_update_job = await record_commands.create_bulk_update_job(
+                session, request_id, ids_statement
+            )
+        affected_count = bulk_update_job.affected_count
+        while bulk_update_job.status == constants.BulkUpdateJobStatus.RUNNING:
+            await _report_bulk_update_progress(
+                bulk_update_job, event_dispatcher, initiator
+            )
+            bulk_update_job = await record_commands.run_bulk_update_chunk(
+                session,
+                request_id,
+                to_update,
+                ids_statement,
+                chunk_size=chunk_size,
+            )
+            affected_count = bulk_update_job.affected_count
     except errors.SeisLabDataError as err:
         await event_dispatcher(
             event_schemas.BulkResourceModificationEvent(
@@ -559,7 +714,7 @@ async def bulk_update_survey_related_records(
                 resource_type=constants.ResourceType.RECORD,
                 modification=constants.BulkResourceModification.UPDATED,
                 succeeded=False,
-                affected_count=0,
+                affected_count=affected_count,
                 details=str(err),
             )
         )
@@ -572,7 +727,23 @@ async def bulk_update_survey_related_records(
             resource_type=constants.ResourceType.RECORD,
             modification=constants.BulkResourceModification.UPDATED,
             succeeded=True,
-            affected_count=updated_count,
+            affected_count=affected_count,
+        )
+    )
+    return affected_count
+
+
+async def _report_bulk_update_progress(
+    bulk_update_job: models.BulkUpdateJob,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    user: user_schemas.User,
+) -> None:
+    await event_dispatcher(
+        event_schemas.BulkUpdateProgressEvent(
+            initiator=user.id,
+            resource_type=constants.ResourceType.RECORD,
+            request_id=identifiers.RequestId(bulk_update_job.id),
+            total_count=bulk_update_job.total_count,
+            affected_count=bulk_update_job.affected_count,
         )
     )
-    return updated_count
@@ -0,0 +1,161 @@
+import dataclasses
+import functools
+import logging
+import uuid
+
+import pydantic
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .. import (
+    constants,
+    dispatch,
+    errors,
+)
+from ..db import models
+from ..db.commands import validation as validation_commands
+from ..db.queries import validation as validation_queries
+from ..permissions.common import can_bulk_validate
+from ..schemas import (
+    events as event_schemas,
+    identifiers,
+    user as user_schemas,
+    validation as validation_schemas,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class BulkValidationSummary:
+    num_validated: int
+    num_invalid: int
+
+
+@functools.cache
+def get_links_validation_adapter() -> pydantic.TypeAdapter:
+    return pydantic.TypeAdapter(list[validation_schemas.ValidLinkSchema])
+
+
+def serialize_validation_error(
+    err: pydantic.ValidationError,
+    *,
+    prefix: tuple[str, ...] = (),
+) -> list[models.ValidationError]:
+    return [
+        {
+            "name": ".".join(str(i) for i in (*prefix, *error["loc"])),
+            "message": error["msg"],
+            "type_": error["type"],
+        }
+        for error in err.errors()
+    ]
+
+
+def validate_links(rows: list[dict]) -> list[tuple[uuid.UUID, models.ValidationResult]]:
+    """Validate the links of rows which were already checked in SQL.
+
+    Links are validated in python because SQL is not able to parse URLs. Link
+    errors are added to the row's existing validation result. Only the rows
+    whose result changes are returned.
+    """
+    adapter = get_links_validation_adapter()
+    results = []
+    for row in rows:
+        try:
+            adapter.validate_python(row["links"])
+        except pydantic.ValidationError as err:
+            sql_result = row["validation_result"] or {}
+            errors = [
+                *(sql_result.get("errors") or []),
+                *serialize_validation_error(err, prefix=("links",)),
+            ]
+            results.append((row["id"], {"is_valid": False, "errors": errors}))
+    return results
+
+
+async def bulk_validate(
+    *,
+    request_id: identifiers.RequestId,
+    resource_type: constants.ResourceType,
+    initiator: user_schemas.User,
+    session: AsyncSession,
+    event_dispatcher: dispatch.EventDispatcherProtocol,
+    batch_size: int,
+    project_id: identifiers.ProjectId | None = None,
+    survey_mission_id: identifiers.SurveyMissionId | None = None,
+) -> BulkValidationSummary | None:
+    """Validate all projects, survey missions or records in a scope.
+
+    Unlike validating a single resource, this does not go through the
+    UNDER_VALIDATION status and does not dispatch events for each resource.
+    Most rules are checked in SQL, with a single statement. Only the rows
+    that have links are then read, in batches, in order to validate their
+    links in python, and each batch's results are written back with a single
+    statement. A single event is dispatched at the end.
+    """
+    num_validated = 0
+    num_invalid = 0
+    try:
+        if not can_bulk_validate(initiator):
+            raise errors.UserNotAllowedError(
+                "User not allowed to bulk-validate resources."
+            )
+        if resource_type not in validation_queries.VALIDATABLE_MODELS:
+            raise errors.SeisLabDataError(
+                f"Resources of type {resource_type.value!r} cannot be validated."
+            )
+        num_validated = await validation_commands.apply_sql_validation_rules(
+            session,
+            resource_type,
+            project_id=project_id,
+            survey_mission_id=survey_mission_id,
+        )
+        batches = validation_queries.iter_rows_to_validate(
+            session,
+            resource_type,
+            ["id", "links", "validation_result"],
+            batch_size=batch_size,
+            with_links_only=True,
+            project_id=project_id,
+            survey_mission_id=survey_mission_id,
+        )
+        async for rows in batches:
+            await validation_commands.write_validation_results(
+                session, resource_type, validate_links(rows)
+            )
+        num_invalid = await validation_queries.count_invalid(
+            session,
+            resource_type,
+            project_id=project_id,
+            survey_mission_id=survey_mission_id,
+        )
+        logger.debug(
+            f"Validated {num_validated} {resource_type.value} rows, "
+            f"{num_invalid} are not valid"
+        )
+    except errors.SeisLabDataError as err:
+        await event_dispatcher(
+            event_schemas.BulkResourceModificationEvent(
+                initiator=initiator.id,
+                request_id=request_id,
+                resource_type=resource_type,
+                modification=constants.BulkResourceModification.VALIDATED,
+                succeeded=False,
+                affected_count=num_validated,
+                details=str(err),
+            )
+        )
+        return None
+
+    await event_dispatcher(
+        event_schemas.BulkResourceModificationEvent(
+            initiator=initiator.id,
+            request_id=request_id,
+            resource_type=resource_type,
+            modification=constants.BulkResourceModification.VALIDATED,
+            succeeded=True,
+            affected_count=num_validated,
+            details=f"{num_invalid} of {num_validated} are not valid",
+        )
+    )
+    return BulkValidationSummary(num_validated=num_validated, num_invalid=num_invalid)
@@ -1,3 +1,9 @@
+from sqlalchemy import (
+    ColumnElement,
+    false,
+    true,
+)
+
 from ..schemas.user import User
 from .. import constants
 
@@ -16,3 +22,16 @@ def can_manage_item(
     if user is None:
         return False
     return is_editor(*user.roles)
+
+
+def can_bulk_validate(user: User | None) -> bool:
+    """Coarse-grained gate for validating many resources at once."""
+    return can_manage_item(user)
+
+
+def get_manage_item_clause(user: User | None) -> ColumnElement[bool]:
+    """SQL counterpart of `can_manage_item()`, for embedding in statements.
+
+    Managing items only depends on the user's roles, so this is a constant.
+    """
+    return true() if can_manage_item(user) else false()
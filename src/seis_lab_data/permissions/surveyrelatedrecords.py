@@ -1,8 +1,19 @@
 import logging
 
+from sqlalchemy import (
+    ColumnElement,
+    false,
+    or_,
+    true,
+)
+
+from ..constants import SurveyRelatedRecordStatus
 from ..schemas.user import User
 from ..db import models
-from .common import can_manage_item
+from .common import (
+    can_manage_item,
+    get_manage_item_clause,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,3 +63,25 @@ def can_change_survey_related_record_status(
 def can_bulk_update_survey_related_records(user: User) -> bool:
     """Coarse-grained gate for attempting a bulk update."""
     return can_manage_item(user)
+
+
+def get_read_survey_related_record_clause(user: User | None) -> ColumnElement[bool]:
+    """SQL counterpart of reading a survey-related-record.
+
+    Published ones can be read by anyone, private ones as allowed by
+    `can_read_private_survey_related_record()`.
+    """
+    return or_(
+        models.SurveyRelatedRecord.status == SurveyRelatedRecordStatus.PUBLISHED,
+        true() if user is not None else false(),
+    )
+
+
+def get_update_survey_related_record_clause(user: User | None) -> ColumnElement[bool]:
+    """SQL counterpart of `can_update_survey_related_record()`."""
+    return get_manage_item_clause(user)
+
+
+def get_delete_survey_related_record_clause(user: User | None) -> ColumnElement[bool]:
+    """SQL counterpart of `can_delete_survey_related_record()`."""
+    return get_manage_item_clause(user)
@@ -119,6 +119,15 @@ def parse_wkbelement_polygon_into_geom(value: WKBElement) -> shapely.Polygon:
     return cast(shapely.Polygon, geom)
 
 
+def parse_wkbelement_into_envelope(value: WKBElement) -> shapely.Polygon:
+    """Parse a geometry into its bounding box, which may have zero area."""
+    try:
+        geom = shapely.from_wkb(value.data)
+    except shapely.GEOSException as err:
+        raise ValueError(f"Could not parse {value} as WKB") from err
+    return shapely.box(*geom.bounds)
+
+
 def serialize_geom_to_wkt(value: shapely.Geometry) -> str:
     return shapely.to_wkt(value)
 
@@ -158,3 +167,11 @@ PolygonOut = Annotated[
     pydantic.PlainValidator(parse_wkbelement_polygon_into_geom),
     pydantic.PlainSerializer(serialize_polygon_to_bounds),
 ]
+
+# like PolygonOut, but for envelopes computed by the DB, such as the extent of
+# the records of a survey mission, which degenerate when all of them do
+EnvelopeOut = Annotated[
+    shapely.Polygon,
+    pydantic.PlainValidator(parse_wkbelement_into_envelope),
+    pydantic.PlainSerializer(serialize_polygon_to_bounds),
+]
@@ -59,6 +59,26 @@ class DiscoveryEvent(_EventBase):
     details: str | None = None
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class DiscoveryProgressEvent(_EventBase):
+    resource_type: constants.ResourceType
+    resource_id: str
+    request_id: identifiers.RequestId
+    total_files: int
+    files_seen: int
+    files_extracted: int
+    files_failed: int
+    files_per_second: float
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class BulkUpdateProgressEvent(_EventBase):
+    resource_type: constants.ResourceType
+    request_id: identifiers.RequestId
+    total_count: int
+    affected_count: int
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class ValidationEvent(_EventBase):
     resource_type: constants.ResourceType
@@ -75,5 +95,7 @@ SeisLabDataEvent: TypeAlias = (
     | BulkResourceModificationEvent
     | ResourceStatusChangedEvent
     | DiscoveryEvent
+    | DiscoveryProgressEvent
+    | BulkUpdateProgressEvent
     | ValidationEvent
 )
@@ -3,6 +3,7 @@ from typing import NewType
 
 AssetDiscoveryConfId = NewType("AssetDiscoveryConfId", uuid.UUID)
 DatasetCategoryId = NewType("DatasetCategoryId", uuid.UUID)
+DiscoveryChunkId = NewType("DiscoveryChunkId", uuid.UUID)
 RecordAssetId = NewType("RecordAssetId", uuid.UUID)
 RecordDiscoveryConfId = NewType("RecordDiscoveryConfId", str)
 RequestId = NewType("RequestId", uuid.UUID)
@@ -57,6 +57,26 @@ class DiscoveryMessage(pydantic.BaseModel):
     details: str | None = None
 
 
+class DiscoveryProgressMessage(pydantic.BaseModel):
+    type: Literal["discovery_progress"] = "discovery_progress"
+    resource_type: constants.ResourceType
+    resource_id: str
+    request_id: identifiers.RequestId
+    total_files: int
+    files_seen: int
+    files_extracted: int
+    files_failed: int
+    files_per_second: float
+
+
+class BulkUpdateProgressMessage(pydantic.BaseModel):
+    type: Literal["bulk_update_progress"] = "bulk_update_progress"
+    resource_type: constants.ResourceType
+    request_id: identifiers.RequestId
+    total_count: int
+    affected_count: int
+
+
 class ValidationMessage(pydantic.BaseModel):
     type: Literal["validation"] = "validation"
     resource_type: constants.ResourceType
@@ -72,6 +92,8 @@ SldPubSubMessage: TypeAlias = Annotated[
     ResourceModificationMessage
     | BulkResourceModificationMessage
     | DiscoveryMessage
+    | DiscoveryProgressMessage
+    | BulkUpdateProgressMessage
     | ValidationMessage
     | ResourceStatusChangedMessage,
     pydantic.Field(discriminator="type"),
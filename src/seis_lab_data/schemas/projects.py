@@ -6,6 +6,7 @@ import pydantic
 from ..constants import ProjectStatus
 from ..db import models
 from .common import (
+    EnvelopeOut,
     LinkSchema,
     LocalizableDraftDescription,
     LocalizableDraftName,
@@ -64,6 +65,14 @@ class ProjectReadEmbedded(pydantic.BaseModel):
 
 class ProjectReadListItem(ProjectReadEmbedded):
     description: LocalizableDraftDescription
+    # extent of the project's records, which the hand-edited one may not match
+    records_bbox_4326: EnvelopeOut | None = None
+    records_temporal_extent_begin: Annotated[
+        dt.date | None, pydantic.PlainSerializer(serialize_possibly_empty_date)
+    ] = None
+    records_temporal_extent_end: Annotated[
+        dt.date | None, pydantic.PlainSerializer(serialize_possibly_empty_date)
+    ] = None
 
     @classmethod
     def from_db_instance(cls, instance: models.Project) -> "ProjectReadListItem":
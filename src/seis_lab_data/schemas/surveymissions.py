@@ -6,6 +6,7 @@ import pydantic
 from ..constants import SurveyMissionStatus
 from ..db import models
 from .common import (
+    EnvelopeOut,
     LinkSchema,
     LocalizableDraftDescription,
     LocalizableDraftName,
@@ -86,6 +87,14 @@ class SurveyMissionReadListItem(pydantic.BaseModel):
         dt.date | None, pydantic.PlainSerializer(serialize_possibly_empty_date)
     ]
     bbox_4326: PolygonOut | None
+    # extent of the mission's records, which the hand-edited one may not match
+    records_bbox_4326: EnvelopeOut | None = None
+    records_temporal_extent_begin: Annotated[
+        dt.date | None, pydantic.PlainSerializer(serialize_possibly_empty_date)
+    ] = None
+    records_temporal_extent_end: Annotated[
+        dt.date | None, pydantic.PlainSerializer(serialize_possibly_empty_date)
+    ] = None
     num_survey_related_records: int
 
     @classmethod
@@ -93,6 +93,11 @@ def parse_possibly_empty_wkbelement_polygon_into_valid_geometry(
     return cast(shapely.Polygon, geom)
 
 
+# NOTE: bulk validation checks the rules of the below schemas in SQL, except
+# for links - see `db.commands.validation.build_sql_validation_errors()`,
+# which must be kept in sync with any change to these rules
+
+
 class ValidProject(pydantic.BaseModel):
     id: identifiers.ProjectId
     name: LocalizableValidName
@@ -1,6 +1,8 @@
 import asyncio
 import dataclasses
 import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
 from typing import (
     Any,
@@ -14,6 +16,7 @@ import jinja2
 import pydantic
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
+from redis.exceptions import ResponseError
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
 
 from . import constants
@@ -27,6 +30,9 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 T_co = TypeVar("T_co", covariant=True)
 
+_MESSAGE_ADAPTER = pydantic.TypeAdapter(message_schemas.SldPubSubMessage)
+_STREAM_READ_BLOCK_MS: int = 15_000
+
 
 @dataclasses.dataclass(frozen=True)
 class HandlerContext:
@@ -65,6 +71,9 @@ async def open_topic_subscription(
     expected to trigger a `resource_modified` event on this topic - otherwise
     a fast consumer can publish before anyone is listening and the event is
     lost for good (redis pub/sub is fire-and-forget).
+
+    When the `streams` event backend is in use, prefer `open_topic_stream()`,
+    which does not suffer from this limitation.
     """
     pubsub = redis_client.pubsub()
     await pubsub.subscribe(*topic_names)
@@ -72,8 +81,114 @@ async def open_topic_subscription(
     return pubsub
 
 
+@dataclasses.dataclass
+class TopicStreamSubscription:
+    """Read position over the redis streams that back a set of topics.
+
+    The ``event_id_tagger`` callable, if provided, is given each chunk produced
+    by the message handlers together with the id of the stream entry that
+    originated it. This allows callers to propagate the id to their own
+    clients (e.g. as the SSE ``id`` field), which then use it to resume
+    reading after a reconnect.
+    """
+
+    redis_client: Redis
+    topic_names: Sequence[str]
+    positions: dict[str, str]
+    consumer_group: str | None = None
+    consumer_name: str | None = None
+    event_id_tagger: Callable[[Any, str], Any] | None = None
+
+
+def get_replay_start_id(replay_window_seconds: float) -> str:
+    """Return a stream entry id that is ``replay_window_seconds`` in the past.
+
+    Redis stream ids are made up of a millisecond timestamp and a sequence
+    number, so we can compute a starting position locally, without a round-trip.
+    """
+    start_ms = max(0, int((time.time() - replay_window_seconds) * 1000))
+    return f"{start_ms}-0"
+
+
+async def open_topic_stream(
+    redis_client: Redis,
+    topic_names: Sequence[str],
+    *,
+    last_event_id: str | None = None,
+    replay_window_seconds: float = 0.0,
+    consumer_group: str | None = None,
+    consumer_name: str | None = None,
+    event_id_tagger: Callable[[Any, str], Any] | None = None,
+) -> TopicStreamSubscription:
+    """Prepare to read events from the redis streams that back some topics.
+
+    Reading starts right after ``last_event_id``, when given, which is how an SSE
+    client resumes after reconnecting. Otherwise reading starts
+    ``replay_window_seconds`` in the past, which covers events that were dispatched
+    moments before the caller opened the stream - this is what removes the
+    need to subscribe before dispatching.
+
+    When ``consumer_group`` is given, entries are instead read through a redis
+    consumer group, which distributes each entry to a single consumer of the
+    group. This is meant for backend consumers that need to scale
+    horizontally, not for browser-facing streams.
+    """
+    stream_names = [
+        constants.EVENT_STREAM_NAME_TEMPLATE.format(topic_name=topic_name)
+        for topic_name in topic_names
+    ]
+    if consumer_group is not None:
+        for stream_name in stream_names:
+            try:
+                await redis_client.xgroup_create(
+                    stream_name, consumer_group, id="$", mkstream=True
+                )
+            except ResponseError as err:
+                if "BUSYGROUP" not in str(err):
+                    raise
+        positions = {stream_name: ">" for stream_name in stream_names}
+        consumer_name = consumer_name or f"{consumer_group}-{uuid.uuid4()}"
+    else:
+        start_id = last_event_id or get_replay_start_id(replay_window_seconds)
+        positions = {stream_name: start_id for stream_name in stream_names}
+    logger.debug(f"Opened streams {positions}")
+    return TopicStreamSubscription(
+        redis_client=redis_client,
+        topic_names=topic_names,
+        positions=positions,
+        consumer_group=consumer_group,
+        consumer_name=consumer_name,
+        event_id_tagger=event_id_tagger,
+    )
+
+
+async def _handle_raw_message[T, TContext: HandlerContext](
+    raw_message: bytes | str,
+    topic_names: Sequence[str],
+    handler_context: TContext,
+    message_handlers: dict[str, MessageHandlerProtocol[T, TContext]],
+    done_event: asyncio.Event,
+) -> AsyncGenerator[T, None]:
+    try:
+        parsed = _MESSAGE_ADAPTER.validate_json(raw_message)
+    except pydantic.ValidationError as err:
+        logger.warning(err)
+        logger.warning(
+            f"Unrecognised message {raw_message!r} on {topic_names!r}, skipping"
+        )
+        return
+
+    handler = message_handlers.get(parsed.type)
+    if handler is None:
+        logger.debug(f"No handler for {parsed.type!r}, ignoring")
+        return
+
+    async for chunk in handler(parsed, context=handler_context, done=done_event):
+        yield chunk
+
+
 async def iter_topic_messages[T, TContext: HandlerContext](
-    pubsub: PubSub,
+    pubsub: PubSub | TopicStreamSubscription,
     topic_names: Sequence[str],
     handler_context: TContext,
     message_handlers: dict[str, MessageHandlerProtocol[T, TContext]],
@@ -81,6 +196,13 @@ async def iter_topic_messages[T, TContext: HandlerContext](
     """
     Dispatch incoming messages on an already-subscribed pubsub to relevant handlers.
     """
+    if isinstance(pubsub, TopicStreamSubscription):
+        async for chunk in _iter_stream_messages(
+            pubsub, handler_context, message_handlers
+        ):
+            yield chunk
+        return
+
     done_event = asyncio.Event()
     try:
         async for message in pubsub.listen():
@@ -89,25 +211,12 @@ async def iter_topic_messages[T, TContext: HandlerContext](
             if message["type"] != "message":
                 continue
 
-            try:
-                parsed = pydantic.TypeAdapter(
-                    message_schemas.SldPubSubMessage
-                ).validate_json(message["data"])
-            except pydantic.ValidationError as err:
-                logger.warning(err)
-                logger.warning(
-                    f"Unrecognised message {message['data']!r} "
-                    f"on {topic_names!r}, skipping"
-                )
-                continue
-
-            handler = message_handlers.get(parsed.type)
-            if handler is None:
-                logger.debug(f"No handler for {parsed.type!r}, ignoring")
-                continue
-
-            async for chunk in handler(
-                parsed, context=handler_context, done=done_event
+            async for chunk in _handle_raw_message(
+                message["data"],
+                topic_names,
+                handler_context,
+                message_handlers,
+                done_event,
             ):
                 yield chunk
 
@@ -119,3 +228,57 @@ async def iter_topic_messages[T, TContext: HandlerContext](
     finally:
         await pubsub.unsubscribe(*topic_names)
         await pubsub.aclose()
+
+
+async def _iter_stream_messages[T, TContext: HandlerContext](
+    subscription: TopicStreamSubscription,
+    handler_context: TContext,
+    message_handlers: dict[str, MessageHandlerProtocol[T, TContext]],
+) -> AsyncGenerator[T, None]:
+    redis_client = subscription.redis_client
+    done_event = asyncio.Event()
+    try:
+        while not done_event.is_set():
+            if subscription.consumer_group is not None:
+                response = await redis_client.xreadgroup(
+                    subscription.consumer_group,
+                    subscription.consumer_name,
+                    streams=subscription.positions,
+                    block=_STREAM_READ_BLOCK_MS,
+                )
+            else:
+                response = await redis_client.xread(
+                    streams=subscription.positions, block=_STREAM_READ_BLOCK_MS
+                )
+            for raw_stream_name, entries in response or []:
+                stream_name = _decode(raw_stream_name)
+                for raw_entry_id, fields in entries:
+                    entry_id = _decode(raw_entry_id)
+                    if subscription.consumer_group is None:
+                        subscription.positions[stream_name] = entry_id
+                    async for chunk in _handle_raw_message(
+                        fields.get(b"data", fields.get("data", b"")),
+                        subscription.topic_names,
+                        handler_context,
+                        message_handlers,
+                        done_event,
+                    ):
+                        yield (
+                            subscription.event_id_tagger(chunk, entry_id)
+                            if subscription.event_id_tagger is not None
+                            else chunk
+                        )
+                    if subscription.consumer_group is not None:
+                        await redis_client.xack(
+                            stream_name, subscription.consumer_group, entry_id
+                        )
+                    if done_event.is_set():
+                        break
+                if done_event.is_set():
+                    break
+    except asyncio.CancelledError:
+        logger.info(f"stream reader for {subscription.topic_names!r} cancelled")
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -5,11 +5,7 @@ from dramatiq.brokers.redis import RedisBroker
 from dramatiq.middleware.asyncio import AsyncIO
 
 from .. import config
-from .middleware import (
-    AsyncRedisPubSubMiddleware,
-    AsyncSqlAlchemyDbMiddleware,
-    SeisLabDataSettingsMiddleware,
-)
+from .middleware import WorkerResourcesMiddleware
 
 # These imports are needed - DO NOT REMOVE
 # Dramatiq's @actor decorator tries to eagerly connect to the global dramatiq broker
@@ -25,9 +21,11 @@ from .middleware import (
 from . import (
     datasetcategories,  # noqa
     discovery,  # noqa
+    extents,  # noqa
     projects,  # noqa
     surveymissions,  # noqa
     surveyrelatedrecords,  # noqa
+    validation,  # noqa
     workflowstages,  # noqa
 )
 
@@ -56,17 +54,8 @@ def setup_broker(settings: config.SeisLabDataSettings | None = None) -> None:
             port=settings.message_broker_dsn.port,
         )
         new_broker.add_middleware(AsyncIO())
-        new_broker.add_middleware(SeisLabDataSettingsMiddleware(settings))
-        new_broker.add_middleware(
-            AsyncRedisPubSubMiddleware(
-                redis_dsn=settings.message_broker_dsn.unicode_string()
-            )
-        )
-        new_broker.add_middleware(
-            AsyncSqlAlchemyDbMiddleware(
-                db_dsn=settings.database_dsn.unicode_string(), debug=settings.debug
-            )
-        )
+        # must come after AsyncIO, as it relies on its event loop thread
+        new_broker.add_middleware(WorkerResourcesMiddleware(settings))
         old_broker = dramatiq.get_broker()
         # reconfigure actors to use the new broker
         for existing_actor_name in old_broker.get_declared_actors():
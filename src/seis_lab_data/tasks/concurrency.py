@@ -0,0 +1,58 @@
+import contextlib
+import logging
+import uuid
+from collections.abc import AsyncIterator
+
+from redis.asyncio import Redis
+
+from .. import constants
+
+logger = logging.getLogger(__name__)
+
+# Holders are members of a sorted set, scored by the time at which their slot
+# expires. Expired slots, which were left behind by crashed workers, are dropped
+# before counting the holders. The key's own TTL is only set when a slot is
+# granted, which means rejected attempts do not keep a stale key alive
+_ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now_ms + tonumber(ARGV[2]), ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class RedisConcurrencyLimiter:
+    """Limit how many holders of a name may run at the same time, across workers."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        name: str,
+        limit: int,
+        ttl_seconds: int,
+    ) -> None:
+        self._redis = redis_client
+        self._key = constants.CONCURRENCY_LIMIT_KEY_TEMPLATE.format(name=name)
+        self._limit = limit
+        self._ttl_ms = ttl_seconds * 1000
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[bool]:
+        """Try to take a slot, yielding whether it was possible to do so."""
+        token = uuid.uuid4().hex
+        acquired = bool(
+            await self._redis.eval(
+                _ACQUIRE_SCRIPT, 1, self._key, self._limit, self._ttl_ms, token
+            )
+        )
+        logger.debug(f"Concurrency limiter {self._key!r} {acquired=}")
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await self._redis.zrem(self._key, token)
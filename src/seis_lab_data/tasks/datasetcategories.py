@@ -20,7 +20,7 @@ dramatiq.set_broker(sld_stub_broker)
 logger = logging.getLogger(__name__)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def create_dataset_category(
     raw_request_id: str,
@@ -41,7 +41,7 @@ async def create_dataset_category(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def update_dataset_category(
     raw_request_id: str,
@@ -65,7 +65,7 @@ async def update_dataset_category(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def delete_dataset_category(
     raw_request_id: str,
@@ -1,35 +1,96 @@
+import inspect
 from functools import wraps
-from typing import Callable
+from typing import (
+    Any,
+    Callable,
+    Final,
+)
 
 import dramatiq
 
-from .middleware import (
-    AsyncRedisPubSubMiddleware,
-    SeisLabDataSettingsMiddleware,
+from .. import (
+    constants,
+    dispatch,
 )
+from .concurrency import RedisConcurrencyLimiter
+from .middleware import get_worker_resources
+
+# options to be passed to `dramatiq.actor()` - lower priority values are processed first
+INTERACTIVE_ACTOR_OPTIONS: Final[dict[str, Any]] = {
+    "queue_name": constants.TaskQueue.INTERACTIVE.value,
+    "priority": 0,
+}
+BATCH_ACTOR_OPTIONS: Final[dict[str, Any]] = {
+    "queue_name": constants.TaskQueue.BATCH.value,
+    "priority": 100,
+    # batch work routinely runs for longer than dramatiq's default 10 minute limit
+    "time_limit": 24 * 60 * 60 * 1000,
+}
 
 
 def redis_client(func: Callable):
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        broker: dramatiq.Broker = dramatiq.get_broker()
-        for middleware in broker.middleware:
-            if isinstance(middleware, AsyncRedisPubSubMiddleware):
-                return await func(*args, **kwargs, redis_client=middleware.redis_client)
-        else:
-            raise RuntimeError("No AsyncRedisPubSubMiddleware found in the broker")
+        return await func(
+            *args, **kwargs, redis_client=get_worker_resources().redis_client
+        )
 
     return wrapper
 
 
 def sld_settings(func: Callable):
+    """Provide the worker's settings to an actor.
+
+    The settings hand out the worker process's shared resources - see
+    `resources.WorkerResources`. Once the actor is done, any events that it
+    dispatched and that are still buffered are sent, before dramatiq
+    acknowledges the message.
+    """
+
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        broker: dramatiq.Broker = dramatiq.get_broker()
-        for middleware in broker.middleware:
-            if isinstance(middleware, SeisLabDataSettingsMiddleware):
-                return await func(*args, **kwargs, settings=middleware.sld_settings)
-        else:
-            raise RuntimeError("No SeisLabDataSettingsMiddleware found in the broker")
+        resources = get_worker_resources()
+        try:
+            return await func(*args, **kwargs, settings=resources.settings)
+        finally:
+            await dispatch.flush_pending_events(resources.event_dispatcher)
 
     return wrapper
+
+
+def limit_concurrency(name_template: str, limit: int = 1):
+    """Allow at most `limit` simultaneous runs of an actor, across all workers.
+
+    Runs are grouped by the name that results from formatting `name_template`
+    with the actor's arguments, e.g. `"discovery-{raw_survey_mission_id}"`
+    allows a single discovery per survey mission. When the limit is reached,
+    `dramatiq.RateLimitExceeded` is raised, which makes dramatiq retry the
+    message later, with backoff.
+
+    This must be applied below `sld_settings`, as the actor's arguments can
+    only be bound once the settings have been injected.
+    """
+
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            name = name_template.format(**signature.bind(*args, **kwargs).arguments)
+            resources = get_worker_resources()
+            limiter = RedisConcurrencyLimiter(
+                resources.redis_client,
+                name=name,
+                limit=limit,
+                ttl_seconds=resources.settings.worker_concurrency_limit_ttl_seconds,
+            )
+            async with limiter.acquire() as acquired:
+                if not acquired:
+                    raise dramatiq.RateLimitExceeded(
+                        f"Concurrency limit of {limit} reached for {name!r}"
+                    )
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -18,7 +18,7 @@ dramatiq.set_broker(sld_stub_broker)
 logger = logging.getLogger(__name__)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def create_asset_discovery_configuration(
     raw_request_id: str,
@@ -39,7 +39,7 @@ async def create_asset_discovery_configuration(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def update_asset_discovery_configuration(
     raw_request_id: str,
@@ -64,7 +64,7 @@ async def update_asset_discovery_configuration(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def delete_asset_discovery_configuration(
     raw_request_id: str,
@@ -85,8 +85,9 @@ async def delete_asset_discovery_configuration(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.BATCH_ACTOR_OPTIONS)
 @decorators.sld_settings
+@decorators.limit_concurrency("discovery-{raw_survey_mission_id}")
 async def discover_survey_mission_contents(
     raw_request_id: str,
     raw_survey_mission_id: str,
@@ -94,11 +95,16 @@ async def discover_survey_mission_contents(
     *,
     settings: config.SeisLabDataSettings,
 ):
+    """Plan the discovery of a survey mission's contents and enqueue its chunks.
+
+    If this message is redelivered, e.g. because the worker got restarted,
+    the chunks that are still pending are enqueued again.
+    """
     request_id = identifiers.RequestId(uuid.UUID(raw_request_id))
     mission_id = identifiers.SurveyMissionId(uuid.UUID(raw_survey_mission_id))
     initiator = user_schemas.User(**json.loads(raw_initiator))
     async with settings.get_db_session_maker()() as session:
-        await discovery_ops.run_mission_discovery(
+        chunk_ids = await discovery_ops.plan_mission_discovery(
             request_id=request_id,
             mission_id=mission_id,
             session=session,
@@ -106,3 +112,54 @@ async def discover_survey_mission_contents(
             settings=settings,
             user=initiator,
         )
+    for chunk_id in chunk_ids:
+        discover_survey_mission_chunk.send(
+            raw_discovery_chunk_id=str(chunk_id),
+            raw_initiator=raw_initiator,
+        )
+
+
+@dramatiq.actor(
+    **decorators.BATCH_ACTOR_OPTIONS,
+    # sent by dramatiq once the chunk's message has run out of retries and is
+    # about to be dead-lettered
+    on_retry_exhausted="fail_survey_mission_discovery_chunk",
+)
+@decorators.sld_settings
+@decorators.limit_concurrency("discovery-chunk-{raw_discovery_chunk_id}")
+async def discover_survey_mission_chunk(
+    raw_discovery_chunk_id: str,
+    raw_initiator: str,
+    *,
+    settings: config.SeisLabDataSettings,
+):
+    async with settings.get_db_session_maker()() as session:
+        await discovery_ops.run_discovery_chunk(
+            chunk_id=identifiers.DiscoveryChunkId(uuid.UUID(raw_discovery_chunk_id)),
+            session=session,
+            event_dispatcher=settings.get_event_dispatcher(),
+            settings=settings,
+            user=user_schemas.User(**json.loads(raw_initiator)),
+        )
+
+
+@dramatiq.actor(**decorators.BATCH_ACTOR_OPTIONS)
+@decorators.sld_settings
+async def fail_survey_mission_discovery_chunk(
+    message_data: dict,
+    retry_data: dict,
+    *,
+    settings: config.SeisLabDataSettings,
+):
+    """Fail the discovery job of a chunk whose message has been dead-lettered."""
+    chunk_kwargs = message_data["kwargs"]
+    async with settings.get_db_session_maker()() as session:
+        await discovery_ops.fail_discovery_chunk(
+            chunk_id=identifiers.DiscoveryChunkId(
+                uuid.UUID(chunk_kwargs["raw_discovery_chunk_id"])
+            ),
+            session=session,
+            event_dispatcher=settings.get_event_dispatcher(),
+            user=user_schemas.User(**json.loads(chunk_kwargs["raw_initiator"])),
+            details=(f"Discovery chunk gave up after {retry_data['retries']} retries"),
+        )
@@ -0,0 +1,37 @@
+import logging
+import uuid
+
+import dramatiq
+
+from .. import config
+from ..operations import extents as extent_ops
+from ..schemas import identifiers
+from . import decorators
+from .stub import sld_stub_broker
+
+dramatiq.set_broker(sld_stub_broker)
+logger = logging.getLogger(__name__)
+
+
+@dramatiq.actor(**decorators.BATCH_ACTOR_OPTIONS)
+@decorators.sld_settings
+@decorators.limit_concurrency("reconcile-extents")
+async def reconcile_extents(*, settings: config.SeisLabDataSettings) -> None:
+    async with settings.get_db_session_maker()() as session:
+        await extent_ops.reconcile_extents(
+            session,
+            request_id=identifiers.RequestId(uuid.uuid4()),
+            event_dispatcher=settings.get_event_dispatcher(),
+            batch_size=settings.extent_reconciliation_batch_size,
+        )
+
+
+def schedule_extent_reconciliation(settings: config.SeisLabDataSettings) -> None:
+    """Have dirty extents reconciled after a delay.
+
+    The delay lets a burst of changes be reconciled in one go, as runs that
+    find nothing left to do are cheap.
+    """
+    reconcile_extents.send_with_options(
+        delay=settings.extent_reconciliation_delay_seconds * 1000
+    )
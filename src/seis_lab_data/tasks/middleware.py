@@ -1,112 +1,81 @@
-import asyncio
 import logging
-import typing
 
 import dramatiq
-from sqlalchemy.ext.asyncio import AsyncEngine
-from redis.asyncio import Redis
-
-from ..config import (
-    get_settings,
-    SeisLabDataSettings,
-)
-from ..db.engine import (
-    get_engine,
-    get_session_maker,
-)
+from dramatiq.asyncio import get_event_loop_thread
+
+from ..config import SeisLabDataSettings
+from .resources import WorkerResources
 
 logger = logging.getLogger(__name__)
 
 
-class SeisLabDataSettingsMiddleware(dramatiq.Middleware):
-    """
-    Dramatiq middleware that stores the settings at worker initialization.
+class WorkerResourcesMiddleware(dramatiq.Middleware):
     """
+    Dramatiq middleware that manages the lifecycle of the worker's shared resources.
 
-    sld_settings: SeisLabDataSettings | None
-
-    def __init__(self, settings: SeisLabDataSettings):
-        self.sld_settings = None
-
-    def after_process_boot(self, broker: dramatiq.Broker):
-        """Hook called after a worker process boots.
-
-        Initializes the async Redis client.
-        """
-        logger.info("Initializing SeisLabData settings...")
-        self.sld_settings = get_settings()
-
-
-class AsyncSqlAlchemyDbMiddleware(dramatiq.Middleware):
-    """
-    Dramatiq middleware that manages the lifecycle of sqlalchemy async engine.
+    It must be added after dramatiq's `AsyncIO` middleware, as it uses the
+    event loop thread for warming up and closing the resources.
     """
 
-    _db_dsn: str
-    _debug: bool
-    engine: AsyncEngine | None
-    session_maker: typing.Callable | None
+    _settings: SeisLabDataSettings
+    resources: WorkerResources | None
 
-    def __init__(self, db_dsn: str, debug: bool = False):
-        self._db_dsn = db_dsn
-        self._debug = debug
-        self.engine = None
-        self.session_maker = None
-
-    def after_process_boot(self, broker: dramatiq.Broker):
-        """Hook called after a worker process boots.
-
-        Initialize the async sqlalchemy session.
-        """
-        logger.info("Initializing sqlalchemy engine...")
-        self.engine = get_engine(self._db_dsn, self._debug)
-        self.session_maker = get_session_maker(self.engine)
-        logger.debug("sqlalchemy engine initialized.")
-
-    def after_worker_shutdown(self, broker: dramatiq.Broker, worker: dramatiq.Worker):
-        """Hook called after a worker process shuts down.
-
-        Closes the async Redis client.
-        """
-        logger.info("Disposing of sqlalchemy engine...")
-        if self.engine:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.engine.dispose())
-            logger.debug("sqlalchemy engine disposed.")
-        self.engine = None
-        self.session_maker = None
-
-
-class AsyncRedisPubSubMiddleware(dramatiq.Middleware):
-    """
-    Dramatiq middleware that manages the lifecycle of a redis client for async pub/sub.
-    """
-
-    _redis_dsn: str
-    redis_client: Redis | None
-
-    def __init__(self, redis_dsn: str):
-        self._redis_dsn = redis_dsn
-        self.redis_client = None
+    def __init__(self, settings: SeisLabDataSettings):
+        self._settings = settings
+        self.resources = None
 
     def after_process_boot(self, broker: dramatiq.Broker):
         """Hook called after a worker process boots.
 
-        Initializes the async Redis client.
+        Creates the resources - connections are only opened later on.
         """
-        logger.info("Initializing Redis PubSub client...")
-        loop = asyncio.get_event_loop()
-        self.redis_client = loop.run_until_complete(Redis.from_url(self._redis_dsn))
-        logger.debug("Redis PubSub client initialized.")
+        logger.info("Initializing worker resources...")
+        self.resources = WorkerResources(self._settings)
+
+    def after_worker_boot(self, broker: dramatiq.Broker, worker: dramatiq.Worker):
+        """Hook called after the worker process has started its threads."""
+        if self.resources is None:
+            return
+        get_event_loop_thread().run_coroutine(self.resources.warm_up())
+        logger.info(f"Worker resources ready: {self.resources.get_connection_counts()}")
+
+    def after_process_message(
+        self,
+        broker: dramatiq.Broker,
+        message: dramatiq.Message,
+        *,
+        result=None,
+        exception=None,
+    ):
+        if self.resources is not None:
+            logger.debug(
+                f"Connection counts after processing {message.actor_name!r}: "
+                f"{self.resources.get_connection_counts()}"
+            )
 
     def after_worker_shutdown(self, broker: dramatiq.Broker, worker: dramatiq.Worker):
         """Hook called after a worker process shuts down.
 
-        Closes the async Redis client.
+        Closes the database engine and the redis client. This runs before the
+        `AsyncIO` middleware stops the event loop thread, as dramatiq calls the
+        `after_*` hooks in reverse order.
         """
-        logger.info("Closing Redis PubSub client...")
-        if self.redis_client:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.redis_client.aclose())
-            logger.debug("Redis PubSub client closed.")
-        self.redis_client = None
+        if self.resources is None:
+            return
+        logger.info(
+            f"Closing worker resources: {self.resources.get_connection_counts()}"
+        )
+        get_event_loop_thread().run_coroutine(self.resources.aclose())
+        self.resources = None
+        logger.debug("Worker resources closed.")
+
+
+def get_worker_resources() -> WorkerResources:
+    broker: dramatiq.Broker = dramatiq.get_broker()
+    for middleware in broker.middleware:
+        if (
+            isinstance(middleware, WorkerResourcesMiddleware)
+            and middleware.resources is not None
+        ):
+            return middleware.resources
+    raise RuntimeError("No initialized WorkerResourcesMiddleware found in the broker")
@@ -18,7 +18,7 @@ dramatiq.set_broker(sld_stub_broker)
 logger = logging.getLogger(__name__)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def create_project(
     raw_request_id: str,
@@ -37,7 +37,7 @@ async def create_project(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def update_project(
     raw_request_id: str,
@@ -58,7 +58,7 @@ async def update_project(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def delete_project(
     raw_request_id: str,
@@ -0,0 +1,96 @@
+import dataclasses
+import logging
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+)
+
+from .. import dispatch
+from ..config import SeisLabDataSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class ConnectionCounts:
+    db_pool_size: int
+    db_max_overflow: int
+    db_checked_out: int
+    db_idle: int
+    redis_in_use: int
+    redis_idle: int
+
+    @property
+    def db_max_connections(self) -> int:
+        return self.db_pool_size + self.db_max_overflow
+
+
+class WorkerResources:
+    """Resources that are shared by all actors of a worker process.
+
+    There is a single instance per worker process, which holds the database
+    engine and session maker, the redis client and the event dispatcher. These
+    are handed out by the settings object, which means actors keep on using
+    `settings.get_db_session_maker()` and `settings.get_event_dispatcher()` but
+    no longer create additional engines or redis clients.
+    """
+
+    settings: SeisLabDataSettings
+    engine: AsyncEngine
+    session_maker: async_sessionmaker
+    redis_client: Redis
+    event_dispatcher: dispatch.EventDispatcherProtocol
+
+    def __init__(self, settings: SeisLabDataSettings) -> None:
+        self.settings = settings
+        self.engine = settings.get_db_engine()
+        self.session_maker = settings.get_db_session_maker()
+        self.redis_client = settings.get_redis_client()
+        event_dispatcher = settings.get_event_dispatcher()
+        if (batch_size := settings.worker_event_batch_max_size) > 1:
+            event_dispatcher = dispatch.BatchingEventDispatcher(
+                event_dispatcher,
+                max_size=batch_size,
+                max_delay_seconds=settings.worker_event_batch_max_delay_seconds,
+            )
+            settings.set_event_dispatcher(event_dispatcher)
+        self.event_dispatcher = event_dispatcher
+
+    async def warm_up(self) -> None:
+        """Open the first database and redis connections.
+
+        This makes connection problems show up when the worker starts,
+        rather than when it processes its first message.
+        """
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await self.redis_client.ping()
+
+    async def aclose(self) -> None:
+        await self.engine.dispose()
+        await self.redis_client.aclose()
+
+    def get_connection_counts(self) -> ConnectionCounts:
+        pool = self.engine.pool
+        redis_pool = self.redis_client.connection_pool
+        return ConnectionCounts(
+            db_pool_size=self.settings.database_pool_size,
+            db_max_overflow=self.settings.database_max_overflow,
+            db_checked_out=pool.checkedout(),
+            db_idle=pool.checkedin(),
+            redis_in_use=len(redis_pool._in_use_connections),
+            redis_idle=len(redis_pool._available_connections),
+        )
+
+
+def get_max_db_connections(settings: SeisLabDataSettings, processes: int) -> int:
+    """Return how many database connections a worker may open, at most.
+
+    Each worker process has its own pool, so this grows with the number of
+    processes but not with the number of threads, which share their
+    process's pool.
+    """
+    return processes * (settings.database_pool_size + settings.database_max_overflow)
@@ -12,13 +12,14 @@ from ..schemas import (
     user as user_schemas,
 )
 from . import decorators
+from . import extents as extent_tasks
 from .stub import sld_stub_broker
 
 dramatiq.set_broker(sld_stub_broker)
 logger = logging.getLogger(__name__)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def create_survey_mission(
     raw_request_id: str,
@@ -39,7 +40,7 @@ async def create_survey_mission(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def update_survey_mission(
     raw_request_id: str,
@@ -62,9 +63,10 @@ async def update_survey_mission(
             session=session,
             event_dispatcher=settings.get_event_dispatcher(),
         )
+    extent_tasks.schedule_extent_reconciliation(settings)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def delete_survey_mission(
     raw_request_id: str,
@@ -83,3 +85,4 @@ async def delete_survey_mission(
             session=session,
             event_dispatcher=settings.get_event_dispatcher(),
         )
+    extent_tasks.schedule_extent_reconciliation(settings)
@@ -16,6 +16,7 @@ from ..schemas import (
 )
 
 from . import decorators
+from . import extents as extent_tasks
 from .stub import sld_stub_broker
 
 dramatiq.set_broker(sld_stub_broker)
@@ -23,7 +24,7 @@ dramatiq.set_broker(sld_stub_broker)
 logger = logging.getLogger(__name__)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def create_survey_related_record(
     raw_request_id: str,
@@ -44,7 +45,7 @@ async def create_survey_related_record(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def delete_survey_related_record(
     raw_request_id: str,
@@ -63,9 +64,10 @@ async def delete_survey_related_record(
             session=session,
             event_dispatcher=settings.get_event_dispatcher(),
         )
+    extent_tasks.schedule_extent_reconciliation(settings)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def update_survey_related_record(
     raw_request_id: str,
@@ -88,9 +90,10 @@ async def update_survey_related_record(
             session=session,
             event_dispatcher=settings.get_event_dispatcher(),
         )
+    extent_tasks.schedule_extent_reconciliation(settings)
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.INTERACTIVE_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def handle_survey_related_record_publication(
     raw_request_id: str,
@@ -120,7 +123,7 @@ async def handle_survey_related_record_publication(
         )
 
 
-@dramatiq.actor
+@dramatiq.actor(**decorators.BATCH_ACTOR_OPTIONS)
 @decorators.sld_settings
 async def bulk_update_survey_related_records(
     raw_request_id: str,
@@ -144,6 +147,7 @@ async def bulk_update_survey_related_records(
             initiator=user_schemas.User(**json.loads(raw_initiator)),
             session=session,
             event_dispatcher=settings.get_event_dispatcher(),
+            chunk_size=settings.bulk_update_chunk_size,
             selected=selection.selected,
             excluded_record_ids=selection.excluded_record_ids,
             en_name_filter=selection.en_name_filter,
@@ -155,3 +159,4 @@ async def bulk_update_survey_related_records(
             dataset_category_id=selection.dataset_category_id,
             workflow_stage_id=selection.workflow_stage_id,
         )
+    extent_tasks.schedule_extent_reconciliation(settings)
@@ -0,0 +1,52 @@
+import json
+import logging
+import uuid
+
+import dramatiq
+
+from .. import (
+    config,
+    constants,
+)
+from ..operations import validation as validation_ops
+from ..schemas import (
+    identifiers,
+    user as user_schemas,
+)
+from . import decorators
+from .stub import sld_stub_broker
+
+dramatiq.set_broker(sld_stub_broker)
+logger = logging.getLogger(__name__)
+
+
+@dramatiq.actor(**decorators.BATCH_ACTOR_OPTIONS)
+@decorators.sld_settings
+async def bulk_validate(
+    raw_request_id: str,
+    raw_resource_type: str,
+    raw_initiator: str,
+    raw_project_id: str | None = None,
+    raw_survey_mission_id: str | None = None,
+    *,
+    settings: config.SeisLabDataSettings,
+) -> None:
+    async with settings.get_db_session_maker()() as session:
+        await validation_ops.bulk_validate(
+            request_id=identifiers.RequestId(uuid.UUID(raw_request_id)),
+            resource_type=constants.ResourceType(raw_resource_type),
+            initiator=user_schemas.User(**json.loads(raw_initiator)),
+            session=session,
+            event_dispatcher=settings.get_event_dispatcher(),
+            batch_size=settings.bulk_validation_batch_size,
+            project_id=(
+                identifiers.ProjectId(uuid.UUID(raw_project_id))
+                if raw_project_id
+                else None
+            ),
+            survey_mission_id=(
+                identifiers.SurveyMissionId(uuid.UUID(raw_survey_mission_id))
+                if raw_survey_mission_id
+                else None
+            ),
+        )
@@ -1,10 +1,13 @@
+import asyncio
 import contextlib
 from typing import (
     AsyncIterator,
     TypedDict,
 )
 
+import httpx
 import jinja2
+import prometheus_client
 import shapely
 from pygments.formatters import HtmlFormatter
 from authlib.integrations.starlette_client import OAuth
@@ -18,7 +21,6 @@ from starlette.routing import (
     Mount,
     Route,
 )
-from starlette.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
 from starlette_babel import (
     get_translator,
@@ -32,6 +34,7 @@ from starlette_wtf import (
 from .. import (
     config,
     constants,
+    geojson,
 )
 from ..auth import (
     AuthConfig,
@@ -39,7 +42,17 @@ from ..auth import (
 )
 from ..tasks.broker import setup_broker
 
-from . import jinjafilters
+from . import (
+    compression,
+    fragmentcache,
+    instrumentation,
+    introspection,
+    jinjafilters,
+    lookuptables,
+    rendering,
+    staticassets,
+    tokenverification,
+)
 from .auth_backend import OIDCAuthBackend
 from .routes import (
     auth,
@@ -57,9 +70,14 @@ from .routes.workflowstages import routes as workflow_stage_routes
 class State(TypedDict):
     settings: config.SeisLabDataSettings
     templates: Jinja2Templates
+    renderer: rendering.TemplateRenderer
+    fragment_cache: fragmentcache.FragmentCache
+    lookup_tables: lookuptables.LookupTableCache
     auth_config: AuthConfig
     oauth_manager: OAuth
     redis_client: aioredis.Redis
+    http_client: httpx.AsyncClient
+    token_verifier: tokenverification.TokenVerifierProtocol
 
 
 @contextlib.asynccontextmanager
@@ -68,8 +86,14 @@ async def lifespan(app: Starlette) -> AsyncIterator[State]:
     auth_config = AuthConfig.from_settings(settings)
     shared_translator = get_translator()
     shared_translator.load_from_directory(settings.translations_dir)
+    bytecode_cache = None
+    if (bytecode_cache_dir := settings.templates_bytecode_cache_dir) is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_dir))
     jinja_env = jinja2.Environment(
-        loader=jinja2.FileSystemLoader(settings.templates_dir), autoescape=True
+        loader=jinja2.FileSystemLoader(settings.templates_dir),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
     )
     default_bbox = shapely.from_wkt(settings.webmap_default_bbox_wkt)
     min_lon, min_lat, max_lon, max_lat = default_bbox.bounds
@@ -110,19 +134,100 @@ async def lifespan(app: Starlette) -> AsyncIterator[State]:
     jinja_env.filters["is_unpublishable"] = jinjafilters.is_unpublishable
     jinja_env.filters["highlight_json"] = jinjafilters.highlight_json
     jinja_env.filters["asset_url"] = jinjafilters.get_url_for_asset
+    jinja_env.filters["map_bbox"] = geojson.get_map_bbox
+    jinja_env.globals["static_url"] = staticassets.get_static_url_function(
+        app.state.static_manifest
+    )
+    if settings.instrumentation_enabled:
+        jinja_env.template_class = instrumentation.InstrumentedTemplate
+        instrumentation.instrument_engine(settings.get_db_engine().sync_engine)
     configure_jinja_env(jinja_env)
     templates = Jinja2Templates(env=jinja_env)
-    yield State(
-        settings=settings,
-        templates=templates,
-        auth_config=auth_config,
-        oauth_manager=get_oauth_manager(auth_config),
-        redis_client=aioredis.from_url(settings.message_broker_dsn.unicode_string()),
+    renderer = rendering.TemplateRenderer(jinja_env)
+    renderer.precompile()
+    redis_client = instrumentation.InstrumentedRedis.from_url(
+        settings.message_broker_dsn.unicode_string()
+    )
+    # a single pooled client, which keeps connections to the auth server open
+    http_client = httpx.AsyncClient(timeout=5.0)
+    token_introspector = introspection.TokenIntrospector(
+        http_client,
+        auth_config,
+        ttl_seconds=settings.auth_token_introspection_cache_seconds,
+        negative_ttl_seconds=settings.auth_token_introspection_negative_cache_seconds,
+        max_entries=settings.auth_token_introspection_cache_max_entries,
+        redis_client=(
+            redis_client if settings.auth_token_introspection_shared_cache else None
+        ),
     )
+    jwks_cache = None
+    token_verifier: tokenverification.TokenVerifierProtocol = token_introspector
+    if settings.auth_token_verification_mode == constants.TokenVerificationMode.LOCAL:
+        jwks_cache = tokenverification.JwksCache(
+            http_client,
+            auth_config.jwks_uri,
+            refresh_interval_seconds=settings.auth_jwks_refresh_interval_seconds,
+        )
+        jwks_cache.start()
+        token_verifier = tokenverification.LocalTokenVerifier(
+            jwks_cache,
+            auth_config,
+            token_introspector,
+            revocation_check_interval_seconds=(
+                settings.auth_token_revocation_check_interval_seconds
+            ),
+            max_entries=settings.auth_token_introspection_cache_max_entries,
+        )
+    lookup_tables = lookuptables.LookupTableCache(
+        settings.get_db_session_maker(),
+        jinja_env,
+        settings.locales,
+        max_age_seconds=settings.lookup_tables_max_age_seconds,
+    )
+    lookup_table_tasks = [
+        asyncio.create_task(lookup_tables.listen(redis_client, settings.event_backend)),
+        asyncio.create_task(lookup_tables.warm_up()),
+    ]
+    try:
+        yield State(
+            settings=settings,
+            templates=templates,
+            renderer=renderer,
+            fragment_cache=fragmentcache.FragmentCache(
+                redis_client,
+                ttl_seconds=settings.fragment_cache_ttl_seconds,
+                enabled=settings.fragment_cache_enabled,
+            ),
+            lookup_tables=lookup_tables,
+            auth_config=auth_config,
+            oauth_manager=get_oauth_manager(auth_config),
+            redis_client=redis_client,
+            http_client=http_client,
+            token_verifier=token_verifier,
+        )
+    finally:
+        for task in lookup_table_tasks:
+            task.cancel()
+        if isinstance(token_verifier, tokenverification.LocalTokenVerifier):
+            await token_verifier.aclose()
+        if jwks_cache is not None:
+            await jwks_cache.aclose()
+        await http_client.aclose()
 
 
 def create_app_from_settings(settings: config.SeisLabDataSettings) -> Starlette:
     setup_broker(settings)
+    # each app gets its own registry, as metrics cannot be registered twice
+    http_metrics = instrumentation.HttpMetrics(prometheus_client.CollectorRegistry())
+    middleware = []
+    if settings.instrumentation_enabled:
+        middleware.append(
+            Middleware(
+                instrumentation.RequestInstrumentationMiddleware,
+                metrics=http_metrics,
+                server_timing=settings.instrumentation_server_timing_enabled,
+            )
+        )
     app = Starlette(
         debug=settings.debug,
         routes=[
@@ -162,6 +267,14 @@ def create_app_from_settings(settings: config.SeisLabDataSettings) -> Starlette:
         ],
         lifespan=lifespan,
         middleware=[
+            *middleware,
+            Middleware(
+                compression.StreamingCompressionMiddleware,
+                enabled=settings.compression_enabled,
+                minimum_size=settings.compression_minimum_size,
+                gzip_level=settings.compression_gzip_level,
+                brotli_quality=settings.compression_brotli_quality,
+            ),
             Middleware(
                 LocaleMiddleware,
                 locales=settings.locales,
@@ -178,8 +291,22 @@ def create_app_from_settings(settings: config.SeisLabDataSettings) -> Starlette:
             ),
         ],
     )
+    if settings.instrumentation_enabled:
+        app.state.http_metrics = http_metrics
+        app.add_route("/metrics", instrumentation.get_metrics, name="metrics")
     settings.static_dir.mkdir(parents=True, exist_ok=True)
-    app.mount("/static", StaticFiles(directory=settings.static_dir), name="static")
+    # built once, so that serving static files does not need to stat them
+    app.state.static_manifest = staticassets.StaticAssetManifest.from_settings(
+        settings.static_dir, settings.static_build_dir
+    )
+    app.mount(
+        "/static",
+        staticassets.FingerprintedStaticFiles(
+            app.state.static_manifest,
+            directory=settings.static_dir,
+        ),
+        name="static",
+    )
     return app
 
 
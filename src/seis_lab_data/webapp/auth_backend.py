@@ -1,7 +1,5 @@
 import logging
-import time
 
-import httpx
 from starlette.authentication import (
     AuthCredentials,
     AuthenticationBackend,
@@ -9,17 +7,24 @@ from starlette.authentication import (
 )
 from starlette.requests import HTTPConnection
 
-from ..auth import AuthConfig
 from ..config import SeisLabDataSettings
 from ..schemas import (
     identifiers,
     user as user_schemas,
 )
+from .tokenverification import TokenVerifierProtocol
 
 logger = logging.getLogger(__name__)
 
 
 class OIDCAuthBackend(AuthenticationBackend):
+    """Authenticate users by checking the access token stored in their session.
+
+    Tokens are checked with the lifespan's token verifier, which either
+    introspects them, caching the outcome across requests, or verifies them
+    locally against the auth server's signing keys.
+    """
+
     def __init__(self, settings: SeisLabDataSettings) -> None:
         self.settings = settings
 
@@ -28,18 +33,10 @@ class OIDCAuthBackend(AuthenticationBackend):
         if not token:
             return AuthCredentials([]), UnauthenticatedUser()
 
-        now = time.time()
-        introspected_at = conn.session.get("token_introspected_at")
-        if not (
-            introspected_at
-            and (now - introspected_at)
-            < self.settings.auth_token_introspection_cache_seconds
-        ):
-            active = await self._introspect_token(token["access_token"])
-            if not active:
-                conn.session.clear()
-                return AuthCredentials([]), UnauthenticatedUser()
-            conn.session["token_introspected_at"] = now
+        token_verifier: TokenVerifierProtocol = conn.state.token_verifier
+        if not await token_verifier.is_active(token["access_token"]):
+            conn.session.clear()
+            return AuthCredentials([]), UnauthenticatedUser()
 
         user_info = conn.session.get("user", {})
         id_ = user_info.get("sub")
@@ -54,18 +51,3 @@ class OIDCAuthBackend(AuthenticationBackend):
             roles=list(user_info.get("roles", [])),
             active=user_info.get("email_verified", False),
         )
-
-    async def _introspect_token(self, access_token: str) -> bool:
-        auth_config = AuthConfig.from_settings(self.settings)
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    auth_config.introspection_endpoint,
-                    data={"token": access_token},
-                    auth=(auth_config.client_id, auth_config.client_secret),
-                    timeout=5.0,
-                )
-            return response.json().get("active", False)
-        except Exception:
-            logger.warning("Token introspection failed — failing closed", exc_info=True)
-            return False
@@ -0,0 +1,241 @@
+import dataclasses
+import zlib
+from typing import (
+    Callable,
+    Final,
+    Protocol,
+    TypeVar,
+)
+
+from starlette.datastructures import (
+    Headers,
+    MutableHeaders,
+)
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, without it only gzip is offered
+    brotli = None
+
+_COMPRESSIBLE_CONTENT_TYPES: Final[tuple[str, ...]] = (
+    "text/",
+    "application/json",
+    "application/geo+json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+_OPTIONS_ATTRIBUTE: Final[str] = "__compression_options__"
+
+_Endpoint = TypeVar("_Endpoint", bound=Callable)
+
+
+@dataclasses.dataclass(frozen=True)
+class CompressionOptions:
+    enabled: bool = True
+    minimum_size: int = 500
+    gzip_level: int = 6
+    brotli_quality: int = 4
+
+
+def configure(**options) -> Callable[[_Endpoint], _Endpoint]:
+    """Override the compression options of a route's endpoint.
+
+    Options that are not given keep the values the middleware was set up
+    with, e.g. `@compression.configure(enabled=False)`.
+    """
+
+    def decorator(endpoint: _Endpoint) -> _Endpoint:
+        setattr(endpoint, _OPTIONS_ATTRIBUTE, options)
+        return endpoint
+
+    return decorator
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes, *, final: bool) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits=31 makes zlib write a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if not data and not final:
+            return b""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if not data and not final:
+            return b""
+        compressed = self._compressor.process(data)
+        return compressed + (
+            self._compressor.finish() if final else self._compressor.flush()
+        )
+
+
+class StreamingCompressionMiddleware:
+    """Compress responses with brotli or gzip, including streamed ones.
+
+    Unlike starlette's `GZipMiddleware`, streamed responses - most notably
+    the SSE responses sent by datastar - are compressed too, with the
+    compressor being flushed after each chunk. This means each event reaches
+    the client as soon as it is sent, while the compression context is kept
+    for the whole connection, so repeated markup in later events compresses
+    very well.
+
+    Routes can override the middleware's options with `configure()`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        enabled: bool = True,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.options = CompressionOptions(
+            enabled=enabled,
+            minimum_size=minimum_size,
+            gzip_level=gzip_level,
+            brotli_quality=brotli_quality,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.options.enabled:
+            await self.app(scope, receive, send)
+            return
+        accepted = get_accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.app, self.options, encoding)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, options: CompressionOptions, encoding: str):
+        self.app = app
+        self.options = options
+        self.encoding = encoding
+        self.send: Send | None = None
+        self.scope: Scope | None = None
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.scope = scope
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # sending the start message is delayed until the first body chunk
+            # shows whether the response is going to be compressed
+            self.start_message = message
+            self.passthrough = not self._is_compressible(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send_start_message()
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            await self._start_body(message, body, more_body)
+            return
+        message["body"] = self.compressor.compress(body, final=not more_body)
+        await self.send(message)
+
+    async def _start_body(self, message: Message, body: bytes, more_body: bool):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        is_event_stream = headers.get("content-type", "").startswith(
+            "text/event-stream"
+        )
+        if not more_body and len(body) < self.options.minimum_size:
+            self.passthrough = True
+            await self._send_start_message()
+            await self.send(message)
+            return
+        self.compressor = self._get_compressor()
+        message["body"] = self.compressor.compress(body, final=not more_body)
+        headers["Content-Encoding"] = self.encoding
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+        if is_event_stream:
+            # keep reverse proxies from buffering, which would defeat flushing
+            headers["X-Accel-Buffering"] = "no"
+        await self._send_start_message()
+        await self.send(message)
+
+    async def _send_start_message(self) -> None:
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            await self.send(start_message)
+
+    def _is_compressible(self, start_message: Message) -> bool:
+        self.options = self._get_route_options()
+        if not self.options.enabled:
+            return False
+        if start_message["status"] in (204, 206, 304):
+            return False
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        return headers.get("content-type", "").startswith(_COMPRESSIBLE_CONTENT_TYPES)
+
+    def _get_route_options(self) -> CompressionOptions:
+        # routing has already happened by the time the response starts, so the
+        # scope holds the endpoint that produced it
+        overrides = getattr(self.scope.get("endpoint"), _OPTIONS_ATTRIBUTE, None)
+        if not overrides:
+            return self.options
+        return dataclasses.replace(self.options, **overrides)
+
+    def _get_compressor(self) -> _Compressor:
+        if self.encoding == "br":
+            return _BrotliCompressor(self.options.brotli_quality)
+        return _GzipCompressor(self.options.gzip_level)
+
+
+def get_accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Parse an `Accept-Encoding` header, leaving out refused encodings."""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        encoding, _, params = item.strip().partition(";")
+        if params:
+            try:
+                if float(params.strip().removeprefix("q=")) == 0:
+                    continue
+            except ValueError:
+                continue
+        if encoding := encoding.strip().lower():
+            accepted.add(encoding)
+    return accepted
@@ -0,0 +1,119 @@
+import dataclasses
+import datetime as dt
+import email.utils
+import hashlib
+import json
+import logging
+from typing import Self
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..db.queries.common import ModificationSummary
+from ..schemas.user import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class Validators:
+    """HTTP validators of a response, for handling conditional requests.
+
+    The ETag is derived from when the rows shown in the response were last
+    modified, how many of them there are, the versions of lookup tables and
+    whatever else the response depends on - like the current user, language
+    and filters. This means it can be computed with a cheap query, before
+    fetching and rendering the actual response.
+    """
+
+    etag: str
+    last_modified: dt.datetime | None
+
+    @classmethod
+    def from_modification_summary(
+        cls,
+        summary: ModificationSummary,
+        *,
+        with_last_modified: bool = True,
+        **variant: str | int | None,
+    ) -> Self:
+        """Build validators from a modification summary.
+
+        List responses should pass `with_last_modified=False`: deleting a
+        row does not make the most recent modification time any more recent,
+        so only their ETag, which includes the number of rows, is reliable.
+        """
+        last_modified = summary.last_modified
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=dt.timezone.utc)
+        digest = hashlib.sha256(
+            json.dumps(
+                {
+                    "last_modified": (
+                        last_modified.isoformat() if last_modified else None
+                    ),
+                    "num_rows": summary.num_rows,
+                    "version": summary.version,
+                    **variant,
+                },
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        return cls(
+            etag=f'W/"{digest[:32]}"',
+            last_modified=last_modified if with_last_modified else None,
+        )
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "ETag": self.etag,
+            # responses depend on the user and language, which are both
+            # taken from cookies, and must always be revalidated
+            "Cache-Control": "private, no-cache",
+            "Vary": "Cookie",
+        }
+        if self.last_modified is not None:
+            headers["Last-Modified"] = email.utils.format_datetime(
+                self.last_modified.astimezone(dt.timezone.utc), usegmt=True
+            )
+        return headers
+
+    def is_not_modified(self, request: Request) -> bool:
+        """Check whether the client already has the current version of a response.
+
+        As per RFC 9110, `If-Modified-Since` is ignored whenever
+        `If-None-Match` is present.
+        """
+        if (if_none_match := request.headers.get("if-none-match")) is not None:
+            return if_none_match.strip() == "*" or _strip_weak_prefix(self.etag) in {
+                _strip_weak_prefix(tag.strip()) for tag in if_none_match.split(",")
+            }
+        if (
+            if_modified_since := request.headers.get("if-modified-since")
+        ) is not None and self.last_modified is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have a one second resolution
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def get_not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers)
+        return response
+
+
+def get_user_fingerprint(user: User | None) -> str | None:
+    """Identify a user along with their roles, which determine their permissions."""
+    if user is None:
+        return None
+    return f"{user.identity}:{','.join(sorted(user.roles))}"
+
+
+def _strip_weak_prefix(etag: str) -> str:
+    return etag.removeprefix("W/")
@@ -88,6 +88,23 @@ class OnlyInternalFilter(SimpleListFilter):
             return ""
 
 
+@dataclasses.dataclass
+class OnlyEditableFilter(SimpleListFilter):
+    value: bool
+    internal_name = "only_updatable"
+    public_name: str = "filterOnlyEditable"
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, str]) -> Self:
+        return cls(value=bool(params.get(cls.public_name, False)))
+
+    def serialize_to_query_string(self) -> str:
+        if self.value:
+            return f"{self.public_name}={self.value}"
+        else:
+            return ""
+
+
 @dataclasses.dataclass
 class BoundingBoxFilter(SimpleListFilter):
     internal_name = "spatial_intersect"
@@ -467,6 +484,7 @@ class SurveyRelatedRecordListFilters(ItemListFilters):
             EnNameFilter,
             PtNameFilter,
             OnlyInternalFilter,
+            OnlyEditableFilter,
             DatasetCategoryFilter,
             MediaTypeFilter,
             WorkflowStageFilter,
@@ -0,0 +1,158 @@
+import dataclasses
+import hashlib
+import json
+import logging
+from collections.abc import (
+    AsyncIterator,
+    Sequence,
+)
+
+from datastar_py.sse import DatastarEvent
+from redis.asyncio import Redis
+
+from .. import constants
+from ..permissions.common import can_manage_item
+from ..schemas.user import User
+
+logger = logging.getLogger(__name__)
+
+# Get a cached fragment and count the lookup as either a hit or a miss, all in a
+# single round trip
+_GET_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then
+    redis.call('HINCRBY', KEYS[2], ARGV[1] .. ':hits', 1)
+else
+    redis.call('HINCRBY', KEYS[2], ARGV[1] .. ':misses', 1)
+end
+return value
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class FragmentKey:
+    name: str
+    key: str
+
+
+@dataclasses.dataclass(frozen=True)
+class FragmentCacheStats:
+    name: str
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+def get_visibility_class(user: User | None) -> str:
+    """Return which group of visitors a user belongs to, as far as lists go.
+
+    Anonymous visitors only get to see published resources, whereas any
+    authenticated user sees all of them. Editors are also shown which records
+    they may edit. All users of the same class get the same list components.
+    """
+    if user is None:
+        return "public"
+    return "editor" if can_manage_item(user) else "internal"
+
+
+class FragmentCache:
+    """Cache rendered components in redis.
+
+    Cached components are the full body of the datastar response, which
+    means a cache hit needs neither database queries nor rendering. Keys
+    include the current version of each resource type that the component
+    shows, which are bumped by the event dispatcher whenever one of those
+    resources is modified - see `dispatch.get_version_key()`.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        ttl_seconds: int,
+        enabled: bool = True,
+    ) -> None:
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._enabled = enabled
+
+    async def get_key(
+        self,
+        name: str,
+        depends_on: Sequence[constants.ResourceType],
+        **variant: str | int,
+    ) -> FragmentKey:
+        """Build the key of a component.
+
+        `variant` holds whatever else the rendered component depends on, like
+        the current filters, page and language.
+        """
+        if not self._enabled:
+            return FragmentKey(name=name, key="")
+        raw_versions = await self._redis.mget(
+            [
+                constants.RESOURCE_VERSION_KEY_TEMPLATE.format(
+                    resource_type=resource_type.value
+                )
+                for resource_type in depends_on
+            ]
+        )
+        versions = {
+            resource_type.value: int(raw_version or 0)
+            for resource_type, raw_version in zip(depends_on, raw_versions)
+        }
+        digest = hashlib.sha256(
+            json.dumps({"versions": versions, **variant}, sort_keys=True).encode()
+        ).hexdigest()
+        return FragmentKey(
+            name=name,
+            key=constants.FRAGMENT_CACHE_KEY_TEMPLATE.format(name=name, digest=digest),
+        )
+
+    async def get(self, fragment_key: FragmentKey) -> str | None:
+        if not self._enabled:
+            return None
+        cached = await self._redis.eval(
+            _GET_SCRIPT,
+            2,
+            fragment_key.key,
+            constants.FRAGMENT_CACHE_STATS_KEY,
+            fragment_key.name,
+        )
+        logger.debug(f"fragment cache {fragment_key.name!r} hit={cached is not None}")
+        if cached is None:
+            return None
+        return cached.decode() if isinstance(cached, bytes) else cached
+
+    async def set(self, fragment_key: FragmentKey, value: str) -> None:
+        if self._enabled:
+            await self._redis.set(fragment_key.key, value, ex=self._ttl_seconds)
+
+    async def replay(self, cached: str) -> AsyncIterator[DatastarEvent]:
+        yield DatastarEvent(cached)
+
+    async def stream_and_store(
+        self,
+        fragment_key: FragmentKey,
+        event_streamer: AsyncIterator[str],
+    ) -> AsyncIterator[str]:
+        """Pass on the events of a response, caching them once they are all sent."""
+        parts = []
+        async for part in event_streamer:
+            parts.append(part)
+            yield part
+        await self.set(fragment_key, "".join(parts))
+
+    async def get_stats(self) -> list[FragmentCacheStats]:
+        raw_stats = await self._redis.hgetall(constants.FRAGMENT_CACHE_STATS_KEY)
+        counters: dict[str, dict[str, int]] = {}
+        for raw_field, raw_count in raw_stats.items():
+            field = raw_field.decode() if isinstance(raw_field, bytes) else raw_field
+            name, _, counter = field.rpartition(":")
+            counters.setdefault(name, {})[counter] = int(raw_count)
+        return [
+            FragmentCacheStats(name=name, **counts) for name, counts in counters.items()
+        ]
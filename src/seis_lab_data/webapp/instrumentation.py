@@ -0,0 +1,362 @@
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import logging
+import os
+import time
+from collections.abc import Iterator
+from typing import Final
+
+import jinja2
+import prometheus_client
+from prometheus_client import multiprocess
+from redis import asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import (
+    Headers,
+    MutableHeaders,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+logger = logging.getLogger(__name__)
+
+_METRIC_PREFIX: Final[str] = "seis_lab_data"
+_QUERY_STARTS_KEY: Final[str] = "seis_lab_data_query_starts"
+_DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+_QUERY_COUNT_BUCKETS: Final[tuple[float, ...]] = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+_SIZE_BUCKETS: Final[tuple[float, ...]] = tuple(2**i * 1024 for i in range(0, 15, 2))
+_SSE_LIFETIME_BUCKETS: Final[tuple[float, ...]] = (1, 5, 15, 60, 300, 900, 3600)
+_SSE_RATE_BUCKETS: Final[tuple[float, ...]] = (0.01, 0.1, 0.5, 1, 5, 10, 50)
+
+
+class Component(str, enum.Enum):
+    DATABASE = "db"
+    RENDERING = "render"
+    REDIS = "redis"
+
+
+@dataclasses.dataclass
+class RequestMetrics:
+    started_at: float = dataclasses.field(default_factory=time.perf_counter)
+    durations: dict[Component, float] = dataclasses.field(
+        default_factory=lambda: {component: 0.0 for component in Component}
+    )
+    num_queries: int = 0
+    bytes_sent: int = 0
+    status_code: int = 500
+    is_event_stream: bool = False
+    num_events: int = 0
+
+    def get_elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def get_server_timing(self) -> str:
+        """Describe the time spent so far, as a `Server-Timing` header value."""
+        entries = [
+            f"{component.value};dur={seconds * 1000:.1f}"
+            for component, seconds in self.durations.items()
+        ]
+        entries[0] += f';desc="{self.num_queries} queries"'
+        entries.append(f"total;dur={self.get_elapsed_seconds() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_metrics: contextvars.ContextVar[RequestMetrics | None] = (
+    contextvars.ContextVar("request_metrics", default=None)
+)
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[RequestMetrics]:
+    """Collect the metrics of whatever runs in the current context."""
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextlib.contextmanager
+def measure(component: Component) -> Iterator[None]:
+    """Add the time spent in the block to the current request's metrics."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (metrics := _current_metrics.get()) is not None:
+            metrics.durations[component] += time.perf_counter() - started_at
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time the queries that an engine sends to the database.
+
+    For async engines, pass their `sync_engine`. SQLAlchemy runs these hooks
+    in the context of the coroutine that issued the query, so queries are
+    attributed to the right request.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_STARTS_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info[_QUERY_STARTS_KEY].pop()
+    if (metrics := _current_metrics.get()) is not None:
+        metrics.durations[Component.DATABASE] += time.perf_counter() - started_at
+        metrics.num_queries += 1
+
+
+def _handle_error(exception_context):
+    if (connection := exception_context.connection) is not None:
+        if query_starts := connection.info.get(_QUERY_STARTS_KEY):
+            query_starts.pop()
+
+
+class InstrumentedTemplate(jinja2.Template):
+    """A template which times its rendering.
+
+    Set as the environment's `template_class` before any template is loaded.
+    Templates that are rendered in worker threads are measured too, as anyio
+    runs them in a copy of the caller's context.
+    """
+
+    def render(self, *args, **kwargs) -> str:
+        with measure(Component.RENDERING):
+            return super().render(*args, **kwargs)
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """A redis client which times its commands.
+
+    Commands sent by pipelines and pubsub subscriptions are not included.
+    """
+
+    async def execute_command(self, *args, **options):
+        with measure(Component.REDIS):
+            return await super().execute_command(*args, **options)
+
+
+class HttpMetrics:
+    """Prometheus metrics about HTTP requests, with a series per route.
+
+    SSE responses get their own metrics, as their duration is how long the
+    client stayed connected, rather than how long it took to respond.
+    """
+
+    def __init__(self, registry: prometheus_client.CollectorRegistry) -> None:
+        self.registry = registry
+        self.request_duration = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_http_request_duration_seconds",
+            "Time taken to respond to requests",
+            ["method", "route", "status"],
+            buckets=_DURATION_BUCKETS,
+            registry=registry,
+        )
+        self.component_duration = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_http_request_component_duration_seconds",
+            "Time spent by requests on the database, rendering and redis",
+            ["route", "component"],
+            buckets=_DURATION_BUCKETS,
+            registry=registry,
+        )
+        self.num_queries = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_http_request_db_queries",
+            "Number of database queries made by requests",
+            ["route"],
+            buckets=_QUERY_COUNT_BUCKETS,
+            registry=registry,
+        )
+        self.response_size = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_http_response_size_bytes",
+            "Number of bytes sent in response bodies",
+            ["route"],
+            buckets=_SIZE_BUCKETS,
+            registry=registry,
+        )
+        self.sse_connection_duration = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_sse_connection_duration_seconds",
+            "How long SSE connections stay open",
+            ["route"],
+            buckets=_SSE_LIFETIME_BUCKETS,
+            registry=registry,
+        )
+        self.sse_open_connections = prometheus_client.Gauge(
+            f"{_METRIC_PREFIX}_sse_open_connections",
+            "Number of currently open SSE connections",
+            ["route"],
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.sse_events = prometheus_client.Counter(
+            f"{_METRIC_PREFIX}_sse_events",
+            "Number of SSE messages sent",
+            ["route"],
+            registry=registry,
+        )
+        self.sse_event_rate = prometheus_client.Histogram(
+            f"{_METRIC_PREFIX}_sse_events_per_second",
+            "Average rate of SSE messages over each connection",
+            ["route"],
+            buckets=_SSE_RATE_BUCKETS,
+            registry=registry,
+        )
+
+    def observe(self, method: str, route: str, metrics: RequestMetrics) -> None:
+        elapsed = metrics.get_elapsed_seconds()
+        if metrics.is_event_stream:
+            self.sse_connection_duration.labels(route).observe(elapsed)
+            self.sse_events.labels(route).inc(metrics.num_events)
+            if elapsed > 0:
+                self.sse_event_rate.labels(route).observe(metrics.num_events / elapsed)
+        else:
+            self.request_duration.labels(
+                method, route, str(metrics.status_code)
+            ).observe(elapsed)
+        for component, seconds in metrics.durations.items():
+            self.component_duration.labels(route, component.value).observe(seconds)
+        self.num_queries.labels(route).observe(metrics.num_queries)
+        self.response_size.labels(route).observe(metrics.bytes_sent)
+
+    def export(self) -> bytes:
+        registry = self.registry
+        # with several worker processes, each one writes its metrics to files
+        # that must be aggregated
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry)
+
+
+class RequestInstrumentationMiddleware:
+    """Record where the time of each request goes.
+
+    Total time, database time and query count, template rendering time, redis
+    time and the number of bytes sent are:
+
+    - sent to the client as a `Server-Timing` header, which describes the
+      time spent until the response started;
+    - logged once the response is complete;
+    - exported to prometheus, through `HttpMetrics`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        metrics: HttpMetrics,
+        server_timing: bool = True,
+        excluded_paths: tuple[str, ...] = ("/metrics",),
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        with collect() as request_metrics:
+            route = "unmatched"
+
+            async def send_instrumented(message: Message) -> None:
+                nonlocal route
+                if message["type"] == "http.response.start":
+                    route = get_route_label(scope)
+                    request_metrics.status_code = message["status"]
+                    request_metrics.is_event_stream = (
+                        Headers(raw=message["headers"])
+                        .get("content-type", "")
+                        .startswith("text/event-stream")
+                    )
+                    if request_metrics.is_event_stream:
+                        self.metrics.sse_open_connections.labels(route).inc()
+                    if self.server_timing:
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", request_metrics.get_server_timing()
+                        )
+                elif message["type"] == "http.response.body":
+                    if body := message.get("body", b""):
+                        request_metrics.bytes_sent += len(body)
+                        request_metrics.num_events += 1
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_instrumented)
+            finally:
+                if request_metrics.is_event_stream:
+                    self.metrics.sse_open_connections.labels(route).dec()
+                self.metrics.observe(scope["method"], route, request_metrics)
+                _log_request(scope, route, request_metrics)
+
+
+def get_route_label(scope: Scope) -> str:
+    """Identify the route that handled a request, by its endpoint.
+
+    Endpoints are used instead of paths, which would create a new series for
+    each resource id.
+    """
+    if (endpoint := scope.get("endpoint")) is None:
+        return "unmatched"
+    if not hasattr(endpoint, "__qualname__"):
+        endpoint = type(endpoint)
+    module_name = endpoint.__module__.rpartition(".")[2]
+    return f"{module_name}.{endpoint.__qualname__}"
+
+
+def _log_request(scope: Scope, route: str, metrics: RequestMetrics) -> None:
+    details = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": route,
+        "status": metrics.status_code,
+        "duration_ms": round(metrics.get_elapsed_seconds() * 1000, 1),
+        **{
+            f"{component.value}_ms": round(seconds * 1000, 1)
+            for component, seconds in metrics.durations.items()
+        },
+        "db_queries": metrics.num_queries,
+        "bytes_sent": metrics.bytes_sent,
+    }
+    if metrics.is_event_stream:
+        details["sse_events"] = metrics.num_events
+    logger.info(
+        " ".join(f"{key}={value}" for key, value in details.items()),
+        extra={"request_metrics": details},
+    )
+
+
+async def get_metrics(request: Request) -> Response:
+    http_metrics: HttpMetrics = request.app.state.http_metrics
+    return Response(
+        http_metrics.export(), media_type=prometheus_client.CONTENT_TYPE_LATEST
+    )
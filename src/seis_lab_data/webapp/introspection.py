@@ -0,0 +1,145 @@
+import asyncio
+import dataclasses
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+import httpx
+from redis.asyncio import Redis
+
+from .. import constants
+from ..auth import AuthConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class _CacheEntry:
+    active: bool
+    expires_at: float
+
+
+@dataclasses.dataclass(frozen=True)
+class _IntrospectionResult:
+    active: bool
+    ttl_seconds: int
+
+
+class TokenIntrospector:
+    """Check whether access tokens are active, caching the outcome.
+
+    Results are cached in-process, in an LRU cache keyed by a hash of the
+    token, and optionally in redis too, which lets all web server processes
+    share them. Active tokens are cached for at most `ttl_seconds` and never
+    past their expiry time, inactive ones for `negative_ttl_seconds`.
+    Concurrent checks of the same token share a single introspection request.
+
+    Failing to reach the introspection endpoint makes `is_active()` consider
+    the token inactive, but that outcome is not cached. `get_active_status()`
+    instead reports it as unknown.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        auth_config: AuthConfig,
+        *,
+        ttl_seconds: int,
+        negative_ttl_seconds: int,
+        max_entries: int,
+        redis_client: Redis | None = None,
+    ) -> None:
+        self._http_client = http_client
+        self._auth_config = auth_config
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._max_entries = max_entries
+        self._redis = redis_client
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._pending: dict[str, asyncio.Future[bool | None]] = {}
+
+    async def is_active(self, access_token: str) -> bool:
+        return await self.get_active_status(access_token) is True
+
+    async def get_active_status(self, access_token: str) -> bool | None:
+        """Return whether a token is active, or `None` if it could not be checked."""
+        token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+        if (cached := self._get_cached(token_hash)) is not None:
+            return cached
+        if (pending := self._pending.get(token_hash)) is None:
+            pending = asyncio.ensure_future(self._resolve(token_hash, access_token))
+            self._pending[token_hash] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(token_hash, None))
+        # a waiter going away, like a closed SSE connection, must not cancel the
+        # introspection for everyone else
+        return await asyncio.shield(pending)
+
+    def _get_cached(self, token_hash: str) -> bool | None:
+        if (entry := self._entries.get(token_hash)) is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[token_hash]
+            return None
+        self._entries.move_to_end(token_hash)
+        return entry.active
+
+    def _set_cached(self, token_hash: str, result: _IntrospectionResult) -> None:
+        self._entries[token_hash] = _CacheEntry(
+            active=result.active, expires_at=time.monotonic() + result.ttl_seconds
+        )
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _resolve(self, token_hash: str, access_token: str) -> bool | None:
+        shared_key = constants.TOKEN_INTROSPECTION_KEY_TEMPLATE.format(
+            token_hash=token_hash
+        )
+        if self._redis is not None:
+            try:
+                pipeline = self._redis.pipeline(transaction=False)
+                pipeline.get(shared_key)
+                pipeline.ttl(shared_key)
+                raw_shared, raw_ttl = await pipeline.execute()
+            except Exception:
+                logger.warning("Could not read shared introspection cache")
+            else:
+                if raw_shared is not None and raw_ttl > 0:
+                    result = _IntrospectionResult(
+                        active=raw_shared in (b"1", "1"), ttl_seconds=raw_ttl
+                    )
+                    self._set_cached(token_hash, result)
+                    return result.active
+        if (result := await self._introspect(access_token)) is None:
+            return None
+        self._set_cached(token_hash, result)
+        if self._redis is not None and result.ttl_seconds > 0:
+            try:
+                await self._redis.set(
+                    shared_key, "1" if result.active else "0", ex=result.ttl_seconds
+                )
+            except Exception:
+                logger.warning("Could not write to shared introspection cache")
+        return result.active
+
+    async def _introspect(self, access_token: str) -> _IntrospectionResult | None:
+        try:
+            response = await self._http_client.post(
+                self._auth_config.introspection_endpoint,
+                data={"token": access_token},
+                auth=(self._auth_config.client_id, self._auth_config.client_secret),
+            )
+            response.raise_for_status()
+            introspected = response.json()
+        except Exception:
+            logger.warning("Token introspection failed — failing closed", exc_info=True)
+            return None
+        if not introspected.get("active", False):
+            return _IntrospectionResult(
+                active=False, ttl_seconds=self._negative_ttl_seconds
+            )
+        ttl_seconds = self._ttl_seconds
+        if (expires_at := introspected.get("exp")) is not None:
+            ttl_seconds = min(ttl_seconds, int(expires_at - time.time()))
+        return _IntrospectionResult(active=True, ttl_seconds=max(ttl_seconds, 0))
@@ -0,0 +1,352 @@
+import asyncio
+import dataclasses
+import enum
+import logging
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+)
+from typing import (
+    Any,
+    Final,
+)
+
+import jinja2
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+
+from .. import (
+    constants,
+    subscribers,
+)
+from ..db.queries import (
+    datasetcategories as category_queries,
+    projects as project_queries,
+    recordassets as asset_queries,
+    surveymissions as mission_queries,
+    workflowstages as stage_queries,
+)
+from ..localization import translate_localizable_dict
+from ..schemas import (
+    projects as project_schemas,
+    surveymissions as mission_schemas,
+)
+from ..schemas.user import User
+from .routes.common import (
+    get_mission_compound_name,
+    get_project_compound_name,
+)
+from .suggestions import (
+    SuggestionIndex,
+    build_project_suggestion_index,
+    build_survey_mission_suggestion_index,
+)
+
+logger = logging.getLogger(__name__)
+
+_LISTENER_RETRY_SECONDS: Final[float] = 5.0
+# how many projects and survey missions are offered by the pickers on list pages
+_PICKER_SIZE: Final[int] = 20
+
+
+class LookupTable(str, enum.Enum):
+    DATASET_CATEGORIES = "dataset_categories"
+    WORKFLOW_STAGES = "workflow_stages"
+    MEDIA_TYPES = "media_types"
+    PROJECTS = "projects"
+    SURVEY_MISSIONS = "survey_missions"
+    PROJECT_SUGGESTIONS = "project_suggestions"
+    SURVEY_MISSION_SUGGESTIONS = "survey_mission_suggestions"
+
+
+# survey mission names include their project's name, so both are invalidated when
+# a project changes
+_INVALIDATED_BY: Final[dict[constants.ResourceType, frozenset[LookupTable]]] = {
+    constants.ResourceType.CATEGORY: frozenset({LookupTable.DATASET_CATEGORIES}),
+    constants.ResourceType.WORKFLOW_STAGE: frozenset({LookupTable.WORKFLOW_STAGES}),
+    constants.ResourceType.RECORD: frozenset({LookupTable.MEDIA_TYPES}),
+    constants.ResourceType.PROJECT: frozenset(
+        {
+            LookupTable.PROJECTS,
+            LookupTable.SURVEY_MISSIONS,
+            LookupTable.PROJECT_SUGGESTIONS,
+            LookupTable.SURVEY_MISSION_SUGGESTIONS,
+        }
+    ),
+    constants.ResourceType.MISSION: frozenset(
+        {LookupTable.SURVEY_MISSIONS, LookupTable.SURVEY_MISSION_SUGGESTIONS}
+    ),
+}
+
+# id, label
+type LookupOption = tuple[str, str]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Entry:
+    value: Any
+    loaded_at: float
+
+
+class LookupTableCache:
+    """Keep small, rarely changing reference tables in memory.
+
+    Each web server process keeps its own copy of the tables, with labels
+    already translated to every supported locale. Tables are loaded on first
+    use, or by `warm_up()`, and are invalidated whenever `listen()` receives
+    an event about the resources they are built from. In case an event is
+    missed, tables are also reloaded once they are older than
+    `max_age_seconds`.
+
+    Projects and survey missions are kept per visibility class, since
+    anonymous visitors must only be offered published ones. Their names are
+    also kept in prefix indexes, which serve typeahead suggestions.
+    """
+
+    def __init__(
+        self,
+        db_session_maker: async_sessionmaker,
+        jinja_environment: jinja2.Environment,
+        locales: list[str],
+        *,
+        max_age_seconds: int,
+    ) -> None:
+        self._db_session_maker = db_session_maker
+        self._jinja_environment = jinja_environment
+        self._locales = locales
+        self._max_age_seconds = max_age_seconds
+        self._entries: dict[LookupTable, _Entry] = {}
+        # bumped on every invalidation, so that loads which overlap with one
+        # do not store what may already be stale data
+        self._generations = {table: 0 for table in LookupTable}
+        self._locks = {table: asyncio.Lock() for table in LookupTable}
+        self._loaders: dict[LookupTable, Callable[[], Awaitable[Any]]] = {
+            LookupTable.DATASET_CATEGORIES: self._load_dataset_categories,
+            LookupTable.WORKFLOW_STAGES: self._load_workflow_stages,
+            LookupTable.MEDIA_TYPES: self._load_media_types,
+            LookupTable.PROJECTS: self._load_projects,
+            LookupTable.SURVEY_MISSIONS: self._load_survey_missions,
+            LookupTable.PROJECT_SUGGESTIONS: self._load_project_suggestions,
+            LookupTable.SURVEY_MISSION_SUGGESTIONS: (
+                self._load_survey_mission_suggestions
+            ),
+        }
+
+    async def get_dataset_category_options(self, language: str) -> list[LookupOption]:
+        return self._localize(await self._get(LookupTable.DATASET_CATEGORIES), language)
+
+    async def get_workflow_stage_options(self, language: str) -> list[LookupOption]:
+        return self._localize(await self._get(LookupTable.WORKFLOW_STAGES), language)
+
+    async def get_media_types(
+        self, name_filter: str | None = None, limit: int | None = None
+    ) -> list[str]:
+        media_types = await self._get(LookupTable.MEDIA_TYPES)
+        if name_filter:
+            media_types = [m for m in media_types if name_filter.lower() in m.lower()]
+        return media_types[:limit]
+
+    async def get_project_names(self, user: User | None, language: str) -> list[str]:
+        names = await self._get(LookupTable.PROJECTS)
+        return self._localize(names[_get_picker_visibility(user)], language)
+
+    async def get_survey_mission_names(
+        self, user: User | None, language: str
+    ) -> list[str]:
+        names = await self._get(LookupTable.SURVEY_MISSIONS)
+        return self._localize(names[_get_picker_visibility(user)], language)
+
+    async def get_project_suggestion_index(self) -> SuggestionIndex:
+        return await self._get(LookupTable.PROJECT_SUGGESTIONS)
+
+    async def get_survey_mission_suggestion_index(self) -> SuggestionIndex:
+        return await self._get(LookupTable.SURVEY_MISSION_SUGGESTIONS)
+
+    def invalidate(self, *tables: LookupTable) -> None:
+        for table in tables or LookupTable:
+            self._entries.pop(table, None)
+            self._generations[table] += 1
+
+    def invalidate_for(self, resource_type: constants.ResourceType) -> None:
+        if tables := _INVALIDATED_BY.get(resource_type):
+            logger.debug(f"{resource_type.value} modified, invalidating {tables}")
+            self.invalidate(*tables)
+
+    async def warm_up(self) -> None:
+        try:
+            for table in LookupTable:
+                await self._get(table)
+        except Exception:
+            logger.warning("Could not load lookup tables", exc_info=True)
+
+    async def listen(
+        self, redis_client: Redis, event_backend: constants.EventBackend
+    ) -> None:
+        """Invalidate tables as events about their resources come in.
+
+        This is meant to run as a background task for the lifetime of the
+        process. Everything is invalidated whenever listening restarts, since
+        events may have been missed in the meantime.
+        """
+        topic_names = [
+            resource_type.get_topic_name() for resource_type in _INVALIDATED_BY
+        ]
+        handlers = {
+            "resource_modified": _get_modified_resource_type,
+            "bulk_resource_modified": _get_modified_resource_type,
+            "resource_status_changed": _get_modified_resource_type,
+            "discovery": _get_discovered_resource_type,
+        }
+        is_restart = False
+        while True:
+            try:
+                if event_backend == constants.EventBackend.STREAMS:
+                    subscription = await subscribers.open_topic_stream(
+                        redis_client, topic_names
+                    )
+                else:
+                    subscription = await subscribers.open_topic_subscription(
+                        redis_client, topic_names
+                    )
+                if is_restart:
+                    self.invalidate()
+                async for resource_type in subscribers.iter_topic_messages(
+                    subscription, topic_names, subscribers.HandlerContext(), handlers
+                ):
+                    self.invalidate_for(resource_type)
+            except Exception:
+                logger.warning("Lookup table listener failed", exc_info=True)
+            # the subscriber iterators swallow cancellation, so it must be
+            # checked for explicitly
+            if asyncio.current_task().cancelling():
+                return
+            is_restart = True
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+    async def _get(self, table: LookupTable) -> Any:
+        if (entry := self._get_fresh_entry(table)) is not None:
+            return entry.value
+        async with self._locks[table]:
+            # another request may have loaded the table while this one waited
+            if (entry := self._get_fresh_entry(table)) is not None:
+                return entry.value
+            generation = self._generations[table]
+            value = await self._loaders[table]()
+            if generation == self._generations[table]:
+                self._entries[table] = _Entry(value=value, loaded_at=time.monotonic())
+            return value
+
+    def _get_fresh_entry(self, table: LookupTable) -> _Entry | None:
+        entry = self._entries.get(table)
+        if entry is None or time.monotonic() - entry.loaded_at > self._max_age_seconds:
+            return None
+        return entry
+
+    async def _load_dataset_categories(self) -> dict[str, list[LookupOption]]:
+        async with self._db_session_maker() as session:
+            items = await category_queries.collect_all_dataset_categories(session)
+        return self._get_options_per_locale([(i.id, i.name) for i in items])
+
+    async def _load_workflow_stages(self) -> dict[str, list[LookupOption]]:
+        async with self._db_session_maker() as session:
+            items = await stage_queries.collect_all_workflow_stages(session)
+        return self._get_options_per_locale([(i.id, i.name) for i in items])
+
+    async def _load_media_types(self) -> list[str]:
+        async with self._db_session_maker() as session:
+            return await asset_queries.collect_all_media_types(session)
+
+    async def _load_projects(self) -> dict[str, dict[str, list[str]]]:
+        async with self._db_session_maker() as session:
+            published, _ = await project_queries.list_published_projects(
+                session, page_size=_PICKER_SIZE
+            )
+            all_, _ = await project_queries.list_projects(
+                session, page_size=_PICKER_SIZE
+            )
+            names = {}
+            for visibility, items in (("public", published), ("internal", all_)):
+                serialized = [
+                    project_schemas.ProjectReadListItem.from_db_instance(i)
+                    for i in items
+                ]
+                names[visibility] = {
+                    locale: [get_project_compound_name(i, locale) for i in serialized]
+                    for locale in self._locales
+                }
+        return names
+
+    async def _load_survey_missions(self) -> dict[str, dict[str, list[str]]]:
+        async with self._db_session_maker() as session:
+            published, _ = await mission_queries.list_published_survey_missions(
+                session, page_size=_PICKER_SIZE
+            )
+            all_, _ = await mission_queries.list_survey_missions(
+                session, page_size=_PICKER_SIZE
+            )
+            names = {}
+            for visibility, items in (("public", published), ("internal", all_)):
+                serialized = [
+                    mission_schemas.SurveyMissionReadListItem.from_db_instance(i)
+                    for i in items
+                ]
+                names[visibility] = {
+                    locale: [
+                        get_mission_compound_name(self._jinja_environment, i, locale)
+                        for i in serialized
+                    ]
+                    for locale in self._locales
+                }
+        return names
+
+    async def _load_project_suggestions(self) -> SuggestionIndex:
+        async with self._db_session_maker() as session:
+            rows = await project_queries.collect_project_names(session)
+        return build_project_suggestion_index(rows, self._locales)
+
+    async def _load_survey_mission_suggestions(self) -> SuggestionIndex:
+        async with self._db_session_maker() as session:
+            rows = await mission_queries.collect_survey_mission_names(session)
+        return build_survey_mission_suggestion_index(
+            rows, self._jinja_environment, self._locales
+        )
+
+    def _localize[T](self, per_locale: dict[str, T], language: str) -> T:
+        return per_locale.get(language, per_locale[self._locales[0]])
+
+    def _get_options_per_locale(
+        self, items: list[tuple[str, dict[str, str]]]
+    ) -> dict[str, list[LookupOption]]:
+        options = {}
+        for locale in self._locales:
+            translated = [
+                (id_, translate_localizable_dict(name, locale)) for id_, name in items
+            ]
+            options[locale] = sorted(translated, key=lambda option: option[1].lower())
+        return options
+
+
+def _get_picker_visibility(user: User | None) -> str:
+    """Return which picker names a user gets.
+
+    Unlike list components, pickers do not depend on whether a user may edit
+    what they show, only on whether unpublished resources are visible.
+    """
+    return "public" if user is None else "internal"
+
+
+async def _get_modified_resource_type(
+    message, context: subscribers.HandlerContext, done: asyncio.Event | None = None
+) -> AsyncGenerator[constants.ResourceType, None]:
+    if message.succeeded:
+        yield message.resource_type
+
+
+async def _get_discovered_resource_type(
+    message, context: subscribers.HandlerContext, done: asyncio.Event | None = None
+) -> AsyncGenerator[constants.ResourceType, None]:
+    # discovery creates survey-related records, along with their assets
+    if message.succeeded:
+        yield constants.ResourceType.RECORD
@@ -0,0 +1,110 @@
+import logging
+from collections.abc import (
+    AsyncIterator,
+    Iterator,
+)
+from typing import Final
+
+import jinja2
+from anyio import to_thread
+from datastar_py import consts as datastar_consts
+from datastar_py.sse import DatastarEvent
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# rendered output is handed over from the rendering thread in batches of roughly
+# this size - Jinja itself produces lots of very small chunks
+_STREAM_BATCH_SIZE: Final[int] = 16 * 1024
+
+
+class TemplateRenderer:
+    """Render Jinja templates without blocking the event loop.
+
+    Templates are rendered in anyio's worker threads, which lets the event loop
+    keep on serving other requests while a large list or detail component is
+    being rendered.
+    """
+
+    def __init__(self, environment: jinja2.Environment) -> None:
+        self.environment = environment
+
+    def precompile(self) -> int:
+        """Load every template, returning how many were loaded.
+
+        Loaded templates stay in the environment's cache, which means requests
+        never pay the compilation cost. When the environment has a bytecode
+        cache, only the first process that starts needs to compile them.
+        """
+        template_names = self.environment.list_templates(extensions=["html"])
+        for template_name in template_names:
+            self.environment.get_template(template_name)
+        logger.debug(f"Precompiled {len(template_names)} templates")
+        return len(template_names)
+
+    async def render(self, template_name: str, **context) -> str:
+        template = self.environment.get_template(template_name)
+        return await to_thread.run_sync(template.render, context)
+
+    async def stream_patch_elements(
+        self,
+        template_name: str,
+        *,
+        selector: str | None = None,
+        mode: datastar_consts.ElementPatchMode | None = None,
+        **context,
+    ) -> AsyncIterator[DatastarEvent]:
+        """Render a template as a datastar patch-elements event, in pieces.
+
+        This produces the same output as
+        `ServerSentEventGenerator.patch_elements()`, but sends it as soon as it
+        is rendered instead of building the whole event in memory first. Each
+        yielded piece is made up of complete lines, as each line of the
+        rendered template must become its own `data: elements` line.
+        """
+        header_lines = [f"event: {datastar_consts.EventType.PATCH_ELEMENTS}"]
+        if mode and mode != datastar_consts.ElementPatchMode.OUTER:
+            header_lines.append(f"data: {datastar_consts.MODE_DATALINE_LITERAL} {mode}")
+        if selector:
+            header_lines.append(
+                f"data: {datastar_consts.SELECTOR_DATALINE_LITERAL} {selector}"
+            )
+        yield DatastarEvent("\n".join(header_lines) + "\n")
+        template = self.environment.get_template(template_name)
+        generator = template.generate(context)
+        pending_line = ""
+        while (batch := await _render_next_batch(generator)) is not None:
+            lines, pending_line = _split_complete_lines(pending_line + batch)
+            if lines:
+                yield DatastarEvent("".join(_to_elements_line(line) for line in lines))
+        yield DatastarEvent(
+            (_to_elements_line(pending_line) if pending_line else "") + "\n"
+        )
+
+
+async def _render_next_batch(generator: Iterator[str]) -> str | None:
+    with instrumentation.measure(instrumentation.Component.RENDERING):
+        return await to_thread.run_sync(_next_batch, generator)
+
+
+def _next_batch(generator: Iterator[str]) -> str | None:
+    chunks = []
+    size = 0
+    for chunk in generator:
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= _STREAM_BATCH_SIZE:
+            break
+    return "".join(chunks) if chunks else None
+
+
+def _split_complete_lines(text: str) -> tuple[list[str], str]:
+    """Split text into its complete lines and whatever comes after the last one."""
+    lines = text.splitlines(keepends=True)
+    remainder = lines.pop() if lines and lines[-1] == lines[-1].rstrip("\r\n") else ""
+    return [line.rstrip("\r\n") for line in lines], remainder
+
+
+def _to_elements_line(line: str) -> str:
+    return f"data: {datastar_consts.ELEMENTS_DATALINE_LITERAL} {line}\n"
@@ -3,22 +3,32 @@ import logging
 import uuid
 from typing import (
     Final,
+    Sequence,
     Type,
     TypeVar,
 )
 
+import jinja2
 import pydantic
 from jinja2.filters import do_truncate
 from starlette.exceptions import HTTPException
+from redis.asyncio.client import PubSub
 from starlette.requests import Request
 
+from ... import (
+    config,
+    constants,
+    subscribers,
+)
 from ...localization import translate_localizable
+from ...schemas.common import Localizable
 from ...schemas import (
     identifiers,
     projects as project_schemas,
     surveymissions as mission_schemas,
     surveyrelatedrecords as record_schemas,
 )
+from ..streamhandlers import common as common_handlers
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +82,28 @@ def get_pagination_info(
     )
 
 
+async def open_request_subscription(
+    request: Request, topic_names: Sequence[str]
+) -> PubSub | subscribers.TopicStreamSubscription:
+    """Start listening for events on the given topics, using the configured backend.
+
+    With the `streams` event backend, reading resumes from the ``Last-Event-ID``
+    header that the datastar client sends when it reconnects.
+    """
+    settings: config.SeisLabDataSettings = request.state.settings
+    if settings.event_backend == constants.EventBackend.STREAMS:
+        return await subscribers.open_topic_stream(
+            request.state.redis_client,
+            topic_names,
+            last_event_id=request.headers.get("last-event-id"),
+            replay_window_seconds=settings.event_stream_replay_window_seconds,
+            event_id_tagger=common_handlers.tag_with_event_id,
+        )
+    return await subscribers.open_topic_subscription(
+        request.state.redis_client, topic_names
+    )
+
+
 RequestPathRetrievableIdType = TypeVar(
     "RequestPathRetrievableIdType",
     identifiers.ProjectId,
@@ -140,21 +172,57 @@ def build_related_record_compound_name(
 def build_mission_compound_name(
     request: Request, survey_mission: mission_schemas.SurveyMissionReadListItem
 ) -> str:
-    current_language = request.state.language
-    current_name = translate_localizable(survey_mission.name, current_language)
+    return get_mission_compound_name(
+        request.state.templates.env, survey_mission, request.state.language
+    )
+
+
+def get_mission_compound_name(
+    jinja_environment: jinja2.Environment,
+    survey_mission: mission_schemas.SurveyMissionReadListItem,
+    language: str,
+) -> str:
+    return format_mission_compound_name(
+        jinja_environment,
+        survey_mission.id,
+        survey_mission.name,
+        survey_mission.project.name,
+        language,
+    )
+
+
+def format_mission_compound_name(
+    jinja_environment: jinja2.Environment,
+    survey_mission_id: uuid.UUID,
+    name: Localizable,
+    project_name: Localizable,
+    language: str,
+) -> str:
+    current_name = translate_localizable(name, language)
     current_project_name = do_truncate(
-        request.state.templates.env,
-        translate_localizable(survey_mission.project.name, current_language),
+        jinja_environment,
+        translate_localizable(project_name, language),
         length=15,
         killwords=True,
         leeway=0,
     )
-    return f"{current_name} ({current_project_name}) - {survey_mission.id}"
+    return f"{current_name} ({current_project_name}) - {survey_mission_id}"
 
 
 def build_project_compound_name(
     request: Request, project: project_schemas.ProjectReadListItem
 ) -> str:
-    current_language = request.state.language
-    current_name = translate_localizable(project.name, current_language)
-    return f"{current_name} - {project.id}"
+    return get_project_compound_name(project, request.state.language)
+
+
+def get_project_compound_name(
+    project: project_schemas.ProjectReadListItem, language: str
+) -> str:
+    return format_project_compound_name(project.id, project.name, language)
+
+
+def format_project_compound_name(
+    project_id: uuid.UUID, name: Localizable, language: str
+) -> str:
+    current_name = translate_localizable(name, language)
+    return f"{current_name} - {project_id}"
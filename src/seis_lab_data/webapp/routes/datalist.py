@@ -1,87 +1,101 @@
+import asyncio
 import json
 import logging
 import typing
+from collections.abc import Awaitable
+
+from markupsafe import escape
 
 from datastar_py import ServerSentEventGenerator
 from datastar_py.starlette import DatastarResponse
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
+from starlette.responses import Response
 
-from ...db.queries import recordassets as asset_queries
-from ...operations import (
-    projects as project_ops,
-    surveymissions as mission_ops,
-    surveyrelatedrecords as record_ops,
-)
-from ...schemas import (
-    projects as project_schemas,
-    surveymissions as mission_schemas,
-    webui as webui_schemas,
-)
+from ...operations import surveyrelatedrecords as record_ops
+from ...schemas import webui as webui_schemas
 from .. import filters
+from ..lookuptables import LookupTableCache
+from ..suggestions import (
+    suggest_projects,
+    suggest_survey_missions,
+)
 from . import common
 
 logger = logging.getLogger(__name__)
 
 
 async def _event_streamer(target_datalist_id: str, values: typing.Sequence[str]):
-    rendered = "".join(f"<option value='{value}'></option>" for value in values)
+    rendered = "".join(f'<option value="{escape(value)}"></option>' for value in values)
     yield ServerSentEventGenerator.patch_elements(
         f'<datalist id="{target_datalist_id}">{"".join(rendered)}</datalist>',
     )
 
 
-async def get_projects_datalist(request: Request) -> DatastarResponse:
-    """Provides project names for building datalists.
+async def get_projects_datalist(request: Request) -> Response:
+    """Provides project name suggestions for building datalists.
 
     This route expects to be called via datastar @get and therefore tries
     to collect relevant signals from a "datastar" query param, which is a
     JSON object.
+
+    Suggestions come from an in-memory prefix index and, when it does not
+    have enough of them, from a trigram search in the database.
     """
-    current_language = request.state.language
-    if (target_datalist_id := request.query_params.get("target")) is None:
-        raise HTTPException(status_code=400, detail="target is required")
-    if (datastar_signal := request.query_params.get("signal")) is None:
-        raise HTTPException(status_code=400, detail="signal is required")
-    try:
-        search_value = json.loads(request.query_params.get("datastar"))[datastar_signal]
-    except (TypeError, KeyError) as err:
-        raise HTTPException(
-            status_code=400, detail="Could not retrieve search value"
-        ) from err
-    name_filter = filters.SearchNameFilter(
-        internal_name=f"{current_language}_name_filter",
-        public_name=f"{current_language}_name",
-        value=search_value,
-    )
-    internal_filter_kwargs = name_filter.as_kwargs()
-    logger.debug(f"{internal_filter_kwargs=}")
-    user = request.user if request.user.is_authenticated else None
-    async with request.state.settings.get_db_session_maker()() as session:
-        items, _ = await project_ops.list_projects(
-            session,
-            initiator=user,
-            **internal_filter_kwargs,
+    target_datalist_id, search_value = _get_suggestion_params(request)
+    lookup_tables: LookupTableCache = request.state.lookup_tables
+    settings = request.state.settings
+
+    async def suggest():
+        return await suggest_projects(
+            await lookup_tables.get_project_suggestion_index(),
+            settings.get_db_session_maker(),
+            search_value,
+            request.state.language,
+            limit=settings.max_name_suggestions,
+            published_only=not request.user.is_authenticated,
         )
-    serialized_items = [  # noqa
-        project_schemas.ProjectReadListItem.from_db_instance(item) for item in items
-    ]
+
+    if (suggestions := await _run_unless_disconnected(request, suggest())) is None:
+        return Response(status_code=204)
     return DatastarResponse(
-        _event_streamer(
-            target_datalist_id,
-            [common.build_project_compound_name(request, i) for i in serialized_items],
-        )
+        _event_streamer(target_datalist_id, [s.name for s in suggestions])
     )
 
 
-async def get_missions_datalist(request: Request) -> DatastarResponse:
-    """Provides survey mission names for building datalists.
+async def get_missions_datalist(request: Request) -> Response:
+    """Provides survey mission name suggestions for building datalists.
 
     This route expects to be called via datastar @get and therefore tries
     to collect relevant signals from a "datastar" query param, which is a
     JSON object.
+
+    Suggestions come from an in-memory prefix index and, when it does not
+    have enough of them, from a trigram search in the database.
     """
-    current_language = request.state.language
+    target_datalist_id, search_value = _get_suggestion_params(request)
+    lookup_tables: LookupTableCache = request.state.lookup_tables
+    settings = request.state.settings
+
+    async def suggest():
+        return await suggest_survey_missions(
+            await lookup_tables.get_survey_mission_suggestion_index(),
+            settings.get_db_session_maker(),
+            request.state.templates.env,
+            search_value,
+            request.state.language,
+            limit=settings.max_name_suggestions,
+            published_only=not request.user.is_authenticated,
+        )
+
+    if (suggestions := await _run_unless_disconnected(request, suggest())) is None:
+        return Response(status_code=204)
+    return DatastarResponse(
+        _event_streamer(target_datalist_id, [s.name for s in suggestions])
+    )
+
+
+def _get_suggestion_params(request: Request) -> tuple[str, str]:
     if (target_datalist_id := request.query_params.get("target")) is None:
         raise HTTPException(status_code=400, detail="target is required")
     if (datastar_signal := request.query_params.get("signal")) is None:
@@ -92,30 +106,33 @@ async def get_missions_datalist(request: Request) -> DatastarResponse:
         raise HTTPException(
             status_code=400, detail="Could not retrieve search value"
         ) from err
-    name_filter = filters.SearchNameFilter(
-        internal_name=f"{current_language}_name_filter",
-        public_name=f"{current_language}_name",
-        value=search_value,
-    )
-    internal_filter_kwargs = name_filter.as_kwargs()
-    logger.debug(f"{internal_filter_kwargs=}")
-    user = request.user if request.user.is_authenticated else None
-    async with request.state.settings.get_db_session_maker()() as session:
-        items, _ = await mission_ops.list_survey_missions(
-            session,
-            initiator=user,
-            **internal_filter_kwargs,
-        )
-    serialized_items = [  # noqa
-        mission_schemas.SurveyMissionReadListItem.from_db_instance(item)
-        for item in items
-    ]
-    return DatastarResponse(
-        _event_streamer(
-            target_datalist_id,
-            [common.build_mission_compound_name(request, i) for i in serialized_items],
+    return target_datalist_id, str(search_value or "")
+
+
+async def _run_unless_disconnected[T](request: Request, work: Awaitable[T]) -> T | None:
+    """Await some work, abandoning it if the client disconnects meanwhile.
+
+    datastar aborts the pending request of an element whenever it makes a new
+    one, so searches for superseded keystrokes are not carried out to the end.
+    """
+    work_task = asyncio.ensure_future(work)
+    disconnect_task = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        done, _ = await asyncio.wait(
+            {work_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED
         )
-    )
+    finally:
+        work_task.cancel()
+        disconnect_task.cancel()
+    if work_task not in done:
+        logger.debug("Client disconnected, abandoned its request")
+        return None
+    return work_task.result()
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
 
 
 async def get_records_datalist(request: Request) -> DatastarResponse:
@@ -182,10 +199,8 @@ async def get_registered_media_types(request: Request) -> DatastarResponse:
         raise HTTPException(
             status_code=400, detail="Could not retrieve search value"
         ) from err
-    async with request.state.settings.get_db_session_maker()() as session:
-        media_types = await asset_queries.list_media_types(
-            session, name_filter=search_value
-        )
-    return DatastarResponse(
-        _event_streamer(target_datalist_id, [i for i in media_types if i])
+    lookup_tables: LookupTableCache = request.state.lookup_tables
+    media_types = await lookup_tables.get_media_types(
+        name_filter=search_value, limit=20
     )
+    return DatastarResponse(_event_streamer(target_datalist_id, media_types))
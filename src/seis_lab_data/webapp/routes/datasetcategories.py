@@ -31,11 +31,13 @@ from ...schemas import (
 from ...tasks import datasetcategories as category_tasks
 from .. import (
     filters,
+    rendering,
 )
 from ..forms import datasetcategories as category_forms
 from ..streamhandlers import common as common_handlers
 from .auth import requires_auth
 from .common import (
+    open_request_subscription,
     get_page_from_request_params,
     get_pagination_info,
 )
@@ -81,31 +83,29 @@ async def get_list_component(request: Request):
     serialized_items = [
         category_schemas.DatasetCategoryReadListItem.from_db_instance(i) for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("datasetcategories/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-        permissions={
-            "can_create": category_permissions.can_create_dataset_category(user),
-            "can_update": category_permissions.can_update_dataset_category(user),
-            "can_delete": category_permissions.can_delete_dataset_category(user),
-        }
-        if user is not None
-        else {"can_create": False, "can_update": False, "can_delete": False},
-        search_initial_value=list_filters.get_text_search_filter(
-            request.state.language
-        ),
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "datasetcategories/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+            permissions={
+                "can_create": category_permissions.can_create_dataset_category(user),
+                "can_update": category_permissions.can_update_dataset_category(user),
+                "can_delete": category_permissions.can_delete_dataset_category(user),
+            }
+            if user is not None
+            else {"can_create": False, "can_update": False, "can_delete": False},
+            search_initial_value=list_filters.get_text_search_filter(
+                request.state.language
+            ),
+        ):
+            yield event_part
 
     return DatastarResponse(event_streamer())
 
@@ -199,9 +199,7 @@ async def get_update_form(request: Request):
 
 async def stream_to_list_page(request: Request):
     topic_names = [constants.NEW_TOPIC_DATASET_CATEGORIES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -234,9 +232,7 @@ async def stream_to_new_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_DATASET_CATEGORIES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -276,9 +272,7 @@ async def stream_to_update_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_DATASET_CATEGORIES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
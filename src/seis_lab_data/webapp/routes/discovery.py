@@ -31,11 +31,13 @@ from ...schemas import (
 from ...tasks import discovery as discovery_tasks
 from .. import (
     filters,
+    rendering,
 )
 from ..forms import discovery as discovery_forms
 from ..streamhandlers import common as common_handlers
 from .auth import requires_auth
 from .common import (
+    open_request_subscription,
     get_page_from_request_params,
     get_pagination_info,
 )
@@ -84,37 +86,35 @@ async def get_list_component(request: Request):
         discovery_schemas.AssetDiscoveryConfigurationReadDetail.from_db_instance(i)
         for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("discovery/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-        permissions={
-            "can_create": discovery_permissions.can_create_asset_discovery_configuration(
-                user
-            ),
-            "can_update": discovery_permissions.can_update_asset_discovery_configuration(
-                user
-            ),
-            "can_delete": discovery_permissions.can_delete_asset_discovery_configuration(
-                user
-            ),
-        }
-        if user is not None
-        else {"can_create": False, "can_update": False, "can_delete": False},
-        search_initial_value=list_filters.get_text_search_filter(
-            request.state.language
-        ),
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "discovery/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+            permissions={
+                "can_create": discovery_permissions.can_create_asset_discovery_configuration(
+                    user
+                ),
+                "can_update": discovery_permissions.can_update_asset_discovery_configuration(
+                    user
+                ),
+                "can_delete": discovery_permissions.can_delete_asset_discovery_configuration(
+                    user
+                ),
+            }
+            if user is not None
+            else {"can_create": False, "can_update": False, "can_delete": False},
+            search_initial_value=list_filters.get_text_search_filter(
+                request.state.language
+            ),
+        ):
+            yield event_part
 
     return DatastarResponse(event_streamer())
 
@@ -218,9 +218,7 @@ async def get_update_form(request: Request):
 
 async def stream_to_list_page(request: Request):
     topic_names = [constants.NEW_TOPIC_ASSET_DISCOVERY_CONFIGURATIONS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -253,9 +251,7 @@ async def stream_to_new_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_ASSET_DISCOVERY_CONFIGURATIONS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -295,9 +291,7 @@ async def stream_to_update_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_ASSET_DISCOVERY_CONFIGURATIONS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -7,7 +7,6 @@ import shapely
 from datastar_py import ServerSentEventGenerator
 from datastar_py.consts import ElementPatchMode
 from datastar_py.starlette import DatastarResponse
-from redis.asyncio import Redis
 from starlette.endpoints import HTTPEndpoint
 from starlette.exceptions import HTTPException
 from starlette.responses import Response
@@ -24,6 +23,7 @@ from ... import (
     geojson,
     subscribers,
 )
+from ...db.queries import projects as project_queries
 from ...operations import (
     projects as project_ops,
     surveymissions as survey_mission_ops,
@@ -44,7 +44,12 @@ from ...schemas import (
     webui as webui_schemas,
 )
 from ..streamhandlers import common as common_handlers
-from .. import filters
+from .. import (
+    conditional,
+    filters,
+    fragmentcache,
+    rendering,
+)
 from ..forms import (
     projects as project_forms,
     surveymissions as mission_forms,
@@ -53,6 +58,7 @@ from .auth import (
     requires_auth,
 )
 from .common import (
+    open_request_subscription,
     get_id_from_request_path,
     get_page_from_request_params,
     get_pagination_info,
@@ -194,12 +200,34 @@ async def get_project_update_form(request: Request):
     )
 
 
+async def _get_project_details_validators(
+    request: Request,
+) -> conditional.Validators:
+    """Get the validators of a project's details, without fetching them."""
+    project_id = get_id_from_request_path(request, "project_id", identifiers.ProjectId)
+    user = request.user if request.user.is_authenticated else None
+    settings: config.SeisLabDataSettings = request.state.settings
+    async with settings.get_db_session_maker()() as session:
+        summary = await project_queries.get_project_modification_summary(
+            session, project_id
+        )
+    return conditional.Validators.from_modification_summary(
+        summary,
+        query=str(request.query_params),
+        language=str(request.state.language),
+        user=conditional.get_user_fingerprint(user),
+    )
+
+
 @requires_auth
 async def get_project_details_component(request: Request):
+    validators = await _get_project_details_validators(request)
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
     details = await _get_project_details(request)
-    template_processor = request.state.templates
-    template = template_processor.get_template("projects/detail-component.html")
-    rendered = template.render(
+    renderer: rendering.TemplateRenderer = request.state.renderer
+    rendered = await renderer.render(
+        "projects/detail-component.html",
         request=request,
         project=details.item,
         pagination=details.pagination,
@@ -215,16 +243,14 @@ async def get_project_details_component(request: Request):
             mode=ElementPatchMode.INNER,
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(DatastarResponse(event_streamer()))
 
 
 async def stream_to_list_page(request: Request):
     """Stream relevant updates for the project list page."""
 
     topic_names = [constants.NEW_TOPIC_PROJECTS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -263,9 +289,7 @@ async def stream_to_new_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_PROJECTS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -299,11 +323,10 @@ async def stream_to_update_page(request: Request):
             status_code=400, detail="Invalid project or request id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user if request.user.is_authenticated else None
 
     topic_names = [constants.NEW_TOPIC_PROJECTS]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -337,14 +360,13 @@ async def stream_to_detail_page(request: Request):
             status_code=400, detail="Invalid project or request id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user if request.user.is_authenticated else None
 
     topic_names = [
         constants.NEW_TOPIC_PROJECTS,
         constants.NEW_TOPIC_SURVEY_MISSIONS,
     ]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -466,6 +488,33 @@ async def get_list_component(request: Request):
     current_page = get_page_from_request_params(request)
     settings: config.SeisLabDataSettings = request.state.settings
     user = request.user if request.user.is_authenticated else None
+    async with settings.get_db_session_maker()() as session:
+        validators = conditional.Validators.from_modification_summary(
+            await project_queries.get_projects_modification_summary(session),
+            with_last_modified=False,
+            filters=filter_query_string,
+            page=current_page,
+            language=str(request.state.language),
+            visibility=fragmentcache.get_visibility_class(user),
+        )
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
+    fragment_cache: fragmentcache.FragmentCache = request.state.fragment_cache
+    fragment_key = await fragment_cache.get_key(
+        "projects:list",
+        depends_on=[
+            constants.ResourceType.PROJECT,
+            constants.ResourceType.MISSION,
+            constants.ResourceType.RECORD,
+        ],
+        filters=filter_query_string,
+        page=current_page,
+        language=str(request.state.language),
+        visibility=fragmentcache.get_visibility_class(user),
+        base_url=str(request.base_url),
+    )
+    if (cached := await fragment_cache.get(fragment_key)) is not None:
+        return validators.apply(DatastarResponse(fragment_cache.replay(cached)))
     async with settings.get_db_session_maker()() as session:
         items, num_total = await project_ops.list_projects(
             session,
@@ -489,21 +538,19 @@ async def get_list_component(request: Request):
     serialized_items = [
         project_schemas.ProjectReadListItem.from_db_instance(i) for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("projects/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "projects/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+        ):
+            yield event_part
         yield ServerSentEventGenerator.execute_script(
             UPDATE_BASEMAP_JS_SCRIPT.format(
                 dumped_features=json.dumps(
@@ -512,7 +559,11 @@ async def get_list_component(request: Request):
             )
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(
+        DatastarResponse(
+            fragment_cache.stream_and_store(fragment_key, event_streamer())
+        )
+    )
 
 
 class ProjectCollectionEndpoint(HTTPEndpoint):
@@ -932,6 +983,16 @@ async def get_project_missions_list_component(request: Request):
     current_page = get_page_from_request_params(request)
     settings: config.SeisLabDataSettings = request.state.settings
     user = request.user if request.user.is_authenticated else None
+    async with settings.get_db_session_maker()() as session:
+        validators = conditional.Validators.from_modification_summary(
+            await project_queries.get_project_modification_summary(session, project_id),
+            filters=filter_query_string,
+            page=current_page,
+            language=str(request.state.language),
+            visibility=fragmentcache.get_visibility_class(user),
+        )
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
     async with settings.get_db_session_maker()() as session:
         items, num_total = await survey_mission_ops.list_survey_missions(
             session,
@@ -957,23 +1018,21 @@ async def get_project_missions_list_component(request: Request):
     serialized_items = [
         webui_schemas.SurveyMissionReadListItem.from_db_instance(i) for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("survey-missions/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "survey-missions/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
-
-    return DatastarResponse(event_streamer())
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+        ):
+            yield event_part
+
+    return validators.apply(DatastarResponse(event_streamer()))
 
 
 @csrf_protect
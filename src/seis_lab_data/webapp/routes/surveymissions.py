@@ -7,7 +7,6 @@ import shapely
 from datastar_py import ServerSentEventGenerator
 from datastar_py.consts import ElementPatchMode
 from datastar_py.starlette import DatastarResponse
-from redis.asyncio import Redis
 from starlette_babel import gettext_lazy as _
 from starlette.endpoints import HTTPEndpoint
 from starlette.exceptions import HTTPException
@@ -22,14 +21,11 @@ from ... import (
     constants,
     errors,
     geojson,
-    localization,
     subscribers,
 )
 from ...db.queries import (
-    datasetcategories as category_queries,
-    recordassets as asset_queries,
+    surveymissions as mission_queries,
     surveyrelatedrecords as record_queries,
-    workflowstages as stage_queries,
 )
 from ...operations import (
     projects as project_ops,
@@ -53,14 +49,19 @@ from ...schemas import (
     webui as webui_schemas,
 )
 from .. import (
+    conditional,
     filters,
     forms,
+    fragmentcache,
+    rendering,
 )
+from ..lookuptables import LookupTableCache
 from ..streamhandlers import common as common_handlers
 from .auth import (
     requires_auth,
 )
 from .common import (
+    open_request_subscription,
     get_id_from_request_path,
     get_page_from_request_params,
     get_pagination_info,
@@ -89,6 +90,7 @@ async def _get_survey_mission_details(
     )
     filter_kwargs = survey_related_records_list_filters.as_kwargs()
     filter_kwargs.pop("survey_mission_id", None)
+    filter_kwargs.pop("only_updatable", None)
     async with settings.get_db_session_maker()() as session:
         try:
             survey_mission = await survey_mission_ops.get_survey_mission(
@@ -115,33 +117,15 @@ async def _get_survey_mission_details(
             page_size=settings.pagination_page_size,
             **filter_kwargs,
         )
-        dataset_category_filter_options = [
-            (
-                dataset_category.id,
-                localization.translate_localizable_dict(
-                    dataset_category.name, current_language
-                ),
-            )
-            for dataset_category in await category_queries.collect_all_dataset_categories(
-                session
-            )
-        ]
-        workflow_stage_filter_options = [
-            (
-                workflow_stage.id,
-                localization.translate_localizable_dict(
-                    workflow_stage.name, current_language
-                ),
-            )
-            for workflow_stage in await stage_queries.collect_all_workflow_stages(
-                session
-            )
-        ]
-        media_type_filter_options = await asset_queries.list_media_types(session)
+    lookup_tables: LookupTableCache = request.state.lookup_tables
     return webui_schemas.SurveyMissionDetails(
-        dataset_categories=dataset_category_filter_options,
-        workflow_stages=workflow_stage_filter_options,
-        filter_media_types_datalist=media_type_filter_options,
+        dataset_categories=(
+            await lookup_tables.get_dataset_category_options(current_language)
+        ),
+        workflow_stages=await lookup_tables.get_workflow_stage_options(
+            current_language
+        ),
+        filter_media_types_datalist=await lookup_tables.get_media_types(limit=20),
         current_temporal_extent={
             "begin": settings.default_temporal_extent_begin,
             "end": settings.default_temporal_extent_end,
@@ -213,12 +197,36 @@ async def _get_survey_mission_details(
     )
 
 
+async def _get_survey_mission_details_validators(
+    request: Request,
+) -> conditional.Validators:
+    """Get the validators of a survey mission's details, without fetching them."""
+    survey_mission_id = get_id_from_request_path(
+        request, "survey_mission_id", identifiers.SurveyMissionId
+    )
+    user = request.user if request.user.is_authenticated else None
+    settings: config.SeisLabDataSettings = request.state.settings
+    async with settings.get_db_session_maker()() as session:
+        summary = await mission_queries.get_survey_mission_modification_summary(
+            session, survey_mission_id
+        )
+    return conditional.Validators.from_modification_summary(
+        summary,
+        query=str(request.query_params),
+        language=str(request.state.language),
+        user=conditional.get_user_fingerprint(user),
+    )
+
+
 @requires_auth
 async def get_details_component(request: Request):
+    validators = await _get_survey_mission_details_validators(request)
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
     details = await _get_survey_mission_details(request)
-    template_processor = request.state.templates
-    template = template_processor.get_template("survey-missions/detail-component.html")
-    rendered = template.render(
+    renderer: rendering.TemplateRenderer = request.state.renderer
+    rendered = await renderer.render(
+        "survey-missions/detail-component.html",
         request=request,
         survey_mission=details.item,
         pagination=details.pagination,
@@ -238,7 +246,7 @@ async def get_details_component(request: Request):
             mode=ElementPatchMode.INNER,
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(DatastarResponse(event_streamer()))
 
 
 @requires_auth
@@ -253,11 +261,10 @@ async def stream_to_update_page(request: Request):
             status_code=400, detail="Invalid survey_mission id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user if request.user.is_authenticated else None
 
     topic_names = [constants.NEW_TOPIC_SURVEY_MISSIONS]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -293,14 +300,15 @@ async def stream_to_detail_page(request: Request):
             status_code=400, detail="Invalid survey_mission id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user if request.user.is_authenticated else None
 
     topic_names = [
         constants.NEW_TOPIC_SURVEY_MISSIONS,
         constants.NEW_TOPIC_SURVEY_RELATED_RECORDS,
+        # progress of discoveries triggered from this page
+        constants.PROGRESS_TOPIC_NAME_TEMPLATE.format(request_id=request_id),
     ]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -318,6 +326,7 @@ async def stream_to_detail_page(request: Request):
             "resource_modified": common_handlers.handle_resource_modification_detail_page,
             "resource_status_changed": common_handlers.handle_resource_status_changed_detail_page,
             "discovery": common_handlers.handle_discovery_detail_page,
+            "discovery_progress": common_handlers.handle_discovery_progress_detail_page,
         },
     )
 
@@ -393,6 +402,7 @@ async def get_mission_records_list_component(request: Request):
         else:
             internal_filter_kwargs = list_filters.as_kwargs()
             internal_filter_kwargs.pop("survey_mission_id", None)
+            internal_filter_kwargs.pop("only_updatable", None)
             filter_query_string = list_filters.serialize_to_query_string()
     else:
         internal_filter_kwargs = {}
@@ -401,6 +411,19 @@ async def get_mission_records_list_component(request: Request):
     current_page = get_page_from_request_params(request)
     settings: config.SeisLabDataSettings = request.state.settings
     user = request.user if request.user.is_authenticated else None
+    async with settings.get_db_session_maker()() as session:
+        validators = conditional.Validators.from_modification_summary(
+            await mission_queries.get_survey_mission_modification_summary(
+                session, survey_mission_id
+            ),
+            with_last_modified=False,
+            filters=filter_query_string,
+            page=current_page,
+            language=str(request.state.language),
+            user=conditional.get_user_fingerprint(user),
+        )
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
     async with settings.get_db_session_maker()() as session:
         items, num_total = await survey_related_record_ops.list_survey_related_records(
             session,
@@ -443,26 +466,22 @@ async def get_mission_records_list_component(request: Request):
         if user and record_permissions.can_bulk_update_survey_related_records(user)
         else None
     )
-    template_processor = request.state.templates
-    template = template_processor.get_template(
-        "survey-related-records/list-component.html"
-    )
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-        bulk_update_base_url=bulk_update_base_url,
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "survey-related-records/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+            bulk_update_base_url=bulk_update_base_url,
+        ):
+            yield event_part
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(DatastarResponse(event_streamer()))
 
 
 async def get_list_component(request: Request):
@@ -483,6 +502,33 @@ async def get_list_component(request: Request):
     current_page = get_page_from_request_params(request)
     settings: config.SeisLabDataSettings = request.state.settings
     user = request.user if request.user.is_authenticated else None
+    async with settings.get_db_session_maker()() as session:
+        validators = conditional.Validators.from_modification_summary(
+            await mission_queries.get_survey_missions_modification_summary(session),
+            with_last_modified=False,
+            filters=filter_query_string,
+            page=current_page,
+            language=str(request.state.language),
+            visibility=fragmentcache.get_visibility_class(user),
+        )
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
+    fragment_cache: fragmentcache.FragmentCache = request.state.fragment_cache
+    fragment_key = await fragment_cache.get_key(
+        "survey_missions:list",
+        depends_on=[
+            constants.ResourceType.MISSION,
+            constants.ResourceType.PROJECT,
+            constants.ResourceType.RECORD,
+        ],
+        filters=filter_query_string,
+        page=current_page,
+        language=str(request.state.language),
+        visibility=fragmentcache.get_visibility_class(user),
+        base_url=str(request.base_url),
+    )
+    if (cached := await fragment_cache.get(fragment_key)) is not None:
+        return validators.apply(DatastarResponse(fragment_cache.replay(cached)))
     async with settings.get_db_session_maker()() as session:
         items, num_total = await survey_mission_ops.list_survey_missions(
             session,
@@ -508,21 +554,19 @@ async def get_list_component(request: Request):
     serialized_items = [
         webui_schemas.SurveyMissionReadListItem.from_db_instance(i) for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("survey-missions/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "survey-missions/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+        ):
+            yield event_part
         yield ServerSentEventGenerator.execute_script(
             UPDATE_BASEMAP_JS_SCRIPT.format(
                 dumped_features=json.dumps(
@@ -531,14 +575,16 @@ async def get_list_component(request: Request):
             )
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(
+        DatastarResponse(
+            fragment_cache.stream_and_store(fragment_key, event_streamer())
+        )
+    )
 
 
 async def stream_to_list_page(request: Request):
     topic_names = [constants.NEW_TOPIC_SURVEY_MISSIONS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1176,9 +1222,7 @@ async def stream_to_new_page(request: Request):
         raise HTTPException(status_code=400, detail="Invalid request id") from err
 
     topic_names = [constants.NEW_TOPIC_SURVEY_MISSIONS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1400,10 +1444,11 @@ async def stream_to_bulk_update_page(request: Request):
     except ValueError as err:
         raise HTTPException(status_code=400, detail="Invalid request id") from err
 
-    topic_names = [constants.NEW_TOPIC_SURVEY_RELATED_RECORDS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    topic_names = [
+        constants.NEW_TOPIC_SURVEY_RELATED_RECORDS,
+        constants.PROGRESS_TOPIC_NAME_TEMPLATE.format(request_id=request_id),
+    ]
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1415,6 +1460,7 @@ async def stream_to_bulk_update_page(request: Request):
         ),
         {
             "bulk_resource_modified": common_handlers.handle_bulk_resource_modification,
+            "bulk_update_progress": common_handlers.handle_bulk_update_progress,
         },
     )
 
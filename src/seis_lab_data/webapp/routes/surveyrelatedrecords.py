@@ -8,7 +8,6 @@ import shapely
 from datastar_py import ServerSentEventGenerator
 from datastar_py.consts import ElementPatchMode
 from datastar_py.starlette import DatastarResponse
-from redis.asyncio import Redis
 from starlette_babel import gettext_lazy as _
 from starlette.endpoints import HTTPEndpoint
 from starlette.exceptions import HTTPException
@@ -16,6 +15,7 @@ from starlette.requests import Request
 from starlette.responses import (
     RedirectResponse,
     Response,
+    StreamingResponse,
 )
 from starlette.routing import Route
 from starlette.templating import Jinja2Templates
@@ -25,44 +25,43 @@ from ... import (
     config,
     constants,
     errors,
+    exports,
     geojson,
-    localization,
     subscribers,
 )
 from ...constants import SURVEY_RELATED_RECORD_MAX_RELATED
 from ...operations import (
-    projects as project_ops,
     surveymissions as survey_mission_ops,
     surveyrelatedrecords as survey_related_record_ops,
 )
-from ...permissions import surveyrelatedrecords as record_permissions
 from ...db import models
 from ...db.queries import (
-    datasetcategories as category_queries,
-    recordassets as asset_queries,
-    workflowstages as stage_queries,
+    surveyrelatedrecords as record_queries,
 )
+from ...db.queries.common import RowPermissions
 from ...tasks import surveyrelatedrecords as record_tasks
 from ...schemas import (
     common as common_schemas,
     identifiers,
-    projects as project_schemas,
-    surveymissions as mission_schemas,
     surveyrelatedrecords as record_schemas,
     webui as webui_schemas,
 )
 from .. import (
+    compression,
+    conditional,
     filters,
     forms,
+    fragmentcache,
+    rendering,
 )
+from ..lookuptables import LookupTableCache
 from ..streamhandlers import common as common_handlers
 from .auth import (
     requires_auth,
 )
 from .common import (
+    open_request_subscription,
     build_related_record_compound_name,
-    build_mission_compound_name,
-    build_project_compound_name,
     get_id_from_request_path,
     get_page_from_request_params,
     get_pagination_info,
@@ -82,7 +81,7 @@ async def _get_survey_related_record_details(
     )
     async with request.state.settings.get_db_session_maker()() as session:
         survey_related_record_info = (
-            await survey_related_record_ops.get_survey_related_record(
+            await survey_related_record_ops.get_survey_related_record_with_permissions(
                 survey_related_record_id,
                 user,
                 session,
@@ -95,22 +94,19 @@ async def _get_survey_related_record_details(
                     f"Survey-related record {survey_related_record_id!r} not found."
                 ),
             )
-    survey_related_record, related_to, subject_for = survey_related_record_info
+    survey_related_record, permissions, related_to, subject_for = (
+        survey_related_record_info
+    )
     serialized = webui_schemas.SurveyRelatedRecordReadDetail.from_db_instance(
         survey_related_record, related_to, subject_for
     )
-    can_update = record_permissions.can_update_survey_related_record(
-        user, survey_related_record
-    )
     settings: config.SeisLabDataSettings = request.state.settings
     return webui_schemas.SurveyRelatedRecordDetails(
         item=serialized,
         permissions=webui_schemas.UserPermissionDetails(
-            can_create_children=can_update,
-            can_update=can_update,
-            can_delete=record_permissions.can_delete_survey_related_record(
-                user, survey_related_record
-            ),
+            can_create_children=permissions.can_update,
+            can_update=permissions.can_update,
+            can_delete=permissions.can_delete,
         ),
         breadcrumbs=[
             webui_schemas.BreadcrumbItem(
@@ -151,14 +147,36 @@ async def _get_survey_related_record_details(
     )
 
 
+async def _get_survey_related_record_details_validators(
+    request: Request,
+) -> conditional.Validators:
+    """Get the validators of a survey related record's details, without fetching them."""
+    survey_related_record_id = get_id_from_request_path(
+        request, "survey_related_record_id", identifiers.SurveyRelatedRecordId
+    )
+    user = request.user if request.user.is_authenticated else None
+    settings: config.SeisLabDataSettings = request.state.settings
+    async with settings.get_db_session_maker()() as session:
+        summary = await record_queries.get_survey_related_record_modification_summary(
+            session, survey_related_record_id
+        )
+    return conditional.Validators.from_modification_summary(
+        summary,
+        query=str(request.query_params),
+        language=str(request.state.language),
+        user=conditional.get_user_fingerprint(user),
+    )
+
+
 @requires_auth
 async def get_details_component(request: Request):
+    validators = await _get_survey_related_record_details_validators(request)
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
     details = await _get_survey_related_record_details(request)
-    template_processor = request.state.templates
-    template = template_processor.get_template(
-        "survey-related-records/detail-component.html"
-    )
-    rendered = template.render(
+    renderer: rendering.TemplateRenderer = request.state.renderer
+    rendered = await renderer.render(
+        "survey-related-records/detail-component.html",
         request=request,
         survey_related_record=details.item,
         permissions=details.permissions,
@@ -171,7 +189,7 @@ async def get_details_component(request: Request):
             mode=ElementPatchMode.INNER,
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(DatastarResponse(event_streamer()))
 
 
 FormType = TypeVar(
@@ -185,21 +203,13 @@ async def build_survey_related_record_form_instance(
 ) -> FormType:
     form_instance = await form_type.from_formdata(request)
     current_language = request.state.language
-    async with request.state.settings.get_db_session_maker()() as session:
-        form_instance.dataset_category_id.choices = [
-            (dc.id, dc.name.get(current_language, dc.name["en"]))
-            for dc in await category_queries.collect_all_dataset_categories(
-                session,
-                order_by_clause=models.DatasetCategory.name[current_language].astext,
-            )
-        ]
-        form_instance.workflow_stage_id.choices = [
-            (ws.id, ws.name.get(current_language, ws.name["en"]))
-            for ws in await stage_queries.collect_all_workflow_stages(
-                session,
-                order_by_clause=models.WorkflowStage.name[current_language].astext,
-            )
-        ]
+    lookup_tables: LookupTableCache = request.state.lookup_tables
+    form_instance.dataset_category_id.choices = (
+        await lookup_tables.get_dataset_category_options(current_language)
+    )
+    form_instance.workflow_stage_id.choices = (
+        await lookup_tables.get_workflow_stage_options(current_language)
+    )
     return form_instance
 
 
@@ -889,6 +899,53 @@ async def remove_update_form_asset_link(request: Request):
     return DatastarResponse(event_streamer())
 
 
+# exports are files to download, often by other systems, which would save them
+# still compressed if they do not decode the content encoding themselves
+@compression.configure(enabled=False)
+async def export_survey_related_records(request: Request):
+    """Stream all records matching the list filters, as a file to download.
+
+    The format is chosen with the `format` query parameter. Rows are read from
+    the database and written to the response in batches, so this can export
+    any number of records.
+    """
+    settings: config.SeisLabDataSettings = request.state.settings
+    try:
+        export_format = constants.ExportFormat(
+            request.query_params.get("format", constants.ExportFormat.NDJSON.value)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid export format")
+    if export_format not in exports.get_available_formats():
+        raise HTTPException(
+            status_code=400, detail=f"Export format {export_format.value!r} unavailable"
+        )
+    list_filters = filters.SurveyRelatedRecordListFilters.from_params(
+        request.query_params, request.state.language
+    )
+    user = request.user if request.user.is_authenticated else None
+
+    async def stream_export():
+        async with settings.get_db_session_maker()() as session:
+            async for chunk in exports.serialize(
+                export_format,
+                survey_related_record_ops.export_survey_related_records(
+                    session,
+                    user,
+                    settings.export_batch_size,
+                    **list_filters.as_kwargs(),
+                ),
+            ):
+                yield chunk
+
+    file_name = f"survey-related-records.{exports.FILE_EXTENSIONS[export_format]}"
+    return StreamingResponse(
+        stream_export(),
+        media_type=exports.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
 async def list_by_name(request: Request):
     """Specialized endpoint that provides record names for building datalists."""
     current_language = request.state.language
@@ -936,6 +993,13 @@ async def list_by_name(request: Request):
     return DatastarResponse(event_streamer())
 
 
+def _get_item_permissions(
+    rows: list[tuple[models.SurveyRelatedRecord, RowPermissions]],
+) -> dict[str, RowPermissions]:
+    """Index per-record permissions by id, for list item templates."""
+    return {str(record.id): permissions for record, permissions in rows}
+
+
 async def get_list_component(request: Request):
     if (raw_search_params := request.query_params.get("datastar")) is not None:
         try:
@@ -955,17 +1019,51 @@ async def get_list_component(request: Request):
     user = request.user if request.user.is_authenticated else None
     settings: config.SeisLabDataSettings = request.state.settings
     async with settings.get_db_session_maker()() as session:
-        items, num_total = await survey_related_record_ops.list_survey_related_records(
+        validators = conditional.Validators.from_modification_summary(
+            await record_queries.get_survey_related_records_modification_summary(
+                session
+            ),
+            with_last_modified=False,
+            filters=filter_query_string,
+            page=current_page,
+            language=str(request.state.language),
+            visibility=fragmentcache.get_visibility_class(user),
+        )
+    if validators.is_not_modified(request):
+        return validators.get_not_modified_response()
+    fragment_cache: fragmentcache.FragmentCache = request.state.fragment_cache
+    fragment_key = await fragment_cache.get_key(
+        "survey_related_records:list",
+        depends_on=[
+            constants.ResourceType.RECORD,
+            constants.ResourceType.MISSION,
+            constants.ResourceType.PROJECT,
+            constants.ResourceType.CATEGORY,
+            constants.ResourceType.WORKFLOW_STAGE,
+        ],
+        filters=filter_query_string,
+        page=current_page,
+        language=str(request.state.language),
+        visibility=fragmentcache.get_visibility_class(user),
+        base_url=str(request.base_url),
+    )
+    if (cached := await fragment_cache.get(fragment_key)) is not None:
+        return validators.apply(DatastarResponse(fragment_cache.replay(cached)))
+    async with settings.get_db_session_maker()() as session:
+        (
+            rows,
+            num_total,
+        ) = await survey_related_record_ops.list_survey_related_records_with_permissions(
             session,
-            initiator=user,
+            user,
             page=current_page,
             page_size=settings.pagination_page_size,
             include_total=True,
             **internal_filter_kwargs,
         )
         num_unfiltered_total = (
-            await survey_related_record_ops.list_survey_related_records(
-                session, initiator=user, include_total=True
+            await survey_related_record_ops.list_survey_related_records_with_permissions(
+                session, user, include_total=True
             )
         )[1]
     pagination_info = get_pagination_info(
@@ -977,25 +1075,22 @@ async def get_list_component(request: Request):
     )
     serialized_items = [
         webui_schemas.SurveyRelatedRecordReadListItem.from_db_instance(item)
-        for item in items
+        for item, _ in rows
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template(
-        "survey-related-records/list-component.html"
-    )
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "survey-related-records/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            item_permissions=_get_item_permissions(rows),
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+        ):
+            yield event_part
         yield ServerSentEventGenerator.execute_script(
             UPDATE_BASEMAP_JS_SCRIPT.format(
                 dumped_features=json.dumps(
@@ -1004,14 +1099,16 @@ async def get_list_component(request: Request):
             )
         )
 
-    return DatastarResponse(event_streamer())
+    return validators.apply(
+        DatastarResponse(
+            fragment_cache.stream_and_store(fragment_key, event_streamer())
+        )
+    )
 
 
 async def stream_to_list_page(request: Request):
     topic_names = [constants.NEW_TOPIC_SURVEY_RELATED_RECORDS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1043,65 +1140,22 @@ class SurveyRelatedRecordCollectionEndpoint(HTTPEndpoint):
         )
         settings: config.SeisLabDataSettings = request.state.settings
         user = request.user if request.user.is_authenticated else None
+        lookup_tables: LookupTableCache = request.state.lookup_tables
         async with settings.get_db_session_maker()() as session:
-            some_db_projects = (
-                await project_ops.list_projects(
-                    session, initiator=user, include_total=False
-                )
-            )[0]
-            some_projects = [
-                project_schemas.ProjectReadListItem.from_db_instance(i)
-                for i in some_db_projects
-            ]
-            some_db_missions = (
-                await survey_mission_ops.list_survey_missions(
-                    session, initiator=user, include_total=False
-                )
-            )[0]
-            some_missions = [
-                mission_schemas.SurveyMissionReadListItem.from_db_instance(i)
-                for i in some_db_missions
-            ]
-            some_media_types = await asset_queries.list_media_types(session)
-
-            dataset_category_filter_options = []
-            for (
-                dataset_category
-            ) in await category_queries.collect_all_dataset_categories(session):
-                dataset_category_filter_options.append(
-                    (
-                        dataset_category.id,
-                        localization.translate_localizable_dict(
-                            dataset_category.name, request.state.language
-                        ),
-                    )
-                )
-            workflow_stage_filter_options = []
-            for workflow_stage in await stage_queries.collect_all_workflow_stages(
-                session
-            ):
-                workflow_stage_filter_options.append(
-                    (
-                        workflow_stage.id,
-                        localization.translate_localizable_dict(
-                            workflow_stage.name, request.state.language
-                        ),
-                    )
-                )
             (
-                items,
+                rows,
                 num_total,
-            ) = await survey_related_record_ops.list_survey_related_records(
+            ) = await survey_related_record_ops.list_survey_related_records_with_permissions(
                 session,
-                initiator=user,
+                user,
                 page=current_page,
                 page_size=settings.pagination_page_size,
                 include_total=True,
                 **list_filters.as_kwargs(),
             )
             num_unfiltered_total = (
-                await survey_related_record_ops.list_survey_related_records(
-                    session, initiator=user, include_total=True
+                await survey_related_record_ops.list_survey_related_records_with_permissions(
+                    session, user, include_total=True
                 )
             )[1]
         template_processor = request.state.templates
@@ -1119,7 +1173,7 @@ class SurveyRelatedRecordCollectionEndpoint(HTTPEndpoint):
             min_lon, min_lat, max_lon, max_lat = default_bbox.bounds
         serialized_items = [
             webui_schemas.SurveyRelatedRecordReadListItem.from_db_instance(item)
-            for item in items
+            for item, _ in rows
         ]
         geojson_features = geojson.to_feature_collection(serialized_items)
         return template_processor.TemplateResponse(
@@ -1127,17 +1181,24 @@ class SurveyRelatedRecordCollectionEndpoint(HTTPEndpoint):
             "survey-related-records/list.html",
             context={
                 "items": serialized_items,
+                "item_permissions": _get_item_permissions(rows),
                 "geojson_features": json.dumps(geojson_features),
                 "pagination": pagination_info,
-                "dataset_categories": dataset_category_filter_options,
-                "workflow_stages": workflow_stage_filter_options,
-                "filter_projects_datalist": [
-                    build_project_compound_name(request, i) for i in some_projects
-                ],
-                "filter_missions_datalist": [
-                    build_mission_compound_name(request, i) for i in some_missions
-                ],
-                "filter_media_types_datalist": some_media_types,
+                "dataset_categories": (
+                    await lookup_tables.get_dataset_category_options(current_language)
+                ),
+                "workflow_stages": (
+                    await lookup_tables.get_workflow_stage_options(current_language)
+                ),
+                "filter_projects_datalist": (
+                    await lookup_tables.get_project_names(user, current_language)
+                ),
+                "filter_missions_datalist": (
+                    await lookup_tables.get_survey_mission_names(user, current_language)
+                ),
+                "filter_media_types_datalist": (
+                    await lookup_tables.get_media_types(limit=20)
+                ),
                 "map_bounds": {
                     "min_lon": min_lon,
                     "min_lat": min_lat,
@@ -1386,9 +1447,7 @@ async def stream_to_new_page(request: Request):
         raise HTTPException(status_code=400, detail="Invalid request id") from err
 
     topic_names = [constants.NEW_TOPIC_SURVEY_RELATED_RECORDS]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1424,11 +1483,10 @@ async def stream_to_detail_page(request: Request):
             status_code=400, detail="Invalid survey_related_record id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user if request.user.is_authenticated else None
 
     topic_names = [constants.NEW_TOPIC_SURVEY_RELATED_RECORDS]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1467,11 +1525,10 @@ async def stream_to_update_page(request: Request):
             status_code=400, detail="Invalid survey_related_record id"
         ) from err
     session_maker = request.state.settings.get_db_session_maker()
-    redis_client: Redis = request.state.redis_client
     user = request.user
 
     topic_names = [constants.NEW_TOPIC_SURVEY_RELATED_RECORDS]
-    pubsub = await subscribers.open_topic_subscription(redis_client, topic_names)
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -1603,6 +1660,12 @@ routes = [
         methods=["GET"],
         name="list_stream",
     ),
+    Route(
+        "/export",
+        export_survey_related_records,
+        methods=["GET"],
+        name="export",
+    ),
     Route(
         "/filter-by-name",
         list_by_name,
@@ -31,11 +31,13 @@ from ...schemas import (
 from ...tasks import workflowstages as stage_tasks
 from .. import (
     filters,
+    rendering,
 )
 from ..forms import workflowstages as stage_forms
 from ..streamhandlers import common as common_handlers
 from .auth import requires_auth
 from .common import (
+    open_request_subscription,
     get_page_from_request_params,
     get_pagination_info,
 )
@@ -81,31 +83,29 @@ async def get_list_component(request: Request):
     serialized_items = [
         stage_schemas.WorkflowStageReadListItem.from_db_instance(i) for i in items
     ]
-    template_processor = request.state.templates
-    template = template_processor.get_template("workflowstages/list-component.html")
-    rendered = template.render(
-        request=request,
-        items=serialized_items,
-        update_current_url_with=filter_query_string,
-        pagination=pagination_info,
-        permissions={
-            "can_create": stage_permissions.can_create_workflow_stage(user),
-            "can_update": stage_permissions.can_update_workflow_stage(user),
-            "can_delete": stage_permissions.can_delete_workflow_stage(user),
-        }
-        if user is not None
-        else {"can_create": False, "can_update": False, "can_delete": False},
-        search_initial_value=list_filters.get_text_search_filter(
-            request.state.language
-        ),
-    )
+    renderer: rendering.TemplateRenderer = request.state.renderer
 
     async def event_streamer():
-        yield ServerSentEventGenerator.patch_elements(
-            rendered,
+        async for event_part in renderer.stream_patch_elements(
+            "workflowstages/list-component.html",
             selector=webui_schemas.selector_info.items_selector,
             mode=ElementPatchMode.REPLACE,
-        )
+            request=request,
+            items=serialized_items,
+            update_current_url_with=filter_query_string,
+            pagination=pagination_info,
+            permissions={
+                "can_create": stage_permissions.can_create_workflow_stage(user),
+                "can_update": stage_permissions.can_update_workflow_stage(user),
+                "can_delete": stage_permissions.can_delete_workflow_stage(user),
+            }
+            if user is not None
+            else {"can_create": False, "can_update": False, "can_delete": False},
+            search_initial_value=list_filters.get_text_search_filter(
+                request.state.language
+            ),
+        ):
+            yield event_part
 
     return DatastarResponse(event_streamer())
 
@@ -195,9 +195,7 @@ async def get_update_form(request: Request):
 
 async def stream_to_list_page(request: Request):
     topic_names = [constants.NEW_TOPIC_WORKFLOW_STAGES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -230,9 +228,7 @@ async def stream_to_new_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_WORKFLOW_STAGES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
@@ -272,9 +268,7 @@ async def stream_to_update_page(request: Request):
 
     # TODO: should we update the form fields with handlers too?
     topic_names = [constants.NEW_TOPIC_WORKFLOW_STAGES]
-    pubsub = await subscribers.open_topic_subscription(
-        request.state.redis_client, topic_names
-    )
+    pubsub = await open_request_subscription(request, topic_names)
     subscription = subscribers.iter_topic_messages(
         pubsub,
         topic_names,
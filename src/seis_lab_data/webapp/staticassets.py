@@ -0,0 +1,233 @@
+import dataclasses
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+from pathlib import Path
+from typing import (
+    Final,
+    Self,
+)
+
+import jinja2
+from starlette.datastructures import Headers
+from starlette.responses import (
+    FileResponse,
+    Response,
+)
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from . import compression
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, without it only gzip variants are built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME: Final[str] = "manifest.json"
+IMMUTABLE_CACHE_CONTROL: Final[str] = "public, max-age=31536000, immutable"
+_COMPRESSIBLE_SUFFIXES: Final[frozenset[str]] = frozenset(
+    {".css", ".js", ".json", ".map", ".svg", ".txt"}
+)
+_ENCODING_SUFFIXES: Final[dict[str, str]] = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclasses.dataclass(frozen=True)
+class StaticAsset:
+    path: str
+    fingerprinted_path: str
+    file_path: Path
+    stat_result: os.stat_result
+    # content encoding -> precompressed file, along with its stat result
+    encoded_files: dict[str, tuple[Path, os.stat_result]]
+
+    @property
+    def media_type(self) -> str:
+        return mimetypes.guess_type(self.path)[0] or "application/octet-stream"
+
+
+@dataclasses.dataclass(frozen=True)
+class StaticAssetManifest:
+    """Fingerprinted names of the static files, along with their precompressed variants.
+
+    The manifest is either loaded from the output of `build()`, which also
+    writes gzip and brotli variants of each file, or computed at startup from
+    the static files themselves, in which case files are served uncompressed.
+    Either way, files are only stat'ed when the manifest is created.
+    """
+
+    assets: dict[str, StaticAsset]
+    by_fingerprinted_path: dict[str, StaticAsset]
+
+    @classmethod
+    def from_assets(cls, assets: list[StaticAsset]) -> Self:
+        return cls(
+            assets={asset.path: asset for asset in assets},
+            by_fingerprinted_path={asset.fingerprinted_path: asset for asset in assets},
+        )
+
+    @classmethod
+    def from_directory(cls, static_dir: Path) -> Self:
+        assets = []
+        for path, file_path in _iter_static_files(static_dir):
+            assets.append(
+                StaticAsset(
+                    path=path,
+                    fingerprinted_path=get_fingerprinted_path(
+                        path, _get_digest(file_path)
+                    ),
+                    file_path=file_path,
+                    stat_result=file_path.stat(),
+                    encoded_files={},
+                )
+            )
+        return cls.from_assets(assets)
+
+    @classmethod
+    def load(cls, build_dir: Path) -> Self:
+        raw_manifest = json.loads((build_dir / MANIFEST_FILE_NAME).read_text())
+        assets = []
+        for path, details in raw_manifest.items():
+            file_path = build_dir / details["path"]
+            encoded_files = {}
+            for encoding in details["encodings"]:
+                encoded_path = file_path.with_name(
+                    file_path.name + _ENCODING_SUFFIXES[encoding]
+                )
+                encoded_files[encoding] = (encoded_path, encoded_path.stat())
+            assets.append(
+                StaticAsset(
+                    path=path,
+                    fingerprinted_path=details["path"],
+                    file_path=file_path,
+                    stat_result=file_path.stat(),
+                    encoded_files=encoded_files,
+                )
+            )
+        return cls.from_assets(assets)
+
+    @classmethod
+    def build(cls, static_dir: Path, build_dir: Path) -> Self:
+        """Write fingerprinted and precompressed copies of the static files."""
+        raw_manifest = {}
+        for path, file_path in _iter_static_files(static_dir):
+            content = file_path.read_bytes()
+            fingerprinted_path = get_fingerprinted_path(
+                path, hashlib.sha256(content).hexdigest()
+            )
+            target = build_dir / fingerprinted_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file_path, target)
+            encodings = []
+            if file_path.suffix in _COMPRESSIBLE_SUFFIXES:
+                for encoding, compressed in _compress(content).items():
+                    # there is no point in serving variants that are not smaller
+                    if len(compressed) < len(content):
+                        target.with_name(
+                            target.name + _ENCODING_SUFFIXES[encoding]
+                        ).write_bytes(compressed)
+                        encodings.append(encoding)
+            raw_manifest[path] = {"path": fingerprinted_path, "encodings": encodings}
+        (build_dir / MANIFEST_FILE_NAME).write_text(
+            json.dumps(raw_manifest, indent=2, sort_keys=True)
+        )
+        return cls.load(build_dir)
+
+    @classmethod
+    def from_settings(cls, static_dir: Path, build_dir: Path | None) -> Self:
+        if build_dir is not None and (build_dir / MANIFEST_FILE_NAME).is_file():
+            return cls.load(build_dir)
+        if build_dir is not None:
+            logger.warning(
+                f"No static assets manifest found in {build_dir}, static files "
+                f"will be served uncompressed"
+            )
+        return cls.from_directory(static_dir)
+
+    def get_url_path(self, path: str) -> str:
+        """Return the fingerprinted path of a static file, if there is one."""
+        path = path.lstrip("/")
+        if (asset := self.assets.get(path)) is None:
+            logger.warning(f"Static file {path!r} is not in the manifest")
+            return path
+        return asset.fingerprinted_path
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Serve static files, with fingerprinted ones being cached forever.
+
+    Since a fingerprinted file name changes whenever the file's contents do,
+    these are served with an immutable `Cache-Control` header and, when the
+    client accepts it, in a precompressed encoding. Files requested by their
+    original name, like modules imported by other scripts, are served as
+    usual.
+    """
+
+    def __init__(self, manifest: StaticAssetManifest, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.manifest.by_fingerprinted_path.get(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        file_path, stat_result = asset.file_path, asset.stat_result
+        accepted = compression.get_accepted_encodings(
+            Headers(scope=scope).get("accept-encoding")
+        )
+        for encoding in _ENCODING_SUFFIXES:
+            if encoding in accepted and encoding in asset.encoded_files:
+                file_path, stat_result = asset.encoded_files[encoding]
+                headers["Content-Encoding"] = encoding
+                break
+        return FileResponse(
+            file_path,
+            stat_result=stat_result,
+            media_type=asset.media_type,
+            headers=headers,
+            method=scope["method"],
+        )
+
+
+def get_static_url_function(manifest: StaticAssetManifest):
+    @jinja2.pass_context
+    def static_url(context: jinja2.runtime.Context, path: str) -> str:
+        return str(
+            context["request"].url_for("static", path=manifest.get_url_path(path))
+        )
+
+    return static_url
+
+
+def get_fingerprinted_path(path: str, digest: str) -> str:
+    parent, _, name = path.rpartition("/")
+    stem, dot, suffix = name.rpartition(".")
+    fingerprinted_name = (
+        f"{stem}.{digest[:12]}.{suffix}" if dot else f"{name}.{digest[:12]}"
+    )
+    return f"{parent}/{fingerprinted_name}" if parent else fingerprinted_name
+
+
+def _iter_static_files(static_dir: Path):
+    for file_path in sorted(static_dir.rglob("*")):
+        if file_path.is_file() and not file_path.name.startswith("."):
+            yield file_path.relative_to(static_dir).as_posix(), file_path
+
+
+def _get_digest(file_path: Path) -> str:
+    with file_path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def _compress(content: bytes) -> dict[str, bytes]:
+    compressed = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(content, quality=11)
+    return compressed
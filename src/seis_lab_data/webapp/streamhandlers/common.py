@@ -25,6 +25,18 @@ from ...schemas import (
 logger = logging.getLogger(__name__)
 
 
+def tag_with_event_id(event: DatastarEvent, event_id: str) -> DatastarEvent:
+    """Add an SSE ``id`` field to an already rendered datastar event.
+
+    Browsers send back the last seen id in the ``Last-Event-ID`` header when
+    they reconnect, which lets us resume reading from the event stream.
+    """
+    event_type_line, _, remainder = event.partition("\n")
+    if remainder.startswith("id: "):
+        return event
+    return DatastarEvent(f"{event_type_line}\nid: {event_id}\n{remainder}")
+
+
 async def flash_ui_message_after_redirect(
     notification: webui_schemas.Notification,
 ) -> AsyncGenerator[DatastarEvent, None]:
@@ -182,6 +194,21 @@ async def handle_bulk_resource_modification(
     )
 
 
+async def handle_bulk_update_progress(
+    message: message_schemas.BulkUpdateProgressMessage,
+    context: subscribers.HandlerContext,
+    done: asyncio.Event | None = None,
+) -> AsyncGenerator[DatastarEvent, None]:
+    if message.request_id != context.request_id:
+        return
+    yield ServerSentEventGenerator.patch_signals(
+        {
+            "bulkUpdateTotalCount": message.total_count,
+            "bulkUpdateAffectedCount": message.affected_count,
+        }
+    )
+
+
 async def handle_resource_modification_edit_page(
     message: message_schemas.SldPubSubMessage,
     context: subscribers.HandlerContext,
@@ -765,6 +792,23 @@ async def handle_resource_modification_detail_page(
                     )
 
 
+async def handle_discovery_progress_detail_page(
+    message: message_schemas.DiscoveryProgressMessage,
+    context: subscribers.HandlerContext,
+    done: asyncio.Event | None = None,
+) -> AsyncGenerator[DatastarEvent, None]:
+    if message.resource_id != context.resource_id:
+        return
+    yield ServerSentEventGenerator.patch_signals(
+        {
+            "discoveryTotalFiles": message.total_files,
+            "discoveryFilesSeen": message.files_seen,
+            "discoveryFilesFailed": message.files_failed,
+            "discoveryFilesPerSecond": message.files_per_second,
+        }
+    )
+
+
 async def handle_discovery_detail_page(
     message: message_schemas.DiscoveryMessage,
     context: subscribers.HandlerContext,
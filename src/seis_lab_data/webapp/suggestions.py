@@ -0,0 +1,303 @@
+import bisect
+import dataclasses
+import logging
+import re
+import unicodedata
+import uuid
+from collections.abc import Sequence
+from typing import Final
+
+import jinja2
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+
+from .. import constants
+from ..db.queries import (
+    projects as project_queries,
+    surveymissions as mission_queries,
+)
+from ..localization import translate_localizable
+from ..schemas.common import LocalizableDraftName
+from .routes.common import (
+    format_mission_compound_name,
+    format_project_compound_name,
+)
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN: Final = re.compile(r"\w+")
+# trigram similarity is meaningless for shorter search values
+_MIN_FUZZY_SEARCH_LENGTH: Final[int] = 3
+
+
+@dataclasses.dataclass(frozen=True)
+class Suggestion:
+    id: str
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class SuggestionEntry:
+    id: str
+    # compound names, per locale
+    names: dict[str, str]
+    # plain, normalized names, per locale
+    normalized_names: dict[str, str]
+    is_published: bool
+    # normalized names in all locales
+    search_text: str
+
+
+class SuggestionIndex:
+    """In-memory prefix index over the names of projects or survey missions.
+
+    A name matches a search value when each of the search value's words is
+    the start of one of the name's words, in any locale. Case and accents
+    are ignored. Matches are ranked like the database's trigram searches,
+    with names that start with the search value coming first.
+    """
+
+    def __init__(self, entries: Sequence[SuggestionEntry], locales: list[str]):
+        self._entries = list(entries)
+        self._locales = locales
+        indexed_words = sorted(
+            {
+                (word, position)
+                for position, entry in enumerate(self._entries)
+                for word in _WORD_PATTERN.findall(entry.search_text)
+            }
+        )
+        self._words = [word for word, _ in indexed_words]
+        self._positions = [position for _, position in indexed_words]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(
+        self,
+        search_value: str,
+        language: str,
+        *,
+        limit: int,
+        published_only: bool = False,
+    ) -> list[Suggestion]:
+        search_words = _WORD_PATTERN.findall(normalize(search_value))
+        if not search_words:
+            return []
+        matches = self._find_prefixed(search_words[0])
+        for word in search_words[1:]:
+            matches &= self._find_prefixed(word)
+        normalized_search_value = " ".join(search_words)
+        search_trigrams = get_trigrams(normalized_search_value)
+        ranked = []
+        for position in matches:
+            entry = self._entries[position]
+            if published_only and not entry.is_published:
+                continue
+            if language not in entry.names:
+                language = self._locales[0]
+            normalized_name = entry.normalized_names[language]
+            ranked.append(
+                (
+                    not normalized_name.startswith(normalized_search_value),
+                    -get_similarity(search_trigrams, get_trigrams(normalized_name)),
+                    normalized_name,
+                    Suggestion(id=entry.id, name=entry.names[language]),
+                )
+            )
+        ranked.sort(key=lambda item: item[:3])
+        return [item[-1] for item in ranked[:limit]]
+
+    def _find_prefixed(self, prefix: str) -> set[int]:
+        found = set()
+        index = bisect.bisect_left(self._words, prefix)
+        while index < len(self._words) and self._words[index].startswith(prefix):
+            found.add(self._positions[index])
+            index += 1
+        return found
+
+
+def normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def get_trigrams(value: str) -> frozenset[str]:
+    """Extract trigrams from a value, the same way as postgresql's pg_trgm."""
+    trigrams = set()
+    for word in _WORD_PATTERN.findall(normalize(value)):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(trigrams)
+
+
+def get_similarity(first: frozenset[str], second: frozenset[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def build_project_suggestion_index(
+    rows: Sequence[tuple[uuid.UUID, dict[str, str], constants.ProjectStatus]],
+    locales: list[str],
+) -> SuggestionIndex:
+    entries = []
+    for id_, name, status in rows:
+        localizable_name = _as_localizable(name)
+        entries.append(
+            SuggestionEntry(
+                id=str(id_),
+                names={
+                    locale: format_project_compound_name(id_, localizable_name, locale)
+                    for locale in locales
+                },
+                normalized_names=_get_normalized_names(localizable_name, locales),
+                is_published=status == constants.ProjectStatus.PUBLISHED,
+                search_text=_get_search_text(name),
+            )
+        )
+    return SuggestionIndex(entries, locales)
+
+
+def build_survey_mission_suggestion_index(
+    rows: Sequence[
+        tuple[
+            uuid.UUID,
+            dict[str, str],
+            constants.SurveyMissionStatus,
+            dict[str, str],
+        ]
+    ],
+    jinja_environment: jinja2.Environment,
+    locales: list[str],
+) -> SuggestionIndex:
+    entries = []
+    for id_, name, status, project_name in rows:
+        localizable_name = _as_localizable(name)
+        localizable_project_name = _as_localizable(project_name)
+        entries.append(
+            SuggestionEntry(
+                id=str(id_),
+                names={
+                    locale: format_mission_compound_name(
+                        jinja_environment,
+                        id_,
+                        localizable_name,
+                        localizable_project_name,
+                        locale,
+                    )
+                    for locale in locales
+                },
+                normalized_names=_get_normalized_names(localizable_name, locales),
+                is_published=status == constants.SurveyMissionStatus.PUBLISHED,
+                search_text=_get_search_text(name),
+            )
+        )
+    return SuggestionIndex(entries, locales)
+
+
+async def suggest_projects(
+    index: SuggestionIndex,
+    db_session_maker: async_sessionmaker,
+    search_value: str,
+    language: str,
+    *,
+    limit: int,
+    published_only: bool,
+) -> list[Suggestion]:
+    """Suggest project names for a partially typed search value.
+
+    Prefix matches come from the in-memory index. When there are not enough
+    of them, the remaining suggestions come from a trigram search in the
+    database, which also tolerates typos.
+    """
+    suggestions = index.search(
+        search_value, language, limit=limit, published_only=published_only
+    )
+    if len(suggestions) >= limit or len(search_value) < _MIN_FUZZY_SEARCH_LENGTH:
+        return suggestions
+    async with db_session_maker() as session:
+        rows = await project_queries.search_project_names(
+            session, search_value, limit, published_only=published_only
+        )
+    return _merge(
+        suggestions,
+        [
+            Suggestion(
+                id=str(id_),
+                name=format_project_compound_name(id_, _as_localizable(name), language),
+            )
+            for id_, name in rows
+        ],
+        limit,
+    )
+
+
+async def suggest_survey_missions(
+    index: SuggestionIndex,
+    db_session_maker: async_sessionmaker,
+    jinja_environment: jinja2.Environment,
+    search_value: str,
+    language: str,
+    *,
+    limit: int,
+    published_only: bool,
+) -> list[Suggestion]:
+    """Suggest survey mission names for a partially typed search value.
+
+    Works like `suggest_projects()`.
+    """
+    suggestions = index.search(
+        search_value, language, limit=limit, published_only=published_only
+    )
+    if len(suggestions) >= limit or len(search_value) < _MIN_FUZZY_SEARCH_LENGTH:
+        return suggestions
+    async with db_session_maker() as session:
+        rows = await mission_queries.search_survey_mission_names(
+            session, search_value, limit, published_only=published_only
+        )
+    return _merge(
+        suggestions,
+        [
+            Suggestion(
+                id=str(id_),
+                name=format_mission_compound_name(
+                    jinja_environment,
+                    id_,
+                    _as_localizable(name),
+                    _as_localizable(project_name),
+                    language,
+                ),
+            )
+            for id_, name, project_name in rows
+        ],
+        limit,
+    )
+
+
+def _merge(
+    suggestions: list[Suggestion], extra: list[Suggestion], limit: int
+) -> list[Suggestion]:
+    seen = {suggestion.id for suggestion in suggestions}
+    merged = list(suggestions)
+    for suggestion in extra:
+        if suggestion.id not in seen:
+            seen.add(suggestion.id)
+            merged.append(suggestion)
+    return merged[:limit]
+
+
+def _as_localizable(name: dict[str, str]) -> LocalizableDraftName:
+    # names have already been validated when they were stored
+    return LocalizableDraftName.model_construct(**name)
+
+
+def _get_normalized_names(
+    name: LocalizableDraftName, locales: list[str]
+) -> dict[str, str]:
+    return {
+        locale: normalize(translate_localizable(name, locale)) for locale in locales
+    }
+
+
+def _get_search_text(name: dict[str, str]) -> str:
+    return normalize(" ".join(value for value in name.values() if value))
@@ -0,0 +1,242 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Final,
+    Protocol,
+)
+
+import httpx
+from authlib.jose import (
+    JsonWebKey,
+    JsonWebToken,
+    KeySet,
+)
+from authlib.jose.errors import JoseError
+
+from ..auth import AuthConfig
+from .introspection import TokenIntrospector
+
+logger = logging.getLogger(__name__)
+
+# only asymmetric algorithms make sense when verifying with a public key set
+_ALLOWED_ALGORITHMS: Final[list[str]] = [
+    "RS256",
+    "RS384",
+    "RS512",
+    "ES256",
+    "ES384",
+    "ES512",
+]
+_CLAIMS_LEEWAY_SECONDS: Final[int] = 30
+
+
+class TokenVerifierProtocol(Protocol):
+    async def is_active(self, access_token: str) -> bool: ...
+
+
+class JwksCache:
+    """Keep the auth server's JSON Web Key Set around, refreshing it periodically.
+
+    Besides the periodic refresh, which runs in the background, the key set is
+    also refreshed whenever a token is signed with a key it does not know
+    about, which is what happens right after the auth server rotates its
+    keys. These on-demand refreshes happen at most once every
+    `min_refresh_interval_seconds`.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        jwks_uri: str,
+        refresh_interval_seconds: int,
+        min_refresh_interval_seconds: int = 30,
+    ) -> None:
+        self._http_client = http_client
+        self._jwks_uri = jwks_uri
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._refresh_lock = asyncio.Lock()
+        self._refreshed_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self.key_set: KeySet | None = None
+
+    def start(self) -> None:
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def knows_key(self, kid: str | None) -> bool:
+        if self.key_set is None:
+            return False
+        if kid is None:
+            return len(self.key_set.keys) == 1
+        return any(key.kid == kid for key in self.key_set.keys)
+
+    async def refresh_for_unknown_key(self, kid: str | None) -> bool:
+        """Refresh the key set, unless it was refreshed very recently.
+
+        Returns whether the key is known afterwards.
+        """
+        async with self._refresh_lock:
+            if self.knows_key(kid):
+                return True
+            if (
+                self._refreshed_at is not None
+                and time.monotonic() - self._refreshed_at
+                < self._min_refresh_interval_seconds
+            ):
+                return False
+            await self._refresh()
+        return self.knows_key(kid)
+
+    async def refresh(self) -> None:
+        async with self._refresh_lock:
+            await self._refresh()
+
+    async def _refresh(self) -> None:
+        self._refreshed_at = time.monotonic()
+        try:
+            response = await self._http_client.get(self._jwks_uri)
+            response.raise_for_status()
+            self.key_set = JsonWebKey.import_key_set(response.json())
+        except Exception:
+            # the previous key set is kept, so that a hiccup on the auth server
+            # does not prevent users from being authenticated
+            logger.warning("Could not refresh the JWKS", exc_info=True)
+        else:
+            logger.debug(f"Loaded {len(self.key_set.keys)} keys from the JWKS")
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self._refresh_interval_seconds)
+
+
+class LocalTokenVerifier:
+    """Verify access tokens locally, without contacting the auth server.
+
+    Tokens are verified against the cached key set, which checks their
+    signature, expiry, issuer and audience. Tokens that cannot be verified
+    locally - for example because the key set could not be loaded yet or
+    because they are not JWTs - are checked with the `fallback` introspector.
+
+    Locally verified tokens cannot be known to have been revoked. Therefore,
+    whenever `revocation_check_interval_seconds` have elapsed since a token
+    was last checked, it is introspected again in the background. Tokens
+    that the auth server reports as inactive are rejected from then on, but
+    failing to reach it leaves them be until the next check.
+    """
+
+    def __init__(
+        self,
+        jwks_cache: JwksCache,
+        auth_config: AuthConfig,
+        fallback: TokenIntrospector,
+        *,
+        revocation_check_interval_seconds: int,
+        max_entries: int,
+    ) -> None:
+        self._jwks_cache = jwks_cache
+        self._fallback = fallback
+        self._revocation_check_interval_seconds = revocation_check_interval_seconds
+        self._max_entries = max_entries
+        self._jwt = JsonWebToken(_ALLOWED_ALGORITHMS)
+        self._claims_options = {
+            "iss": {"essential": True, "value": auth_config.issuer},
+            "aud": {"essential": True, "value": auth_config.client_id},
+            "exp": {"essential": True},
+        }
+        # token hash -> (when it was last introspected, whether it was active)
+        self._revocation_checks: OrderedDict[str, tuple[float, bool]] = OrderedDict()
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def is_active(self, access_token: str) -> bool:
+        if (header := _get_jwt_header(access_token)) is None:
+            return await self._fallback.is_active(access_token)
+        kid = header.get("kid")
+        if not self._jwks_cache.knows_key(
+            kid
+        ) and not await self._jwks_cache.refresh_for_unknown_key(kid):
+            logger.debug(f"Token signed with unknown key {kid!r}, introspecting it")
+            return await self._fallback.is_active(access_token)
+        try:
+            claims = self._jwt.decode(
+                access_token,
+                self._jwks_cache.key_set,
+                claims_options=self._claims_options,
+            )
+            claims.validate(leeway=_CLAIMS_LEEWAY_SECONDS)
+        except (JoseError, ValueError) as err:
+            logger.debug(f"Token failed local verification: {err}")
+            return False
+        return self._check_revocation(access_token)
+
+    async def aclose(self) -> None:
+        for task in self._background_tasks:
+            task.cancel()
+
+    def _check_revocation(self, access_token: str) -> bool:
+        if self._revocation_check_interval_seconds <= 0:
+            return True
+        token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+        checked_at, active = self._revocation_checks.get(token_hash, (None, True))
+        if not active:
+            return False
+        now = time.monotonic()
+        if (
+            checked_at is None
+            or now - checked_at >= self._revocation_check_interval_seconds
+        ):
+            # recording the check beforehand ensures only one runs at a time
+            self._record_revocation_check(token_hash, now, active=True)
+            task = asyncio.create_task(
+                self._introspect_in_background(token_hash, access_token)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return True
+
+    async def _introspect_in_background(
+        self, token_hash: str, access_token: str
+    ) -> None:
+        match await self._fallback.get_active_status(access_token):
+            case False:
+                logger.info("Locally verified token was found to be inactive")
+                self._record_revocation_check(
+                    token_hash, time.monotonic(), active=False
+                )
+            case None:
+                logger.warning(
+                    "Could not check whether a locally verified token was revoked, "
+                    "keeping it until the next check"
+                )
+
+    def _record_revocation_check(
+        self, token_hash: str, checked_at: float, active: bool
+    ) -> None:
+        self._revocation_checks[token_hash] = (checked_at, active)
+        self._revocation_checks.move_to_end(token_hash)
+        while len(self._revocation_checks) > self._max_entries:
+            self._revocation_checks.popitem(last=False)
+
+
+def _get_jwt_header(token: str) -> dict | None:
+    """Return the header of a JWT, or None if the token is not a JWT."""
+    raw_header, separator, _ = token.partition(".")
+    if not separator:
+        return None
+    try:
+        header = json.loads(
+            base64.urlsafe_b64decode(raw_header + "=" * (-len(raw_header) % 4))
+        )
+    except ValueError:
+        return None
+    return header if isinstance(header, dict) else None
@@ -32,6 +32,15 @@ from seis_lab_data.schemas.identifiers import UserId
 from seis_lab_data.webapp.app import create_app_from_settings
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-plans",
+        action="store_true",
+        default=False,
+        help="Rewrite the stored query plan snapshots instead of comparing with them",
+    )
+
+
 @pytest_asyncio.fixture(scope="session")
 async def bootstrap_data():
     bootstrap_data_path = (
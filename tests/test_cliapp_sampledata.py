@@ -0,0 +1,108 @@
+import contextlib
+import types
+
+import pytest
+import shapely
+import typer
+
+from seis_lab_data.cliapp import (
+    devapp,
+    sampledata,
+)
+from seis_lab_data.schemas import identifiers
+
+_OWNER_ID = identifiers.UserId("admin")
+
+
+def _generate(seed: int, batch_index: int = 0):
+    vocabulary = sampledata.SyntheticVocabulary.from_faker()
+    projects = sampledata.generate_synthetic_projects(seed, 5, _OWNER_ID, vocabulary)
+    survey_missions = sampledata.generate_synthetic_survey_missions(
+        seed, 20, projects, _OWNER_ID, vocabulary
+    )
+    records = sampledata.generate_synthetic_survey_related_records(
+        seed,
+        batch_index,
+        100,
+        survey_missions,
+        _OWNER_ID,
+        [identifiers.DatasetCategoryId(1)],
+        [identifiers.WorkflowStageId(1)],
+        vocabulary,
+    )
+    return projects, survey_missions, records
+
+
+def _without_creation_dates(rows, columns):
+    created_at_index = columns.index("created_at")
+    return [row[:created_at_index] + row[created_at_index + 1 :] for row in rows]
+
+
+def test_synthetic_data_is_deterministic():
+    first_projects, first_missions, first_records = _generate(seed=7)
+    second_projects, second_missions, second_records = _generate(seed=7)
+    assert [p.id for p in first_projects] == [p.id for p in second_projects]
+    assert [m.id for m in first_missions] == [m.id for m in second_missions]
+    assert _without_creation_dates(
+        first_records, sampledata.SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS
+    ) == _without_creation_dates(
+        second_records, sampledata.SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS
+    )
+    _, _, other_batch_records = _generate(seed=7, batch_index=1)
+    assert {r[0] for r in first_records}.isdisjoint(r[0] for r in other_batch_records)
+
+
+def test_synthetic_data_is_nested_around_the_portuguese_eez():
+    projects, survey_missions, records = _generate(seed=3)
+    regions = [shapely.box(*bounds) for bounds, _ in sampledata.PORTUGUESE_EEZ_REGIONS]
+    for project in projects:
+        assert any(r.contains(shapely.Point(project.x, project.y)) for r in regions)
+    missions_by_id = {m.id: m for m in survey_missions}
+    projects_by_id = {p.id: p for p in projects}
+    columns = sampledata.SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS
+    for record in records:
+        assert len(record) == len(columns)
+        mission = missions_by_id[record[columns.index("survey_mission_id")]]
+        project = projects_by_id[
+            mission.row[sampledata.SYNTHETIC_SURVEY_MISSION_COLUMNS.index("project_id")]
+        ]
+        begin = record[columns.index("temporal_extent_begin")]
+        end = record[columns.index("temporal_extent_end")]
+        assert mission.temporal_extent_begin <= begin <= end
+        assert end <= mission.temporal_extent_end <= project.temporal_extent_end
+        if record[columns.index("status")] == "PUBLISHED":
+            assert mission.is_published and project.is_published
+        assert record[columns.index("bbox_4326")].startswith("SRID=4326;POLYGON")
+
+
+@pytest.mark.asyncio
+async def test_load_test_data_needs_bootstrap_data(monkeypatch):
+    async def collect_nothing(session):
+        return []
+
+    async def copy_rows(*args, **kwargs):
+        raise AssertionError("nothing should be written")
+
+    monkeypatch.setattr(
+        devapp.category_queries, "collect_all_dataset_categories", collect_nothing
+    )
+    monkeypatch.setattr(
+        devapp.stage_queries, "collect_all_workflow_stages", collect_nothing
+    )
+    monkeypatch.setattr(devapp.common_commands, "copy_rows", copy_rows)
+    messages = []
+    settings = types.SimpleNamespace(
+        get_db_session_maker=lambda: lambda: contextlib.nullcontext(None)
+    )
+    ctx = types.SimpleNamespace(
+        obj={
+            "admin_user": types.SimpleNamespace(id=_OWNER_ID),
+            "main": types.SimpleNamespace(
+                settings=settings,
+                status_console=types.SimpleNamespace(print=messages.append),
+            ),
+        }
+    )
+    with pytest.raises(typer.Abort):
+        await devapp.generate_load_test_data(ctx, num_records=10)
+    assert "bootstrap" in messages[-1]
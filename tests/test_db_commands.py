@@ -9,6 +9,7 @@ from seis_lab_data import (
 from seis_lab_data.db.commands import (
     datasetcategories as category_commands,
     projects as project_commands,
+    publication as publication_commands,
     surveymissions as mission_commands,
     surveyrelatedrecords as record_commands,
     workflowstages as stage_commands,
@@ -398,6 +399,22 @@ async def test_delete_survey_related_record(
         )
 
 
+async def _run_bulk_update(session, to_update, **filter_kwargs) -> int:
+    bulk_update_job_id = identifiers.RequestId(uuid.uuid4())
+    ids_statement = record_queries.build_survey_related_record_id_statement(
+        **filter_kwargs
+    )
+    bulk_update_job = await record_commands.create_bulk_update_job(
+        session, bulk_update_job_id, ids_statement
+    )
+    while bulk_update_job.status == constants.BulkUpdateJobStatus.RUNNING:
+        bulk_update_job = await record_commands.run_bulk_update_chunk(
+            session, bulk_update_job_id, to_update, ids_statement, chunk_size=1
+        )
+    assert bulk_update_job.affected_count == bulk_update_job.total_count
+    return bulk_update_job.affected_count
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_bulk_update_filtered_records(
@@ -415,7 +432,7 @@ async def test_bulk_update_filtered_records(
         workflow_stage_id=identifiers.WorkflowStageId(new_stage.id)
     )
     async with db_session_maker() as session:
-        updated_count = await record_commands.bulk_update_filtered_records(
+        updated_count = await _run_bulk_update(
             session,
             to_update,
             en_name_filter="First",
@@ -448,7 +465,7 @@ async def test_bulk_update_filtered_records_excludes_records(
         workflow_stage_id=identifiers.WorkflowStageId(new_stage.id)
     )
     async with db_session_maker() as session:
-        updated_count = await record_commands.bulk_update_filtered_records(
+        updated_count = await _run_bulk_update(
             session,
             to_update,
             excluded_record_ids=[identifiers.SurveyRelatedRecordId(first_record.id)],
@@ -479,10 +496,10 @@ async def test_bulk_update_manually_selected_records(
         )
     )
     async with db_session_maker() as session:
-        updated_count = await record_commands.bulk_update_manually_selected_records(
+        updated_count = await _run_bulk_update(
             session,
             to_update,
-            [identifiers.SurveyRelatedRecordId(second_record.id)],
+            record_ids=[identifiers.SurveyRelatedRecordId(second_record.id)],
         )
         assert updated_count == 1
         updated_second = await record_queries.get_survey_related_record(
@@ -516,10 +533,10 @@ async def test_bulk_update_manually_selected_records_replaces_related_records(
         ]
     )
     async with db_session_maker() as session:
-        await record_commands.bulk_update_manually_selected_records(
+        await _run_bulk_update(
             session,
             add_relation,
-            [identifiers.SurveyRelatedRecordId(second_record.id)],
+            record_ids=[identifiers.SurveyRelatedRecordId(second_record.id)],
         )
         related_to = await record_queries.list_survey_related_record_related_to_records(
             session, identifiers.SurveyRelatedRecordId(second_record.id)
@@ -531,10 +548,10 @@ async def test_bulk_update_manually_selected_records_replaces_related_records(
 
     clear_relations = record_schemas.SurveyRelatedRecordBulkUpdate(related_records=[])
     async with db_session_maker() as session:
-        await record_commands.bulk_update_manually_selected_records(
+        await _run_bulk_update(
             session,
             clear_relations,
-            [identifiers.SurveyRelatedRecordId(second_record.id)],
+            record_ids=[identifiers.SurveyRelatedRecordId(second_record.id)],
         )
         related_to = await record_queries.list_survey_related_record_related_to_records(
             session, identifiers.SurveyRelatedRecordId(second_record.id)
@@ -544,7 +561,7 @@ async def test_bulk_update_manually_selected_records_replaces_related_records(
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_bulk_publish_valid_survey_related_records(
+async def test_cascade_publication_of_survey_mission(
     db,
     db_session_maker,
     sample_survey_related_records,
@@ -593,12 +610,16 @@ async def test_bulk_publish_valid_survey_related_records(
         )
         # invalid_sibling is left with its default (not valid) validation result
 
-        published_count = (
-            await record_commands.bulk_publish_valid_survey_related_records(
-                session, identifiers.SurveyMissionId(first_record.survey_mission_id)
-            )
+        cascade = await publication_commands.cascade_publication(
+            session,
+            publish=True,
+            survey_mission_id=identifiers.SurveyMissionId(
+                first_record.survey_mission_id
+            ),
+        )
+        assert cascade == publication_commands.PublicationCascade(
+            num_survey_missions=0, num_records=1
         )
-        assert published_count == 1
 
         published_first = await record_queries.get_survey_related_record(
             session, identifiers.SurveyRelatedRecordId(first_record.id)
@@ -617,7 +638,7 @@ async def test_bulk_publish_valid_survey_related_records(
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_bulk_unpublish_survey_related_records(
+async def test_cascade_unpublication_of_survey_mission(
     db,
     db_session_maker,
     sample_survey_related_records,
@@ -636,10 +657,14 @@ async def test_bulk_unpublish_survey_related_records(
             constants.SurveyRelatedRecordStatus.PUBLISHED,
         )
 
-        unpublished_count = await record_commands.bulk_unpublish_survey_related_records(
-            session, identifiers.SurveyMissionId(first_record.survey_mission_id)
+        cascade = await publication_commands.cascade_publication(
+            session,
+            publish=False,
+            survey_mission_id=identifiers.SurveyMissionId(
+                first_record.survey_mission_id
+            ),
         )
-        assert unpublished_count == 1
+        assert cascade.num_records == 1
         updated_first = await record_queries.get_survey_related_record(
             session, identifiers.SurveyRelatedRecordId(first_record.id)
         )
@@ -653,7 +678,7 @@ async def test_bulk_unpublish_survey_related_records(
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_bulk_publish_valid_survey_missions_for_project(
+async def test_cascade_publication_of_project(
     db,
     db_session_maker,
     sample_survey_missions,
@@ -678,12 +703,10 @@ async def test_bulk_publish_valid_survey_missions_for_project(
         )
         # invalid_mission is left with its default (not valid) validation result
 
-        published_ids = (
-            await mission_commands.bulk_publish_valid_survey_missions_for_project(
-                session, identifiers.ProjectId(project_id)
-            )
+        cascade = await publication_commands.cascade_publication(
+            session, publish=True, project_id=identifiers.ProjectId(project_id)
         )
-        assert published_ids == [identifiers.SurveyMissionId(valid_mission.id)]
+        assert cascade.num_survey_missions == 1
 
         published = await mission_queries.get_survey_mission(
             session, identifiers.SurveyMissionId(valid_mission.id)
@@ -702,7 +725,7 @@ async def test_bulk_publish_valid_survey_missions_for_project(
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_bulk_unpublish_survey_missions_for_project(
+async def test_cascade_unpublication_of_project(
     db,
     db_session_maker,
     sample_survey_missions,
@@ -730,12 +753,10 @@ async def test_bulk_unpublish_survey_missions_for_project(
             constants.SurveyMissionStatus.PUBLISHED,
         )
 
-        unpublished_ids = (
-            await mission_commands.bulk_unpublish_survey_missions_for_project(
-                session, identifiers.ProjectId(project_id)
-            )
+        cascade = await publication_commands.cascade_publication(
+            session, publish=False, project_id=identifiers.ProjectId(project_id)
         )
-        assert unpublished_ids == [identifiers.SurveyMissionId(first_mission.id)]
+        assert cascade.num_survey_missions == 1
 
         updated_first = await mission_queries.get_survey_mission(
             session, identifiers.SurveyMissionId(first_mission.id)
@@ -0,0 +1,381 @@
+"""Query plan regression tests for the list query builders.
+
+These run `EXPLAIN (FORMAT JSON)` for each combination of filters that the
+web UI uses, against a synthetic dataset that is large enough for the planner
+to prefer indexes. Plans are compared with the snapshots stored in
+`tests/data/query-plans`, along with their estimated cost, and a missing
+snapshot fails the test. Write new snapshots, or rewrite them after an
+intended change, with:
+
+    pytest -m integration tests/test_db_query_plans.py --update-query-plans
+
+Snapshots must come from the PostGIS image used by CI. While none are
+committed, the CI workflow generates them before running the integration tests
+and publishes them as the `query-plan-snapshots` artifact.
+"""
+
+import dataclasses
+import datetime as dt
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import anyio
+import pytest
+import pytest_asyncio
+import shapely
+import sqlmodel
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import (
+    ClauseElement,
+    Executable,
+)
+
+from seis_lab_data import (
+    config,
+    constants,
+)
+from seis_lab_data.cliapp import (
+    sampledata,
+    utils,
+)
+from seis_lab_data.db import models
+from seis_lab_data.db.commands import (
+    common as common_commands,
+    datasetcategories as category_commands,
+    users as user_commands,
+    workflowstages as stage_commands,
+)
+from seis_lab_data.db.engine import (
+    get_engine,
+    get_session_maker,
+    get_sync_engine,
+)
+from seis_lab_data.db.queries import (
+    projects as project_queries,
+    surveymissions as mission_queries,
+    surveyrelatedrecords as record_queries,
+)
+from seis_lab_data.schemas import (
+    filters as filter_schemas,
+    identifiers,
+)
+from seis_lab_data.schemas.user import User
+
+_SNAPSHOTS_DIR = Path(__file__).parent / "data/query-plans"
+_SEED = 48
+_PAGE_SIZE = 20
+# estimated costs may grow this much over their snapshot before failing
+_COST_TOLERANCE = 1.5
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def get_plan_shape(node: dict) -> dict:
+    """Keep only the parts of a plan that do not depend on estimates."""
+    shape = {"node_type": node["Node Type"]}
+    for key, name in (
+        ("Relation Name", "relation"),
+        ("Index Name", "index"),
+        ("Join Type", "join_type"),
+    ):
+        if key in node:
+            shape[name] = node[key]
+    if children := node.get("Plans"):
+        shape["plans"] = [get_plan_shape(child) for child in children]
+    return shape
+
+
+def _get_index_names(shape: dict) -> set[str]:
+    names = {shape["index"]} if "index" in shape else set()
+    for child in shape.get("plans", []):
+        names |= _get_index_names(child)
+    return names
+
+
+@dataclasses.dataclass(frozen=True)
+class _SyntheticDataset:
+    project_id: identifiers.ProjectId
+    survey_mission_id: identifiers.SurveyMissionId
+    dataset_category_id: identifiers.DatasetCategoryId
+    workflow_stage_id: identifiers.WorkflowStageId
+    bbox: shapely.Polygon
+    search_term: str
+    temporal_extent: filter_schemas.TemporalExtentFilterValue
+
+
+@dataclasses.dataclass(frozen=True)
+class _PlanCase:
+    name: str
+    build: Callable[[_SyntheticDataset], object]
+    expected_indexes: tuple[str, ...] = ()
+
+
+def _published_records(**kwargs):
+    return record_queries._build_survey_related_record_statement(**kwargs).where(
+        models.SurveyRelatedRecord.status
+        == constants.SurveyRelatedRecordStatus.PUBLISHED
+    )
+
+
+def _published_missions(**kwargs):
+    return mission_queries._build_survey_mission_statement(**kwargs).where(
+        models.SurveyMission.status == constants.SurveyMissionStatus.PUBLISHED
+    )
+
+
+def _published_projects(**kwargs):
+    return project_queries._build_project_statement(**kwargs).where(
+        models.Project.status == constants.ProjectStatus.PUBLISHED
+    )
+
+
+_PLAN_CASES = [
+    _PlanCase("records-published", lambda d: _published_records()),
+    _PlanCase(
+        "records-published-by-name",
+        lambda d: _published_records(en_name_filter=d.search_term),
+    ),
+    _PlanCase(
+        "records-published-by-bbox",
+        lambda d: _published_records(spatial_intersect=d.bbox),
+    ),
+    _PlanCase(
+        "records-published-by-temporal-extent",
+        lambda d: _published_records(temporal_extent=d.temporal_extent),
+    ),
+    _PlanCase(
+        "records-published-by-bbox-and-temporal-extent",
+        lambda d: _published_records(
+            spatial_intersect=d.bbox, temporal_extent=d.temporal_extent
+        ),
+    ),
+    _PlanCase(
+        "records-published-by-dataset-category",
+        lambda d: _published_records(dataset_category_id=d.dataset_category_id),
+    ),
+    _PlanCase(
+        "records-published-by-workflow-stage",
+        lambda d: _published_records(workflow_stage_id=d.workflow_stage_id),
+    ),
+    _PlanCase(
+        "records-of-survey-mission",
+        lambda d: record_queries._build_survey_related_record_statement(
+            survey_mission_id=d.survey_mission_id
+        ),
+        expected_indexes=("ix_surveyrelatedrecord_survey_mission_id",),
+    ),
+    _PlanCase(
+        "records-of-survey-mission-by-name",
+        lambda d: record_queries._build_survey_related_record_statement(
+            survey_mission_id=d.survey_mission_id, en_name_filter=d.search_term
+        ),
+        expected_indexes=("ix_surveyrelatedrecord_survey_mission_id",),
+    ),
+    _PlanCase(
+        "records-of-project",
+        lambda d: record_queries._build_survey_related_record_statement(
+            project_id=d.project_id
+        ),
+    ),
+    _PlanCase("survey-missions-published", lambda d: _published_missions()),
+    _PlanCase(
+        "survey-missions-published-by-name",
+        lambda d: _published_missions(en_name_filter=d.search_term),
+    ),
+    _PlanCase(
+        "survey-missions-published-by-bbox-and-temporal-extent",
+        lambda d: _published_missions(
+            spatial_intersect=d.bbox, temporal_extent=d.temporal_extent
+        ),
+    ),
+    _PlanCase(
+        "survey-missions-of-project",
+        lambda d: mission_queries._build_survey_mission_statement(
+            project_id=d.project_id
+        ),
+        expected_indexes=("ix_surveymission_project_id",),
+    ),
+    _PlanCase("projects-published", lambda d: _published_projects()),
+    _PlanCase(
+        "projects-published-by-name",
+        lambda d: _published_projects(en_name_filter=d.search_term),
+    ),
+    _PlanCase(
+        "projects-published-by-bbox-and-temporal-extent",
+        lambda d: _published_projects(
+            spatial_intersect=d.bbox, temporal_extent=d.temporal_extent
+        ),
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def query_plan_settings():
+    settings = config.get_settings()
+    settings.message_broker_dsn = None
+    settings.database_dsn = settings.test_database_dsn
+    return settings
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def synthetic_dataset(query_plan_settings):
+    """Load a synthetic catalogue with a realistic distribution of extents."""
+    sync_engine = get_sync_engine(query_plan_settings)
+    sqlmodel.SQLModel.metadata.create_all(sync_engine)
+    engine = get_engine(query_plan_settings.database_dsn.unicode_string(), debug=False)
+    session_maker = get_session_maker(engine)
+    bootstrap_data = await utils.get_bootstrap_data(
+        anyio.Path(__file__).parents[1] / "src/seis_lab_data/cliapp/bootstrapdata.toml"
+    )
+    owner = User(
+        id=identifiers.UserId("queryplanner"),
+        username="query-planner",
+        email="queryplanner@tests.dev",
+        roles=[constants.ROLE_SYSTEM_ADMIN],
+    )
+    vocabulary = sampledata.SyntheticVocabulary.from_faker()
+    projects = sampledata.generate_synthetic_projects(_SEED, 300, owner.id, vocabulary)
+    survey_missions = sampledata.generate_synthetic_survey_missions(
+        _SEED, 3_000, projects, owner.id, vocabulary
+    )
+    async with session_maker() as session:
+        await user_commands.upsert_user(session, owner)
+        categories = [
+            await category_commands.create_dataset_category(session, to_create)
+            for to_create in bootstrap_data[constants.ResourceType.CATEGORY]
+        ]
+        stages = [
+            await stage_commands.create_workflow_stage(session, to_create)
+            for to_create in bootstrap_data[constants.ResourceType.WORKFLOW_STAGE]
+        ]
+        for model, column_names, rows in (
+            (
+                models.Project,
+                sampledata.SYNTHETIC_PROJECT_COLUMNS,
+                [p.row for p in projects],
+            ),
+            (
+                models.SurveyMission,
+                sampledata.SYNTHETIC_SURVEY_MISSION_COLUMNS,
+                [m.row for m in survey_missions],
+            ),
+            (
+                models.SurveyRelatedRecord,
+                sampledata.SYNTHETIC_SURVEY_RELATED_RECORD_COLUMNS,
+                sampledata.generate_synthetic_survey_related_records(
+                    _SEED,
+                    0,
+                    60_000,
+                    survey_missions,
+                    owner.id,
+                    [identifiers.DatasetCategoryId(c.id) for c in categories],
+                    [identifiers.WorkflowStageId(s.id) for s in stages],
+                    vocabulary,
+                ),
+            ),
+        ):
+            await common_commands.copy_rows(
+                session, model.__tablename__, column_names, rows
+            )
+        await session.commit()
+        for model in (models.Project, models.SurveyMission, models.SurveyRelatedRecord):
+            await session.execute(text(f"ANALYZE {model.__tablename__}"))
+        await session.commit()
+    survey_mission = survey_missions[0]
+    yield (
+        session_maker,
+        _SyntheticDataset(
+            project_id=identifiers.ProjectId(
+                survey_mission.row[
+                    sampledata.SYNTHETIC_SURVEY_MISSION_COLUMNS.index("project_id")
+                ]
+            ),
+            survey_mission_id=identifiers.SurveyMissionId(survey_mission.id),
+            dataset_category_id=identifiers.DatasetCategoryId(categories[0].id),
+            workflow_stage_id=identifiers.WorkflowStageId(stages[0].id),
+            bbox=shapely.box(
+                survey_mission.x - 0.25,
+                survey_mission.y - 0.25,
+                survey_mission.x + 0.25,
+                survey_mission.y + 0.25,
+            ),
+            search_term=vocabulary.en_words[0],
+            temporal_extent=filter_schemas.TemporalExtentFilterValue(
+                begin=dt.date(2010, 1, 1), end=dt.date(2014, 12, 31)
+            ),
+        ),
+    )
+    await engine.dispose()
+    sqlmodel.SQLModel.metadata.drop_all(sync_engine)
+
+
+def test_plan_shapes_ignore_estimates():
+    plan = {
+        "Node Type": "Limit",
+        "Total Cost": 123.4,
+        "Plan Rows": 20,
+        "Plans": [
+            {
+                "Node Type": "Bitmap Heap Scan",
+                "Relation Name": "surveyrelatedrecord",
+                "Total Cost": 120.0,
+                "Plans": [
+                    {
+                        "Node Type": "Bitmap Index Scan",
+                        "Index Name": "ix_surveyrelatedrecord_survey_mission_id",
+                        "Index Cond": "(survey_mission_id = '...'::uuid)",
+                    }
+                ],
+            }
+        ],
+    }
+    shape = get_plan_shape(plan)
+    assert "Total Cost" not in json.dumps(shape)
+    assert _get_index_names(shape) == {"ix_surveyrelatedrecord_survey_mission_id"}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("case", _PLAN_CASES, ids=lambda case: case.name)
+async def test_query_plan_has_not_regressed(
+    synthetic_dataset, case: _PlanCase, request
+):
+    session_maker, dataset = synthetic_dataset
+    async with session_maker() as session:
+        explained = (
+            await session.execute(_Explain(case.build(dataset).limit(_PAGE_SIZE)))
+        ).scalar_one()
+    plan = explained[0]["Plan"]
+    shape = get_plan_shape(plan)
+    for index_name in case.expected_indexes:
+        assert index_name in _get_index_names(shape), json.dumps(shape, indent=2)
+
+    snapshot_path = _SNAPSHOTS_DIR / f"{case.name}.json"
+    current = {"total_cost": plan["Total Cost"], "plan": shape}
+    if request.config.getoption("--update-query-plans"):
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot_path.write_text(json.dumps(current, indent=2) + "\n")
+        return
+    if not snapshot_path.exists():
+        pytest.fail(
+            f"There is no query plan snapshot for {case.name!r} - generate it by "
+            f"rerunning with --update-query-plans and commit {snapshot_path}"
+        )
+    snapshot = json.loads(snapshot_path.read_text())
+    assert shape == snapshot["plan"], (
+        f"The plan for {case.name!r} changed - if this is intended, rerun with "
+        f"--update-query-plans"
+    )
+    assert plan["Total Cost"] <= snapshot["total_cost"] * _COST_TOLERANCE
@@ -0,0 +1,291 @@
+import asyncio
+import dataclasses
+import uuid
+
+import pytest
+
+from seis_lab_data import (
+    constants,
+    dispatch,
+    subscribers,
+)
+from seis_lab_data.schemas import (
+    events,
+    identifiers,
+    messages,
+)
+from seis_lab_data.webapp.streamhandlers import common as common_handlers
+
+
+class _FakePipeline:
+    def __init__(self, redis_client: "_FakeRedis"):
+        self._redis = redis_client
+        self._queued: list[tuple[str, str]] = []
+        self._increments: list[str] = []
+        self._stream_entries: list[dict] = []
+
+    def publish(self, channel: str, message: str) -> "_FakePipeline":
+        self._queued.append((channel, message))
+        return self
+
+    def incr(self, name: str) -> "_FakePipeline":
+        self._increments.append(name)
+        return self
+
+    def xadd(self, **kwargs) -> "_FakePipeline":
+        self._stream_entries.append(kwargs)
+        return self
+
+    def expire(self, name: str, time: int) -> "_FakePipeline":
+        self._redis.expirations[name] = time
+        return self
+
+    async def execute(self) -> None:
+        self._redis.pipeline_executions += 1
+        for name in self._increments:
+            await self._redis.incr(name)
+        for xadd_kwargs in self._stream_entries:
+            await self._redis.xadd(**xadd_kwargs)
+        self._redis.published.extend(self._queued)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.published: list[tuple[str, str]] = []
+        self.stream_entries: dict[str, list[tuple[str, dict]]] = {}
+        self.pipeline_executions = 0
+        self.counters: dict[str, int] = {}
+        self.stream_max_lengths: dict[str, int] = {}
+        self.expirations: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+    async def incr(self, name: str) -> int:
+        self.counters[name] = self.counters.get(name, 0) + 1
+        return self.counters[name]
+
+    async def xadd(self, name: str, fields: dict, maxlen: int, approximate: bool):
+        entries = self.stream_entries.setdefault(name, [])
+        self.stream_max_lengths[name] = maxlen
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append(
+            (entry_id.encode(), {k.encode(): v.encode() for k, v in fields.items()})
+        )
+        return entry_id
+
+    async def xread(self, streams: dict[str, str], block: int | None = None):
+        result = []
+        for stream_name, last_id in streams.items():
+            last_ms = int(last_id.partition("-")[0])
+            pending = [
+                entry
+                for entry in self.stream_entries.get(stream_name, [])
+                if int(entry[0].decode().partition("-")[0]) > last_ms
+            ]
+            if pending:
+                result.append((stream_name.encode(), pending))
+        return result
+
+
+def _get_event() -> events.ResourceModificationEvent:
+    return events.ResourceModificationEvent(
+        initiator="tester",
+        request_id=identifiers.RequestId(uuid.uuid4()),
+        resource_type=constants.ResourceType.PROJECT,
+        resource_id=str(uuid.uuid4()),
+        modification=constants.ResourceModification.CREATED,
+        succeeded=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_event_dispatcher_publishes_on_topic():
+    fake_redis = _FakeRedis()
+    event = _get_event()
+    await dispatch.RedisEventDispatcher(fake_redis)(event)
+    assert len(fake_redis.published) == 1
+    channel, payload = fake_redis.published[0]
+    assert channel == constants.NEW_TOPIC_PROJECTS
+    message = messages.ResourceModificationMessage.model_validate_json(payload)
+    assert message.resource_id == event.resource_id
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_event_dispatcher_appends_to_stream():
+    fake_redis = _FakeRedis()
+    await dispatch.RedisStreamEventDispatcher(fake_redis, max_length=10)(_get_event())
+    assert fake_redis.published == []
+    stream_name = constants.EVENT_STREAM_NAME_TEMPLATE.format(
+        topic_name=constants.NEW_TOPIC_PROJECTS
+    )
+    assert len(fake_redis.stream_entries[stream_name]) == 1
+
+
+@pytest.mark.asyncio
+async def test_batching_event_dispatcher_sends_when_batch_is_full():
+    fake_redis = _FakeRedis()
+    dispatcher = dispatch.BatchingEventDispatcher(
+        dispatch.RedisEventDispatcher(fake_redis), max_size=3, max_delay_seconds=60
+    )
+    to_dispatch = [_get_event() for _ in range(4)]
+    for event in to_dispatch:
+        await dispatcher(event)
+    assert fake_redis.pipeline_executions == 1
+    assert len(fake_redis.published) == 3
+    await dispatch.flush_pending_events(dispatcher)
+    assert fake_redis.pipeline_executions == 2
+    sent_ids = [
+        messages.ResourceModificationMessage.model_validate_json(payload).resource_id
+        for _, payload in fake_redis.published
+    ]
+    assert sent_ids == [event.resource_id for event in to_dispatch]
+
+
+@pytest.mark.asyncio
+async def test_batching_event_dispatcher_sends_after_delay():
+    fake_redis = _FakeRedis()
+    dispatcher = dispatch.BatchingEventDispatcher(
+        dispatch.RedisEventDispatcher(fake_redis), max_size=10, max_delay_seconds=0.01
+    )
+    await dispatcher(_get_event())
+    assert fake_redis.published == []
+    await asyncio.sleep(0.05)
+    assert len(fake_redis.published) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_subscription_resumes_after_last_event_id():
+    fake_redis = _FakeRedis()
+    dispatcher = dispatch.RedisStreamEventDispatcher(fake_redis, max_length=10)
+    first_event = _get_event()
+    second_event = _get_event()
+    await dispatcher(first_event)
+    await dispatcher(second_event)
+
+    async def handler(message, context, done=None):
+        yield message.resource_id
+        done.set()
+
+    subscription = await subscribers.open_topic_stream(
+        fake_redis,
+        [constants.NEW_TOPIC_PROJECTS],
+        last_event_id="1-0",
+        event_id_tagger=lambda chunk, event_id: (event_id, chunk),
+    )
+    received = [
+        chunk
+        async for chunk in subscribers.iter_topic_messages(
+            subscription,
+            subscription.topic_names,
+            subscribers.HandlerContext(),
+            {"resource_modified": handler},
+        )
+    ]
+    assert received == [("2-0", second_event.resource_id)]
+
+
+def test_get_replay_start_id_is_in_the_past():
+    ms, _, seq = subscribers.get_replay_start_id(10).partition("-")
+    assert seq == "0"
+    recent_ms, _, _ = subscribers.get_replay_start_id(0).partition("-")
+    assert int(recent_ms) - int(ms) >= 10_000
+
+
+def test_tag_with_event_id():
+    event = common_handlers.ServerSentEventGenerator.patch_signals({"a": 1})
+    tagged = common_handlers.tag_with_event_id(event, "123-0")
+    assert tagged.splitlines()[1] == "id: 123-0"
+    assert common_handlers.tag_with_event_id(tagged, "456-0") == tagged
+
+
+@pytest.mark.asyncio
+async def test_discovery_progress_is_published_on_request_topic():
+    fake_redis = _FakeRedis()
+    request_id = identifiers.RequestId(uuid.uuid4())
+    await dispatch.RedisEventDispatcher(fake_redis)(
+        events.DiscoveryProgressEvent(
+            initiator="tester",
+            resource_type=constants.ResourceType.MISSION,
+            resource_id=str(uuid.uuid4()),
+            request_id=request_id,
+            total_files=10,
+            files_seen=4,
+            files_extracted=3,
+            files_failed=1,
+            files_per_second=2.0,
+        )
+    )
+    channel, payload = fake_redis.published[0]
+    assert channel == f"progress:{request_id}"
+    message = messages.DiscoveryProgressMessage.model_validate_json(payload)
+    assert (message.files_seen, message.total_files) == (4, 10)
+
+
+@pytest.mark.asyncio
+async def test_progress_streams_are_shorter_and_expire():
+    fake_redis = _FakeRedis()
+    request_id = identifiers.RequestId(uuid.uuid4())
+    dispatcher = dispatch.RedisStreamEventDispatcher(
+        fake_redis, max_length=10, progress_max_length=5, progress_ttl_seconds=60
+    )
+    await dispatcher(_get_event())
+    await dispatcher(
+        events.BulkUpdateProgressEvent(
+            initiator="tester",
+            resource_type=constants.ResourceType.RECORD,
+            request_id=request_id,
+            total_count=10,
+            affected_count=4,
+        )
+    )
+    progress_stream_name = constants.EVENT_STREAM_NAME_TEMPLATE.format(
+        topic_name=f"progress:{request_id}"
+    )
+    projects_stream_name = constants.EVENT_STREAM_NAME_TEMPLATE.format(
+        topic_name=constants.NEW_TOPIC_PROJECTS
+    )
+    assert fake_redis.stream_max_lengths == {
+        projects_stream_name: 10,
+        progress_stream_name: 5,
+    }
+    assert fake_redis.expirations == {progress_stream_name: 60}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_progress_is_published_on_request_topic():
+    fake_redis = _FakeRedis()
+    request_id = identifiers.RequestId(uuid.uuid4())
+    await dispatch.RedisEventDispatcher(fake_redis)(
+        events.BulkUpdateProgressEvent(
+            initiator="tester",
+            resource_type=constants.ResourceType.RECORD,
+            request_id=request_id,
+            total_count=10,
+            affected_count=4,
+        )
+    )
+    channel, payload = fake_redis.published[0]
+    assert channel == f"progress:{request_id}"
+    message = messages.BulkUpdateProgressMessage.model_validate_json(payload)
+    assert (message.affected_count, message.total_count) == (4, 10)
+    assert fake_redis.counters == {}
+
+
+@pytest.mark.asyncio
+async def test_successful_modifications_bump_resource_version():
+    fake_redis = _FakeRedis()
+    dispatcher = dispatch.BatchingEventDispatcher(
+        dispatch.RedisEventDispatcher(fake_redis), max_size=10, max_delay_seconds=60
+    )
+    failed_event = dataclasses.replace(_get_event(), succeeded=False)
+    for event in (_get_event(), failed_event, _get_event()):
+        await dispatcher(event)
+    await dispatch.flush_pending_events(dispatcher)
+    version_key = constants.RESOURCE_VERSION_KEY_TEMPLATE.format(
+        resource_type=constants.ResourceType.PROJECT.value
+    )
+    assert fake_redis.counters == {version_key: 2}
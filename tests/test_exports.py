@@ -0,0 +1,157 @@
+import contextlib
+import csv
+import datetime as dt
+import io
+import json
+import types
+import uuid
+
+import pyarrow.parquet
+import pytest
+import shapely
+from sqlalchemy.dialects import postgresql
+from starlette.applications import Starlette
+from starlette.authentication import UnauthenticatedUser
+from starlette.middleware import Middleware
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from seis_lab_data import (
+    constants,
+    exports,
+)
+from seis_lab_data.db.queries import surveyrelatedrecords as record_queries
+from seis_lab_data.permissions import surveyrelatedrecords as record_permissions
+from seis_lab_data.webapp import compression
+from seis_lab_data.webapp.routes import surveyrelatedrecords as record_routes
+
+
+def _get_row(index: int, with_bbox: bool = True) -> dict:
+    return {
+        "id": uuid.UUID(int=index),
+        "name_en": f"Record {index}",
+        "name_pt": f"Registo {index}",
+        "description_en": None,
+        "description_pt": "Descrição",
+        "status": constants.SurveyRelatedRecordStatus.PUBLISHED,
+        "survey_mission_id": uuid.UUID(int=100),
+        "survey_mission_name_en": "Mission",
+        "project_id": uuid.UUID(int=200),
+        "project_name_en": "Project",
+        "dataset_category_en": "bathymetry",
+        "workflow_stage_en": None,
+        "temporal_extent_begin": dt.date(2024, 1, index),
+        "temporal_extent_end": None,
+        "bbox_4326": (
+            memoryview(shapely.box(-9.5, 38.5, -9.0, 39.0).wkb) if with_bbox else None
+        ),
+    }
+
+
+async def _get_batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.asyncio
+async def test_ndjson_exports_one_line_per_record():
+    chunks = [
+        c
+        async for c in exports.serialize_as_ndjson(
+            _get_batches([_get_row(1), _get_row(2, with_bbox=False)], [_get_row(3)])
+        )
+    ]
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [line["name_en"] for line in lines] == ["Record 1", "Record 2", "Record 3"]
+    assert lines[0]["id"] == str(uuid.UUID(int=1))
+    assert lines[0]["status"] == "published"
+    assert lines[0]["description_pt"] == "Descrição"
+    assert lines[0]["temporal_extent_begin"] == "2024-01-01"
+    assert shapely.from_wkt(lines[0]["bbox_4326"]).bounds == (-9.5, 38.5, -9.0, 39.0)
+    assert lines[1]["bbox_4326"] is None
+
+
+@pytest.mark.asyncio
+async def test_csv_exports_write_the_header_once():
+    chunks = [
+        c
+        async for c in exports.serialize_as_csv(
+            _get_batches([_get_row(1)], [_get_row(2), _get_row(3)])
+        )
+    ]
+    assert len(chunks) == 2
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [r["name_en"] for r in rows] == ["Record 1", "Record 2", "Record 3"]
+    assert tuple(rows[0].keys()) == exports.EXPORT_COLUMNS
+    assert rows[0]["workflow_stage_en"] == ""
+
+    empty = [c async for c in exports.serialize_as_csv(_get_batches())]
+    assert b"".join(empty).decode().strip() == ",".join(exports.EXPORT_COLUMNS)
+
+
+@pytest.mark.asyncio
+async def test_geoparquet_exports_write_a_row_group_per_batch():
+    chunks = [
+        c
+        async for c in exports.serialize_as_geoparquet(
+            _get_batches([_get_row(1), _get_row(2, with_bbox=False)], [_get_row(3)])
+        )
+    ]
+    parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.metadata.num_rows == 3
+    geo_metadata = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+    assert geo_metadata["primary_column"] == "bbox_4326"
+    table = parquet_file.read()
+    assert table.column("status").to_pylist()[0] == "published"
+    first_bbox = table.column("bbox_4326").to_pylist()[0]
+    assert shapely.from_wkb(first_bbox).bounds == (-9.5, 38.5, -9.0, 39.0)
+
+
+def test_export_statement_only_selects_readable_flat_rows():
+    statement = record_queries.build_survey_related_record_export_statement(
+        record_permissions.get_read_survey_related_record_clause(None),
+        project_id=uuid.UUID(int=200),
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ST_AsBinary(surveyrelatedrecord.bbox_4326) AS bbox_4326" in compiled
+    assert "LEFT OUTER JOIN datasetcategory" in compiled
+    assert "WHERE surveyrelatedrecord.status = " in compiled
+    assert compiled.rstrip().endswith("ORDER BY surveyrelatedrecord.id")
+
+
+def test_exports_are_downloaded_uncompressed(monkeypatch):
+    async def export_survey_related_records(session, user, batch_size, **filters):
+        yield [_get_row(index) for index in range(1, 21)]
+
+    monkeypatch.setattr(
+        record_routes.survey_related_record_ops,
+        "export_survey_related_records",
+        export_survey_related_records,
+    )
+    settings = types.SimpleNamespace(
+        export_batch_size=10,
+        get_db_session_maker=lambda: contextlib.nullcontext,
+    )
+
+    def with_request_state(app):
+        async def middleware(scope, receive, send):
+            scope["user"] = UnauthenticatedUser()
+            scope.setdefault("state", {}).update(settings=settings, language="en")
+            await app(scope, receive, send)
+
+        return middleware
+
+    app = Starlette(
+        routes=[Route("/export", record_routes.export_survey_related_records)],
+        middleware=[
+            Middleware(compression.StreamingCompressionMiddleware),
+            Middleware(with_request_state),
+        ],
+    )
+    with TestClient(app) as client:
+        response = client.get("/export", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert len(response.text.splitlines()) == 20
@@ -0,0 +1,144 @@
+import asyncio
+import dataclasses
+import datetime as dt
+import uuid
+
+import httpx
+import pytest
+
+from seis_lab_data.loadtesting import (
+    results,
+    scenarios,
+)
+
+
+def test_percentiles_use_the_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert results.get_percentile(values, 0.5) == 50
+    assert results.get_percentile(values, 0.95) == 95
+    assert results.get_percentile(values, 0.99) == 99
+    assert results.get_percentile([7.0], 0.99) == 7
+    assert results.get_percentile([], 0.5) == 0
+
+
+def test_samples_are_summarized_per_route():
+    samples = [
+        results.RequestSample("GET /", 0.010, True),
+        results.RequestSample("GET /", 0.030, False),
+        results.RequestSample("GET /survey-related-records/", 0.100, True),
+    ]
+    summary = {s.route: s for s in results.summarize_samples(samples, 2)}
+    assert summary["GET /"].num_requests == 2
+    assert summary["GET /"].error_rate == 0.5
+    assert summary["GET /"].requests_per_second == 1
+    assert summary["GET /"].p99_ms == pytest.approx(30)
+    assert summary["GET /survey-related-records/"].p50_ms == pytest.approx(100)
+
+
+def test_runs_can_be_stored_and_compared(tmp_path):
+    baseline = results.LoadTestRun(
+        scenario="anonymous-browsing",
+        base_url="http://localhost:8888",
+        commit="abc1234",
+        started_at=dt.datetime(2026, 10, 19, 12, tzinfo=dt.timezone.utc),
+        duration_seconds=60,
+        options={"num_users": 10},
+        routes=[
+            results.RouteStats("GET /", 100, 0, 1.7, 10, 20, 40),
+            results.RouteStats("GET /gone", 10, 0, 0.2, 10, 20, 40),
+        ],
+    )
+    stored = baseline.save(tmp_path)
+    assert stored.name == "20261019T120000-anonymous-browsing-abc1234.json"
+    assert results.LoadTestRun.from_json(stored.read_text()) == baseline
+
+    candidate = dataclasses.replace(
+        baseline,
+        commit="def5678",
+        routes=[results.RouteStats("GET /", 100, 0, 1.7, 10, 30, 40)],
+    )
+    comparisons = {c.route: c for c in results.compare_runs(baseline, candidate)}
+    assert comparisons["GET /"].p95_change == pytest.approx(0.5)
+    assert comparisons["GET /gone"].candidate is None
+    assert comparisons["GET /gone"].p95_change is None
+
+
+def test_bulk_update_form_values_are_parsed():
+    rendered = """
+        <form>
+            <input name="request_id" type="hidden" value="some-id">
+            <input name="selection" type="hidden" value="{&#34;survey_mission_id&#34;: 1}">
+            <input name="update_dataset_category" type="checkbox" value="y">
+            <select name="workflow_stage_id">
+                <option value=""></option>
+                <option value="3">raw</option>
+                <option value="4">processed</option>
+            </select>
+            <button data-on:click="@post('/x', {headers: {'X-CSRFToken': 'the-token'}})">
+        </form>
+    """
+    assert scenarios.get_form_values(rendered) == {
+        "request_id": "some-id",
+        "selection": '{"survey_mission_id": 1}',
+        "workflow_stage_id": "3",
+    }
+    assert scenarios.get_csrf_token(rendered) == "the-token"
+
+
+@pytest.mark.asyncio
+async def test_anonymous_browsing_labels_requests_by_route():
+    record_id = str(uuid.uuid4())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/survey-related-records/search":
+            assert "datastar" in request.url.params
+            return httpx.Response(
+                200, text=f'<a href="/survey-related-records/{record_id}">'
+            )
+        if request.url.path == f"/survey-related-records/{record_id}":
+            return httpx.Response(500)
+        return httpx.Response(200, text="<html></html>")
+
+    recorder = results.LoadTestRecorder()
+    await scenarios.run_scenario(
+        scenarios.LoadTestScenario.ANONYMOUS_BROWSING,
+        scenarios.LoadTestOptions(
+            base_url="http://testserver",
+            duration_seconds=0.05,
+            num_users=2,
+            think_time_seconds=0,
+            seed=1,
+        ),
+        recorder,
+        transport=httpx.MockTransport(handler),
+    )
+    summary = {
+        s.route: s
+        for s in results.summarize_samples(recorder.samples, recorder.elapsed_seconds)
+    }
+    assert summary["GET /"].num_errors == 0
+    assert summary["GET /survey-related-records/search"].num_requests > 0
+    details = summary["GET /survey-related-records/{survey_related_record_id}"]
+    assert details.error_rate == 1
+
+
+@pytest.mark.asyncio
+async def test_sse_listeners_count_early_disconnections_as_errors():
+    async def stream_events():
+        yield b"event: datastar-patch-signals\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=stream_events())
+
+    recorder = results.LoadTestRecorder()
+    async with httpx.AsyncClient(
+        base_url="http://testserver", transport=httpx.MockTransport(handler)
+    ) as client:
+        lines = []
+        stop = asyncio.Event()
+        await scenarios.LoadTestClient(client, recorder).listen(
+            "/stream", "/stream", stop, on_line=lines.append
+        )
+    assert lines == ["event: datastar-patch-signals"]
+    assert recorder.samples[0].route == "GET /stream"
+    assert recorder.samples[0].succeeded is False
@@ -35,6 +35,7 @@ from seis_lab_data.schemas import (  # noqa: E402
     identifiers,
     projects as project_schemas,
     surveymissions as mission_schemas,
+    user as user_schemas,
 )
 from seis_lab_data.tasks.extractors import schemas as extractor_schemas  # noqa: E402
 
@@ -533,3 +534,217 @@ async def test_discovery_survives_invalid_implicit_crs(
     records = await _get_mission_records(db_session_maker, discovery_env["mission"].id)
     assert len(records) == 1
     assert records[0].bbox_4326 is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_discovery_is_split_in_resumable_chunks(
+    db_session_maker, admin_user, discovery_env, monkeypatch
+):
+    for name in ("a.tif", "b.tif", "c.tif"):
+        _write_geotiff(
+            discovery_env["archive_root"] / _MISSION_RELATIVE_PATH / "s01" / name
+        )
+    settings = discovery_env["settings"]
+    monkeypatch.setattr(settings, "discovery_chunk_size", 2)
+    request_id = identifiers.RequestId(uuid.uuid4())
+    collector = _EventCollector()
+    async with db_session_maker() as session:
+        chunk_ids = await discovery_ops.plan_mission_discovery(
+            request_id=request_id,
+            mission_id=identifiers.SurveyMissionId(discovery_env["mission"].id),
+            session=session,
+            event_dispatcher=collector,
+            settings=settings,
+            user=admin_user,
+        )
+        assert len(chunk_ids) == 2
+        # planning again for the same request resumes the existing job
+        assert (
+            await discovery_ops.plan_mission_discovery(
+                request_id=request_id,
+                mission_id=identifiers.SurveyMissionId(discovery_env["mission"].id),
+                session=session,
+                event_dispatcher=collector,
+                settings=settings,
+                user=admin_user,
+            )
+            == chunk_ids
+        )
+        # running a chunk twice has no further effect
+        for chunk_id in (chunk_ids[0], chunk_ids[0], chunk_ids[1]):
+            await discovery_ops.run_discovery_chunk(
+                chunk_id=chunk_id,
+                session=session,
+                event_dispatcher=collector,
+                settings=settings,
+                user=admin_user,
+            )
+
+    records = await _get_mission_records(db_session_maker, discovery_env["mission"].id)
+    assert len(records) == 3
+    ended = _ended_events(collector)
+    assert len(ended) == 1
+    assert ended[0].succeeded is True
+    progress = [
+        e
+        for e in collector.events
+        if isinstance(e, event_schemas.DiscoveryProgressEvent)
+    ]
+    assert [(e.files_seen, e.total_files) for e in progress] == [
+        (0, 3),
+        (2, 3),
+        (3, 3),
+    ]
+    assert progress[-1].files_extracted == 3
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_discovery_is_only_resumed_for_allowed_users(
+    db_session_maker, admin_user, discovery_env, monkeypatch
+):
+    for name in ("a.tif", "b.tif"):
+        _write_geotiff(
+            discovery_env["archive_root"] / _MISSION_RELATIVE_PATH / "s01" / name
+        )
+    settings = discovery_env["settings"]
+    monkeypatch.setattr(settings, "discovery_chunk_size", 1)
+    mission_id = identifiers.SurveyMissionId(discovery_env["mission"].id)
+    request_id = identifiers.RequestId(uuid.uuid4())
+    collector = _EventCollector()
+    plain_user = user_schemas.User(
+        id=identifiers.UserId("plainuser"),
+        username="plain-user",
+        email="plainuser@tests.dev",
+        roles=[],
+    )
+    async with db_session_maker() as session:
+        assert (
+            len(
+                await discovery_ops.plan_mission_discovery(
+                    request_id=request_id,
+                    mission_id=mission_id,
+                    session=session,
+                    event_dispatcher=collector,
+                    settings=settings,
+                    user=admin_user,
+                )
+            )
+            == 2
+        )
+        for resumed_request_id in (request_id, uuid.uuid4()):
+            assert (
+                await discovery_ops.plan_mission_discovery(
+                    request_id=identifiers.RequestId(resumed_request_id),
+                    mission_id=mission_id,
+                    session=session,
+                    event_dispatcher=collector,
+                    settings=settings,
+                    user=plain_user,
+                )
+                == []
+            )
+    assert [e.succeeded for e in _ended_events(collector)] == [False, False]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_failed_chunk_fails_discovery_and_restores_mission_status(
+    db_session_maker, admin_user, discovery_env, monkeypatch
+):
+    for name in ("a.tif", "b.tif"):
+        _write_geotiff(
+            discovery_env["archive_root"] / _MISSION_RELATIVE_PATH / "s01" / name
+        )
+    settings = discovery_env["settings"]
+    monkeypatch.setattr(settings, "discovery_chunk_size", 1)
+    mission_id = identifiers.SurveyMissionId(discovery_env["mission"].id)
+    request_id = identifiers.RequestId(uuid.uuid4())
+    collector = _EventCollector()
+    async with db_session_maker() as session:
+        chunk_ids = await discovery_ops.plan_mission_discovery(
+            request_id=request_id,
+            mission_id=mission_id,
+            session=session,
+            event_dispatcher=collector,
+            settings=settings,
+            user=admin_user,
+        )
+        mission = await session.get(models.SurveyMission, mission_id)
+        assert mission.status == constants.SurveyMissionStatus.UNDER_DISCOVERY
+        await discovery_ops.fail_discovery_chunk(
+            chunk_id=chunk_ids[0],
+            session=session,
+            event_dispatcher=collector,
+            user=admin_user,
+            details="gave up",
+        )
+        # the job's remaining chunks are no longer processed
+        await discovery_ops.run_discovery_chunk(
+            chunk_id=chunk_ids[1],
+            session=session,
+            event_dispatcher=collector,
+            settings=settings,
+            user=admin_user,
+        )
+        discovery_job = await session.get(models.DiscoveryJob, request_id)
+        await session.refresh(discovery_job)
+        assert discovery_job.status == constants.DiscoveryJobStatus.FAILED
+        await session.refresh(mission)
+        assert mission.status == constants.SurveyMissionStatus.DRAFT
+        # a redelivered planner message leaves the failed job alone
+        assert (
+            await discovery_ops.plan_mission_discovery(
+                request_id=request_id,
+                mission_id=mission_id,
+                session=session,
+                event_dispatcher=collector,
+                settings=settings,
+                user=admin_user,
+            )
+            == []
+        )
+        await session.refresh(mission)
+        assert mission.status == constants.SurveyMissionStatus.DRAFT
+
+    assert await _get_mission_records(db_session_maker, mission_id) == []
+    ended = _ended_events(collector)
+    assert [(e.succeeded, e.details) for e in ended] == [(False, "gave up")]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_running_discovery_restores_mission_status_on_errors(
+    db_session_maker, admin_user, discovery_env, monkeypatch
+):
+    _write_geotiff(
+        discovery_env["archive_root"] / _MISSION_RELATIVE_PATH / "s01" / "a.tif"
+    )
+
+    async def _discover_record(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(discovery_ops, "_discover_record", _discover_record)
+    mission_id = identifiers.SurveyMissionId(discovery_env["mission"].id)
+    request_id = identifiers.RequestId(uuid.uuid4())
+    collector = _EventCollector()
+    async with db_session_maker() as session:
+        with pytest.raises(RuntimeError):
+            await discovery_ops.run_mission_discovery(
+                request_id=request_id,
+                mission_id=mission_id,
+                session=session,
+                event_dispatcher=collector,
+                settings=discovery_env["settings"],
+                user=admin_user,
+            )
+        discovery_job = await session.get(models.DiscoveryJob, request_id)
+        await session.refresh(discovery_job)
+        assert discovery_job.status == constants.DiscoveryJobStatus.FAILED
+        mission = await session.get(models.SurveyMission, mission_id)
+        await session.refresh(mission)
+        assert mission.status == constants.SurveyMissionStatus.DRAFT
+
+    ended = _ended_events(collector)
+    assert [(e.succeeded, e.details) for e in ended] == [(False, "boom")]
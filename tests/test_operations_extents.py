@@ -0,0 +1,232 @@
+import datetime as dt
+import types
+import uuid
+
+import pytest
+import shapely
+from geoalchemy2.shape import to_shape
+
+from seis_lab_data import (
+    constants,
+    dispatch,
+    geojson,
+)
+from seis_lab_data.db import models
+from seis_lab_data.db.commands import (
+    extents as extent_commands,
+    surveyrelatedrecords as record_commands,
+)
+from seis_lab_data.db.queries import (
+    surveymissions as mission_queries,
+    surveyrelatedrecords as record_queries,
+)
+from seis_lab_data.operations import extents as extent_ops
+from seis_lab_data.schemas import (
+    common as common_schemas,
+    identifiers,
+    surveyrelatedrecords as record_schemas,
+)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_extents_handles_missions_before_projects(monkeypatch):
+    reconciled = []
+    mission_batches = [10, 3, 0]
+    project_batches = [2, 0]
+
+    async def reconcile_survey_mission_extents(session, batch_size):
+        reconciled.append("mission")
+        return mission_batches.pop(0)
+
+    async def reconcile_project_extents(session, batch_size):
+        reconciled.append("project")
+        return project_batches.pop(0)
+
+    monkeypatch.setattr(
+        extent_ops.extent_commands,
+        "reconcile_survey_mission_extents",
+        reconcile_survey_mission_extents,
+    )
+    monkeypatch.setattr(
+        extent_ops.extent_commands,
+        "reconcile_project_extents",
+        reconcile_project_extents,
+    )
+    dispatched = []
+
+    async def event_dispatcher(event):
+        dispatched.append(event)
+
+    summary = await extent_ops.reconcile_extents(
+        None,
+        request_id=identifiers.RequestId(uuid.uuid4()),
+        event_dispatcher=event_dispatcher,
+        batch_size=10,
+    )
+    assert summary == extent_ops.ExtentReconciliationSummary(
+        num_survey_missions=13, num_projects=2
+    )
+    assert reconciled == ["mission"] * 3 + ["project"] * 2
+    # projects and survey missions get new versions, which invalidates the
+    # components that show their extents
+    assert [(e.resource_type, e.affected_count, e.succeeded) for e in dispatched] == [
+        (constants.ResourceType.MISSION, 13, True),
+        (constants.ResourceType.PROJECT, 2, True),
+    ]
+
+
+def test_maps_fall_back_to_the_extent_of_records():
+    own_bbox = shapely.box(-9.5, 38.5, -9.0, 39.0)
+    records_bbox = shapely.box(-10.0, 37.0, -8.0, 40.0)
+    item = types.SimpleNamespace(bbox_4326=own_bbox, records_bbox_4326=records_bbox)
+    assert geojson.get_map_bbox(item) is own_bbox
+    item.bbox_4326 = None
+    assert geojson.get_map_bbox(item) is records_bbox
+    item.records_bbox_4326 = None
+    assert geojson.get_map_bbox(item) is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_record_changes_keep_mission_extents_up_to_date(
+    db,
+    db_session_maker,
+    sample_survey_related_records,
+):
+    survey_mission_id = identifiers.SurveyMissionId(
+        sample_survey_related_records[0].survey_mission_id
+    )
+    mission_records = [
+        r
+        for r in sample_survey_related_records
+        if r.survey_mission_id == survey_mission_id
+    ]
+    async with db_session_maker() as session:
+        mission = await mission_queries.get_survey_mission(session, survey_mission_id)
+        assert mission.records_extent_is_dirty is False
+        assert mission.records_temporal_extent_begin == min(
+            r.temporal_extent_begin for r in mission_records
+        )
+
+        await record_commands.delete_survey_related_record(
+            session, identifiers.SurveyRelatedRecordId(mission_records[0].id)
+        )
+        await session.refresh(mission)
+        assert mission.records_extent_is_dirty is True
+
+        await extent_ops.reconcile_extents(
+            session,
+            request_id=identifiers.RequestId(uuid.uuid4()),
+            event_dispatcher=dispatch.no_op_dispatcher,
+            batch_size=10,
+        )
+        await session.refresh(mission)
+        assert mission.records_extent_is_dirty is False
+        assert mission.records_temporal_extent_begin == min(
+            (r.temporal_extent_begin for r in mission_records[1:]), default=None
+        )
+
+
+async def _get_rollups(session, survey_mission_id):
+    mission = await session.get(models.SurveyMission, survey_mission_id)
+    await session.refresh(mission)
+    project = await session.get(models.Project, mission.project_id)
+    await session.refresh(project)
+    return mission, project
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_creating_a_record_widens_mission_and_project_extents(
+    db,
+    db_session_maker,
+    sample_survey_related_records,
+    admin_user,
+):
+    template = sample_survey_related_records[0]
+    survey_mission_id = identifiers.SurveyMissionId(template.survey_mission_id)
+    async with db_session_maker() as session:
+        mission, project = await _get_rollups(session, survey_mission_id)
+        versions = (mission.version, project.version)
+        mission_updated_at = mission.updated_at
+        project_updated_at = project.updated_at
+        await record_commands.create_survey_related_record(
+            session,
+            record_schemas.SurveyRelatedRecordCreate(
+                id=identifiers.SurveyRelatedRecordId(uuid.uuid4()),
+                owner_id=identifiers.UserId(admin_user.id),
+                survey_mission_id=survey_mission_id,
+                name=common_schemas.LocalizableDraftName(en="far away record"),
+                description=common_schemas.LocalizableDraftDescription(en=""),
+                dataset_category_id=identifiers.DatasetCategoryId(
+                    template.dataset_category_id
+                ),
+                workflow_stage_id=identifiers.WorkflowStageId(
+                    template.workflow_stage_id
+                ),
+                bbox_4326=shapely.box(170.0, 80.0, 171.0, 81.0),
+                temporal_extent_begin=dt.date(1900, 1, 1),
+                temporal_extent_end=dt.date(2999, 12, 31),
+            ),
+        )
+        mission, project = await _get_rollups(session, survey_mission_id)
+        for rollup, updated_at in (
+            (mission, mission_updated_at),
+            (project, project_updated_at),
+        ):
+            assert rollup.records_extent_is_dirty is False
+            assert rollup.records_temporal_extent_begin == dt.date(1900, 1, 1)
+            assert rollup.records_temporal_extent_end == dt.date(2999, 12, 31)
+            assert to_shape(rollup.records_bbox_4326).bounds[2:] == (171.0, 81.0)
+            assert rollup.updated_at == updated_at
+        # modification times are left alone, so versions are what make
+        # validators change
+        assert (mission.version, project.version) == (versions[0] + 1, versions[1] + 1)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_updating_a_record_reconciles_missions_before_projects(
+    db,
+    db_session_maker,
+    sample_survey_related_records,
+):
+    template = sample_survey_related_records[0]
+    survey_mission_id = identifiers.SurveyMissionId(template.survey_mission_id)
+    async with db_session_maker() as session:
+        record = await record_queries.get_survey_related_record(
+            session, identifiers.SurveyRelatedRecordId(template.id)
+        )
+        await record_commands.update_survey_related_record(
+            session,
+            record,
+            record_schemas.SurveyRelatedRecordUpdate(
+                bbox_4326=shapely.box(-171.0, -81.0, -170.0, -80.0),
+                temporal_extent_begin=dt.date(1800, 1, 1),
+            ),
+        )
+        mission, project = await _get_rollups(session, survey_mission_id)
+        assert mission.records_extent_is_dirty is True
+        assert project.records_extent_is_dirty is True
+
+        # the project has a dirty mission, so it is left for later
+        assert await extent_commands.reconcile_project_extents(session, 10) == 0
+        mission, project = await _get_rollups(session, survey_mission_id)
+        assert project.records_extent_is_dirty is True
+        versions = (mission.version, project.version)
+
+        summary = await extent_ops.reconcile_extents(
+            session,
+            request_id=identifiers.RequestId(uuid.uuid4()),
+            event_dispatcher=dispatch.no_op_dispatcher,
+            batch_size=10,
+        )
+        assert summary.num_survey_missions >= 1
+        assert summary.num_projects >= 1
+        mission, project = await _get_rollups(session, survey_mission_id)
+        for rollup in (mission, project):
+            assert rollup.records_extent_is_dirty is False
+            assert rollup.records_temporal_extent_begin == dt.date(1800, 1, 1)
+            assert to_shape(rollup.records_bbox_4326).bounds[:2] == (-171.0, -81.0)
+        assert mission.version == versions[0] + 1
+        assert project.version == versions[1] + 1
@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from seis_lab_data import constants
+from seis_lab_data.db.commands import publication as publication_commands
+from seis_lab_data.operations import publication as publication_ops
+from seis_lab_data.schemas import (
+    events as event_schemas,
+    identifiers,
+)
+from seis_lab_data.schemas.user import User
+
+
+class _EventCollector:
+    def __init__(self):
+        self.events: list[event_schemas.SeisLabDataEvent] = []
+
+    async def __call__(self, event: event_schemas.SeisLabDataEvent) -> None:
+        self.events.append(event)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_project_records_are_published_in_one_statement_with_their_missions():
+    compiled = _compile(
+        publication_commands.build_record_publication_update(
+            publish=True, project_id=identifiers.ProjectId(uuid.uuid4())
+        )
+    )
+    assert compiled.startswith("UPDATE surveyrelatedrecord SET status=")
+    assert "FROM surveymission WHERE" in compiled
+    assert "surveymission.project_id = " in compiled
+    assert "CAST((surveymission.validation_result ->> " in compiled
+    assert "CAST((surveyrelatedrecord.validation_result ->> " in compiled
+
+
+def test_unpublishing_ignores_validity():
+    for compiled in (
+        _compile(
+            publication_commands.build_survey_mission_publication_update(
+                identifiers.ProjectId(uuid.uuid4()), publish=False
+            )
+        ),
+        _compile(
+            publication_commands.build_record_publication_update(
+                publish=False, project_id=identifiers.ProjectId(uuid.uuid4())
+            )
+        ),
+    ):
+        assert "validation_result" not in compiled
+
+
+@pytest.mark.asyncio
+async def test_cascade_dispatches_one_event_per_affected_level(monkeypatch):
+    async def cascade_publication(session, **kwargs):
+        assert kwargs["publish"] is True
+        return publication_commands.PublicationCascade(
+            num_survey_missions=0, num_records=250
+        )
+
+    monkeypatch.setattr(
+        publication_ops.publication_commands,
+        "cascade_publication",
+        cascade_publication,
+    )
+    dispatcher = _EventCollector()
+    await publication_ops.cascade_publication(
+        request_id=identifiers.RequestId(uuid.uuid4()),
+        initiator=User(
+            id=identifiers.UserId("editor"),
+            username="editor",
+            email="editor@tests.dev",
+            roles=[constants.ROLE_EDITOR],
+        ),
+        session=None,
+        event_dispatcher=dispatcher,
+        publish=True,
+        project_id=identifiers.ProjectId(uuid.uuid4()),
+    )
+    assert len(dispatcher.events) == 1
+    assert dispatcher.events[0].resource_type == constants.ResourceType.RECORD
+    assert dispatcher.events[0].affected_count == 250
@@ -1,8 +1,17 @@
 import uuid
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from seis_lab_data import constants
+from seis_lab_data.db import models
+from seis_lab_data.db.commands import surveyrelatedrecords as record_commands
+from seis_lab_data.db.queries import (
+    common as common_queries,
+    surveyrelatedrecords as record_queries,
+)
 from seis_lab_data.operations import surveyrelatedrecords as record_ops
+from seis_lab_data.permissions import surveyrelatedrecords as record_permissions
 from seis_lab_data.schemas import (
     identifiers,
     surveyrelatedrecords as record_schemas,
@@ -21,6 +30,122 @@ class _EventCollector:
         self.events.append(event)
 
 
+def test_bulk_update_chunks_select_ids_in_a_subquery():
+    statement = record_commands.build_bulk_update_chunk_statement(
+        record_schemas.SurveyRelatedRecordBulkUpdate(
+            description=common_schemas.LocalizableDraftDescription(en="Updated")
+        ),
+        record_queries.build_survey_related_record_id_statement(en_name_filter="First"),
+        after_record_id=uuid.uuid4(),
+        chunk_size=100,
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("UPDATE surveyrelatedrecord SET description=")
+    assert "WHERE surveyrelatedrecord.id IN (SELECT matched.id" in compiled
+    assert "WHERE matched.id > " in compiled
+    assert "ORDER BY matched.id \n LIMIT " in compiled
+    assert compiled.rstrip().endswith("RETURNING surveyrelatedrecord.id")
+
+
+def test_bulk_update_chunks_only_select_ids_when_there_are_no_columns_to_set():
+    statement = record_commands.build_bulk_update_chunk_statement(
+        record_schemas.SurveyRelatedRecordBulkUpdate(related_records=[]),
+        record_queries.build_survey_related_record_id_statement(),
+        after_record_id=None,
+        chunk_size=100,
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("SELECT matched.id \nFROM (SELECT")
+    assert "matched.id >" not in compiled
+
+
+@pytest.mark.parametrize(
+    "roles, expected_can_read, expected_can_update",
+    [
+        pytest.param(None, "surveyrelatedrecord.status = ", "false", id="anonymous"),
+        pytest.param([], "true", "false", id="no-role"),
+        pytest.param([constants.ROLE_EDITOR], "true", "true", id="editor"),
+    ],
+)
+def test_permissions_are_selected_as_columns(
+    roles, expected_can_read, expected_can_update
+):
+    user = (
+        None
+        if roles is None
+        else User(id=UserId("user"), username="user", email="u@tests.dev", roles=roles)
+    )
+    statement = record_queries._build_survey_related_record_statement(
+        columns=common_queries.get_permission_columns(
+            record_permissions.get_read_survey_related_record_clause(user),
+            record_permissions.get_update_survey_related_record_clause(user),
+            record_permissions.get_delete_survey_related_record_clause(user),
+        )
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert f", {expected_can_read}" in compiled
+    assert f"{expected_can_update} AS can_update" in compiled
+    assert f"{expected_can_update} AS can_delete" in compiled
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_resumes_existing_job(monkeypatch):
+    request_id = RequestId(uuid.uuid4())
+    existing_job = models.BulkUpdateJob(
+        id=request_id, total_count=5, affected_count=2, last_record_id=uuid.uuid4()
+    )
+    chunk_results = [
+        models.BulkUpdateJob(id=request_id, total_count=5, affected_count=4),
+        models.BulkUpdateJob(id=request_id, total_count=5, affected_count=5),
+        models.BulkUpdateJob(
+            id=request_id,
+            total_count=5,
+            affected_count=5,
+            status=constants.BulkUpdateJobStatus.COMPLETED,
+        ),
+    ]
+
+    async def get_bulk_update_job(session, bulk_update_job_id):
+        return existing_job
+
+    async def create_bulk_update_job(session, bulk_update_job_id, ids_statement):
+        raise AssertionError("existing jobs must not be planned again")
+
+    async def run_bulk_update_chunk(session, bulk_update_job_id, *args, chunk_size):
+        assert chunk_size == 2
+        return chunk_results.pop(0)
+
+    for module, function in (
+        (record_ops.record_queries, get_bulk_update_job),
+        (record_ops.record_commands, create_bulk_update_job),
+        (record_ops.record_commands, run_bulk_update_chunk),
+    ):
+        monkeypatch.setattr(module, function.__name__, function)
+    dispatcher = _EventCollector()
+    result = await record_ops.bulk_update_survey_related_records(
+        request_id=request_id,
+        to_update=record_schemas.SurveyRelatedRecordBulkUpdate(),
+        initiator=User(
+            id=UserId("editor"),
+            username="editor",
+            email="editor@tests.dev",
+            roles=[constants.ROLE_EDITOR],
+        ),
+        session=None,
+        event_dispatcher=dispatcher,
+        chunk_size=2,
+        en_name_filter="First",
+    )
+    assert result == 5
+    *progress_events, final_event = dispatcher.events
+    assert [e.affected_count for e in progress_events] == [2, 4, 5]
+    assert all(
+        isinstance(e, event_schemas.BulkUpdateProgressEvent) for e in progress_events
+    )
+    assert final_event.succeeded is True
+    assert final_event.affected_count == 5
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_bulk_update_denies_user_without_editor_role(
@@ -39,11 +164,12 @@ async def test_bulk_update_denies_user_without_editor_role(
             initiator=plain_user,
             session=session,
             event_dispatcher=dispatcher,
+            chunk_size=1,
             en_name_filter="First",
         )
     assert result is None
     assert len(dispatcher.events) == 1
-    assert dispatcher.events[0].succeeded is False
+    assert dispatcher.events[-1].succeeded is False
 
 
 @pytest.mark.integration
@@ -70,11 +196,12 @@ async def test_bulk_update_workflow_stage_filter_excludes_non_matching_records(
             initiator=admin_user,
             session=session,
             event_dispatcher=dispatcher,
+            chunk_size=1,
             workflow_stage_id=identifiers.WorkflowStageId(non_matching_stage.id),
         )
     assert result == 0
-    assert dispatcher.events[0].succeeded is True
-    assert dispatcher.events[0].affected_count == 0
+    assert dispatcher.events[-1].succeeded is True
+    assert dispatcher.events[-1].affected_count == 0
 
 
 @pytest.mark.integration
@@ -101,12 +228,13 @@ async def test_bulk_update_dataset_category_filter_combines_with_name_filter(
             initiator=admin_user,
             session=session,
             event_dispatcher=dispatcher,
+            chunk_size=1,
             en_name_filter="First",
             dataset_category_id=identifiers.DatasetCategoryId(matching_category.id),
         )
     assert result == 1
-    assert dispatcher.events[0].succeeded is True
-    assert dispatcher.events[0].affected_count == 1
+    assert dispatcher.events[-1].succeeded is True
+    assert dispatcher.events[-1].affected_count == 1
 
 
 @pytest.mark.integration
@@ -129,12 +257,13 @@ async def test_bulk_update_asset_media_type_filter_excludes_non_matching_records
             initiator=admin_user,
             session=session,
             event_dispatcher=dispatcher,
+            chunk_size=1,
             en_name_filter="First",
             asset_media_type_filter="video/mp4",
         )
     assert result == 0
-    assert dispatcher.events[0].succeeded is True
-    assert dispatcher.events[0].affected_count == 0
+    assert dispatcher.events[-1].succeeded is True
+    assert dispatcher.events[-1].affected_count == 0
 
 
 @pytest.mark.integration
@@ -159,8 +288,37 @@ async def test_bulk_update_manually_selected_records_via_operation(
             initiator=admin_user,
             session=session,
             event_dispatcher=dispatcher,
+            chunk_size=1,
             selected=[identifiers.SurveyRelatedRecordId(second_record.id)],
         )
     assert result == 1
-    assert dispatcher.events[0].succeeded is True
-    assert dispatcher.events[0].affected_count == 1
+    assert dispatcher.events[-1].succeeded is True
+    assert dispatcher.events[-1].affected_count == 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_listing_only_updatable_records_excludes_them_for_plain_users(
+    db,
+    db_session_maker,
+    sample_survey_related_records,
+    admin_user,
+):
+    plain_user = User(
+        id=UserId("plain-user"), username="plain", email="plain@tests.dev", roles=[]
+    )
+    async with db_session_maker() as session:
+        editable, _ = await record_ops.list_survey_related_records_with_permissions(
+            session, admin_user, only_updatable=True
+        )
+        readable, _ = await record_ops.list_survey_related_records_with_permissions(
+            session, plain_user
+        )
+        not_editable, _ = await record_ops.list_survey_related_records_with_permissions(
+            session, plain_user, only_updatable=True
+        )
+    assert len(editable) == len(sample_survey_related_records)
+    assert all(p.can_update and p.can_delete for _, p in editable)
+    assert len(readable) == len(sample_survey_related_records)
+    assert not any(p.can_update or p.can_delete for _, p in readable)
+    assert not_editable == []
@@ -0,0 +1,233 @@
+import uuid
+
+import pydantic
+import pytest
+import shapely
+from geoalchemy2 import WKBElement
+from sqlalchemy.dialects import postgresql
+
+from seis_lab_data import constants
+from seis_lab_data.db.commands import validation as validation_commands
+from seis_lab_data.db.queries import validation as validation_queries
+from seis_lab_data.operations import validation as validation_ops
+from seis_lab_data.schemas import (
+    events as event_schemas,
+    identifiers,
+    validation as validation_schemas,
+)
+from seis_lab_data.schemas.user import User
+
+
+class _EventCollector:
+    def __init__(self):
+        self.events: list[event_schemas.SeisLabDataEvent] = []
+
+    async def __call__(self, event: event_schemas.SeisLabDataEvent) -> None:
+        self.events.append(event)
+
+
+def _get_project_row(**overrides) -> dict:
+    row = {
+        "id": uuid.uuid4(),
+        "name": {"en": "A valid project name", "pt": "Um nome de projeto válido"},
+        "description": {
+            "en": "A long enough description of the project",
+            "pt": "Uma descrição suficientemente longa do projeto",
+        },
+        "status": constants.ProjectStatus.DRAFT,
+        "temporal_extent_begin": None,
+        "temporal_extent_end": None,
+        "owner_id": "owner",
+        "root_path": "/data/project",
+        "links": [],
+        "bbox_4326": WKBElement(
+            shapely.to_wkb(shapely.box(-10, 36, -7, 42)), srid=4326
+        ),
+    }
+    row.update(overrides)
+    return row
+
+
+def _get_compiled_errors(
+    resource_type: constants.ResourceType,
+) -> list[tuple[str, str, str]]:
+    compiled = validation_commands.build_sql_validation_errors(resource_type).compile(
+        dialect=postgresql.dialect()
+    )
+    values = list(compiled.params.values())
+    return [
+        (values[i + 1], values[i + 5], values[i + 3])
+        for i, value in enumerate(values)
+        if value == "name" and values[i + 2] == "message"
+    ]
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        pytest.param({"name": {"en": "x", "pt": "y" * 200}}, id="name-length"),
+        pytest.param({"name": {"pt": "Um nome válido"}}, id="name-missing"),
+        pytest.param({"description": {"en": None, "pt": "z"}}, id="description"),
+        pytest.param({"bbox_4326": None}, id="bbox-missing"),
+    ],
+)
+def test_sql_rules_match_pydantic_rules(overrides: dict):
+    sql_errors = _get_compiled_errors(constants.ResourceType.PROJECT)
+    row = _get_project_row(**overrides)
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        validation_schemas.ValidProject.model_validate(row)
+    for error in validation_ops.serialize_validation_error(exc_info.value):
+        assert (error["name"], error["type_"], error["message"]) in sql_errors
+
+
+def test_sql_rules_update_all_rows_in_one_statement():
+    statement = validation_commands.build_sql_validation_update(
+        constants.ResourceType.RECORD,
+        survey_mission_id=identifiers.SurveyMissionId(uuid.uuid4()),
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("UPDATE surveyrelatedrecord SET is_valid=")
+    for function_name in ("ST_IsValid", "ST_GeometryType", "ST_Area", "char_length"):
+        assert function_name in compiled
+    assert "surveyrelatedrecord.survey_mission_id = " in compiled
+    assert "ORDER BY" not in compiled
+
+
+def test_validate_links():
+    sql_errors = [{"name": "name.en", "message": "too short", "type_": "x"}]
+    valid_row = {
+        "id": uuid.uuid4(),
+        "links": [],
+        "validation_result": {"is_valid": True, "errors": None},
+    }
+    invalid_row = {
+        "id": uuid.uuid4(),
+        "links": [
+            {
+                "url": "not a url",
+                "media_type": "text/html",
+                "relation": "related",
+                "link_description": {
+                    "en": "A valid description",
+                    "pt": "Uma descrição válida",
+                },
+            }
+        ],
+        "validation_result": {"is_valid": False, "errors": sql_errors},
+    }
+    results = validation_ops.validate_links([valid_row, invalid_row])
+    assert len(results) == 1
+    invalid_id, invalid_result = results[0]
+    assert invalid_id == invalid_row["id"]
+    assert invalid_result["is_valid"] is False
+    assert [error["name"] for error in invalid_result["errors"]] == [
+        "name.en",
+        "links.0.url",
+    ]
+
+
+def test_validation_reads_only_rows_with_links():
+    model = validation_queries.VALIDATABLE_MODELS[constants.ResourceType.RECORD]
+    statement = validation_queries.build_validation_statement(
+        constants.ResourceType.RECORD,
+        [model.id, model.links],
+        project_id=identifiers.ProjectId(uuid.uuid4()),
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith(
+        "SELECT surveyrelatedrecord.id, surveyrelatedrecord.links \n"
+    )
+    assert "JOIN surveymission" in compiled
+    assert compiled.rstrip().endswith("ORDER BY surveyrelatedrecord.id")
+
+
+def test_validation_results_are_written_in_one_statement():
+    statement = validation_commands.build_validation_results_update(
+        constants.ResourceType.MISSION,
+        [
+            (uuid.uuid4(), {"is_valid": True, "errors": None}),
+            (uuid.uuid4(), {"is_valid": False, "errors": []}),
+        ],
+    )
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("UPDATE surveymission SET")
+    assert "FROM (VALUES" in compiled
+
+
+@pytest.mark.asyncio
+async def test_bulk_validate_dispatches_a_single_event(monkeypatch):
+    link = {"url": "not a url", "media_type": "", "relation": ""}
+    rows = [
+        {"id": uuid.uuid4(), "links": [link], "validation_result": None}
+        for _ in range(3)
+    ]
+    written = []
+
+    async def apply_sql_validation_rules(session, resource_type, **kwargs):
+        return 5
+
+    async def iter_rows_to_validate(session, resource_type, column_names, **kwargs):
+        assert kwargs["with_links_only"] is True
+        for start in range(0, len(rows), kwargs["batch_size"]):
+            yield rows[start : start + kwargs["batch_size"]]
+
+    async def write_validation_results(session, resource_type, results):
+        written.append(results)
+        return len(results)
+
+    async def count_invalid(session, resource_type, **kwargs):
+        return 4
+
+    for module, function in (
+        (validation_ops.validation_commands, apply_sql_validation_rules),
+        (validation_ops.validation_queries, iter_rows_to_validate),
+        (validation_ops.validation_commands, write_validation_results),
+        (validation_ops.validation_queries, count_invalid),
+    ):
+        monkeypatch.setattr(module, function.__name__, function)
+    dispatcher = _EventCollector()
+    summary = await validation_ops.bulk_validate(
+        request_id=identifiers.RequestId(uuid.uuid4()),
+        resource_type=constants.ResourceType.PROJECT,
+        initiator=User(
+            id=identifiers.UserId("editor"),
+            username="editor",
+            email="editor@tests.dev",
+            roles=[constants.ROLE_EDITOR],
+        ),
+        session=None,
+        event_dispatcher=dispatcher,
+        batch_size=2,
+    )
+    assert summary == validation_ops.BulkValidationSummary(
+        num_validated=5, num_invalid=4
+    )
+    assert [len(batch) for batch in written] == [2, 1]
+    assert len(dispatcher.events) == 1
+    assert dispatcher.events[0].succeeded is True
+    assert dispatcher.events[0].affected_count == 5
+    assert (
+        dispatcher.events[0].modification
+        == constants.BulkResourceModification.VALIDATED
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_validate_denies_user_without_editor_role():
+    dispatcher = _EventCollector()
+    summary = await validation_ops.bulk_validate(
+        request_id=identifiers.RequestId(uuid.uuid4()),
+        resource_type=constants.ResourceType.RECORD,
+        initiator=User(
+            id=identifiers.UserId("plain-user"),
+            username="plain",
+            email="plain@tests.dev",
+            roles=[],
+        ),
+        session=None,
+        event_dispatcher=dispatcher,
+        batch_size=10,
+    )
+    assert summary is None
+    assert len(dispatcher.events) == 1
+    assert dispatcher.events[0].succeeded is False
@@ -0,0 +1,107 @@
+import types
+
+import dramatiq
+import pytest
+
+from seis_lab_data import (
+    config,
+    constants,
+)
+from seis_lab_data.tasks import (
+    decorators,
+    discovery as discovery_tasks,
+    projects as project_tasks,
+)
+from seis_lab_data.tasks.concurrency import RedisConcurrencyLimiter
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+def _get_limiter(redis_client, limit: int = 1, ttl_seconds: int = 60):
+    return RedisConcurrencyLimiter(
+        redis_client, name="test", limit=limit, ttl_seconds=ttl_seconds
+    )
+
+
+@pytest.mark.asyncio
+async def test_limiter_grants_up_to_the_limit_and_releases_slots():
+    redis_client = fakeredis.FakeAsyncRedis()
+    async with _get_limiter(redis_client, limit=2).acquire() as first:
+        async with _get_limiter(redis_client, limit=2).acquire() as second:
+            async with _get_limiter(redis_client, limit=2).acquire() as third:
+                assert (first, second, third) == (True, True, False)
+        async with _get_limiter(redis_client, limit=2).acquire() as fourth:
+            assert fourth is True
+    key = constants.CONCURRENCY_LIMIT_KEY_TEMPLATE.format(name="test")
+    assert await redis_client.exists(key) == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_attempts_do_not_extend_the_slot_ttl():
+    redis_client = fakeredis.FakeAsyncRedis()
+    key = constants.CONCURRENCY_LIMIT_KEY_TEMPLATE.format(name="test")
+    async with _get_limiter(redis_client, ttl_seconds=60).acquire() as acquired:
+        assert acquired
+        await redis_client.pexpire(key, 1_000)
+        async with _get_limiter(redis_client, ttl_seconds=60).acquire() as rejected:
+            assert not rejected
+        assert await redis_client.pttl(key) <= 1_000
+
+
+@pytest.mark.asyncio
+async def test_expired_slots_are_dropped_on_acquire():
+    redis_client = fakeredis.FakeAsyncRedis()
+    key = constants.CONCURRENCY_LIMIT_KEY_TEMPLATE.format(name="test")
+    # a slot whose holder crashed long ago, without releasing it
+    await redis_client.zadd(key, {"crashed-holder": 1})
+    async with _get_limiter(redis_client).acquire() as acquired:
+        assert acquired
+        assert await redis_client.zscore(key, "crashed-holder") is None
+
+
+@pytest.mark.asyncio
+async def test_limit_concurrency_rejects_runs_over_the_limit(monkeypatch):
+    redis_client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(
+        decorators,
+        "get_worker_resources",
+        lambda: types.SimpleNamespace(
+            redis_client=redis_client, settings=config.SeisLabDataSettings()
+        ),
+    )
+    runs = []
+
+    @decorators.limit_concurrency("test-{name}")
+    async def limited(name: str, *, nested: bool = False):
+        runs.append(name)
+        if nested:
+            await limited(name)
+
+    await limited("a", nested=False)
+    with pytest.raises(dramatiq.RateLimitExceeded):
+        await limited("a", nested=True)
+    # a different name gets a slot of its own
+    await limited("b")
+    assert runs == ["a", "a", "b"]
+    await limited("a")
+    assert runs == ["a", "a", "b", "a"]
+
+
+def test_actors_are_routed_to_their_queues():
+    planner = discovery_tasks.discover_survey_mission_contents
+    chunk = discovery_tasks.discover_survey_mission_chunk
+    for batch_actor in (planner, chunk):
+        assert batch_actor.queue_name == constants.TaskQueue.BATCH.value
+        assert batch_actor.priority == decorators.BATCH_ACTOR_OPTIONS["priority"]
+        assert (
+            batch_actor.options["time_limit"]
+            == decorators.BATCH_ACTOR_OPTIONS["time_limit"]
+        )
+    assert (
+        chunk.options["on_retry_exhausted"]
+        == discovery_tasks.fail_survey_mission_discovery_chunk.actor_name
+    )
+    interactive_actor = project_tasks.create_project
+    assert interactive_actor.queue_name == constants.TaskQueue.INTERACTIVE.value
+    assert interactive_actor.priority < planner.priority
@@ -0,0 +1,28 @@
+from seis_lab_data import (
+    config,
+    dispatch,
+)
+from seis_lab_data.tasks import resources
+
+
+def test_worker_resources_share_a_single_redis_client():
+    settings = config.SeisLabDataSettings(worker_event_batch_max_size=10)
+    worker_resources = resources.WorkerResources(settings)
+    assert isinstance(
+        worker_resources.event_dispatcher, dispatch.BatchingEventDispatcher
+    )
+    assert settings.get_event_dispatcher() is worker_resources.event_dispatcher
+    assert settings.get_redis_client() is worker_resources.redis_client
+    assert settings.get_db_session_maker() is worker_resources.session_maker
+    assert (
+        worker_resources.event_dispatcher._dispatcher._redis
+        is worker_resources.redis_client
+    )
+
+
+def test_worker_resources_report_connection_counts_without_connecting():
+    settings = config.SeisLabDataSettings(database_pool_size=3, database_max_overflow=2)
+    counts = resources.WorkerResources(settings).get_connection_counts()
+    assert counts.db_max_connections == 5
+    assert (counts.db_checked_out, counts.redis_in_use) == (0, 0)
+    assert resources.get_max_db_connections(settings, processes=4) == 20
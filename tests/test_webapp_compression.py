@@ -0,0 +1,115 @@
+import asyncio
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import (
+    PlainTextResponse,
+    StreamingResponse,
+)
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from seis_lab_data.webapp import compression
+
+_EVENTS = [
+    f"event: datastar-patch-elements\ndata: elements <li>item {i}</li>\n\n"
+    for i in range(5)
+]
+
+
+async def _stream_events(request: Request):
+    async def event_streamer():
+        for event in _EVENTS:
+            yield event
+
+    return StreamingResponse(event_streamer(), media_type="text/event-stream")
+
+
+async def _get_page(request: Request):
+    return PlainTextResponse("x" * int(request.query_params.get("size", 1000)))
+
+
+@compression.configure(enabled=False)
+async def _get_uncompressed_page(request: Request):
+    return PlainTextResponse("x" * 1000)
+
+
+_APP = Starlette(
+    routes=[
+        Route("/stream", _stream_events),
+        Route("/page", _get_page),
+        Route("/uncompressed", _get_uncompressed_page),
+    ],
+    middleware=[Middleware(compression.StreamingCompressionMiddleware)],
+)
+
+
+@pytest.mark.asyncio
+async def test_each_event_can_be_decompressed_as_soon_as_it_arrives():
+    messages = []
+
+    async def receive():
+        # the client never disconnects
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await _APP(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/stream",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+        },
+        receive,
+        send,
+    )
+    start, *body_messages = messages
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    decompressor = zlib.decompressobj(31)
+    *event_messages, final_message = body_messages
+    decompressed = [
+        decompressor.decompress(message["body"]).decode() for message in event_messages
+    ]
+    assert decompressed == _EVENTS
+    # the last message only carries the gzip trailer
+    assert decompressor.decompress(final_message["body"]) == b""
+    assert decompressor.eof
+
+
+@pytest.mark.parametrize(
+    "path, accept_encoding, expected_encoding",
+    [
+        pytest.param("/page", "gzip, deflate", "gzip", id="compressed"),
+        pytest.param("/page", "gzip, br", "br", id="brotli-preferred"),
+        pytest.param("/page?size=10", "gzip", None, id="too-small"),
+        pytest.param("/page", "gzip;q=0", None, id="refused"),
+        pytest.param("/page", "identity", None, id="unsupported"),
+        pytest.param("/uncompressed", "gzip", None, id="route-override"),
+    ],
+)
+def test_compression_negotiation(
+    path: str, accept_encoding: str, expected_encoding: str | None
+):
+    with TestClient(_APP) as client:
+        response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+    assert response.headers.get("content-encoding") == expected_encoding
+    assert response.text.startswith("x")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, set()),
+        ("gzip, br;q=0.5", {"gzip", "br"}),
+        ("GZIP;q=0, br", {"br"}),
+        ("gzip;q=nope", set()),
+    ],
+)
+def test_get_accepted_encodings(header: str | None, expected: set[str]):
+    assert compression.get_accepted_encodings(header) == expected
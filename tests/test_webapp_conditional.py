@@ -0,0 +1,105 @@
+import datetime as dt
+
+import pytest
+from starlette.requests import Request
+
+from seis_lab_data.db.queries.common import ModificationSummary
+from seis_lab_data.webapp import conditional
+
+
+def _get_request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()
+            ],
+        }
+    )
+
+
+_SUMMARY = ModificationSummary(
+    last_modified=dt.datetime(2026, 10, 19, 9, 30, 12, 481516), num_rows=3
+)
+
+
+def test_etag_depends_on_summary_and_variant():
+    validators = conditional.Validators.from_modification_summary(_SUMMARY, page=1)
+    assert validators.etag.startswith('W/"')
+    assert validators.etag == (
+        conditional.Validators.from_modification_summary(_SUMMARY, page=1).etag
+    )
+    assert validators.etag != (
+        conditional.Validators.from_modification_summary(_SUMMARY, page=2).etag
+    )
+    assert validators.etag != (
+        conditional.Validators.from_modification_summary(
+            ModificationSummary(last_modified=_SUMMARY.last_modified, num_rows=2),
+            page=1,
+        ).etag
+    )
+    assert validators.etag != (
+        conditional.Validators.from_modification_summary(
+            ModificationSummary(
+                last_modified=_SUMMARY.last_modified, num_rows=3, version=1
+            ),
+            page=1,
+        ).etag
+    )
+    assert validators.headers["Last-Modified"] == "Mon, 19 Oct 2026 09:30:12 GMT"
+
+
+def test_list_validators_rely_on_the_etag_alone():
+    validators = conditional.Validators.from_modification_summary(
+        _SUMMARY, with_last_modified=False, page=1
+    )
+    assert "Last-Modified" not in validators.headers
+    assert validators.etag == (
+        conditional.Validators.from_modification_summary(_SUMMARY, page=1).etag
+    )
+    # a deleted row does not make the last modification time more recent
+    assert not validators.is_not_modified(
+        _get_request(if_modified_since="Mon, 19 Oct 2026 09:30:12 GMT")
+    )
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        pytest.param({}, False, id="unconditional"),
+        pytest.param({"if_none_match": "*"}, True, id="any-etag"),
+        pytest.param({"if_none_match": 'W/"other"'}, False, id="other-etag"),
+        pytest.param(
+            {"if_modified_since": "Mon, 19 Oct 2026 09:30:12 GMT"},
+            True,
+            id="not-modified-since",
+        ),
+        pytest.param(
+            {"if_modified_since": "Mon, 19 Oct 2026 09:30:11 GMT"},
+            False,
+            id="modified-since",
+        ),
+        pytest.param(
+            {
+                "if_none_match": 'W/"other"',
+                "if_modified_since": "Mon, 19 Oct 2026 09:30:12 GMT",
+            },
+            False,
+            id="etag-takes-precedence",
+        ),
+    ],
+)
+def test_is_not_modified(headers: dict[str, str], expected: bool):
+    validators = conditional.Validators.from_modification_summary(_SUMMARY)
+    assert validators.is_not_modified(_get_request(**headers)) is expected
+
+
+def test_is_not_modified_matches_own_etag_in_list():
+    validators = conditional.Validators.from_modification_summary(_SUMMARY)
+    request = _get_request(if_none_match=f'"abc", {validators.etag.removeprefix("W/")}')
+    assert validators.is_not_modified(request)
+    response = validators.get_not_modified_response()
+    assert response.status_code == 304
+    assert response.headers["etag"] == validators.etag
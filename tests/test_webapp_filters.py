@@ -166,6 +166,17 @@ def test_survey_related_record_list_filters_includes_survey_mission_id_when_set(
     assert kwargs["survey_mission_id"] == mission_id
 
 
+def test_survey_related_record_list_filters_can_keep_only_editable_records():
+    list_filters = filters.SurveyRelatedRecordListFilters.from_params(
+        {"filterOnlyEditable": "true"}, "en"
+    )
+    assert list_filters.as_kwargs()["only_updatable"] is True
+    assert "filterOnlyEditable=True" in list_filters.serialize_to_query_string()
+    unfiltered = filters.SurveyRelatedRecordListFilters.from_params({}, "en")
+    assert unfiltered.as_kwargs()["only_updatable"] is False
+    assert "filterOnlyEditable" not in unfiltered.serialize_to_query_string()
+
+
 @pytest.mark.parametrize(
     "filter_, expected_qs_fragment",
     [
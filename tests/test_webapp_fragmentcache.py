@@ -0,0 +1,76 @@
+import pytest
+
+from seis_lab_data import constants
+from seis_lab_data.schemas.identifiers import UserId
+from seis_lab_data.schemas.user import User
+from seis_lab_data.webapp import fragmentcache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, int]] = {}
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, name: str, value: str, ex: int | None = None) -> None:
+        self.values[name] = value
+
+    async def eval(self, script: str, num_keys: int, key, stats_key, name):
+        value = self.values.get(key)
+        counter = f"{name}:{'hits' if value is not None else 'misses'}"
+        stats = self.hashes.setdefault(stats_key, {})
+        stats[counter] = stats.get(counter, 0) + 1
+        return value
+
+    async def hgetall(self, name: str) -> dict[str, int]:
+        return self.hashes.get(name, {})
+
+
+@pytest.mark.asyncio
+async def test_fragment_key_changes_when_resource_version_is_bumped():
+    fake_redis = _FakeRedis()
+    cache = fragmentcache.FragmentCache(fake_redis, ttl_seconds=60)
+    depends_on = [constants.ResourceType.PROJECT]
+    first = await cache.get_key("projects:list", depends_on, page=1)
+    assert first == await cache.get_key("projects:list", depends_on, page=1)
+    assert first != await cache.get_key("projects:list", depends_on, page=2)
+    fake_redis.values[
+        constants.RESOURCE_VERSION_KEY_TEMPLATE.format(resource_type="project")
+    ] = "1"
+    assert first != await cache.get_key("projects:list", depends_on, page=1)
+
+
+@pytest.mark.asyncio
+async def test_fragment_cache_stores_streamed_events_and_counts_lookups():
+    cache = fragmentcache.FragmentCache(_FakeRedis(), ttl_seconds=60)
+    fragment_key = await cache.get_key(
+        "projects:list", [constants.ResourceType.PROJECT], page=1
+    )
+
+    async def event_streamer():
+        yield "first\n\n"
+        yield "second\n\n"
+
+    assert await cache.get(fragment_key) is None
+    streamed = [
+        part async for part in cache.stream_and_store(fragment_key, event_streamer())
+    ]
+    assert await cache.get(fragment_key) == "".join(streamed)
+    [stats] = await cache.get_stats()
+    assert (stats.name, stats.hits, stats.misses) == ("projects:list", 1, 1)
+    assert stats.hit_ratio == 0.5
+
+
+def test_editors_get_list_components_of_their_own():
+    def get_user(*roles: str) -> User:
+        return User(
+            id=UserId("someone"), username="someone", email="a@b.dev", roles=roles
+        )
+
+    assert fragmentcache.get_visibility_class(None) == "public"
+    assert fragmentcache.get_visibility_class(get_user()) == "internal"
+    assert (
+        fragmentcache.get_visibility_class(get_user(constants.ROLE_EDITOR)) == "editor"
+    )
@@ -0,0 +1,134 @@
+import jinja2
+import prometheus_client
+import pytest
+import sqlalchemy as sa
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import (
+    HTMLResponse,
+    StreamingResponse,
+)
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from seis_lab_data.webapp import instrumentation
+
+_JINJA_ENV = jinja2.Environment(
+    loader=jinja2.DictLoader({"page.html": "<p>{{ value }}</p>"}),
+)
+_JINJA_ENV.template_class = instrumentation.InstrumentedTemplate
+
+
+async def _get_page(request: Request):
+    with instrumentation.measure(instrumentation.Component.REDIS):
+        pass
+    return HTMLResponse(_JINJA_ENV.get_template("page.html").render(value="hi"))
+
+
+async def _stream_events(request: Request):
+    async def event_streamer():
+        for i in range(3):
+            yield f"event: datastar-patch-elements\ndata: elements <p>{i}</p>\n\n"
+
+    return StreamingResponse(event_streamer(), media_type="text/event-stream")
+
+
+@pytest.fixture
+def http_metrics() -> instrumentation.HttpMetrics:
+    return instrumentation.HttpMetrics(prometheus_client.CollectorRegistry())
+
+
+@pytest.fixture
+def client(http_metrics) -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/page", _get_page),
+            Route("/stream", _stream_events),
+            Route("/metrics", instrumentation.get_metrics),
+        ],
+        middleware=[
+            Middleware(
+                instrumentation.RequestInstrumentationMiddleware,
+                metrics=http_metrics,
+            )
+        ],
+    )
+    app.state.http_metrics = http_metrics
+    return TestClient(app)
+
+
+def _get_sample(http_metrics, name: str, **labels) -> float | None:
+    return http_metrics.registry.get_sample_value(name, labels)
+
+
+def test_requests_are_timed(client, http_metrics):
+    response = client.get("/page")
+    assert response.text == "<p>hi</p>"
+    server_timing = response.headers["server-timing"]
+    for component in ("db", "render", "redis", "total"):
+        assert f"{component};dur=" in server_timing
+    assert 'desc="0 queries"' in server_timing
+    route = "test_webapp_instrumentation._get_page"
+    assert (
+        _get_sample(
+            http_metrics,
+            "seis_lab_data_http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        == 1
+    )
+    assert _get_sample(
+        http_metrics, "seis_lab_data_http_response_size_bytes_sum", route=route
+    ) == len("<p>hi</p>")
+    metrics_response = client.get("/metrics")
+    assert "server-timing" not in metrics_response.headers
+    assert route in metrics_response.text
+
+
+def test_event_streams_get_their_own_metrics(client, http_metrics):
+    with client.stream("GET", "/stream") as response:
+        assert len(list(response.iter_lines())) > 0
+    route = "test_webapp_instrumentation._stream_events"
+    assert _get_sample(http_metrics, "seis_lab_data_sse_events_total", route=route) == 3
+    assert (
+        _get_sample(
+            http_metrics,
+            "seis_lab_data_sse_connection_duration_seconds_count",
+            route=route,
+        )
+        == 1
+    )
+    assert (
+        _get_sample(http_metrics, "seis_lab_data_sse_open_connections", route=route)
+        == 0
+    )
+    assert (
+        _get_sample(
+            http_metrics,
+            "seis_lab_data_http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        is None
+    )
+
+
+def test_database_queries_are_counted():
+    engine = sa.create_engine("sqlite://")
+    instrumentation.instrument_engine(engine)
+    # instrumenting twice must not count queries twice
+    instrumentation.instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(sa.text("SELECT 1"))
+        with instrumentation.collect() as metrics:
+            for _ in range(3):
+                connection.execute(sa.text("SELECT 1"))
+            with pytest.raises(sa.exc.OperationalError):
+                connection.execute(sa.text("SELECT * FROM missing"))
+            connection.execute(sa.text("SELECT 1"))
+    assert metrics.num_queries == 4
+    assert metrics.durations[instrumentation.Component.DATABASE] > 0
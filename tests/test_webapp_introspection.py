@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from seis_lab_data import config
+from seis_lab_data.auth import AuthConfig
+from seis_lab_data.webapp import introspection
+
+
+def _get_introspector(
+    handler, **kwargs
+) -> tuple[introspection.TokenIntrospector, httpx.AsyncClient]:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    introspector = introspection.TokenIntrospector(
+        http_client,
+        AuthConfig.from_settings(config.SeisLabDataSettings()),
+        **{
+            "ttl_seconds": 60,
+            "negative_ttl_seconds": 300,
+            "max_entries": 10,
+            **kwargs,
+        },
+    )
+    return introspector, http_client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_introspection():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"active": True})
+
+    introspector, http_client = _get_introspector(handler)
+    async with http_client:
+        results = await asyncio.gather(
+            *(introspector.is_active("token-a") for _ in range(5))
+        )
+        assert results == [True] * 5
+        assert await introspector.is_active("token-a")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_inactive_tokens_are_cached_and_failures_are_not():
+    active_by_token = {"revoked": False}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.content.decode().partition("=")[2]
+        calls.append(token)
+        if token not in active_by_token:
+            return httpx.Response(503)
+        return httpx.Response(
+            200, content=json.dumps({"active": active_by_token[token]})
+        )
+
+    introspector, http_client = _get_introspector(handler)
+    async with http_client:
+        for _ in range(2):
+            assert not await introspector.is_active("revoked")
+            assert not await introspector.is_active("unknown")
+        assert await introspector.get_active_status("revoked") is False
+        assert await introspector.get_active_status("unknown") is None
+    assert calls == ["revoked", "unknown", "unknown", "unknown"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.content.decode())
+        return httpx.Response(200, json={"active": True})
+
+    introspector, http_client = _get_introspector(handler, max_entries=2)
+    async with http_client:
+        for token in ("a", "b", "a", "c", "a", "b"):
+            await introspector.is_active(token)
+    assert calls == ["token=a", "token=b", "token=c", "token=b"]
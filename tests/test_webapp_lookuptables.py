@@ -0,0 +1,167 @@
+import asyncio
+import contextlib
+import dataclasses
+import uuid
+
+import jinja2
+import pytest
+
+from seis_lab_data import constants
+from seis_lab_data.schemas import messages
+from seis_lab_data.schemas.identifiers import UserId
+from seis_lab_data.schemas.user import User
+from seis_lab_data.webapp import lookuptables
+
+
+@dataclasses.dataclass
+class _FakeCategory:
+    id: str
+    name: dict[str, str]
+
+
+class _FakePubSub:
+    def __init__(self, raw_messages: list[str]) -> None:
+        self._raw_messages = raw_messages
+
+    async def subscribe(self, *topic_names: str) -> None:
+        pass
+
+    async def unsubscribe(self, *topic_names: str) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def listen(self):
+        for raw_message in self._raw_messages:
+            yield {"type": "message", "data": raw_message}
+        await asyncio.Event().wait()
+
+
+class _FakeRedis:
+    def __init__(self, raw_messages: list[str]) -> None:
+        self._raw_messages = raw_messages
+
+    def pubsub(self) -> _FakePubSub:
+        return _FakePubSub(self._raw_messages)
+
+
+@contextlib.asynccontextmanager
+async def _fake_session():
+    yield None
+
+
+@pytest.fixture
+def category_loads(monkeypatch) -> list[int]:
+    loads = []
+
+    async def collect_all_dataset_categories(session):
+        loads.append(1)
+        return [
+            _FakeCategory(id="1", name={"en": "Seismic", "pt": "Sísmica"}),
+            _FakeCategory(id="2", name={"en": "Bathymetry", "pt": "Batimetria"}),
+            _FakeCategory(id="3", name={"en": "Magnetometry", "pt": "Magnetometria"}),
+        ]
+
+    monkeypatch.setattr(
+        lookuptables.category_queries,
+        "collect_all_dataset_categories",
+        collect_all_dataset_categories,
+    )
+    return loads
+
+
+def _get_cache() -> lookuptables.LookupTableCache:
+    return lookuptables.LookupTableCache(
+        _fake_session,
+        jinja2.Environment(),
+        ["en", "pt"],
+        max_age_seconds=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_options_are_translated_per_locale_and_cached(category_loads):
+    cache = _get_cache()
+    assert await cache.get_dataset_category_options("en") == [
+        ("2", "Bathymetry"),
+        ("3", "Magnetometry"),
+        ("1", "Seismic"),
+    ]
+    assert await cache.get_dataset_category_options("pt") == [
+        ("2", "Batimetria"),
+        ("3", "Magnetometria"),
+        ("1", "Sísmica"),
+    ]
+    # unknown locales get the default one
+    assert (await cache.get_dataset_category_options("fr"))[0] == ("2", "Bathymetry")
+    assert len(category_loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_affected_tables_are_invalidated(category_loads):
+    cache = _get_cache()
+    await cache.get_dataset_category_options("en")
+    cache.invalidate_for(constants.ResourceType.WORKFLOW_STAGE)
+    await cache.get_dataset_category_options("en")
+    assert len(category_loads) == 1
+    cache.invalidate_for(constants.ResourceType.CATEGORY)
+    await cache.get_dataset_category_options("en")
+    assert len(category_loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_modification_events_invalidate_tables(category_loads):
+    cache = _get_cache()
+    await cache.get_dataset_category_options("en")
+    raw_messages = [
+        messages.ResourceModificationMessage(
+            request_id=uuid.uuid4(),
+            resource_type=resource_type,
+            resource_id=str(uuid.uuid4()),
+            modification=constants.ResourceModification.UPDATED,
+            succeeded=succeeded,
+        ).model_dump_json()
+        for resource_type, succeeded in [
+            (constants.ResourceType.CATEGORY, False),
+            (constants.ResourceType.CATEGORY, True),
+        ]
+    ]
+    listener = asyncio.create_task(
+        cache.listen(_FakeRedis(raw_messages), constants.EventBackend.PUBSUB)
+    )
+    await asyncio.sleep(0.01)
+    listener.cancel()
+    await listener
+    await cache.get_dataset_category_options("en")
+    assert len(category_loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_picker_names_depend_only_on_whether_users_are_logged_in():
+    cache = _get_cache()
+
+    async def load_names():
+        return {
+            "public": {"en": ["published"], "pt": ["publicado"]},
+            "internal": {"en": ["published", "draft"], "pt": ["publicado", "rascunho"]},
+        }
+
+    cache._loaders[lookuptables.LookupTable.PROJECTS] = load_names
+    cache._loaders[lookuptables.LookupTable.SURVEY_MISSIONS] = load_names
+    editor = User(
+        id=UserId("editor"),
+        username="editor",
+        email="editor@tests.dev",
+        roles=[constants.ROLE_EDITOR],
+    )
+    plain_user = User(
+        id=UserId("plain"), username="plain", email="plain@tests.dev", roles=[]
+    )
+    assert await cache.get_project_names(None, "en") == ["published"]
+    for user in (editor, plain_user):
+        assert await cache.get_project_names(user, "en") == ["published", "draft"]
+        assert await cache.get_survey_mission_names(user, "pt") == [
+            "publicado",
+            "rascunho",
+        ]
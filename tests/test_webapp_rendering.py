@@ -0,0 +1,51 @@
+import jinja2
+import pytest
+from datastar_py import ServerSentEventGenerator
+from datastar_py.consts import ElementPatchMode
+
+from seis_lab_data.webapp import rendering
+
+
+@pytest.fixture
+def renderer():
+    environment = jinja2.Environment(
+        loader=jinja2.DictLoader(
+            {
+                "list.html": (
+                    "<ul id='items'>\n"
+                    "{% for item in items %}<li>{{ item }}</li>\n{% endfor %}"
+                    "</ul>"
+                ),
+            }
+        )
+    )
+    return rendering.TemplateRenderer(environment)
+
+
+@pytest.mark.asyncio
+async def test_render_matches_synchronous_rendering(renderer):
+    rendered = await renderer.render("list.html", items=["a", "b"])
+    assert rendered == "<ul id='items'>\n<li>a</li>\n<li>b</li>\n</ul>"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("num_items", [0, 3, 5000])
+async def test_stream_patch_elements_matches_datastar_output(renderer, num_items):
+    items = [f"item {i}" for i in range(num_items)]
+    expected = ServerSentEventGenerator.patch_elements(
+        renderer.environment.get_template("list.html").render(items=items),
+        selector="#items",
+        mode=ElementPatchMode.REPLACE,
+    )
+    parts = [
+        part
+        async for part in renderer.stream_patch_elements(
+            "list.html",
+            selector="#items",
+            mode=ElementPatchMode.REPLACE,
+            items=items,
+        )
+    ]
+    assert "".join(parts) == expected
+    if num_items == 5000:
+        assert len(parts) > 3
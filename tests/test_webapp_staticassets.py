@@ -0,0 +1,110 @@
+import gzip
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from seis_lab_data.webapp import staticassets
+
+_SCRIPT = b"console.log('hello');\n" * 50
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> Path:
+    static_dir = tmp_path / "static"
+    (static_dir / "js").mkdir(parents=True)
+    (static_dir / "js" / "main.js").write_bytes(_SCRIPT)
+    (static_dir / "img").mkdir()
+    (static_dir / "img" / "logo.png").write_bytes(b"\x89PNG")
+    return static_dir
+
+
+def _get_client(manifest, static_dir: Path) -> TestClient:
+    app = Starlette(
+        routes=[
+            Mount(
+                "/static",
+                staticassets.FingerprintedStaticFiles(manifest, directory=static_dir),
+                name="static",
+            )
+        ]
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        pytest.param("js/main.js", "js/main.0123456789ab.js", id="nested"),
+        pytest.param(
+            "css/bootstrap.min.css", "css/bootstrap.min.0123456789ab.css", id="dots"
+        ),
+        pytest.param("LICENSE", "LICENSE.0123456789ab", id="no-suffix"),
+    ],
+)
+def test_get_fingerprinted_path(path: str, expected: str):
+    assert staticassets.get_fingerprinted_path(path, "0123456789abcdef") == expected
+
+
+def test_fingerprint_changes_with_content(static_dir: Path):
+    before = staticassets.StaticAssetManifest.from_directory(static_dir)
+    (static_dir / "js" / "main.js").write_bytes(_SCRIPT + b"// changed\n")
+    after = staticassets.StaticAssetManifest.from_directory(static_dir)
+    assert before.get_url_path("/js/main.js") != after.get_url_path("/js/main.js")
+    assert before.get_url_path("img/logo.png") == after.get_url_path("img/logo.png")
+    assert before.get_url_path("js/missing.js") == "js/missing.js"
+
+
+def test_built_assets_are_precompressed_and_immutable(static_dir: Path, tmp_path):
+    manifest = staticassets.StaticAssetManifest.build(static_dir, tmp_path / "build")
+    script = manifest.assets["js/main.js"]
+    assert "gzip" in script.encoded_files
+    assert manifest.assets["img/logo.png"].encoded_files == {}
+    # loading the manifest again gives the same fingerprints
+    loaded = staticassets.StaticAssetManifest.from_settings(
+        static_dir, tmp_path / "build"
+    )
+    assert loaded.get_url_path("js/main.js") == script.fingerprinted_path
+
+    client = _get_client(loaded, static_dir)
+    response = client.get(
+        f"/static/{script.fingerprinted_path}",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == staticassets.IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert int(response.headers["content-length"]) == len(
+        gzip.compress(_SCRIPT, compresslevel=9, mtime=0)
+    )
+    assert response.content == _SCRIPT
+
+    uncompressed = client.get(
+        f"/static/{script.fingerprinted_path}",
+        headers={"Accept-Encoding": "gzip;q=0"},
+    )
+    assert "content-encoding" not in uncompressed.headers
+    assert uncompressed.content == _SCRIPT
+
+
+def test_brotli_variants_are_preferred(static_dir: Path, tmp_path):
+    manifest = staticassets.StaticAssetManifest.build(static_dir, tmp_path / "build")
+    script = manifest.assets["js/main.js"]
+    assert "br" in script.encoded_files
+    response = _get_client(manifest, static_dir).get(
+        f"/static/{script.fingerprinted_path}",
+        headers={"Accept-Encoding": "gzip, br"},
+    )
+    assert response.headers["content-encoding"] == "br"
+    assert response.content == _SCRIPT
+
+
+def test_original_names_are_still_served(static_dir: Path):
+    manifest = staticassets.StaticAssetManifest.from_directory(static_dir)
+    response = _get_client(manifest, static_dir).get("/static/js/main.js")
+    assert response.status_code == 200
+    assert "immutable" not in response.headers.get("cache-control", "")
+    assert response.content == _SCRIPT
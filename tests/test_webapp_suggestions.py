@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from seis_lab_data import constants
+from seis_lab_data.webapp import suggestions
+from seis_lab_data.webapp.routes import datalist
+
+_LOCALES = ["en", "pt"]
+
+_PROJECT_NAMES = [
+    {"en": "Seismic survey of the Algarve", "pt": "Levantamento sísmico do Algarve"},
+    {"en": "Algarve coast bathymetry", "pt": "Batimetria da costa algarvia"},
+    {"en": "Madeira seismic campaign", "pt": "Campanha sísmica da Madeira"},
+    {"en": "Secret survey", "pt": "Levantamento secreto"},
+]
+
+
+@pytest.fixture
+def project_rows() -> list[tuple[uuid.UUID, dict[str, str], constants.ProjectStatus]]:
+    return [
+        (
+            uuid.uuid4(),
+            name,
+            constants.ProjectStatus.DRAFT
+            if name["en"].startswith("Secret")
+            else constants.ProjectStatus.PUBLISHED,
+        )
+        for name in _PROJECT_NAMES
+    ]
+
+
+@pytest.fixture
+def project_index(project_rows) -> suggestions.SuggestionIndex:
+    return suggestions.build_project_suggestion_index(project_rows, _LOCALES)
+
+
+def _get_names(found: list[suggestions.Suggestion]) -> list[str]:
+    return [suggestion.name.rpartition(" - ")[0] for suggestion in found]
+
+
+@pytest.mark.parametrize(
+    "search_value, language, expected",
+    [
+        pytest.param(
+            "alg",
+            "en",
+            ["Algarve coast bathymetry", "Seismic survey of the Algarve"],
+            id="names-starting-with-the-search-value-first",
+        ),
+        pytest.param(
+            "SISM",
+            "pt",
+            ["Campanha sísmica da Madeira", "Levantamento sísmico do Algarve"],
+            id="case-and-accents-ignored",
+        ),
+        pytest.param(
+            "seis alg",
+            "en",
+            ["Seismic survey of the Algarve"],
+            id="every-word-must-match",
+        ),
+        pytest.param(
+            "costa",
+            "en",
+            ["Algarve coast bathymetry"],
+            id="other-locales-match",
+        ),
+        pytest.param("lisbon", "en", [], id="no-match"),
+        pytest.param("  ", "en", [], id="blank"),
+    ],
+)
+def test_prefix_search(
+    project_index, search_value: str, language: str, expected: list[str]
+):
+    found = project_index.search(search_value, language, limit=10)
+    assert _get_names(found) == expected
+
+
+def test_prefix_search_limits_and_filters(project_index):
+    assert len(project_index.search("s", "en", limit=2)) == 2
+    assert "Secret survey" in _get_names(project_index.search("s", "en", limit=10))
+    assert "Secret survey" not in _get_names(
+        project_index.search("s", "en", limit=10, published_only=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_database_search_tops_up_prefix_matches(
+    monkeypatch, project_index, project_rows
+):
+    searches = []
+
+    async def search_project_names(session, search_value, limit, published_only):
+        searches.append(search_value)
+        # typo-tolerant matches, which include one of the prefix matches
+        return [(id_, name) for id_, name, _ in project_rows[:2]]
+
+    @contextlib.asynccontextmanager
+    async def session_maker():
+        yield None
+
+    monkeypatch.setattr(
+        suggestions.project_queries, "search_project_names", search_project_names
+    )
+    found = await suggestions.suggest_projects(
+        project_index, session_maker, "bathy", "en", limit=5, published_only=True
+    )
+    assert _get_names(found) == [
+        "Algarve coast bathymetry",
+        "Seismic survey of the Algarve",
+    ]
+    # short search values and enough prefix matches do not need the database
+    await suggestions.suggest_projects(
+        project_index, session_maker, "ba", "en", limit=5, published_only=True
+    )
+    await suggestions.suggest_projects(
+        project_index, session_maker, "seis", "en", limit=1, published_only=True
+    )
+    assert searches == ["bathy"]
+
+
+@pytest.mark.asyncio
+async def test_superseded_requests_are_abandoned():
+    outcome = []
+    disconnect = asyncio.Event()
+
+    async def slow_search():
+        await asyncio.sleep(10)
+        outcome.append("finished")
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    request = Request({"type": "http", "method": "GET", "headers": []}, receive)
+    task = asyncio.create_task(
+        datalist._run_unless_disconnected(request, slow_search())
+    )
+    await asyncio.sleep(0.01)
+    disconnect.set()
+    assert await asyncio.wait_for(task, timeout=1) is None
+    await asyncio.sleep(0.01)
+    assert outcome == []
@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from authlib.jose import (
+    JsonWebKey,
+    JsonWebToken,
+)
+
+from seis_lab_data import config
+from seis_lab_data.auth import AuthConfig
+from seis_lab_data.webapp import (
+    introspection,
+    tokenverification,
+)
+
+_AUTH_CONFIG = AuthConfig.from_settings(config.SeisLabDataSettings())
+
+
+class _FakeAuthServer:
+    def __init__(self) -> None:
+        self.keys = [self._generate_key("key-1")]
+        self.jwks_requests = 0
+        self.introspected: list[str] = []
+        self.revoked: set[str] = set()
+        self.introspection_error: int | Exception | None = None
+
+    @staticmethod
+    def _generate_key(kid: str):
+        return JsonWebKey.generate_key(
+            "RSA", 2048, is_private=True, options={"kid": kid}
+        )
+
+    def rotate_keys(self) -> None:
+        self.keys.insert(0, self._generate_key(f"key-{len(self.keys) + 1}"))
+
+    def issue_token(self, lifetime_seconds: int = 300, **claims) -> str:
+        key = self.keys[0]
+        now = int(time.time())
+        payload = {
+            "iss": _AUTH_CONFIG.issuer,
+            "aud": _AUTH_CONFIG.client_id,
+            "sub": "someone",
+            "iat": now,
+            "exp": now + lifetime_seconds,
+            **claims,
+        }
+        return (
+            JsonWebToken(["RS256"])
+            .encode({"alg": "RS256", "kid": key.kid}, payload, key)
+            .decode()
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url == _AUTH_CONFIG.jwks_uri:
+            self.jwks_requests += 1
+            return httpx.Response(
+                200, json={"keys": [key.as_dict(is_private=False) for key in self.keys]}
+            )
+        token = request.content.decode().partition("=")[2]
+        self.introspected.append(token)
+        if isinstance(self.introspection_error, Exception):
+            raise self.introspection_error
+        if self.introspection_error is not None:
+            return httpx.Response(self.introspection_error)
+        return httpx.Response(200, json={"active": token not in self.revoked})
+
+
+def _get_verifier(
+    auth_server: _FakeAuthServer, revocation_check_interval_seconds: int = 0
+) -> tuple[
+    tokenverification.LocalTokenVerifier,
+    tokenverification.JwksCache,
+    httpx.AsyncClient,
+]:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(auth_server.handle))
+    jwks_cache = tokenverification.JwksCache(
+        http_client,
+        _AUTH_CONFIG.jwks_uri,
+        refresh_interval_seconds=60,
+        min_refresh_interval_seconds=0,
+    )
+    verifier = tokenverification.LocalTokenVerifier(
+        jwks_cache,
+        _AUTH_CONFIG,
+        introspection.TokenIntrospector(
+            http_client,
+            _AUTH_CONFIG,
+            ttl_seconds=0,
+            negative_ttl_seconds=0,
+            max_entries=10,
+        ),
+        revocation_check_interval_seconds=revocation_check_interval_seconds,
+        max_entries=10,
+    )
+    return verifier, jwks_cache, http_client
+
+
+@pytest.mark.asyncio
+async def test_valid_tokens_are_verified_locally():
+    auth_server = _FakeAuthServer()
+    verifier, jwks_cache, http_client = _get_verifier(auth_server)
+    async with http_client:
+        await jwks_cache.refresh()
+        for _ in range(3):
+            assert await verifier.is_active(auth_server.issue_token())
+    assert auth_server.jwks_requests == 1
+    assert auth_server.introspected == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token_kwargs",
+    [
+        pytest.param({"lifetime_seconds": -120}, id="expired"),
+        pytest.param({"aud": "some-other-client"}, id="wrong-audience"),
+        pytest.param({"iss": "https://elsewhere/"}, id="wrong-issuer"),
+    ],
+)
+async def test_invalid_tokens_are_rejected(token_kwargs: dict):
+    auth_server = _FakeAuthServer()
+    verifier, jwks_cache, http_client = _get_verifier(auth_server)
+    async with http_client:
+        await jwks_cache.refresh()
+        assert not await verifier.is_active(auth_server.issue_token(**token_kwargs))
+    assert auth_server.introspected == []
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_refreshes_the_key_set():
+    auth_server = _FakeAuthServer()
+    verifier, jwks_cache, http_client = _get_verifier(auth_server)
+    async with http_client:
+        await jwks_cache.refresh()
+        auth_server.rotate_keys()
+        assert await verifier.is_active(auth_server.issue_token())
+    assert auth_server.jwks_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_opaque_tokens_fall_back_to_introspection():
+    auth_server = _FakeAuthServer()
+    verifier, jwks_cache, http_client = _get_verifier(auth_server)
+    async with http_client:
+        await jwks_cache.refresh()
+        assert await verifier.is_active("opaque-token")
+    assert auth_server.introspected == ["opaque-token"]
+
+
+@pytest.mark.asyncio
+async def test_revoked_tokens_are_rejected_after_background_check():
+    auth_server = _FakeAuthServer()
+    verifier, jwks_cache, http_client = _get_verifier(
+        auth_server, revocation_check_interval_seconds=300
+    )
+    token = auth_server.issue_token()
+    auth_server.revoked.add(token)
+    async with http_client:
+        await jwks_cache.refresh()
+        # the first check is answered locally, while revocation is checked
+        # in the background
+        assert await verifier.is_active(token)
+        await asyncio.sleep(0.01)
+        assert not await verifier.is_active(token)
+    assert auth_server.introspected == [token]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "introspection_error",
+    [
+        pytest.param(httpx.ConnectError("unreachable"), id="transport-error"),
+        pytest.param(503, id="server-error"),
+    ],
+)
+async def test_tokens_are_kept_when_revocation_cannot_be_checked(
+    introspection_error, caplog
+):
+    auth_server = _FakeAuthServer()
+    auth_server.introspection_error = introspection_error
+    verifier, jwks_cache, http_client = _get_verifier(
+        auth_server, revocation_check_interval_seconds=300
+    )
+    token = auth_server.issue_token()
+    async with http_client:
+        await jwks_cache.refresh()
+        assert await verifier.is_active(token)
+        await asyncio.sleep(0.01)
+        assert await verifier.is_active(token)
+    assert auth_server.introspected == [token]
+    assert "Could not check whether a locally verified token was revoked" in (
+        caplog.text
+    )